@@ -14,6 +14,8 @@ melhorias:
 - Para β "EC2":
   * Retangulares (bordo/canto): usa u1*, W1 e k(c1/c2) (Quadro 6.1, com interpolação).
   * Circulares (interior/bordo/canto): usa equivalência retangular (c1=c2=D) para W1 e u1*.
+  * Poligonais / com bordos e aberturas (geometria): u1 e W1 pelo contorno real
+    (Punching_EC2_geometria), com c1 × c2 envolventes.
 - Para β "fib_MC10":
   * Utiliza o coeficiente de excentricidade ke do Model Code 2010
     (via fórmula geral ke = 1 / (1 + e_u / b1,e) e limites típicos por posição de pilar),
@@ -31,11 +33,189 @@ Local/Data: Porto, 2025-10-31
 © 2025 Engº Lutonda Tomalela. Todos os direitos reservados
 """
 
+import contextvars
 import math
+import operator
+import os
 import sys
+import time
+from functools import lru_cache, partial
 
 FMT = ".3f"  #formato global de 3 casas
 
+TIPOS_PILAR = ("interior", "bordo", "canto")
+FORMAS_PILAR = ("retangular", "circular")
+BETA_MODES = ("simplificado", "ec2", "fib")
+
+#códigos de estado da verificação (PuncoamentoEC2.estado)
+ESTADO_OK = 0             # v_Ed(u1) ≤ v_Rd,c – sem armadura
+ESTADO_ARMADURA = 1       # armadura de punçoamento dimensionada
+ESTADO_FALHA_CS_MAX = 2   # v_Ed(u1) > v_Rd,cs,max
+ESTADO_FALHA_U0 = 3       # esmagamento da escora em u0
+ESTADO_ERRO = 4           # u0 = 0, u1,ef = 0 ou β indeterminado
+
+ESTADOS = {
+    ESTADO_OK: "ok",
+    ESTADO_ARMADURA: "armadura",
+    ESTADO_FALHA_CS_MAX: "falha_v_Rd_cs_max",
+    ESTADO_FALHA_U0: "falha_esmagamento",
+    ESTADO_ERRO: "erro",
+}
+
+
+def normalizar_beta_mode(beta_mode) -> str:
+    """Converte os aliases aceites para o modo de β ("simplificado", "ec2" ou "fib")."""
+    beta_mode = (beta_mode or "simplificado").lower().strip()
+    if beta_mode in ("calculado", "ec2", "calculado_ec2", "2"):
+        return "ec2"
+    if beta_mode in ("fib", "calculado_fib", "fib_model_code", "3"):
+        return "fib"
+    return "simplificado"
+
+
+
+# ---------------------------------------------------------------------
+# --- CONSTANTES DE MATERIAIS / LAJE (cache LRU) ---
+# ---------------------------------------------------------------------
+TAMANHO_CACHE_CONSTANTES = 1024
+
+
+def _calc_rho_l_from_As(As_lx_cm2pm, As_ly_cm2pm, d):
+    rho_lx = (As_lx_cm2pm or 0.0) / 10000.0 / d
+    rho_ly = (As_ly_cm2pm or 0.0) / 10000.0 / d
+    if rho_lx <= 0 or rho_ly <= 0:
+        return None
+    return min((rho_lx * rho_ly) ** 0.5, 0.02)
+
+
+def _calcular_constantes(fck, fyk, fywk, gamma_C, gamma_S, d, As_lx_cm2pm, As_ly_cm2pm, rho_l):
+    """
+    ρl e parâmetros de cálculo que só dependem dos materiais e da laje.
+    Devolve (rho_l, Asx, Asy, fcd, fctm, fctk_0_05, fctd, fyd, fywd, k_val, C_Rd_c, v_min, nu).
+    """
+    #cálculo automático de ρl
+    rho_from_As = _calc_rho_l_from_As(As_lx_cm2pm, As_ly_cm2pm, d)
+
+    if rho_from_As is not None:
+        rho, Asx, Asy = rho_from_As, As_lx_cm2pm, As_ly_cm2pm  # prioridade: Asx/Asy
+    elif rho_l is not None:
+        rho, Asx, Asy = min(float(rho_l), 0.02), None, None
+    else:
+        raise ValueError("Forneça As_lx/As_ly (cm²/m) ou laje_rho_l.")
+
+    fcd = 1.0 * fck / gamma_C
+    if fck <= 50:
+        fctm = 0.30 * fck ** (2 / 3)
+    else:
+        fctm = 2.12 * math.log(1 + (fck + 8) / 10)
+    fctk_0_05 = 0.7 * fctm
+    fctd = (1.0 * fctk_0_05 / gamma_C)
+    fyd = fyk / gamma_S
+    fywd = fywk / gamma_S
+    k_val = min(1 + math.sqrt(200 / (d * 1000)), 2.0)
+    C_Rd_c = 0.18 / gamma_C
+    v_min = 0.035 * (k_val ** 1.5) * (fck ** 0.5)
+    nu = 0.6 * (1 - fck / 250)
+    return rho, Asx, Asy, fcd, fctm, fctk_0_05, fctd, fyd, fywd, k_val, C_Rd_c, v_min, nu
+
+
+_constantes_cache = lru_cache(maxsize=TAMANHO_CACHE_CONSTANTES)(_calcular_constantes)
+
+
+def _constantes_laje(*args):
+    """Versão memorizada de _calcular_constantes (argumentos não hasheáveis não usam a cache)."""
+    try:
+        return _constantes_cache(*args)
+    except TypeError:
+        return _calcular_constantes(*args)
+
+
+def info_cache_constantes():
+    """Estatísticas da cache de constantes: (hits, misses, maxsize, currsize)."""
+    return _constantes_cache.cache_info()
+
+
+def limpar_cache_constantes():
+    """Esvazia a cache de constantes e repõe as estatísticas."""
+    _constantes_cache.cache_clear()
+
+
+def configurar_cache_constantes(maxsize: int | None = TAMANHO_CACHE_CONSTANTES):
+    """Redefine a dimensão máxima da cache (None -> ilimitada, 0 -> desativada)."""
+    global _constantes_cache
+    _constantes_cache = lru_cache(maxsize=maxsize)(_calcular_constantes)
+
+
+# ---------------------------------------------------------------------
+# --- GRAFO DE DEPENDÊNCIAS (recálculo incremental) ---
+# ---------------------------------------------------------------------
+
+#atributos só definidos quando há dimensionamento de armadura (estado 1 ou 2)
+ATRIBUTOS_ARMADURA = ("v_Rd_cs_max", "f_ywd_ef", "Asw_sr_calc", "Asw_sr_min", "Asw_sr_req", "u_out_ef",
+                      "dist_zona_armar", "s0_max", "sr_max", "n_perimetros", "Asw_por_perimetro")
+
+#nó -> (método que o avalia, entradas diretas (atributos ou outros nós), atributos calculados)
+#cada atributo pertence a um só nó; "verificacao" avalia v_Rd_max e v_Rd_c dentro dele
+GRAFO_DEPENDENCIAS = {
+    "constantes": ("_get_constantes",
+                   ("fck", "fyk", "fywk", "gamma_C", "gamma_S", "d", "_armadura_laje"),
+                   ("rho_l", "Asx_cm2pm", "Asy_cm2pm", "fcd", "fctm", "fctk_0_05", "fctd", "fyd", "fywd",
+                    "k_val", "C_Rd_c", "v_min", "nu")),
+    "perimetros": ("_get_perimetros_criticos",
+                   ("tipo_pilar", "forma_pilar", "c1", "c2", "D", "d", "geometria"),
+                   ("u0", "u1", "perimetros_controlo")),
+    "termos_beta": ("_get_termos_beta",
+                    ("perimetros", "beta_mode", "tipo_pilar", "forma_pilar", "c1", "c2", "D", "d"),
+                    ("termos_beta",)),
+    "beta": ("_get_beta",
+             ("termos_beta", "perimetros", "beta_mode", "tipo_pilar", "forma_pilar", "D", "d",
+              "V_Ed", "M_Edx", "M_Edy", "edge_perp_interior", "corner_interior"),
+             ("beta", "k_beta")),
+    "reducoes": ("_get_V_Ed_red_e_u1_efetivo",
+                 ("perimetros", "forma_pilar", "c1", "c2", "D", "d", "V_Ed", "is_sapata", "sigma_gd",
+                  "u1_ineffective", "geometria"),
+                 ("V_Ed_red", "Delta_V_Ed", "u1_eff")),
+    "v_Rd_max": ("_get_v_Rd_max", ("constantes",), ("v_Rd_max",)),
+    "v_Rd_c": ("_get_v_Rd_c", ("constantes", "fck", "sigma_cp", "k1"), ("v_Rd_c",)),
+    "verificacao": ("_verificar_resistencias",
+                    ("constantes", "perimetros", "beta", "reducoes", "v_Rd_max", "v_Rd_c",
+                     "tipo_pilar", "forma_pilar", "c1", "c2", "D", "d", "fck", "fywk", "V_Ed", "is_sapata",
+                     "kmax"),
+                    ("v_Ed_u0", "v_Ed_u1", "armadura_necessaria", "estado") + ATRIBUTOS_ARMADURA),
+}
+
+
+def nos_a_jusante(*nomes) -> set:
+    """Nós do grafo que dependem (direta ou indiretamente) das entradas ou nós dados."""
+    afetados, pendentes = set(), list(nomes)
+    while pendentes:
+        nome = pendentes.pop()
+        for no, (_, entradas, _) in GRAFO_DEPENDENCIAS.items():
+            if nome in entradas and no not in afetados:
+                afetados.add(no)
+                pendentes.append(no)
+    return afetados
+
+
+_METODO_NO = {no: metodo for no, (metodo, _, _) in GRAFO_DEPENDENCIAS.items()}
+_ENTRADAS_GRAFO = tuple(sorted({e for _, entradas, _ in GRAFO_DEPENDENCIAS.values() for e in entradas
+                                if e not in GRAFO_DEPENDENCIAS}))
+_JUSANTE = {e: frozenset(nos_a_jusante(e)) for e in _ENTRADAS_GRAFO}
+_ler_entradas_grafo = operator.attrgetter(*_ENTRADAS_GRAFO)
+_ATRIBUTOS_ENTRADA = tuple(e for e in _ENTRADAS_GRAFO if e not in ("k1", "kmax"))  #vindos do construtor
+#nós avaliados dentro de outro nó (reutilizar o de fora também os reutiliza)
+_SUBNOS = {no: tuple(e for e in entradas if e in GRAFO_DEPENDENCIAS) for no, (_, entradas, _) in GRAFO_DEPENDENCIAS.items()}
+
+#valores dos resultados antes de uma verificação (V_Ed_red parte de V_Ed)
+_RESULTADOS_INICIAIS = {"u0": 0.0, "u1": 0.0, "perimetros_controlo": None, "u1_eff": 0.0, "Delta_V_Ed": 0.0, "beta": 1.0, "k_beta": None,
+                        "termos_beta": None, "v_Ed_u0": 0.0, "v_Ed_u1": 0.0, "v_Rd_max": 0.0, "v_Rd_c": 0.0,
+                        "armadura_necessaria": False}
+#o mesmo, por nó (as constantes não se repõem: são recalculadas quando o nó é avaliado)
+_INICIAIS_NO = {no: {a: _RESULTADOS_INICIAIS[a] for a in saidas if a in _RESULTADOS_INICIAIS}
+                for no, (_, _, saidas) in GRAFO_DEPENDENCIAS.items()}
+_INICIAIS_NO["verificacao"]["estado"] = ESTADO_ERRO
+
+
 class PuncoamentoEC2:
     """
     Verificação ao punçoamento em lajes maciças (NP EN 1992-1-1:2010 + A1:2019).
@@ -65,9 +245,13 @@ class PuncoamentoEC2:
                  laje_As_ly_cm2pm: float | None = None,
                  laje_rho_l: float | None = None,
                  edge_perp_interior: bool = True,
-                 corner_interior: bool = True):
+                 corner_interior: bool = True,
+                 geometria=None):
         """
         Aceita Asx/Asy [cm²/m] ou ρl diretamente (retrocompatível).
+        geometria: GeometriaPilar (ou dict) com o contorno do pilar, bordos e aberturas;
+        u1, W1 e a parte ineficaz de u1 passam a vir de Punching_EC2_geometria.
+        Com pilar_forma="poligonal" é obrigatória e c1, c2 são as dimensões envolventes.
         """
 
         #entradas base
@@ -81,6 +265,14 @@ class PuncoamentoEC2:
         self.c1 = pilar_c1
         self.c2 = pilar_c2 if self.forma_pilar == 'retangular' else pilar_c1
         self.D = pilar_c1 if self.forma_pilar == 'circular' else None
+        self.geometria = None
+        if geometria is not None:
+            from Punching_EC2_geometria import GeometriaPilar  # NumPy só quando necessário
+            self.geometria = GeometriaPilar.de(geometria)
+        if self.forma_pilar == 'poligonal':
+            if self.geometria is None:
+                raise ValueError("Pilares poligonais exigem geometria (contorno do pilar).")
+            self.c1, self.c2 = self.geometria.dimensoes
         self.M_Edx = M_Edx
         self.M_Edy = M_Edy
         self.sigma_cp = sigma_cp
@@ -91,75 +283,185 @@ class PuncoamentoEC2:
         self.gamma_S = gamma_S
         self.edge_perp_interior = bool(edge_perp_interior)
         self.corner_interior = bool(corner_interior)
+        self._armadura_laje = (laje_As_lx_cm2pm, laje_As_ly_cm2pm, laje_rho_l)
 
         #normalização do modo de β
-        beta_mode = (beta_mode or "simplificado").lower().strip()
-        if beta_mode in ("calculado", "ec2", "calculado_ec2", "2"):
-            self.beta_mode = "ec2"
-        elif beta_mode in ("fib", "calculado_fib", "fib_model_code", "3"):
-            self.beta_mode = "fib"
-        else:
-            self.beta_mode = "simplificado"
-
-        #cálculo automático de ρl
-        def _calc_rho_l_from_As(As_lx_cm2pm, As_ly_cm2pm, d):
-            rho_lx = (As_lx_cm2pm or 0.0) / 10000.0 / d
-            rho_ly = (As_ly_cm2pm or 0.0) / 10000.0 / d
-            if rho_lx <= 0 or rho_ly <= 0:
-                return None
-            return min((rho_lx * rho_ly) ** 0.5, 0.02)
-
-        rho_from_As = _calc_rho_l_from_As(laje_As_lx_cm2pm, laje_As_ly_cm2pm, self.d)
-
-        if rho_from_As is not None:
-            self.rho_l = rho_from_As  # prioridade: Asx/Asy
-            self.Asx_cm2pm = laje_As_lx_cm2pm
-            self.Asy_cm2pm = laje_As_ly_cm2pm
-        elif laje_rho_l is not None:
-            self.rho_l = min(float(laje_rho_l), 0.02)
-            self.Asx_cm2pm = None
-            self.Asy_cm2pm = None
-        else:
-            raise ValueError("Forneça As_lx/As_ly (cm²/m) ou laje_rho_l.")
-
-        #parâmetros de cálculo -
-        self.fcd = 1.0 * self.fck / self.gamma_C
-        if self.fck <= 50:
-            self.fctm = 0.30 * self.fck ** (2 / 3)
-        else:
-            self.fctm = 2.12 * math.log(1 + (self.fck + 8) / 10)
-        self.fctk_0_05 = 0.7 * self.fctm
-        self.fctd = (1.0 * self.fctk_0_05 / self.gamma_C)
-        self.fyd = self.fyk / self.gamma_S
-        self.fywd = self.fywk / self.gamma_S
-        self.k_val = min(1 + math.sqrt(200 / (self.d * 1000)), 2.0)
-        self.C_Rd_c = 0.18 / self.gamma_C
+        self.beta_mode = normalizar_beta_mode(beta_mode)
+
+        #ρl e parâmetros de cálculo (memorizados por combinação de materiais/laje)
+        (self.rho_l, self.Asx_cm2pm, self.Asy_cm2pm,
+         self.fcd, self.fctm, self.fctk_0_05, self.fctd, self.fyd, self.fywd,
+         self.k_val, self.C_Rd_c, self.v_min, self.nu) = _constantes_laje(
+            self.fck, self.fyk, self.fywk, self.gamma_C, self.gamma_S, self.d,
+            laje_As_lx_cm2pm, laje_As_ly_cm2pm, laje_rho_l)
         self.k1 = 0.1
-        self.v_min = 0.035 * (self.k_val ** 1.5) * (self.fck ** 0.5)
-        self.nu = 0.6 * (1 - self.fck / 250)
         self.kmax = 1.5
 
+        #grafo de dependências: nós guardados (nome -> (linhas do relatório, retorno)) e
+        #entradas da última verificação (None -> a próxima avalia todos os nós)
+        self._nos = {}
+        self._entradas_grafo = None
+        self._avaliados = None
+
         #resultados
         self.u0 = 0.0
         self.u1 = 0.0
+        self.perimetros_controlo = None
         self.u1_eff = 0.0
         self.V_Ed_red = self.V_Ed
+        self.Delta_V_Ed = 0.0
         self.beta = 1.0
         self.k_beta = None
+        self.termos_beta = None
         self.v_Ed_u0 = 0.0
         self.v_Ed_u1 = 0.0
         self.v_Rd_max = 0.0
         self.v_Rd_c = 0.0
         self.armadura_necessaria = False
+        self.estado = ESTADO_ERRO
         self.relatorio = []
+        self.traco = []
+
+    # -------------------------------
+    # entradas e recálculo incremental
+    # --------------------------
+    def entradas(self) -> dict:
+        """Argumentos de PuncoamentoEC2 que reproduzem as entradas atuais."""
+        As_lx, As_ly, rho_l = self._armadura_laje
+        return {
+            "laje_d": self.d, "betão_fck": self.fck, "aço_fyk": self.fyk, "aço_fywk": self.fywk,
+            "pilar_tipo": self.tipo_pilar, "pilar_forma": self.forma_pilar, "V_Ed": self.V_Ed,
+            "pilar_c1": self.c1, "pilar_c2": self.c2, "M_Edx": self.M_Edx, "M_Edy": self.M_Edy,
+            "sigma_cp": self.sigma_cp, "is_sapata": self.is_sapata, "sigma_gd_kpa": self.sigma_gd / 1000,
+            "u1_ineffective": self.u1_ineffective, "gamma_C": self.gamma_C, "gamma_S": self.gamma_S,
+            "beta_mode": self.beta_mode, "laje_As_lx_cm2pm": As_lx, "laje_As_ly_cm2pm": As_ly,
+            "laje_rho_l": rho_l, "edge_perp_interior": self.edge_perp_interior,
+            "corner_interior": self.corner_interior, "geometria": self.geometria,
+        }
+
+    def atualizar(self, **alteracoes) -> "PuncoamentoEC2":
+        """
+        Altera entradas (com os nomes dos argumentos do construtor) para uma nova verificação.
+
+        A verificação seguinte só reavalia os nós do grafo (GRAFO_DEPENDENCIAS) a
+        jusante das entradas que mudaram desde a verificação anterior (antes da 1.ª,
+        todos, incluindo as constantes); os restantes mantêm os valores e repõem as
+        linhas do relatório guardadas. Atribuir diretamente às entradas (v.V_Ed = ...)
+        tem o mesmo efeito. Devolve o próprio objeto.
+        """
+        novo = PuncoamentoEC2(**{**self.entradas(), **alteracoes})  # normaliza e valida como o construtor
+        for nome in _ATRIBUTOS_ENTRADA:
+            setattr(self, nome, getattr(novo, nome))
+        return self
+
+    def __copy__(self):
+        """Cópia com as entradas e os resultados atuais (e os seus próprios nós guardados)."""
+        novo = PuncoamentoEC2.__new__(PuncoamentoEC2)
+        novo.__dict__.update(self.__dict__)
+        novo._nos = dict(self._nos)
+        return novo
+
+    @property
+    def nos_avaliados(self) -> list | None:
+        """
+        Nós do grafo reavaliados na última verificação (os outros foram reutilizados).
+        None antes da 1.ª verificação.
+        """
+        return self._avaliados
+
+    def _no(self, nome: str):
+        """
+        Avalia um nó do grafo ou, se continuar válido, repõe as suas linhas do relatório
+        (os atributos que calcula ficaram no objeto desde a verificação anterior).
+        """
+        guardado = self._nos.get(nome)
+        if guardado is not None:
+            self.traco += guardado[0]
+            self._usados.update(_SUBNOS[nome])
+            self._usados.add(nome)
+            return guardado[1]
+        inicio = len(self.traco)
+        retorno = getattr(self, _METODO_NO[nome])()
+        self._nos[nome] = (self.traco[inicio:], retorno)
+        self._avaliados.append(nome)
+        self._usados.add(nome)
+        return retorno
+
+    def _repor_no(self, nome: str):
+        """Repõe os atributos calculados por um nó nos valores anteriores a uma verificação."""
+        self.__dict__.update(_INICIAIS_NO[nome])
+        if nome == "reducoes":
+            self.V_Ed_red = self.V_Ed
+        elif nome == "verificacao":
+            for atributo in ATRIBUTOS_ARMADURA:
+                self.__dict__.pop(atributo, None)
+
+    def _preparar_nos(self):
+        """
+        Antes de uma verificação: descarta os nós a jusante das entradas alteradas
+        (todos, na 1.ª verificação) e repõe os atributos dos que vão ser reavaliados.
+        """
+        entradas = _ler_entradas_grafo(self)
+        self._avaliados = []
+        self._usados = set()
+        if self._entradas_grafo is None:  #1.ª verificação: resultados ainda nos valores iniciais
+            self._entradas_grafo = entradas
+            return
+        if entradas != self._entradas_grafo:
+            alterados = [nome for nome, novo, antigo in zip(_ENTRADAS_GRAFO, entradas, self._entradas_grafo)
+                         if novo is not antigo and novo != antigo]
+            for nome in set().union(*map(_JUSANTE.__getitem__, alterados)):
+                self._nos.pop(nome, None)
+            self._entradas_grafo = entradas
+        for nome in GRAFO_DEPENDENCIAS:
+            if nome not in self._nos:
+                self._repor_no(nome)
+
+    def _descartar_nao_usados(self):
+        """Depois de uma verificação: esquece (e repõe) os nós guardados que não foram alcançados."""
+        if len(self._usados) < len(self._nos):
+            for nome in set(self._nos).difference(self._usados):
+                del self._nos[nome]
+                self._repor_no(nome)
+
+    # -------------------------------
+    # relatório (formatação diferida)
+    # --------------------------
+    def _rel(self, modelo: str, *valores):
+        """
+        Regista uma linha do relatório como (modelo, valores), sem formatar.
+        `modelo` segue str.format; {:{FMT}} usa o formato global de 3 casas.
+        """
+        self.traco.append((modelo, valores))
+
+    def gerar_relatorio(self) -> str:
+        """Formata o traço registado na última verificação e devolve o relatório em texto."""
+        self.relatorio = [modelo.format(*valores, FMT=FMT) for modelo, valores in self.traco]
+        return "\n".join(self.relatorio)
+
+    def resultado(self) -> "PunchingResult":
+        """Registo compacto (PunchingResult) dos resultados da última verificação."""
+        return PunchingResult.de_verificacao(self)
+
+    # -------------------------------
+    # constantes dos materiais e da laje
+    # --------------------------
+    def _get_constantes(self):
+        """ρl e parâmetros de cálculo (memorizados por combinação de materiais/laje)."""
+        constantes = _constantes_laje(self.fck, self.fyk, self.fywk, self.gamma_C, self.gamma_S, self.d,
+                                      *self._armadura_laje)
+        (self.rho_l, self.Asx_cm2pm, self.Asy_cm2pm,
+         self.fcd, self.fctm, self.fctk_0_05, self.fctd, self.fyd, self.fywd,
+         self.k_val, self.C_Rd_c, self.v_min, self.nu) = constantes
+        return constantes
 
     # -------------------------------
     # Perímetros críticos u0 / u1
     # --------------------------
     def _get_perimetros_criticos(self):
-        """Calcula u0 (face) e u1 (a 2d)."""
+        """Calcula u0 (face) e u1 (a 2d); com geometria, u1 (e u0 nos interiores) vêm do contorno."""
 
-        if self.forma_pilar == 'retangular':
+        if self.forma_pilar in ('retangular', 'poligonal'):
             if self.tipo_pilar == 'interior':
                 self.u0 = 2 * (self.c1 + self.c2)
                 self.u1 = 2 * (self.c1 + self.c2) + 4 * math.pi * self.d
@@ -181,6 +483,17 @@ class PuncoamentoEC2:
                 self.u0 = min(3 * self.d, 2 * self.D)
                 self.u1 = 0.25 * math.pi * self.D + 2 * math.pi * self.d
 
+        if self.geometria is not None:
+            g = self.perimetros_controlo = self.geometria.perimetros(self.d)
+            if self.tipo_pilar == 'interior':
+                self.u0 = g.u0
+            self.u1 = g.u1
+            self._rel(
+                "\nPerímetros pela geometria do pilar: u0={:{FMT}} m, u1={:{FMT}} m "
+                "(ineficaz junto a {} abertura(s): {:{FMT}} m).",
+                self.u0, self.u1, len(g.aberturas), g.u1_ineficaz
+            )
+
     # ---------------------------------
     # aux para β calculado (EC2)
     # ---------------------------------------
@@ -274,9 +587,73 @@ class PuncoamentoEC2:
     # --------------------------
     # Beta (simplificado / EC2 / fib)
     # ---------------------------------------
+    def _get_termos_beta(self):
+        """
+        Termos de β que só dependem da geometria (k, W1, u1*, b_x, b_y, b1,e, ...),
+        só para o modo/tipo/forma do pilar; as excentricidades entram em _get_beta.
+        """
+        t = {}
+        retangular = self.forma_pilar != 'circular'  #poligonais: c1 × c2 envolventes
+        if self.beta_mode == "ec2":
+            ratio = (self.c1 / self.c2 if self.c2 not in (0.0, None) else 1.0) if retangular else 1.0
+            t["ratio"] = ratio
+            t["k_ratio"] = self._interp_k_por_ratio(ratio)
+            if self.tipo_pilar == 'interior':
+                if retangular:
+                    t["W1_x"] = self._W1_retangular(self.c1, self.c2)
+                    t["k_y"] = self._interp_k_por_ratio(1.0 / ratio if ratio > 1e-12 else 1.0)
+                    t["W1_y"] = self._W1_retangular(self.c2, self.c1)
+                    t["b_x"] = self.c1 + 4.0 * self.d
+                    t["b_y"] = self.c2 + 4.0 * self.d
+                else:
+                    t["b_circ"] = self.D + 4.0 * self.d
+            elif self.tipo_pilar == 'bordo':
+                # Convenção geométrica do programa: c1 paralelo ao bordo; c2 perpendicular ao bordo.
+                if retangular:
+                    t["u1_star"] = self._u1_estrela_bordo_ret()
+                    t["W1"] = self._W1_bordo_retangular()
+                    t["ratio_bordo"] = self.c1 / (2.0 * self.c2) if self.c2 not in (0.0, None) else 1.0
+                else:
+                    t["u1_star"] = self._u1_estrela_bordo_circ()
+                    t["W1"] = self._W1_circular_equiv()
+                    t["ratio_bordo"] = 0.5
+                t["k_bordo"] = self._interp_k_por_ratio_bordo(t["ratio_bordo"])
+            elif self.tipo_pilar == 'canto':
+                if retangular:
+                    t["u1_star"] = self._u1_estrela_canto_ret()
+                    t["W1"] = self._W1_retangular_interior()
+                else:
+                    t["u1_star"] = self._u1_estrela_canto_circ()
+                    t["W1"] = self._W1_circular_equiv()
+        elif self.beta_mode == "fib":
+            # comprimento característico be1 na direção da excentricidade
+            # (aproximação: maior dimensão do perímetro de controlo na direção relevante)
+            if retangular:
+                t["be1_x"] = self.c1 + 4.0 * self.d
+                t["be1_y"] = self.c2 + 4.0 * self.d
+            else:
+                t["be1_x"] = t["be1_y"] = self.D + 4.0 * self.d
+            # limites típicos por posição do pilar (valores usuais de MC2010 / literatura)
+            if self.tipo_pilar == 'interior':
+                t["ke_min"] = 0.90
+            elif self.tipo_pilar == 'bordo':
+                t["ke_min"] = 0.70
+            else:  # canto
+                t["ke_min"] = 0.65
+        g = self.perimetros_controlo
+        if g is not None and self.beta_mode == "ec2":
+            # W1 (6.40) integrado ao longo de u1; no canto, o menor dos dois (maior β)
+            if "W1_x" in t:
+                t["W1_x"], t["W1_y"] = g.W1_x, g.W1_y
+            if "W1" in t:
+                t["W1"] = g.W1_x if self.tipo_pilar == 'bordo' else min(g.W1_x, g.W1_y)
+        self.termos_beta = t
+        return t
+
     def _get_beta(self):
-        """Calcula o fator β (simplificado, EC2 ou fib)."""
+        """Calcula o fator β (simplificado, EC2 ou fib); devolve o ramo seguido (para PerfilEtapas)."""
 
+        t = self.termos_beta if self.termos_beta is not None else self._get_termos_beta()
         V = max(self.V_Ed, 1e-9)
         e_x, e_y = self._eccentricidades_planas(V)
         tiny = 1e-12
@@ -286,8 +663,8 @@ class PuncoamentoEC2:
             if abs(e_x) < tiny and abs(e_y) < tiny:
                 self.beta = 1.0
                 self.k_beta = None
-                self.relatorio.append(f"\nFator β: {self.beta:{FMT}} (sem momentos, simplificado).")
-                return
+                self._rel("\nFator β: {:{FMT}} (sem momentos, simplificado).", self.beta)
+                return "sem momentos"
             if self.tipo_pilar == 'interior':
                 self.beta = 1.15
             elif self.tipo_pilar == 'bordo':
@@ -295,63 +672,64 @@ class PuncoamentoEC2:
             elif self.tipo_pilar == 'canto':
                 self.beta = 1.5
             self.k_beta = None
-            self.relatorio.append(
-                f"\nFator β (simplificado): {self.beta:{FMT}} (valores recomendados EC2 em função da posição do pilar)."
+            self._rel(
+                "\nFator β (simplificado): {:{FMT}} "
+                "(valores recomendados EC2 em função da posição do pilar).",
+                self.beta
             )
-            return
+            return "valores recomendados"
 
         # 2) MODO EC2
         if self.beta_mode == "ec2":
-            if self.forma_pilar == 'retangular':
-                ratio = self.c1 / self.c2 if self.c2 not in (0.0, None) else 1.0
-                self.k_beta = self._interp_k_por_ratio(ratio)
-            else:
-                ratio = 1.0
-                self.k_beta = self._interp_k_por_ratio(ratio)
+            ratio = t["ratio"]
+            self.k_beta = t["k_ratio"]
 
             # 2.1 PILAR INTERIOR
             if self.tipo_pilar == 'interior':
                 if abs(e_x) < tiny and abs(e_y) < tiny:
                     self.beta = 1.0
-                    self.relatorio.append("\nFator β (EC2 – interior): 1.000 (sem excentricidades).")
-                    return
+                    self._rel("\nFator β (EC2 – interior): 1.000 (sem excentricidades).")
+                    return "interior, sem excentricidades"
 
-                if self.forma_pilar == 'retangular':
+                if self.forma_pilar != 'circular':
                     if abs(e_x) >= abs(e_y) and abs(e_y) < tiny:
-                        W1 = self._W1_retangular(self.c1, self.c2)
+                        W1 = t["W1_x"]
                         self.beta = self._beta_ec2_expressao_639(e_x, W1, self.k_beta, self.u1)
-                        self.relatorio.append(
-                            f"\nFator β (EC2 – interior ret., uniaxial x): {self.beta:{FMT}} "
-                            f"(e_x={e_x:{FMT}} m, W1={W1:{FMT}} m², k={self.k_beta:{FMT}}, c1/c2={ratio:{FMT}})."
+                        self._rel(
+                            "\nFator β (EC2 – interior ret., uniaxial x): {:{FMT}} "
+                            "(e_x={:{FMT}} m, W1={:{FMT}} m², k={:{FMT}}, c1/c2={:{FMT}}).",
+                            self.beta, e_x, W1, self.k_beta, ratio
                         )
-                        return
+                        return "interior ret., uniaxial x"
                     if abs(e_y) > abs(e_x) and abs(e_x) < tiny:
-                        W1 = self._W1_retangular(self.c2, self.c1)
-                        k = self._interp_k_por_ratio(1.0 / ratio if ratio > tiny else 1.0)
+                        W1 = t["W1_y"]
+                        k = t["k_y"]
                         self.beta = self._beta_ec2_expressao_639(e_y, W1, k, self.u1)
-                        self.relatorio.append(
-                            f"\nFator β (EC2 – interior ret., uniaxial y): {self.beta:{FMT}} "
-                            f"(e_y={e_y:{FMT}} m, W1={W1:{FMT}} m², k={k:{FMT}})."
+                        self._rel(
+                            "\nFator β (EC2 – interior ret., uniaxial y): {:{FMT}} "
+                            "(e_y={:{FMT}} m, W1={:{FMT}} m², k={:{FMT}}).",
+                            self.beta, e_y, W1, k
                         )
-                        return
+                        return "interior ret., uniaxial y"
 
-                    b_x = self.c1 + 4.0 * self.d
-                    b_y = self.c2 + 4.0 * self.d
+                    b_x = t["b_x"]
+                    b_y = t["b_y"]
                     self.beta = 1.0 + 1.8 * math.sqrt((e_x / b_x) ** 2 + (e_y / b_y) ** 2)
-                    self.relatorio.append(
-                        f"\nFator β (EC2 – interior ret., biaxial): {self.beta:{FMT}} "
-                        f"(e_x={e_x:{FMT}} m, e_y={e_y:{FMT}} m, b_x={b_x:{FMT}} m, b_y={b_y:{FMT}} m)."
+                    self._rel(
+                        "\nFator β (EC2 – interior ret., biaxial): {:{FMT}} "
+                        "(e_x={:{FMT}} m, e_y={:{FMT}} m, b_x={:{FMT}} m, b_y={:{FMT}} m).",
+                        self.beta, e_x, e_y, b_x, b_y
                     )
-                    return
+                    return "interior ret., biaxial"
 
                 if self.forma_pilar == 'circular':
                     e_tot = math.sqrt(e_x**2 + e_y**2)
-                    self.beta = 1.0 + 0.6 * math.pi * e_tot / (self.D + 4.0 * self.d)
-                    self.relatorio.append(
-                        f"\nFator β (EC2 – interior circ.): {self.beta:{FMT}} "
-                        f"(e={e_tot:{FMT}} m, D={self.D:{FMT}} m, d={self.d:{FMT}} m)."
+                    self.beta = 1.0 + 0.6 * math.pi * e_tot / t["b_circ"]
+                    self._rel(
+                        "\nFator β (EC2 – interior circ.): {:{FMT}} (e={:{FMT}} m, D={:{FMT}} m, d={:{FMT}} m).",
+                        self.beta, e_tot, self.D, self.d
                     )
-                    return
+                    return "interior circ."
 
             # 2.2 PILAR DE BORDO
             if self.tipo_pilar == 'bordo':
@@ -359,72 +737,66 @@ class PuncoamentoEC2:
                 e_perp = e_y
                 e_par = e_x
 
-                if self.forma_pilar == 'retangular':
-                    u1_star = self._u1_estrela_bordo_ret()
-                    W1 = self._W1_bordo_retangular()
-                    ratio_bordo = self.c1 / (2.0 * self.c2) if self.c2 not in (0.0, None) else 1.0
-                    k_bordo = self._interp_k_por_ratio_bordo(ratio_bordo)
-                else:
-                    u1_star = self._u1_estrela_bordo_circ()
-                    W1 = self._W1_circular_equiv()
-                    ratio_bordo = 0.5
-                    k_bordo = self._interp_k_por_ratio_bordo(ratio_bordo)
+                u1_star, W1 = t["u1_star"], t["W1"]
+                ratio_bordo, k_bordo = t["ratio_bordo"], t["k_bordo"]
 
                 if self.edge_perp_interior:
                     beta_base = self.u1 / u1_star
                     if abs(e_par) < tiny:
                         self.beta = beta_base
                         self.k_beta = k_bordo
-                        self.relatorio.append(
-                            f"\nFator β (EC2 – bordo): {self.beta:{FMT}} (u1/u1*; excentricidade perpendicular dirigida para o interior)."
+                        self._rel(
+                            "\nFator β (EC2 – bordo): {:{FMT}} "
+                            "(u1/u1*; excentricidade perpendicular dirigida para o interior).",
+                            self.beta
                         )
-                        return
+                        return "bordo, u1/u1*"
 
                     self.beta = beta_base + k_bordo * (self.u1 / W1) * abs(e_par)
                     self.k_beta = k_bordo
-                    self.relatorio.append(
-                        f"\nFator β (EC2 – bordo, expr. 6.44): {self.beta:{FMT}} "
-                        f"(u1/u1*={beta_base:{FMT}}, e_par={abs(e_par):{FMT}} m, W1={W1:{FMT}} m², k={k_bordo:{FMT}}, c1/2c2={ratio_bordo:{FMT}})."
+                    self._rel(
+                        "\nFator β (EC2 – bordo, expr. 6.44): {:{FMT}} "
+                        "(u1/u1*={:{FMT}}, e_par={:{FMT}} m, W1={:{FMT}} m², k={:{FMT}}, c1/2c2={:{FMT}}).",
+                        self.beta, beta_base, abs(e_par), W1, k_bordo, ratio_bordo
                     )
-                    return
+                    return "bordo, expr. 6.44"
 
                 # excentricidade perpendicular para o exterior -> expressão geral 6.39
                 self.beta = self._beta_ec2_expressao_639(e_perp, W1, k_bordo, self.u1)
                 self.k_beta = k_bordo
-                self.relatorio.append(
-                    f"\nFator β (EC2 – bordo, expr. geral 6.39): {self.beta:{FMT}} "
-                    f"(e_perp exterior={abs(e_perp):{FMT}} m, W1={W1:{FMT}} m², k={k_bordo:{FMT}})."
+                self._rel(
+                    "\nFator β (EC2 – bordo, expr. geral 6.39): {:{FMT}} "
+                    "(e_perp exterior={:{FMT}} m, W1={:{FMT}} m², k={:{FMT}}).",
+                    self.beta, abs(e_perp), W1, k_bordo
                 )
-                return
+                return "bordo, expr. geral 6.39"
 
             # 2.3 PILAR DE CANTO
             if self.tipo_pilar == 'canto':
-                if self.forma_pilar == 'retangular':
-                    u1_star = self._u1_estrela_canto_ret()
-                    W1 = self._W1_retangular_interior()
-                else:
-                    u1_star = self._u1_estrela_canto_circ()
-                    W1 = self._W1_circular_equiv()
+                u1_star, W1 = t["u1_star"], t["W1"]
 
                 if self.corner_interior:
                     self.beta = self.u1 / u1_star
-                    self.relatorio.append(
-                        f"\nFator β (EC2 – canto, expr. 6.46): {self.beta:{FMT}} (u1/u1*; excentricidade dirigida para o interior)."
+                    self._rel(
+                        "\nFator β (EC2 – canto, expr. 6.46): {:{FMT}} "
+                        "(u1/u1*; excentricidade dirigida para o interior).",
+                        self.beta
                     )
-                    return
+                    return "canto, expr. 6.46"
 
                 e_tot = math.sqrt(e_x**2 + e_y**2)
                 self.beta = self._beta_ec2_expressao_639(e_tot, W1, self.k_beta, self.u1)
-                self.relatorio.append(
-                    f"\nFator β (EC2 – canto, expr. geral 6.39): {self.beta:{FMT}} "
-                    f"(e={e_tot:{FMT}} m, W1={W1:{FMT}} m², k={self.k_beta:{FMT}})."
+                self._rel(
+                    "\nFator β (EC2 – canto, expr. geral 6.39): {:{FMT}} "
+                    "(e={:{FMT}} m, W1={:{FMT}} m², k={:{FMT}}).",
+                    self.beta, e_tot, W1, self.k_beta
                 )
-                return
+                return "canto, expr. geral 6.39"
 
             self.beta = 1.0
             self.k_beta = None
-            self.relatorio.append(f"\nFator β (EC2 – fallback): {self.beta:{FMT}}.")
-            return
+            self._rel("\nFator β (EC2 – fallback): {:{FMT}}.", self.beta)
+            return "fallback"
 
         # 3) MODO fib_MC10 – via coeficiente de excentricidade ke (MC2010)
         if self.beta_mode == "fib":
@@ -432,134 +804,134 @@ class PuncoamentoEC2:
             if abs(e_x) < tiny and abs(e_y) < tiny:
                 self.beta = 1.0
                 self.k_beta = None
-                self.relatorio.append(
-                    "\nFator β (fib MC2010): 1.000 (sem excentricidades, ke≈1.0)."
-                )
-                return
+                self._rel("\nFator β (fib MC2010): 1.000 (sem excentricidades, ke≈1.0).")
+                return "sem excentricidades"
 
             e_tot = math.sqrt(e_x**2 + e_y**2)
 
-            # comprimento característico be1 na direção da excentricidade
-            # (aproximação: maior dimensão do perímetro de controlo na direção relevante)
-            if self.forma_pilar == 'retangular':
-                # eixo “principal” da excentricidade
-                if abs(e_x) >= abs(e_y):
-                    be1 = self.c1 + 4.0 * self.d
-                else:
-                    be1 = self.c2 + 4.0 * self.d
-            else:  # circular
-                be1 = self.D + 4.0 * self.d
-
-            be1 = max(be1, 1e-6)
+            # comprimento característico be1 no eixo “principal” da excentricidade
+            be1 = max(t["be1_x"] if abs(e_x) >= abs(e_y) else t["be1_y"], 1e-6)
 
             # expressão geral: ke = 1 / (1 + e_u / b1,e)
             ke = 1.0 / (1.0 + e_tot / be1)
 
-            # limites típicos por posição do pilar (valores usuais de MC2010 / literatura)
-            if self.tipo_pilar == 'interior':
-                ke_min = 0.90
-            elif self.tipo_pilar == 'bordo':
-                ke_min = 0.70
-            else:  # canto
-                ke_min = 0.65
-
-            ke = max(min(ke, 1.0), ke_min)
+            ke = max(min(ke, 1.0), t["ke_min"])
 
             # β_fib equivalente: aumento da tensão ≈ 1/ke
             self.beta = 1.0 / ke
             self.k_beta = None
-            self.relatorio.append(
-                f"\nFator β (fib MC2010): {self.beta:{FMT}} "
-                f"(e={e_tot:{FMT}} m, b1,e={be1:{FMT}} m, ke={ke:{FMT}}, tipo={self.tipo_pilar})."
+            self._rel(
+                "\nFator β (fib MC2010): {:{FMT}} "
+                "(e={:{FMT}} m, b1,e={:{FMT}} m, ke={:{FMT}}, tipo={}).",
+                self.beta, e_tot, be1, ke, self.tipo_pilar
             )
-            return
+            return "ke"
 
         #Se chegar aqui, algo correu mal -> assumir β=1.0
         self.beta = 1.0
         self.k_beta = None
-        self.relatorio.append(
-            "\nAviso: modo de β desconhecido. Assumido β = 1.000."
-        )
+        self._rel("\nAviso: modo de β desconhecido. Assumido β = 1.000.")
+        return "modo desconhecido"
 
     # --------------------------
     # resistências e esforços
     # --------------------------------------------------------------------------
-    def _get_v_Rd_c(self):
-        """v_Rd,c (MPa) – Eq. 6.47."""
+    def _get_v_Rd_max(self):
+        """v_Rd,max (MPa) na face do pilar."""
+        # IMPORTANTE: o coeficiente 0.4 antes era 0.5 (foi alterado numa das revisões do ec2; verificar/confirmar posteriormennte)
+        self.v_Rd_max = 0.4 * self.nu * self.fcd
+
+    def _calc_v_Rd_c(self) -> float:
+        """v_Rd,c (MPa) – Eq. 6.47, sem registo no relatório."""
         v_Rd_c_calc = self.C_Rd_c * self.k_val * (100 * self.rho_l * self.fck)**(1/3) + self.k1 * self.sigma_cp
         v_min_calc = self.v_min + self.k1 * self.sigma_cp
-        self.v_Rd_c = max(v_Rd_c_calc, v_min_calc)
-        self.relatorio.append(
-            f"\nResistência s/ armadura (v_Rd,c): {self.v_Rd_c:{FMT}} MPa "
-            f"(ρl={(self.rho_l*100):{FMT}} %, σ_cp={self.sigma_cp:{FMT}} MPa)"
+        return max(v_Rd_c_calc, v_min_calc)
+
+    def _get_v_Rd_c(self):
+        """v_Rd,c (MPa) – Eq. 6.47."""
+        self.v_Rd_c = self._calc_v_Rd_c()
+        self._rel(
+            "\nResistência s/ armadura (v_Rd,c): {:{FMT}} MPa "
+            "(ρl={:{FMT}} %, σ_cp={:{FMT}} MPa)",
+            self.v_Rd_c, self.rho_l * 100, self.sigma_cp
         )
 
     def _get_V_Ed_red_e_u1_efetivo(self):
         """V_Ed_red (sapatas) e u1_eff (aberturas)."""
         self.V_Ed_red = self.V_Ed
+        self.Delta_V_Ed = 0.0
         
         # sapatas
         if self.is_sapata and self.sigma_gd > 0:
             if self.forma_pilar == 'retangular':
                 A_control_1 = (self.c1 * self.c2) + (self.c1 * 2 * self.d) + (self.c2 * 2 * self.d) + (math.pi * (2 * self.d)**2 / 4)
+            elif self.forma_pilar == 'poligonal':
+                A_control_1 = self.geometria.area_controlo(self.d)
             else: # pilar circular
                 A_control_1 = math.pi * (self.D/2 + 2*self.d)**2
             Delta_V_Ed = self.sigma_gd * A_control_1
+            self.Delta_V_Ed = Delta_V_Ed
             self.V_Ed_red = self.V_Ed - Delta_V_Ed
-            self.relatorio.append(
-                f"\nSapata detetada. V_Ed reduzido de {(self.V_Ed/1000):{FMT}} kN para "
-                f"{(self.V_Ed_red/1000):{FMT}} kN (ΔV_Ed={(Delta_V_Ed/1000):{FMT}} kN)."
+            self._rel(
+                "\nSapata detetada. V_Ed reduzido de {:{FMT}} kN para "
+                "{:{FMT}} kN (ΔV_Ed={:{FMT}} kN).",
+                self.V_Ed / 1000, self.V_Ed_red / 1000, Delta_V_Ed / 1000
             )
         
-        # aberturas
-        self.u1_eff = self.u1 - self.u1_ineffective
-        if self.u1_ineffective > 0:
-            self.relatorio.append(
-                f"\nAbertura detetada. u1: {self.u1:{FMT}} m → u1,ef: {self.u1_eff:{FMT}} m."
-            )
+        # aberturas (indicadas à mão e/ou modeladas na geometria)
+        u1_ineffective = self.u1_ineffective
+        if self.perimetros_controlo is not None:
+            u1_ineffective += self.perimetros_controlo.u1_ineficaz
+        self.u1_eff = self.u1 - u1_ineffective
+        if u1_ineffective > 0:
+            self._rel("\nAbertura detetada. u1: {:{FMT}} m → u1,ef: {:{FMT}} m.", self.u1, self.u1_eff)
         else:
             self.u1_eff = self.u1
 
     def _verificar_esmagamento(self):
         """v_Ed(u0) vs v_Rd,max na face do pilar."""
         if self.u0 == 0:
-            self.relatorio.append("\nERRO: Perímetro u0 é zero. Verifique dimensões do pilar.")
+            self._rel("\nERRO: Perímetro u0 é zero. Verifique dimensões do pilar.")
             return False
-        
-        # IMPORTANTE: o coeficiente 0.4 antes era 0.5 (foi alterado numa das revisões do ec2; verificar/confirmar posteriormennte)
-        self.v_Rd_max = 0.4 * self.nu * self.fcd
+
+        self._no("v_Rd_max")
         self.v_Ed_u0 = (self.beta * self.V_Ed) / (self.u0 * self.d) / 1e6 # MPa
         
-        self.relatorio.append(f"\n--- Verificação da Escora (u0={self.u0:{FMT}} m) ---")
-        self.relatorio.append(f"Tensão de cálculo v_Ed(u0): {self.v_Ed_u0:{FMT}} MPa")
-        self.relatorio.append(f"Tensão resistente v_Rd,max: {self.v_Rd_max:{FMT}} MPa")
+        self._rel("\n--- Verificação da Escora (u0={:{FMT}} m) ---", self.u0)
+        self._rel("Tensão de cálculo v_Ed(u0): {:{FMT}} MPa", self.v_Ed_u0)
+        self._rel("Tensão resistente v_Rd,max: {:{FMT}} MPa", self.v_Rd_max)
         
         if self.v_Ed_u0 > self.v_Rd_max:
-            self.relatorio.append("\nFALHA: Esmagamento da escora (v_Ed > v_Rd,max).")
-            self.relatorio.append("       Aumentar d, fck ou dimensão do pilar.")
+            self.estado = ESTADO_FALHA_U0
+            self._rel("\nFALHA: Esmagamento da escora (v_Ed > v_Rd,max).")
+            self._rel("       Aumentar d, fck ou dimensão do pilar.")
             return False
-        self.relatorio.append("OK: Resistência ao esmagamento da escora verificada.")
+        self._rel("OK: Resistência ao esmagamento da escora verificada.")
         return True
 
     def _dimensionar_armadura(self):
         """Dimensiona a armadura de punçoamento Asw/sr."""
         self.armadura_necessaria = True
-        self.relatorio.append(f"\n\n--- Dimensionamento de Armadura (u1,ef={self.u1_eff:{FMT}} m) ---")
+        self._rel("\n\n--- Dimensionamento de Armadura (u1,ef={:{FMT}} m) ---", self.u1_eff)
 
         # limite superior
         v_Rd_cs_max = self.kmax * self.v_Rd_c
         self.v_Rd_cs_max = v_Rd_cs_max
-        self.relatorio.append(
-            f"Resistência máxima c/ armadura (v_Rd,cs,max = {self.kmax:{FMT}} * v_Rd,c): {v_Rd_cs_max:{FMT}} MPa"
+        self._rel(
+            "Resistência máxima c/ armadura (v_Rd,cs,max = {:{FMT}} * v_Rd,c): {:{FMT}} MPa",
+            self.kmax, v_Rd_cs_max
         )
         if self.v_Ed_u1 > v_Rd_cs_max:
-            self.relatorio.append(
-                f"FALHA: v_Ed(u1) ({self.v_Ed_u1:{FMT}} MPa) > v_Rd,cs,max ({v_Rd_cs_max:{FMT}} MPa). "
-                "Aumentar d, fck ou pilar."
+            self.estado = ESTADO_FALHA_CS_MAX
+            self._rel(
+                "FALHA: v_Ed(u1) ({:{FMT}} MPa) > v_Rd,cs,max ({:{FMT}} MPa). "
+                "Aumentar d, fck ou pilar.",
+                self.v_Ed_u1, v_Rd_cs_max
             )
             return
 
         # Asw/sr (Eq. 6.52)
+        self.estado = ESTADO_ARMADURA
         f_ywd_ef_d_mm = self.d * 1000
         f_ywd_ef = min(250 + 0.25 * f_ywd_ef_d_mm, self.fywd) # MPa
         
@@ -571,17 +943,19 @@ class PuncoamentoEC2:
         self.Asw_sr_min = Asw_sr_min
         self.Asw_sr_req = Asw_sr_req
         
-        self.relatorio.append(f"Tensão f_ywd,ef: {f_ywd_ef:{FMT}} MPa")
-        self.relatorio.append(f"Armadura necessária (Asw/sr) (cálculo): {(Asw_sr_calc * 1e4):{FMT}} cm²/m")
-        self.relatorio.append(f"Armadura mínima (Asw/sr): {(Asw_sr_min * 1e4):{FMT}} cm²/m")
-        self.relatorio.append(f"**Armadura adotada (Asw/sr): {(Asw_sr_req * 1e4):{FMT}} cm²/m**")
+        self._rel("Tensão f_ywd,ef: {:{FMT}} MPa", f_ywd_ef)
+        self._rel("Armadura necessária (Asw/sr) (cálculo): {:{FMT}} cm²/m", Asw_sr_calc * 1e4)
+        self._rel("Armadura mínima (Asw/sr): {:{FMT}} cm²/m", Asw_sr_min * 1e4)
+        self._rel("**Armadura adotada (Asw/sr): {:{FMT}} cm²/m**", Asw_sr_req * 1e4)
         
         # perímetro exterior u_out,ef
         self.u_out_ef = (self.beta * self.V_Ed_red) / (self.v_Rd_c * self.d) / 1e6 # m
-        self.relatorio.append(f"\nPerímetro exterior (u_out,ef): {self.u_out_ef:{FMT}} m")
+        self._rel("\nPerímetro exterior (u_out,ef): {:{FMT}} m", self.u_out_ef)
 
         # zona a armar e número de perímetros
-        if self.forma_pilar == 'retangular':
+        if self.geometria is not None and self.tipo_pilar == 'interior':
+            r_out = (self.u_out_ef - self.perimetros_controlo.u0) / (2*math.pi)
+        elif self.forma_pilar != 'circular':
             if self.tipo_pilar == 'interior':
                 r_out = (self.u_out_ef - 2*(self.c1 + self.c2)) / (2*math.pi)
             elif self.tipo_pilar == 'bordo':
@@ -599,74 +973,450 @@ class PuncoamentoEC2:
         self.s0_max = s0_max
         self.sr_max = sr_max
         
-        self.relatorio.append("\n--- Pormenorização recomendada ---")
-        self.relatorio.append(f"Distância radial a armar (da face): {dist_zona_armar:{FMT}} m (até {(1.5*self.d):{FMT}} m dentro de u_out,ef)")
-        self.relatorio.append(f"Espaçamento radial máx. (sr): {sr_max:{FMT}} m")
-        self.relatorio.append(f"Posição do 1º perímetro (s0): ≤ {s0_max:{FMT}} m")
+        self._rel("\n--- Pormenorização recomendada ---")
+        self._rel(
+            "Distância radial a armar (da face): {:{FMT}} m (até {:{FMT}} m dentro de u_out,ef)",
+            dist_zona_armar, 1.5 * self.d
+        )
+        self._rel("Espaçamento radial máx. (sr): {:{FMT}} m", sr_max)
+        self._rel("Posição do 1º perímetro (s0): ≤ {:{FMT}} m", s0_max)
         
         if dist_zona_armar < s0_max:
             n_perimetros = 2  # número mínimo por defeito
-            self.relatorio.append(f"Zona a armar é pequena. Adotar {n_perimetros} perímetros (mínimo).")
+            self._rel("Zona a armar é pequena. Adotar {} perímetros (mínimo).", n_perimetros)
         else:
             n_perimetros = math.ceil((dist_zona_armar - s0_max) / sr_max) + 1
             if n_perimetros < 2:
                 n_perimetros = 2
-            self.relatorio.append(f"Número de perímetros estimado (com sr={sr_max:{FMT}} m): {n_perimetros}")
+            self._rel("Número de perímetros estimado (com sr={:{FMT}} m): {}", sr_max, n_perimetros)
 
         Asw_por_perimetro = Asw_sr_req * sr_max
         self.n_perimetros = n_perimetros
         self.Asw_por_perimetro = Asw_por_perimetro
-        self.relatorio.append(f"Área por perímetro (Asw) (para sr={sr_max:{FMT}} m): {(Asw_por_perimetro * 1e4):{FMT}} cm²")
+        self._rel(
+            "Área por perímetro (Asw) (para sr={:{FMT}} m): {:{FMT}} cm²",
+            sr_max, Asw_por_perimetro * 1e4
+        )
+
+    # ------------------------------------------------------
+    # fatores de reserva
+    # --------------------------
+    def fatores_de_reserva(self) -> dict:
+        """
+        Multiplicador λ das cargas (V_Ed, M_Edx, M_Edy) para o qual cada verificação
+        atinge a unidade: {"u0": λ, "u1": λ, "cs_max": λ}.
+
+        β só depende de M/V e não varia com λ; ΔV_Ed (sapatas) não é multiplicado:
+            λ_u0     = v_Rd,max · u0 · d / (β · V_Ed)
+            λ_u1     = (v_Rd,c · u1,ef · d / β + ΔV_Ed) / V_Ed
+            λ_cs_max = (v_Rd,cs,max · u1,ef · d / β + ΔV_Ed) / V_Ed
+        λ > 1 indica reserva. inf sem carga (V_Ed ≤ 0); NaN se u0 ou u1,ef forem nulos.
+        Verifica o caso (sem relatório) se ainda não tiver sido verificado ou se alguma
+        entrada tiver sido alterada desde a última verificação.
+        """
+        if self._entradas_grafo is None or _ler_entradas_grafo(self) != self._entradas_grafo:
+            self.verificar_puncoamento(relatorio=False)
+        if self.V_Ed <= 0:
+            return {"u0": math.inf, "u1": math.inf, "cs_max": math.inf}
+        v_Rd_max = 0.4 * self.nu * self.fcd
+        v_Rd_c = self._calc_v_Rd_c()
+        bV = self.beta * self.V_Ed / 1e6
+        lam_u0 = v_Rd_max * self.u0 * self.d / bV if self.u0 > 0 else math.nan
+        if self.u1_eff > 0:
+            lam_u1 = (v_Rd_c * self.u1_eff * self.d * 1e6 / self.beta + self.Delta_V_Ed) / self.V_Ed
+            lam_cs = (self.kmax * v_Rd_c * self.u1_eff * self.d * 1e6 / self.beta + self.Delta_V_Ed) / self.V_Ed
+        else:
+            lam_u1 = lam_cs = math.nan
+        return {"u0": lam_u0, "u1": lam_u1, "cs_max": lam_cs}
+
+    def sensibilidades(self) -> dict:
+        """
+        Utilizações (u0, u1, cs_max) e as suas derivadas em relação a d, fck, c1, c2,
+        As_lx, As_ly, V_Ed, M_Edx e M_Edy, por diferenciação automática:
+        {"u1": {"util": ..., "d": ∂u1/∂d, ...}, ...}. Ver Punching_EC2_sensibilidades.
+        """
+        entradas = self.entradas()
+        if entradas.pop("geometria") is not None:
+            raise ValueError("Sensibilidades não disponíveis com geometria (só pilares retangulares/circulares).")
+        from Punching_EC2_sensibilidades import sensibilidades  # NumPy só quando necessário
+        return sensibilidades(**entradas).caso(0)
 
     # ------------------------------------------------------
     # pipeline principal
     # --------------------------
-    def verificar_puncoamento(self):
-        """Executa a verificação completa ao punçoamento."""
-        
-        self.relatorio = ["\n--- Relatório de verificação de Punçoamento (NP EN 1992-1-1) ---\n"]
+    def verificar_puncoamento(self, relatorio: bool = True):
+        """
+        Executa a verificação completa ao punçoamento.
+
+        Com relatorio=False só calcula os valores numéricos e o traço (self.traco),
+        devolvendo None; o texto pode ser obtido depois com gerar_relatorio().
+        Com um PerfilEtapas ativo, as etapas são cronometradas (ver PerfilEtapas).
+        """
+        perfil = _perfil_ativo.get()
+        if perfil is not None:
+            return perfil.verificar(self, relatorio)
+        return self._verificar(relatorio)
+
+    def _verificar(self, relatorio: bool):
+        self._preparar_nos()
+        self.relatorio = []
+        self.traco = []
+        self._executar_verificacao()
+        self._descartar_nao_usados()
+        if not relatorio:
+            return None
+        return self.gerar_relatorio()
+
+    def _executar_verificacao(self):
+        """Sequência de cálculo (nós do grafo); regista as linhas do relatório via _rel."""
+        self._no("constantes")
+        self._rel("\n--- Relatório de verificação de Punçoamento (NP EN 1992-1-1) ---\n")
         
-        self.relatorio.append(f"Taxa média de armadura ρl = {(self.rho_l*100):.3f} %")        
+        self._rel("Taxa média de armadura ρl = {:.3f} %", self.rho_l * 100)        
         try:
-            self._get_perimetros_criticos()
-            self._get_beta()
-            self._get_V_Ed_red_e_u1_efetivo()
-            
-            self.relatorio.append(
-                f"Parâmetros: d={self.d:{FMT}} m, fck={self.fck:{FMT}} MPa, VEd_total={(self.V_Ed/1000):{FMT}} kN"
-            )
-            if self.is_sapata:
-                self.relatorio.append(f"V_Ed_red (sapata): {(self.V_Ed_red/1000):{FMT}} kN")
-
-            if not self._verificar_esmagamento():
-                return "\n".join(self.relatorio)
-
-            self._get_v_Rd_c()
-            
-            if self.u1_eff == 0:
-                self.relatorio.append("\nERRO: Perímetro u1,ef é zero. Verifique dimensões/aberturas.")
-                return "\n".join(self.relatorio)
-            
-            self.v_Ed_u1 = (self.beta * self.V_Ed_red) / (self.u1_eff * self.d) / 1e6 # MPa
-            
-            self.relatorio.append(f"\n--- Verificação da necessidade de armadura (u1,ef={self.u1_eff:{FMT}} m) ---")
-            self.relatorio.append(f"Tensão de cálculo v_Ed(u1): {self.v_Ed_u1:{FMT}} MPa")
-            
-            if self.v_Ed_u1 <= self.v_Rd_c:
-                self.relatorio.append(f"OK: v_Ed(u1) ({self.v_Ed_u1:{FMT}} MPa) ≤ v_Rd,c ({self.v_Rd_c:{FMT}} MPa).")
-                self.relatorio.append("Não é necessária armadura de punçoamento.")
-                self.armadura_necessaria = False
-            else:
-                self.relatorio.append(f"FALHA: v_Ed(u1) ({self.v_Ed_u1:{FMT}} MPa) > v_Rd,c ({self.v_Rd_c:{FMT}} MPa).")
-                self.relatorio.append("É necessária armadura de punçoamento.")
-                self._dimensionar_armadura()
+            self._no("perimetros")
+            self._no("termos_beta")
+            self._no("beta")
+            self._no("reducoes")
+            self._no("verificacao")
         
         except Exception as e:
-            self.relatorio.append(f"\nERRO INESPERADO: {e}")
+            self.estado = ESTADO_ERRO
+            self._rel("\nERRO INESPERADO: {}", e)
             import traceback
-            self.relatorio.append(traceback.format_exc())
+            self._rel("{}", traceback.format_exc())
+
+    def _verificar_resistencias(self):
+        """Esmagamento em u0, v_Rd,c, v_Ed(u1) e, se necessário, dimensionamento da armadura."""
+        self._rel(
+            "Parâmetros: d={:{FMT}} m, fck={:{FMT}} MPa, VEd_total={:{FMT}} kN",
+            self.d, self.fck, self.V_Ed / 1000
+        )
+        if self.is_sapata:
+            self._rel("V_Ed_red (sapata): {:{FMT}} kN", self.V_Ed_red / 1000)
+
+        if not self._verificar_esmagamento():
+            return
+
+        self._no("v_Rd_c")
+        
+        if self.u1_eff == 0:
+            self._rel("\nERRO: Perímetro u1,ef é zero. Verifique dimensões/aberturas.")
+            return
+        
+        self.v_Ed_u1 = (self.beta * self.V_Ed_red) / (self.u1_eff * self.d) / 1e6 # MPa
+        
+        self._rel("\n--- Verificação da necessidade de armadura (u1,ef={:{FMT}} m) ---", self.u1_eff)
+        self._rel("Tensão de cálculo v_Ed(u1): {:{FMT}} MPa", self.v_Ed_u1)
+        
+        if self.v_Ed_u1 <= self.v_Rd_c:
+            self._rel("OK: v_Ed(u1) ({:{FMT}} MPa) ≤ v_Rd,c ({:{FMT}} MPa).", self.v_Ed_u1, self.v_Rd_c)
+            self._rel("Não é necessária armadura de punçoamento.")
+            self.armadura_necessaria = False
+            self.estado = ESTADO_OK
+        else:
+            self._rel(
+                "FALHA: v_Ed(u1) ({:{FMT}} MPa) > v_Rd,c ({:{FMT}} MPa).",
+                self.v_Ed_u1, self.v_Rd_c
+            )
+            self._rel("É necessária armadura de punçoamento.")
+            self._dimensionar_armadura()
+
+
+# ---------------------------------------------------------------------
+# --- EXECUÇÃO DE MUITOS CASOS (multiprocesso) ---
+# ---------------------------------------------------------------------
+
+#ordem dos argumentos de PuncoamentoEC2 nas tuplas enviadas aos processos
+#(lida do código de __init__ sem importar inspect, que pesa no arranque da linha de comandos)
+_INIT = PuncoamentoEC2.__init__
+CAMPOS_ENTRADA = _INIT.__code__.co_varnames[1:_INIT.__code__.co_argcount]
+_DEFAULTS_ENTRADA = dict(zip(CAMPOS_ENTRADA[len(CAMPOS_ENTRADA) - len(_INIT.__defaults__):], _INIT.__defaults__))
+
+#atributos numéricos devolvidos por run_many (None se não calculados)
+CAMPOS_RESULTADO = (
+    "u0", "u1", "u1_eff", "V_Ed_red", "beta", "k_beta",
+    "v_Ed_u0", "v_Rd_max", "v_Ed_u1", "v_Rd_c", "armadura_necessaria",
+    "v_Rd_cs_max", "f_ywd_ef", "Asw_sr_calc", "Asw_sr_min", "Asw_sr_req",
+    "u_out_ef", "dist_zona_armar", "n_perimetros", "Asw_por_perimetro", "estado",
+)
+
+#tipos de cada campo no registo compacto (restantes: float64, None -> NaN)
+_TIPOS_RESULTADO = {"armadura_necessaria": "?", "n_perimetros": "<i4", "estado": "i1"}
+
+
+def dtype_resultado():
+    """dtype estruturado NumPy de um PunchingResult (um registo por caso)."""
+    import numpy as np
+    return np.dtype([(nome, _TIPOS_RESULTADO.get(nome, "<f8")) for nome in CAMPOS_RESULTADO])
+
+
+class PunchingResult:
+    """
+    Registo imutável e compacto dos resultados numéricos de uma verificação.
+
+    Guarda apenas CAMPOS_RESULTADO (sem relatório nem dados de entrada). Valores
+    não calculados ficam NaN (n_perimetros: 0). to_array/from_array convertem
+    listas de registos em arrays estruturados contíguos (dtype_resultado()).
+    """
+
+    __slots__ = CAMPOS_RESULTADO
+
+    def __init__(self, *valores, **campos):
+        if len(valores) > len(CAMPOS_RESULTADO):
+            raise TypeError("Demasiados valores para PunchingResult.")
+        dados = dict(zip(CAMPOS_RESULTADO, valores))
+        repetidos = set(dados) & set(campos)
+        desconhecidos = set(campos) - set(CAMPOS_RESULTADO)
+        if repetidos or desconhecidos:
+            raise TypeError(f"Campos inválidos: {', '.join(sorted(repetidos | desconhecidos))}")
+        dados.update(campos)
+        for nome in CAMPOS_RESULTADO:
+            valor = dados.get(nome)
+            if nome == "armadura_necessaria":
+                valor = bool(valor)
+            elif nome == "n_perimetros":
+                valor = 0 if valor is None else int(valor)
+            elif nome == "estado":
+                valor = ESTADO_ERRO if valor is None else int(valor)
+            else:
+                valor = math.nan if valor is None else float(valor)
+            object.__setattr__(self, nome, valor)
+
+    @classmethod
+    def de_verificacao(cls, v: "PuncoamentoEC2") -> "PunchingResult":
+        """Extrai o registo de um PuncoamentoEC2 já verificado."""
+        return cls(*(getattr(v, nome, None) for nome in CAMPOS_RESULTADO))
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("PunchingResult é imutável.")
+
+    __delattr__ = __setattr__
+
+    def __reduce__(self):
+        return (PunchingResult, self.valores())
+
+    def valores(self) -> tuple:
+        return tuple(getattr(self, nome) for nome in CAMPOS_RESULTADO)
+
+    def como_dict(self) -> dict:
+        return dict(zip(CAMPOS_RESULTADO, self.valores()))
+
+    def __eq__(self, outro):
+        if not isinstance(outro, PunchingResult):
+            return NotImplemented
+        return all(a == b or (a != a and b != b) for a, b in zip(self.valores(), outro.valores()))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PunchingResult(estado={ESTADOS[self.estado]!r}, beta={self.beta:.3f}, " \
+               f"v_Ed_u1={self.v_Ed_u1:.3f}, v_Rd_c={self.v_Rd_c:.3f}, Asw_sr_req={self.Asw_sr_req:.3e})"
+
+    @staticmethod
+    def to_array(resultados):
+        """Converte uma sequência de PunchingResult num array estruturado contíguo."""
+        import numpy as np
+        resultados = list(resultados)
+        return np.array([r.valores() for r in resultados], dtype=dtype_resultado())
+
+    @classmethod
+    def from_array(cls, arr) -> list:
+        """Reconstrói a lista de PunchingResult a partir de um array estruturado (ou de um registo)."""
+        import numpy as np
+        arr = np.asarray(arr)
+        if arr.ndim == 0:
+            return cls(*arr.item())
+        return [cls(*linha) for linha in arr.tolist()]
+
+
+def _caso_para_tupla(caso) -> tuple:
+    """Converte um dict de argumentos de PuncoamentoEC2 numa tupla na ordem de CAMPOS_ENTRADA."""
+    if not isinstance(caso, dict):
+        return tuple(caso)
+    desconhecidos = set(caso) - set(CAMPOS_ENTRADA)
+    if desconhecidos:
+        raise TypeError(f"Argumentos desconhecidos: {', '.join(sorted(desconhecidos))}")
+    try:
+        return tuple(caso[nome] if nome in caso else _DEFAULTS_ENTRADA[nome] for nome in CAMPOS_ENTRADA)
+    except KeyError as exc:
+        raise TypeError(f"Falta o argumento obrigatório '{exc.args[0]}'.") from None
+
+
+def _verificar_bloco(bloco, relatorio=False):
+    """Verifica um bloco de tuplas de entrada; devolve tuplas de resultados (corre nos processos)."""
+    resultados = []
+    for valores in bloco:
+        v = PuncoamentoEC2(**dict(zip(CAMPOS_ENTRADA, valores)))
+        texto = v.verificar_puncoamento(relatorio=relatorio)
+        res = tuple(getattr(v, nome, None) for nome in CAMPOS_RESULTADO)
+        resultados.append(res + (texto,) if relatorio else res)
+    return resultados
+
+
+def run_many(cases, workers: int | None = None, chunksize: int = 512, relatorio: bool = False,
+             executor=None) -> list:
+    """
+    Verifica muitos casos independentes, repartidos por um conjunto de processos.
+
+    cases ...... iterável de dicts com os argumentos de PuncoamentoEC2
+                 (ou tuplas na ordem de CAMPOS_ENTRADA)
+    workers .... nº de processos (None -> os.cpu_count(); 1 -> execução em série)
+    chunksize .. nº de casos por bloco enviado a cada processo
+    relatorio .. se True, inclui o texto do relatório em "relatorio"
+    executor ... ProcessPoolExecutor já criado, a reutilizar entre chamadas (ignora workers)
+
+    Devolve uma lista de dicts (CAMPOS_RESULTADO), pela ordem de entrada.
+    Os resultados são idênticos aos da execução em série.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize deve ser ≥ 1.")
+    entradas = [_caso_para_tupla(c) for c in cases]
+    blocos = [entradas[i:i + chunksize] for i in range(0, len(entradas), chunksize)]
+    tarefa = partial(_verificar_bloco, relatorio=relatorio)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if executor is not None:
+        partes = list(executor.map(tarefa, blocos))
+    elif workers <= 1 or len(blocos) <= 1:
+        partes = map(tarefa, blocos)
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # só quando necessário (arranque da GUI)
+        with ProcessPoolExecutor(max_workers=min(workers, len(blocos))) as ex:
+            partes = list(ex.map(tarefa, blocos))
+
+    campos = CAMPOS_RESULTADO + ("relatorio",) if relatorio else CAMPOS_RESULTADO
+    return [dict(zip(campos, res)) for parte in partes for res in parte]
+
+
+# ---------------------------------------------------------------------
+# --- PERFIL DE TEMPOS POR ETAPA (opcional) ---
+# ---------------------------------------------------------------------
+
+#perfil ativo no contexto atual (None -> verificar_puncoamento sem instrumentação); por contexto,
+#para que um perfil ativado numa thread não instrumente as verificações de outras (p.ex. a da GUI)
+_perfil_ativo = contextvars.ContextVar("perfil_ativo", default=None)
+
+
+class PerfilEtapas:
+    """
+    Tempos e nº de chamadas por etapa de verificar_puncoamento, agregados entre casos.
+
+    Uso:
+        perfil = PerfilEtapas()
+        with perfil:
+            for caso in casos:
+                PuncoamentoEC2(**caso).verificar_puncoamento()
+        print(perfil.tabela())
+        perfil.guardar_csv("perfil.csv")
+
+    _get_beta é discriminado por modo/tipo/forma e pelo ramo seguido (o que
+    _get_beta devolve). Só abrange a thread (contexto) e o processo onde foi
+    ativado: não as outras threads nem os processos de run_many com workers > 1.
+    Desativado, o custo é uma leitura de ContextVar.
+    """
+
+    ETAPAS = ("_get_perimetros_criticos", "_get_termos_beta", "_get_beta", "_get_V_Ed_red_e_u1_efetivo",
+              "_verificar_esmagamento", "_get_v_Rd_c", "_dimensionar_armadura", "gerar_relatorio")
+    TOTAL = "verificar_puncoamento"
+
+    def __init__(self):
+        self.tempos_ns = {}
+        self.chamadas = {}
+        self._token = None
+
+    def __enter__(self):
+        self.ativar()
+        return self
+
+    def __exit__(self, *exc):
+        self.desativar()
+        return False
+
+    def ativar(self):
+        self._token = _perfil_ativo.set(self)
+
+    def desativar(self):
+        if _perfil_ativo.get() is self:
+            try:
+                _perfil_ativo.reset(self._token)  #repõe o perfil anterior (ativações encaixadas)
+            except ValueError:  #token de outro contexto
+                _perfil_ativo.set(None)
+        self._token = None
+
+    def limpar(self):
+        self.tempos_ns.clear()
+        self.chamadas.clear()
+
+    def _registar(self, chave, dt):
+        self.tempos_ns[chave] = self.tempos_ns.get(chave, 0) + dt
+        self.chamadas[chave] = self.chamadas.get(chave, 0) + 1
+
+    def _cronometrar(self, v, nome):
+        metodo = getattr(v, nome)
+        relogio = time.perf_counter_ns
+
+        if nome == "_get_beta":
+            def etapa(*args):
+                t0 = relogio()
+                res = metodo(*args)
+                dt = relogio() - t0
+                self._registar(f"_get_beta [{v.beta_mode}/{v.tipo_pilar}/{v.forma_pilar}] {res}", dt)
+                self._registar(nome, dt)
+                return res
+        else:
+            def etapa(*args):
+                t0 = relogio()
+                res = metodo(*args)
+                self._registar(nome, relogio() - t0)
+                return res
+        return etapa
+
+    def verificar(self, v, relatorio=True):
+        """Executa v.verificar_puncoamento com as etapas cronometradas."""
+        for nome in self.ETAPAS:
+            setattr(v, nome, self._cronometrar(v, nome))
+        try:
+            t0 = time.perf_counter_ns()
+            res = v._verificar(relatorio)
+            self._registar(self.TOTAL, time.perf_counter_ns() - t0)
+        finally:
+            for nome in self.ETAPAS:
+                del v.__dict__[nome]
+        return res
+
+    def linhas(self) -> list:
+        """Uma linha (dict) por etapa: chamadas, total (ms), média (µs) e % do total."""
+        total = self.tempos_ns.get(self.TOTAL, 0) or 1
+        ordem = [self.TOTAL] + [e for e in self.ETAPAS if e in self.tempos_ns]
+        ordem += sorted(k for k in self.tempos_ns if k not in ordem)
+        return [{
+            "etapa": chave,
+            "chamadas": self.chamadas[chave],
+            "total_ms": self.tempos_ns[chave] / 1e6,
+            "media_us": self.tempos_ns[chave] / self.chamadas[chave] / 1e3,
+            "percentagem": 100.0 * self.tempos_ns[chave] / total,
+        } for chave in ordem if chave in self.tempos_ns]
+
+    def tabela(self) -> str:
+        """Tabela de texto com as linhas de linhas()."""
+        dados = self.linhas()
+        largura = max([len(l["etapa"]) for l in dados] + [5])
+        texto = [f"{'etapa':<{largura}} {'chamadas':>9} {'total (ms)':>11} {'média (µs)':>11} {'%':>6}"]
+        for l in dados:
+            texto.append(f"{l['etapa']:<{largura}} {l['chamadas']:>9d} {l['total_ms']:>11.3f} "
+                         f"{l['media_us']:>11.3f} {l['percentagem']:>6.1f}")
+        return "\n".join(texto)
+
+    def guardar_csv(self, caminho: str):
+        """Exporta linhas() para CSV."""
+        import csv
+        with open(caminho, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=("etapa", "chamadas", "total_ms", "media_us", "percentagem"))
+            escritor.writeheader()
+            escritor.writerows(self.linhas())
 
-        return "\n".join(self.relatorio)
 
 # ---------------------------------------------------------------------
 # --- FUNÇÕES INTERATIVAS PRA OBTER DADOS --- 
@@ -1,29 +1,47 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import copy
 from datetime import datetime
+import importlib.util
 import math
+import queue
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
 from Punching_EC2 import PuncoamentoEC2
 
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-    from openpyxl.utils import get_column_letter
-    OPENPYXL_OK = True
-except Exception:
-    OPENPYXL_OK = False
-
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import cm
-    from reportlab.pdfbase.pdfmetrics import stringWidth
-    from reportlab.pdfgen import canvas as pdf_canvas
-    REPORTLAB_OK = True
-except Exception:
-    REPORTLAB_OK = False
+# openpyxl e reportlab só são importados na primeira exportação (arranque mais rápido);
+# aqui apenas se verifica se estão instalados.
+OPENPYXL_OK = importlib.util.find_spec("openpyxl") is not None
+REPORTLAB_OK = importlib.util.find_spec("reportlab") is not None
+
+
+def _carregar_openpyxl():
+    """Importa openpyxl no primeiro uso; devolve OPENPYXL_OK (False se a importação falhar)."""
+    global OPENPYXL_OK, Workbook, Alignment, Border, Font, PatternFill, Side, get_column_letter
+    if OPENPYXL_OK and "Workbook" not in globals():
+        try:
+            from openpyxl import Workbook
+            from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+            from openpyxl.utils import get_column_letter
+        except Exception:
+            OPENPYXL_OK = False
+    return OPENPYXL_OK
+
+
+def _carregar_reportlab():
+    """Importa reportlab (via Punching_EC2_pdf) no primeiro uso; devolve REPORTLAB_OK."""
+    global REPORTLAB_OK, pdf
+    if REPORTLAB_OK and "pdf" not in globals():
+        try:
+            import Punching_EC2_pdf as pdf
+        except Exception:
+            REPORTLAB_OK = False
+        else:
+            REPORTLAB_OK = pdf.REPORTLAB_OK
+    return REPORTLAB_OK
 
 APP_TITLE = "PunchingShearEC2"
 BG = "#f5f7fb"
@@ -35,6 +53,9 @@ OK = "#15803d"
 WARN = "#b45309"
 FAIL = "#b91c1c"
 
+RECALC_ATRASO_MS = 50    # janela em que as alterações são agrupadas num só cálculo
+RECALC_SONDAGEM_MS = 15  # intervalo de recolha do resultado do cálculo em fundo
+
 EXEMPLOS = {
     "Pilar interior retangular": {
         "fck": "30", "fyk": "500", "fywk": "500", "d": "0.22", "asx": "12.57", "asy": "12.57",
@@ -77,6 +98,16 @@ class PuncoamentoApp(tk.Tk):
         self.last_report = ""
         self.last_verif = None
         self.drag_mode = None
+        self._recalc_after = None       # after() pendente do recálculo automático
+        self._recalc_pedido = None      # pedido à espera de o trabalhador ficar livre
+        self._recalc_thread = None
+        self._recalc_fila = queue.Queue()
+        self._recalc_geracao = 0
+        self._recalc_motor = {}         # motor reutilizado pelo trabalhador (recálculo incremental)
+        self._visibilidade_agendada = False
+        self._esquema_topologia = None  # (tipo, forma) dos itens criados no canvas do esquema
+        self._esquema_itens = {}
+        self._esquema_opcoes = {}
         self._apply_theme()
         self._build_variables()
         self._build_ui()
@@ -137,11 +168,18 @@ class PuncoamentoApp(tk.Tk):
         self.var_resultado = tk.StringVar(value="Aguardando cálculo")
         self.var_pdf_state = tk.StringVar(value="PDF disponível" if REPORTLAB_OK else "PDF indisponível")
         self.var_excel_state = tk.StringVar(value="Excel disponível" if OPENPYXL_OK else "Excel indisponível")
+        self.var_auto_calc = tk.BooleanVar(value=True)
         for var in (self.var_d, self.var_asx, self.var_asy, self.var_tipo_pilar, self.var_forma_pilar,
                     self.var_c1, self.var_c2, self.var_has_abertura, self.var_is_sapata):
             var.trace_add("write", self._on_geometry_change)
         for var in (self.var_d, self.var_asx, self.var_asy):
             var.trace_add("write", self._update_rho_label)
+        for var in (self.var_fck, self.var_fyk, self.var_fywk, self.var_d, self.var_asx, self.var_asy,
+                    self.var_sigma_cp, self.var_tipo_pilar, self.var_forma_pilar, self.var_c1, self.var_c2,
+                    self.var_ved, self.var_medx, self.var_medy, self.var_is_sapata, self.var_sigma_gd,
+                    self.var_has_abertura, self.var_u1_inef, self.var_beta, self.var_edge_interior,
+                    self.var_corner_interior):
+            var.trace_add("write", self._agendar_recalculo)
 
     def _build_ui(self):
         self.columnconfigure(0, weight=0)
@@ -171,6 +209,8 @@ class PuncoamentoApp(tk.Tk):
         ttk.Button(frm, text="Aplicar exemplo", command=self.carregar_exemplo).grid(row=0, column=2, padx=(0, 6))
         ttk.Button(frm, text="Calcular", command=self.calcular, style="Accent.TButton").grid(row=0, column=3, padx=(0, 6))
         ttk.Button(frm, text="Limpar", command=self.limpar).grid(row=0, column=4)
+        ttk.Checkbutton(frm, text="Recalcular automaticamente (resumo e diagnóstico)", variable=self.var_auto_calc,
+                        command=self._agendar_recalculo).grid(row=1, column=0, columnspan=5, sticky="w", pady=(6, 0))
 
     def _build_left_notebook(self, parent):
         nb = ttk.Notebook(parent)
@@ -180,8 +220,19 @@ class PuncoamentoApp(tk.Tk):
         tab_esquema = ttk.Frame(nb, padding=10)
         nb.add(tab_esquema, text="Geometria")
         self._build_tab_dados(tab_dados)
-        self._build_tab_opcoes(tab_opcoes)
-        self._build_tab_esquema(tab_esquema)
+        # "Opções" e "Geometria" só são construídos quando selecionados pela primeira vez
+        _, id_opcoes, id_esquema = nb.tabs()
+        self._tabs_adiados = {id_opcoes: (self._build_tab_opcoes, tab_opcoes),
+                              id_esquema: (self._build_tab_esquema, tab_esquema)}
+        nb.bind("<<NotebookTabChanged>>", self._on_left_tab_changed)
+
+    def _on_left_tab_changed(self, event):
+        adiado = self._tabs_adiados.pop(event.widget.select(), None)
+        if adiado is None:
+            return
+        construir, parent = adiado
+        construir(parent)
+        self._apply_visibility_rules()
 
     def _make_scrollable_tab(self, notebook, title):
         outer = ttk.Frame(notebook)
@@ -388,10 +439,16 @@ class PuncoamentoApp(tk.Tk):
         tipo = self.var_tipo_pilar.get().lower()
         self.lbl_c1.configure(text="Diâmetro D (m)" if forma == "circular" else ("c1 (m) ‖ bordo" if tipo == "bordo" else "c1 (m)"))
         if forma == "circular":
-            self.lbl_c2.grid_remove(); self.ent_c2.grid_remove(); self.scale_c2.configure(state="disabled")
+            self.lbl_c2.grid_remove(); self.ent_c2.grid_remove()
         else:
             self.lbl_c2.configure(text="c2 (m) ⟂ bordo" if tipo == "bordo" else "c2 (m)")
-            self.lbl_c2.grid(); self.ent_c2.grid(); self.scale_c2.configure(state="normal")
+            self.lbl_c2.grid(); self.ent_c2.grid()
+        if hasattr(self, "canvas_scheme"):
+            self.scale_c2.configure(state="disabled" if forma == "circular" else "normal")
+            self._sync_scales()
+            self._draw_scheme()
+        if not hasattr(self, "chk_edge_interior"):  # separador "Opções" ainda não construído
+            return
         if self.var_is_sapata.get():
             self.lbl_sigma_gd.grid(); self.ent_sigma_gd.grid()
         else:
@@ -409,8 +466,6 @@ class PuncoamentoApp(tk.Tk):
         else:
             self.chk_edge_interior.state(["disabled"])
             self.chk_corner_interior.state(["disabled"])
-        self._sync_scales()
-        self._draw_scheme()
 
     def _sync_scales(self):
         self.scale_c1.set(self._safe_float(self.var_c1.get(), 0.40))
@@ -428,7 +483,14 @@ class PuncoamentoApp(tk.Tk):
             self.var_rho_calc.set("ρl = -")
 
     def _on_geometry_change(self, *_):
-        self.after_idle(self._apply_visibility_rules)
+        # várias alterações seguidas (p.ex. c1 e c2 num arrasto) dão um só redesenho
+        if not self._visibilidade_agendada:
+            self._visibilidade_agendada = True
+            self.after_idle(self._apply_visibility_rules_agendado)
+
+    def _apply_visibility_rules_agendado(self):
+        self._visibilidade_agendada = False
+        self._apply_visibility_rules()
 
     def _collect_inputs(self):
         forma = self.var_forma_pilar.get().lower()
@@ -461,19 +523,100 @@ class PuncoamentoApp(tk.Tk):
     def calcular(self):
         try:
             inputs = self._collect_inputs()
-            verif = PuncoamentoEC2(**inputs)
-            report = verif.verificar_puncoamento()
-            self.last_verif = verif
-            self.last_report = report
-            self.txt_output.delete("1.0", tk.END)
-            self.txt_output.insert(tk.END, report)
-            self._fill_summary(verif)
-            self._fill_diagnostic(verif)
-            self._draw_scheme(verif)
-            self.var_status.set("Cálculo concluído com sucesso.")
         except Exception as exc:
             self.var_status.set("Erro no cálculo.")
             messagebox.showerror("Erro", str(exc))
+            return
+        if self._recalc_after is not None:
+            self.after_cancel(self._recalc_after)
+            self._recalc_after = None
+        self.var_status.set("A calcular...")
+        self._submeter_calculo(inputs, completo=True)
+
+    # ------------------------------------------------------------------
+    # Cálculo em fundo: o motor corre numa thread e o resultado volta ao
+    # ciclo do Tk por after(). Só há um cálculo em curso; os pedidos que
+    # chegam entretanto são agrupados no mais recente.
+    # ------------------------------------------------------------------
+    def _agendar_recalculo(self, *_):
+        if not self.var_auto_calc.get() or self._recalc_after is not None:
+            return
+        self._recalc_after = self.after(RECALC_ATRASO_MS, self._recalculo_automatico)
+
+    def _recalculo_automatico(self):
+        self._recalc_after = None
+        try:
+            inputs = self._collect_inputs()
+        except Exception as exc:
+            self.var_status.set(f"Dados incompletos: {exc}")
+            return
+        self._submeter_calculo(inputs, completo=False)
+
+    def _submeter_calculo(self, inputs, completo):
+        self._recalc_geracao += 1
+        if self._recalc_pedido is not None:
+            completo = completo or self._recalc_pedido[2]
+        pedido = (self._recalc_geracao, inputs, completo)
+        if self._recalc_thread is not None:
+            self._recalc_pedido = pedido
+            return
+        self._iniciar_calculo(pedido)
+
+    def _iniciar_calculo(self, pedido):
+        self._recalc_pedido = None
+        self._recalc_thread = threading.Thread(target=self._calcular_em_fundo, daemon=True,
+                                               args=(*pedido, self._recalc_fila, self._recalc_motor))
+        self._recalc_thread.start()
+        self.after(RECALC_SONDAGEM_MS, self._recolher_calculo)
+
+    @staticmethod
+    def _calcular_em_fundo(geracao, inputs, completo, fila, estado):
+        # corre fora da thread do Tk: não tocar em widgets nem em variáveis Tk.
+        # O motor fica em `estado` entre cálculos: só os nós do grafo afetados pelas
+        # entradas alteradas são reavaliados; à thread do Tk vai uma cópia.
+        try:
+            motor = estado.get("motor")
+            if motor is None:
+                motor = estado["motor"] = PuncoamentoEC2(**inputs)
+            else:
+                motor.atualizar(**inputs)
+            report = motor.verificar_puncoamento(relatorio=completo)
+            fila.put((geracao, completo, copy.copy(motor), report, None))
+        except Exception as exc:
+            fila.put((geracao, completo, None, None, exc))
+
+    def _recolher_calculo(self):
+        try:
+            geracao, completo, verif, report, exc = self._recalc_fila.get_nowait()
+        except queue.Empty:
+            self.after(RECALC_SONDAGEM_MS, self._recolher_calculo)
+            return
+        self._recalc_thread = None
+        if self._recalc_pedido is not None:
+            self._iniciar_calculo(self._recalc_pedido)
+        if exc is not None:
+            if completo:
+                self.var_status.set("Erro no cálculo.")
+                messagebox.showerror("Erro", str(exc))
+            else:
+                self.var_status.set(f"Dados incompletos: {exc}")
+        elif completo:
+            self._aplicar_calculo(verif, report)
+        elif geracao == self._recalc_geracao:  # resultados já ultrapassados são descartados
+            self._fill_summary(verif)
+            self._fill_diagnostic(verif)
+            self._draw_scheme(verif)
+            self.var_status.set("Resumo atualizado (Calcular para o relatório completo).")
+
+    def _aplicar_calculo(self, verif, report):
+        self.last_verif = verif
+        self.last_report = report
+        self.txt_output.delete("1.0", tk.END)
+        self.txt_output.insert(tk.END, report)
+        self._fill_summary(verif)
+        self._fill_diagnostic(verif)
+        self._draw_scheme(verif)
+        self.var_status.set("Cálculo concluído com sucesso.")
 
     def _fill_summary(self, verif):
         for item in self.tree_summary.get_children():
@@ -522,15 +665,20 @@ class PuncoamentoApp(tk.Tk):
         if not hasattr(self, "canvas_scheme"):
             return
         cv = self.canvas_scheme
-        cv.delete("all")
+        forma = self.var_forma_pilar.get().lower()
+        tipo = self.var_tipo_pilar.get().lower()
+        # os itens são criados uma vez por topologia (tipo, forma); depois só mudam coords()/opções
+        if self._esquema_topologia != (tipo, forma):
+            cv.delete("all")
+            self._esquema_topologia = (tipo, forma)
+            self._esquema_itens = {}
+            self._esquema_opcoes = {}
         w = max(cv.winfo_width(), 700)
         h = max(cv.winfo_height(), 420)
         pad = 35
         slab_left, slab_top, slab_right, slab_bottom = pad, pad, w - pad, h - pad
-        cv.create_rectangle(slab_left, slab_top, slab_right, slab_bottom, outline="#cbd5e1", width=1, dash=(6, 4))
-        cv.create_text(slab_left + 10, slab_top + 12, anchor="w", text="Contorno da laje / zona representativa", fill=MUTED, font=("Segoe UI", 9))
-        forma = self.var_forma_pilar.get().lower()
-        tipo = self.var_tipo_pilar.get().lower()
+        self._esq(cv, "laje", "rectangle", (slab_left, slab_top, slab_right, slab_bottom), dict(outline="#cbd5e1", width=1, dash=(6, 4)))
+        self._esq(cv, "laje_txt", "text", (slab_left + 10, slab_top + 12), dict(anchor="w", text="Contorno da laje / zona representativa", fill=MUTED, font=("Segoe UI", 9)))
         c1 = self._safe_float(self.var_c1.get(), 0.40)
         c2 = self._safe_float(self.var_c2.get(), 0.40) if forma == "retangular" else self._safe_float(self.var_c1.get(), 0.40)
         d = self._safe_float(self.var_d.get(), 0.22)
@@ -544,94 +692,115 @@ class PuncoamentoApp(tk.Tk):
             cx, cy = slab_left + pw / 2, slab_top + ph / 2
         px1, py1, px2, py2 = cx - pw / 2, cy - ph / 2, cx + pw / 2, cy + ph / 2
         # pilar
-        if forma == "retangular":
-            cv.create_rectangle(px1, py1, px2, py2, fill="#dbeafe", outline=ACCENT, width=2)
-        else:
-            cv.create_oval(px1, py1, px2, py2, fill="#dbeafe", outline=ACCENT, width=2)
-        cv.create_text(cx, cy, text="Pilar", font=("Segoe UI", 10, "bold"), fill=TEXT)
+        self._esq(cv, "pilar", "rectangle" if forma == "retangular" else "oval", (px1, py1, px2, py2), dict(fill="#dbeafe", outline=ACCENT, width=2))
+        self._esq(cv, "pilar_txt", "text", (cx, cy), dict(text="Pilar", font=("Segoe UI", 10, "bold"), fill=TEXT))
         # u0 técnico
         self._draw_u0(cv, tipo, forma, px1, py1, px2, py2, d * scale)
         # u1 técnico
         self._draw_u1(cv, tipo, forma, px1, py1, px2, py2, 2 * d * scale)
         # handles
+        self.handle_c1 = (px2, cy)
+        self._esq(cv, "handle_c1", "oval", (px2 - 6, cy - 6, px2 + 6, cy + 6), dict(fill=ACCENT, outline=ACCENT, tags=("handle_c1",)))
         if forma == "retangular":
-            self.handle_c1 = (px2, cy)
             self.handle_c2 = (cx, py2)
-            cv.create_oval(px2 - 6, cy - 6, px2 + 6, cy + 6, fill=ACCENT, outline=ACCENT, tags=("handle_c1",))
-            cv.create_oval(cx - 6, py2 - 6, cx + 6, py2 + 6, fill=ACCENT, outline=ACCENT, tags=("handle_c2",))
+            self._esq(cv, "handle_c2", "oval", (cx - 6, py2 - 6, cx + 6, py2 + 6), dict(fill=ACCENT, outline=ACCENT, tags=("handle_c2",)))
         else:
-            self.handle_c1 = (px2, cy)
             self.handle_c2 = None
-            cv.create_oval(px2 - 6, cy - 6, px2 + 6, cy + 6, fill=ACCENT, outline=ACCENT, tags=("handle_c1",))
         # cotas
-        self._dim_line(cv, px1, py2 + 24, px2, py2 + 24, f"c1 = {c1:.3f} m")
+        self._dim_line(cv, "cota_c1", px1, py2 + 24, px2, py2 + 24, f"c1 = {c1:.3f} m")
         if forma == "retangular":
-            self._dim_line(cv, px2 + 24, py1, px2 + 24, py2, f"c2 = {c2:.3f} m", vertical=True)
-        self._dim_line(cv, px2 + 62, py2 - 2 * d * scale, px2 + 62, py2, f"2d = {2*d:.3f} m", vertical=True, color="#dc2626")
-        if self.var_has_abertura.get():
-            ax, ay = px2 + 90, py1 + 20
-            cv.create_rectangle(ax, ay, ax + 64, ay + 28, outline="#f59e0b", fill="#fef3c7")
-            cv.create_text(ax + 32, ay + 14, text="Abertura", fill=WARN, font=("Segoe UI", 8, "bold"))
-            cv.create_line(px2 + 2 * d * scale, cy, ax, ay + 14, arrow="last", fill="#f59e0b")
+            self._dim_line(cv, "cota_c2", px2 + 24, py1, px2 + 24, py2, f"c2 = {c2:.3f} m", vertical=True)
+        self._dim_line(cv, "cota_2d", px2 + 62, py2 - 2 * d * scale, px2 + 62, py2, f"2d = {2*d:.3f} m", vertical=True, color="#dc2626")
+        ax, ay = px2 + 90, py1 + 20
+        estado = "normal" if self.var_has_abertura.get() else "hidden"
+        self._esq(cv, "abertura", "rectangle", (ax, ay, ax + 64, ay + 28), dict(outline="#f59e0b", fill="#fef3c7"), state=estado)
+        self._esq(cv, "abertura_txt", "text", (ax + 32, ay + 14), dict(text="Abertura", fill=WARN, font=("Segoe UI", 8, "bold")), state=estado)
+        self._esq(cv, "abertura_seta", "line", (px2 + 2 * d * scale, cy, ax, ay + 14), dict(arrow="last", fill="#f59e0b"), state=estado)
         if verif is not None:
-            cv.create_text(slab_left + 10, slab_bottom - 10, anchor="sw", text=f"β = {verif.beta:.3f} | u0 = {verif.u0:.3f} m | u1 = {verif.u1:.3f} m", fill=TEXT, font=("Segoe UI", 10, "bold"))
+            self._esq(cv, "verif_txt", "text", (slab_left + 10, slab_bottom - 10), dict(anchor="sw", fill=TEXT, font=("Segoe UI", 10, "bold")),
+                      text=f"β = {verif.beta:.3f} | u0 = {verif.u0:.3f} m | u1 = {verif.u1:.3f} m", state="normal")
+        elif "verif_txt" in self._esquema_itens:
+            # com recálculo automático o valor é atualizado logo a seguir; evita piscar durante o arrasto
+            self._esq(cv, "verif_txt", "text", (slab_left + 10, slab_bottom - 10),
+                      state="normal" if self.var_auto_calc.get() else "hidden")
         legend = "u0 junto ao pilar" if tipo == "interior" else "u0 limitado por bordo livre"
-        cv.create_text(slab_left + 10, slab_top + 32, anchor="w", text=f"Azul: pilar | Roxo: u0 | Vermelho: u1 a 2d | {legend}", fill=MUTED, font=("Segoe UI", 9))
+        self._esq(cv, "legenda", "text", (slab_left + 10, slab_top + 32), dict(anchor="w", text=f"Azul: pilar | Roxo: u0 | Vermelho: u1 a 2d | {legend}", fill=MUTED, font=("Segoe UI", 9)))
+
+    def _esq(self, cv, chave, tipo, coords, estilo=None, **dinamico):
+        """
+        Item `chave` do esquema: criado na primeira chamada (com `estilo`); nas
+        seguintes só se atualizam as coordenadas e as opções `dinamico` que mudaram.
+        """
+        item = self._esquema_itens.get(chave)
+        if item is None:
+            item = getattr(cv, "create_" + tipo)(*coords, **(estilo or {}), **dinamico)
+            self._esquema_itens[chave] = item
+            self._esquema_opcoes[chave] = dinamico
+            return item
+        cv.coords(item, *coords)
+        anteriores = self._esquema_opcoes[chave]
+        mudou = {k: v for k, v in dinamico.items() if anteriores.get(k) != v}
+        if mudou:
+            cv.itemconfigure(item, **mudou)
+            anteriores.update(mudou)
+        return item
 
     def _draw_u0(self, cv, tipo, forma, x1, y1, x2, y2, doff):
         col = "#7c3aed"
+        linha = dict(fill=col, width=2)
+        arco = dict(style="arc", outline=col, width=2)
+        rotulo = dict(anchor="w", text="u0", fill=col, font=("Segoe UI", 9, "bold"))
         if tipo == "interior":
-            if forma == "retangular":
-                cv.create_rectangle(x1, y1, x2, y2, outline=col, width=2)
-            else:
-                cv.create_oval(x1, y1, x2, y2, outline=col, width=2)
-            cv.create_text(x2 + 10, y1 - 8, anchor="w", text="u0", fill=col, font=("Segoe UI", 9, "bold"))
+            self._esq(cv, "u0", "rectangle" if forma == "retangular" else "oval", (x1, y1, x2, y2), dict(outline=col, width=2))
+            self._esq(cv, "u0_txt", "text", (x2 + 10, y1 - 8), rotulo)
         elif tipo == "bordo":
-            cv.create_line(x1, y2 + doff * 1.5, x2, y2 + doff * 1.5, fill=col, width=2)
-            cv.create_line(x2, y1, x2, y2 + doff * 1.5, fill=col, width=2)
-            cv.create_arc(x1 - 2 * doff, y2 - doff * 0.5, x1 + doff, y2 + doff * 2.0, start=90, extent=90, style="arc", outline=col, width=2)
-            cv.create_text(x2 + 10, y2 + doff * 1.5, anchor="w", text="u0", fill=col, font=("Segoe UI", 9, "bold"))
+            self._esq(cv, "u0_a", "line", (x1, y2 + doff * 1.5, x2, y2 + doff * 1.5), linha)
+            self._esq(cv, "u0_b", "line", (x2, y1, x2, y2 + doff * 1.5), linha)
+            self._esq(cv, "u0_c", "arc", (x1 - 2 * doff, y2 - doff * 0.5, x1 + doff, y2 + doff * 2.0), dict(arco, start=90, extent=90))
+            self._esq(cv, "u0_txt", "text", (x2 + 10, y2 + doff * 1.5), rotulo)
         else:
-            cv.create_arc(x2 - doff * 1.5, y2 - doff * 1.5, x2 + doff * 1.5, y2 + doff * 1.5, start=180, extent=90, style="arc", outline=col, width=2)
-            cv.create_text(x2 + 10, y2 + 10, anchor="w", text="u0", fill=col, font=("Segoe UI", 9, "bold"))
+            self._esq(cv, "u0", "arc", (x2 - doff * 1.5, y2 - doff * 1.5, x2 + doff * 1.5, y2 + doff * 1.5), dict(arco, start=180, extent=90))
+            self._esq(cv, "u0_txt", "text", (x2 + 10, y2 + 10), rotulo)
 
     def _draw_u1(self, cv, tipo, forma, x1, y1, x2, y2, off):
         col = "#dc2626"
+        linha = dict(fill=col, width=2)
+        arco = dict(style="arc", outline=col, width=2)
         if forma == "circular":
             if tipo == "interior":
-                cv.create_oval(x1 - off, y1 - off, x2 + off, y2 + off, outline=col, width=2)
+                self._esq(cv, "u1", "oval", (x1 - off, y1 - off, x2 + off, y2 + off), dict(outline=col, width=2))
             elif tipo == "bordo":
-                cv.create_arc(x1 - off, y1 - off, x2 + off, y2 + off, start=180, extent=180, style="arc", outline=col, width=2)
-                cv.create_line(x1 - off, y2, x2 + off, y2, fill=col, width=2)
+                self._esq(cv, "u1_a", "arc", (x1 - off, y1 - off, x2 + off, y2 + off), dict(arco, start=180, extent=180))
+                self._esq(cv, "u1_b", "line", (x1 - off, y2, x2 + off, y2), linha)
             else:
-                cv.create_arc(x1 - off, y1 - off, x2 + off, y2 + off, start=180, extent=90, style="arc", outline=col, width=2)
-                cv.create_line(x1, y2 + off, x2 + off * 0.5, y2 + off, fill=col, width=2)
-                cv.create_line(x2 + off, y1, x2 + off, y2 + off * 0.5, fill=col, width=2)
+                self._esq(cv, "u1_a", "arc", (x1 - off, y1 - off, x2 + off, y2 + off), dict(arco, start=180, extent=90))
+                self._esq(cv, "u1_b", "line", (x1, y2 + off, x2 + off * 0.5, y2 + off), linha)
+                self._esq(cv, "u1_c", "line", (x2 + off, y1, x2 + off, y2 + off * 0.5), linha)
         else:
             if tipo == "interior":
-                cv.create_rectangle(x1 - off, y1 - off, x2 + off, y2 + off, outline=col, width=2)
+                self._esq(cv, "u1", "rectangle", (x1 - off, y1 - off, x2 + off, y2 + off), dict(outline=col, width=2))
             elif tipo == "bordo":
-                cv.create_line(x1 - off, y2 + off, x2 + off, y2 + off, fill=col, width=2)
-                cv.create_line(x2 + off, y1, x2 + off, y2 + off, fill=col, width=2)
-                cv.create_line(x1 - off, y1, x1 - off, y2 + off, fill=col, width=2)
-                cv.create_arc(x1 - 2*off, y2, x1, y2 + 2*off, start=90, extent=90, style="arc", outline=col, width=2)
-                cv.create_arc(x2, y2, x2 + 2*off, y2 + 2*off, start=0, extent=90, style="arc", outline=col, width=2)
+                self._esq(cv, "u1_a", "line", (x1 - off, y2 + off, x2 + off, y2 + off), linha)
+                self._esq(cv, "u1_b", "line", (x2 + off, y1, x2 + off, y2 + off), linha)
+                self._esq(cv, "u1_c", "line", (x1 - off, y1, x1 - off, y2 + off), linha)
+                self._esq(cv, "u1_d", "arc", (x1 - 2*off, y2, x1, y2 + 2*off), dict(arco, start=90, extent=90))
+                self._esq(cv, "u1_e", "arc", (x2, y2, x2 + 2*off, y2 + 2*off), dict(arco, start=0, extent=90))
             else:
-                cv.create_line(x1, y2 + off, x2 + off, y2 + off, fill=col, width=2)
-                cv.create_line(x2 + off, y1, x2 + off, y2 + off, fill=col, width=2)
-                cv.create_arc(x2, y2, x2 + 2*off, y2 + 2*off, start=180, extent=90, style="arc", outline=col, width=2)
-        cv.create_text(x2 + off + 10, y1 - off, anchor="w", text="u1", fill=col, font=("Segoe UI", 9, "bold"))
+                self._esq(cv, "u1_a", "line", (x1, y2 + off, x2 + off, y2 + off), linha)
+                self._esq(cv, "u1_b", "line", (x2 + off, y1, x2 + off, y2 + off), linha)
+                self._esq(cv, "u1_c", "arc", (x2, y2, x2 + 2*off, y2 + 2*off), dict(arco, start=180, extent=90))
+        self._esq(cv, "u1_txt", "text", (x2 + off + 10, y1 - off), dict(anchor="w", text="u1", fill=col, font=("Segoe UI", 9, "bold")))
 
-    def _dim_line(self, cv, x1, y1, x2, y2, text, vertical=False, color="#334155"):
-        cv.create_line(x1, y1, x2, y2, fill=color)
+    def _dim_line(self, cv, chave, x1, y1, x2, y2, text, vertical=False, color="#334155"):
+        self._esq(cv, chave, "line", (x1, y1, x2, y2), dict(fill=color))
         if vertical:
-            cv.create_line(x1 - 6, y1, x1 + 6, y1, fill=color)
-            cv.create_line(x2 - 6, y2, x2 + 6, y2, fill=color)
-            cv.create_text(x1 + 8, (y1 + y2) / 2, anchor="w", text=text, fill=color, font=("Segoe UI", 9))
+            self._esq(cv, chave + "_t1", "line", (x1 - 6, y1, x1 + 6, y1), dict(fill=color))
+            self._esq(cv, chave + "_t2", "line", (x2 - 6, y2, x2 + 6, y2), dict(fill=color))
+            self._esq(cv, chave + "_txt", "text", (x1 + 8, (y1 + y2) / 2), dict(anchor="w", fill=color, font=("Segoe UI", 9)), text=text)
         else:
-            cv.create_line(x1, y1 - 6, x1, y1 + 6, fill=color)
-            cv.create_line(x2, y2 - 6, x2, y2 + 6, fill=color)
-            cv.create_text((x1 + x2) / 2, y1 - 12, text=text, fill=color, font=("Segoe UI", 9))
+            self._esq(cv, chave + "_t1", "line", (x1, y1 - 6, x1, y1 + 6), dict(fill=color))
+            self._esq(cv, chave + "_t2", "line", (x2, y2 - 6, x2, y2 + 6), dict(fill=color))
+            self._esq(cv, chave + "_txt", "text", ((x1 + x2) / 2, y1 - 12), dict(fill=color, font=("Segoe UI", 9)), text=text)
 
     def _on_canvas_press(self, event):
         item = self.canvas_scheme.find_closest(event.x, event.y)
@@ -661,7 +830,7 @@ class PuncoamentoApp(tk.Tk):
         elif self.drag_mode == "c2" and self.var_forma_pilar.get().lower() == "retangular":
             new_c2 = max(0.20, min(1.50, 2 * abs(event.y - cy) / scale))
             self.var_c2.set(f"{new_c2:.3f}")
-        self._draw_scheme()
+        # o redesenho e o recálculo são agendados pelos traces de var_c1/var_c2
 
     def guardar_relatorio_txt(self):
         content = self.txt_output.get("1.0", tk.END).strip()
@@ -680,7 +849,7 @@ class PuncoamentoApp(tk.Tk):
         if not content:
             messagebox.showinfo("Exportar PDF", "Não existe relatório para exportar.")
             return
-        if not REPORTLAB_OK:
+        if not _carregar_reportlab():
             messagebox.showerror("Exportar PDF", "A biblioteca ReportLab não está disponível neste ambiente.")
             return
         filepath = filedialog.asksaveasfilename(title="Exportar relatório PDF", defaultextension=".pdf", filetypes=[("PDF", "*.pdf")])
@@ -690,190 +859,23 @@ class PuncoamentoApp(tk.Tk):
         self.var_status.set(f"Relatório PDF guardado em: {filepath}")
 
     def _create_pdf(self, filepath, content):
+        _carregar_reportlab()
         emitted_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        c = pdf_canvas.Canvas(filepath, pagesize=A4)
-        width, height = A4
-        x0 = 2.0 * cm
-        top_margin = 2.2 * cm
-        bottom_margin = 1.8 * cm
-        usable_w = width - 4.0 * cm
-        body_font = "Courier"
-        body_bold = "Courier-Bold"
-        body_size = 10
-        subtitle_size = 12
-        footer_size = 8
-        body_leading = body_size * 1.5
-        section_gap = body_size * 2.0
-        subtitle_gap = body_size * 2.0
-        repo_url = "https://github.com/lutondatomalela/PunchingShearEC2"
-
-        sections = self._build_professional_report_sections(emitted_at)
-        first_page = True
-
-        def draw_footer():
-            c.setFont(body_font, footer_size)
-            footer = f"PunchingShearEC2 | {emitted_at}"
-            footer_w = stringWidth(footer, body_font, footer_size)
-            footer_x = (width - footer_w) / 2
-            footer_y = 1.0 * cm
-            c.drawString(footer_x, footer_y, footer)
-            c.linkURL(repo_url, (footer_x, footer_y-2, footer_x + footer_w, footer_y + footer_size), relative=0)
-
-        def new_page():
-            nonlocal first_page
-            if not first_page:
-                c.showPage()
-            y = height - top_margin
-            if first_page:
-                c.setTitle("PunchingShearEC2 - Relatório de Verificação de Punçoamento")
-                c.setFont(body_bold, 14)
-                c.drawString(x0, y, "Relatório de verificação de punçoamento")
-                y -= 0.9 * cm
-                c.setFont(body_font, body_size)
-                prog_text = "Programa: PunchingShearEC2"
-                c.drawString(x0, y, prog_text)
-                c.linkURL("https://github.com/lutondatomalela/PunchingShearEC2", (x0, y-2, x0 + stringWidth(prog_text, body_font, body_size), y + body_size), relative=0)
-                y -= 0.55 * cm
-                c.drawString(x0, y, "Norma de referência principal: NP EN 1992-1-1")
-                y -= 0.8 * cm
-                first_page = False
-            return y
-
-        y = new_page()
-        c.setFont(body_font, body_size)
-        for section in sections:
-            title = section.get("title", "")
-            lines = section.get("lines", [])
-            if title:
-                needed = subtitle_size + subtitle_gap + body_leading * max(1, len(lines)) + section_gap
-                if y < bottom_margin + needed:
-                    draw_footer()
-                    y = new_page()
-                c.setFont(body_bold, subtitle_size)
-                c.drawString(x0, y, title)
-                y -= subtitle_gap
-            c.setFont(body_font, body_size)
-            for line in lines:
-                wrapped_lines = self._wrap_text(line if line else " ", body_font, body_size, usable_w)
-                for wrapped in wrapped_lines:
-                    if y < bottom_margin + body_leading:
-                        draw_footer()
-                        y = new_page()
-                        c.setFont(body_font, body_size)
-                    c.drawString(x0, y, wrapped)
-                    y -= body_leading
-            y -= section_gap
-
-        draw_footer()
+        paginacao = pdf.PaginacaoPDF()
+        c = paginacao.novo_canvas(filepath)
+        paginacao.desenhar(c, self._build_professional_report_sections(emitted_at), emitted_at)
         c.save()
 
     def _build_professional_report_sections(self, emitted_at):
         v = self.last_verif
         if v is None:
             return [{"title": "", "lines": [self.txt_output.get("1.0", tk.END).strip()]}]
-
-        def fmt(num, nd=3):
-            try:
-                return f"{float(num):.{nd}f}"
-            except Exception:
-                return "-"
-
-        def yesno(flag):
-            return "Sim" if flag else "Não"
-
-        tipo = self.var_tipo_pilar.get().capitalize()
-        forma = self.var_forma_pilar.get().capitalize()
-        c2_label = "Diâmetro do pilar D [m]" if self.var_forma_pilar.get().lower() == "circular" else "Dimensão do pilar c2 [m]"
-        ratio_u0 = v.v_Ed_u0 / v.v_Rd_max if getattr(v, 'v_Rd_max', 0) else float('inf')
-        ratio_u1 = v.v_Ed_u1 / v.v_Rd_c if getattr(v, 'v_Rd_c', 0) else float('inf')
-
-        sections = [
-            {"title": "1. Info", "lines": [
-                "Verificação de punçoamento de ligação laje-pilar segundo a NP EN 1992-1-1, com avaliação da resistência na face do pilar e da resistência sem armadura de punçoamento no perímetro de controlo básico.",
-            ]},
-            {"title": "2. Dados de entrada", "lines": [
-                f"Resistência característica do betão fck [MPa]: {fmt(v.fck)}",
-                f"Tensão característica de cedência das armaduras longitudinais fyk [MPa]: {fmt(v.fyk)}",
-                f"Tensão característica de cedência das armaduras de punçoamento fywk [MPa]: {fmt(v.fywk)}",
-                f"Altura útil da laje d [m]: {fmt(v.d)}",
-                f"Armadura longitudinal As,lx [cm²/m]: {self.var_asx.get()}",
-                f"Armadura longitudinal As,ly [cm²/m]: {self.var_asy.get()}",
-                f"Taxa média de armadura ρl [%]: {fmt(v.rho_l * 100)}",
-                f"Tensão média de compressão σcp [MPa]: {fmt(v.sigma_cp)}",
-                f"Tipo de pilar: {tipo}",
-                f"Forma do pilar: {forma}",
-                f"Dimensão do pilar c1 [m]: {fmt(v.c1)}",
-                f"{c2_label}: {fmt(v.c2 if getattr(v,'c2',None) is not None else getattr(v,'D',None))}",
-                f"Esforço transverso de cálculo VEd [kN]: {fmt(v.V_Ed / 1000)}",
-                f"Momento fletor de cálculo MEdx [kN·m]: {fmt(v.M_Edx / 1000)}",
-                f"Momento fletor de cálculo MEdy [kN·m]: {fmt(v.M_Edy / 1000)}",
-                f"Elemento de fundação tipo sapata: {yesno(v.is_sapata)}",
-                f"Existem aberturas próximas consideradas na redução de perímetro: {yesno(v.u1_ineffective > 0)}",
-                f"Perímetro ineficaz devido a aberturas u1,inef [m]: {fmt(v.u1_ineffective)}",
-                f"Modo de avaliação do coeficiente β: {self.var_beta.get().upper()}",
-            ]},
-            {"title": "3. Parâmetros geométricos e mecânicos", "lines": [
-                f"Perímetro na face do pilar u0 [m]: {fmt(v.u0)}",
-                f"Perímetro de controlo básico u1 [m]: {fmt(v.u1)}",
-                f"Perímetro de controlo efetivo u1,ef [m]: {fmt(v.u1_eff)}",
-                f"Esforço transverso reduzido VEd,red [kN]: {fmt(v.V_Ed_red / 1000)}",
-                f"Coeficiente β [-]: {fmt(v.beta)}",
-                f"Coeficiente k [-]: {fmt(getattr(v, 'k_val', None))}",
-                f"Tensão de cálculo v_Ed(u0) [MPa]: {fmt(v.v_Ed_u0)}",
-                f"Tensão resistente máxima v_Rd,max [MPa]: {fmt(v.v_Rd_max)}",
-                f"Tensão de cálculo v_Ed(u1) [MPa]: {fmt(v.v_Ed_u1)}",
-                f"Tensão resistente do betão v_Rd,c [MPa]: {fmt(v.v_Rd_c)}",
-                f"Índice de utilização em u0 [-]: {fmt(ratio_u0)}",
-                f"Índice de utilização em u1 [-]: {fmt(ratio_u1)}",
-            ]},
-            {"title": "4. Referências normativas adotadas", "lines": [
-                "Determinação do perímetro de controlo básico conforme 6.4.2 da NP EN 1992-1-1.",
-                "Avaliação do coeficiente β conforme 6.4.3, incluindo expressões (6.39), (6.41), (6.44), (6.45) e (6.46), conforme aplicável ao tipo de pilar e à direção da excentricidade.",
-                "Resistência ao punçoamento sem armadura conforme 6.4.4, com v_Rd,c pela expressão (6.47).",
-                "Resistência máxima junto ao pilar conforme 6.4.5 e respetiva nota nacional adotada no programa para v_Rd,max.",
-                "Dimensionamento da armadura de punçoamento, quando necessária, conforme 6.4.5 e expressão (6.52).",
-            ]},
-            {"title": "5. Verificações realizadas", "lines": [
-                f"Verificação na face do pilar: v_Ed(u0) = {fmt(v.v_Ed_u0)} MPa {'≤' if v.v_Ed_u0 <= v.v_Rd_max else '>'} v_Rd,max = {fmt(v.v_Rd_max)} MPa.",
-                f"Verificação no perímetro de controlo básico: v_Ed(u1) = {fmt(v.v_Ed_u1)} MPa {'≤' if v.v_Ed_u1 <= v.v_Rd_c else '>'} v_Rd,c = {fmt(v.v_Rd_c)} MPa.",
-            ]},
-            {"title": "6. Conclusão", "lines": [
-                self.var_resultado.get() + ".",
-            ]},
-        ]
-
-        det_lines = []
-        if getattr(v, 'armadura_necessaria', False):
-            det_lines.extend([
-                f"Tensão resistente máxima com armadura v_Rd,cs,max [MPa]: {fmt(getattr(v, 'v_Rd_cs_max', None))}",
-                f"Tensão efetiva de cálculo do aço de punçoamento f_ywd,ef [MPa]: {fmt(getattr(v, 'f_ywd_ef', None))}",
-                f"Armadura calculada Asw/sr [cm²/m]: {fmt(getattr(v, 'Asw_sr_calc', 0) * 1e4)}",
-                f"Armadura mínima Asw/sr [cm²/m]: {fmt(getattr(v, 'Asw_sr_min', 0) * 1e4)}",
-                f"Armadura adotada Asw/sr [cm²/m]: {fmt(getattr(v, 'Asw_sr_req', 0) * 1e4)}",
-                f"Perímetro exterior efetivo u_out,ef [m]: {fmt(getattr(v, 'u_out_ef', None))}",
-                f"Extensão radial a armar a partir da face do pilar [m]: {fmt(getattr(v, 'dist_zona_armar', None))}",
-                f"Posição máxima do primeiro perímetro s0,max [m]: {fmt(getattr(v, 's0_max', None))}",
-                f"Espaçamento radial máximo entre perímetros sr,max [m]: {fmt(getattr(v, 'sr_max', None))}",
-                f"Número estimado de perímetros de armadura: {getattr(v, 'n_perimetros', '-')}",
-                f"Área de armadura por perímetro Asw [cm²]: {fmt(getattr(v, 'Asw_por_perimetro', 0) * 1e4)}",
-                "Pormenorização resultante: dispor o primeiro perímetro a uma distância não superior a 0,5d da face do pilar e os perímetros seguintes com espaçamento radial não superior a 0,75d, prolongando a armadura até ao limite definido por u_out,ef.",
-            ])
-        else:
-            det_lines.append("Pormenorização resultante: não é necessária armadura específica de punçoamento para a situação verificada.")
-        sections.append({"title": "7. Recomendação de pormenorização", "lines": det_lines})
-
-        note_lines = []
-        if self.var_tipo_pilar.get() == 'bordo':
-            note_lines.append("Nota: para pilar de bordo, o programa adota a formulação do EC2 com u1*, β pela expressão (6.44), quando aplicável, e W1 pela expressão (6.45).")
-        elif self.var_tipo_pilar.get() == 'canto':
-            note_lines.append("Nota: para pilar de canto com excentricidade dirigida para o interior da laje, o programa adota β = u1/u1* conforme a expressão (6.46).")
-        if note_lines:
-            sections.append({"title": "", "lines": note_lines})
-
-        return sections
+        _carregar_reportlab()
+        return pdf.secoes_relatorio(v, self.var_resultado.get(), self.var_asx.get(),
+                                    self.var_asy.get(), self.var_beta.get())
 
     def guardar_relatorio_excel(self):
-        if not OPENPYXL_OK:
+        if not _carregar_openpyxl():
             messagebox.showerror("Exportar Excel", "A biblioteca openpyxl não está disponível neste ambiente.")
             return
         if self.last_verif is None:
@@ -882,6 +884,11 @@ class PuncoamentoApp(tk.Tk):
         filepath = filedialog.asksaveasfilename(title="Exportar relatório Excel", defaultextension=".xlsx", filetypes=[("Excel", "*.xlsx")])
         if not filepath:
             return
+        self._create_excel(filepath)
+        self.var_status.set(f"Relatório Excel guardado em: {filepath}")
+
+    def _create_excel(self, filepath):
+        _carregar_openpyxl()
         wb = Workbook()
         ws1 = wb.active
         ws1.title = "Resumo"
@@ -934,22 +941,11 @@ class PuncoamentoApp(tk.Tk):
             for col in range(1, ws.max_column + 1):
                 ws.column_dimensions[get_column_letter(col)].bestFit = True
         wb.save(filepath)
-        self.var_status.set(f"Relatório Excel guardado em: {filepath}")
 
     @staticmethod
     def _wrap_text(text, font_name, font_size, max_width):
-        words = text.split()
-        if not words:
-            return [""]
-        lines, current = [], words[0]
-        for word in words[1:]:
-            test = current + " " + word
-            if stringWidth(test, font_name, font_size) <= max_width:
-                current = test
-            else:
-                lines.append(current); current = word
-        lines.append(current)
-        return lines
+        _carregar_reportlab()
+        return list(pdf.quebrar_texto(text, font_name, font_size, max_width))
 
     def copiar_relatorio(self):
         content = self.txt_output.get("1.0", tk.END).strip()
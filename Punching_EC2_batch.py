@@ -0,0 +1,622 @@
+# -*- coding: utf-8 -*-
+"""
+Motor vetorizado (NumPy) para verificação de punçoamento em lote.
+
+Reproduz, elemento a elemento, o caminho de cálculo de PuncoamentoEC2
+(perímetros, β, V_Ed,red, u1,ef, esmagamento, v_Rd,c e Asw/sr), sem construir
+instâncias nem relatórios. Os ramos do motor escalar são avaliados como
+expressões mascaradas sobre arrays com um elemento por pilar/combinação.
+
+Os atributos de resultado têm os mesmos nomes dos de PuncoamentoEC2; valores
+que o motor escalar não chega a calcular (p.ex. Asw/sr sem armadura) ficam NaN.
+
+Precisão: as operações são as do motor escalar, mas o NumPy calcula x ** 0.5
+com sqrt e as outras potências (k^1,5 em v_min, raiz cúbica em v_Rd,c) com a
+sua própria implementação vetorizada, enquanto o motor escalar usa pow da
+libm. Por isso ρl (a partir de As), v_min, v_Rd,c e o que deles depende
+(v_Rd,cs,max, Asw/sr, u_out,ef, dist_zona_armar, fatores de reserva) podem
+diferir do motor escalar em poucos ulp: diferença relativa até
+TOLERANCIA_ESCALAR. Estados e nº de perímetros só diferem em casos exatamente
+na fronteira. Chamar pow elemento a elemento daria igualdade exata, mas
+tornaria o lote cerca de 50 % mais lento.
+"""
+
+import math
+
+import numpy as np
+
+from Punching_EC2 import (BETA_MODES, CAMPOS_RESULTADO, ESTADO_ARMADURA, ESTADO_ERRO,
+                          ESTADO_FALHA_CS_MAX, ESTADO_FALHA_U0, ESTADO_OK, ESTADOS, FORMAS_PILAR,
+                          TIPOS_PILAR, dtype_resultado, normalizar_beta_mode)
+
+TOLERANCIA_ESCALAR = 1e-14  #diferença relativa máxima face a PuncoamentoEC2 (ver acima)
+_TINY = 1e-12
+_BETA_SIMPLIFICADO = np.array([1.15, 1.4, 1.5])  # interior, bordo, canto
+
+
+def _codificar(valores, opcoes, nome, normalizar=None):
+    """Converte strings (ou códigos inteiros) em índices de `opcoes`."""
+    arr = np.asarray(valores)
+    if arr.dtype.kind in "iu":
+        if arr.size and (arr.min() < 0 or arr.max() >= len(opcoes)):
+            raise ValueError(f"Código inválido em '{nome}'.")
+        return arr.astype(np.int8)
+    codigos = np.empty(arr.shape, dtype=np.int8)
+    for valor in np.unique(arr):
+        chave = normalizar(valor) if normalizar else str(valor).lower()
+        if chave not in opcoes:
+            raise ValueError(f"Valor inválido em '{nome}': {valor!r}. Opções: {', '.join(opcoes)}.")
+        codigos[arr == valor] = opcoes.index(chave)
+    return codigos
+
+
+def _interp_k_por_ratio(r):
+    """Quadro 6.1 – versão vetorizada de PuncoamentoEC2._interp_k_por_ratio."""
+    k = np.where(
+        r < 1.0, 0.45 + (r - 0.5) / (1.0 - 0.5) * (0.60 - 0.45),
+        np.where(r < 2.0, 0.60 + (r - 1.0) / (2.0 - 1.0) * (0.70 - 0.60),
+                 0.70 + (r - 2.0) / (3.0 - 2.0) * (0.80 - 0.70)))
+    k = np.where(r <= 0.5, 0.45, k)
+    return np.where(r >= 3.0, 0.80, k)
+
+
+def _W1_retangular(c_par, c_perp, d):
+    """Expressão (6.41) – igual a PuncoamentoEC2._W1_retangular."""
+    return (c_par**2) / 2.0 + c_par * c_perp + 4.0 * c_perp * d + 16.0 * d**2 + 2.0 * math.pi * d * c_par
+
+
+def _asw_sr(v_Ed_u1, v_Rd_c, u1_eff, d, fck, fywd, fywk):
+    """Asw/sr (Eq. 6.52) e mínimo; devolve (f_ywd_ef, Asw_sr_calc, Asw_sr_min, Asw_sr_req)."""
+    f_ywd_ef = np.minimum(250 + 0.25 * (d * 1000), fywd)
+    Asw_sr_calc = (v_Ed_u1 - 0.75 * v_Rd_c) * u1_eff / (1.5 * f_ywd_ef)
+    Asw_sr_min = (0.08 * np.sqrt(fck) / fywk) * (u1_eff / 1.5)
+    return f_ywd_ef, Asw_sr_calc, Asw_sr_min, np.maximum(Asw_sr_calc, Asw_sr_min)
+
+
+def _n_perimetros(u_out_ef, c1, c2, d, tipo, forma):
+    """Distância da zona a armar e nº de perímetros de armadura; devolve (dist_zona_armar, n)."""
+    interior, bordo = tipo == 0, tipo == 1
+    r_out = np.where(forma == 0, np.select(
+        [interior, bordo],
+        [(u_out_ef - 2*(c1 + c2)) / (2*math.pi), (u_out_ef - (c1 + 2*c2)) / (3*math.pi/2)],
+        (u_out_ef - (c1 + c2)) / (math.pi)),
+        (u_out_ef / math.pi - c1) / 2)
+    dist_zona_armar = r_out - 1.5 * d
+    s0_max = 0.5 * d
+    sr_max = 0.75 * d
+    n_calc = np.ceil((dist_zona_armar - s0_max) / sr_max) + 1
+    return dist_zona_armar, np.where(dist_zona_armar < s0_max, 2, np.maximum(n_calc, 2))
+
+
+class PuncoamentoEC2Batch:
+    """
+    Verificação ao punçoamento de N casos em simultâneo (arrays NumPy 1-D).
+    Unidades internas: N, m, MPa (como em PuncoamentoEC2).
+
+    Os argumentos seguem os de PuncoamentoEC2 e podem ser escalares ou arrays;
+    são difundidos (broadcast) para um comprimento comum.
+    """
+
+    def __init__(self,
+                 laje_d,
+                 betão_fck,
+                 aço_fyk,
+                 aço_fywk,
+                 pilar_tipo,
+                 pilar_forma,
+                 V_Ed,
+                 pilar_c1,
+                 pilar_c2=None,
+                 M_Edx=0.0,
+                 M_Edy=0.0,
+                 sigma_cp=0.0,
+                 is_sapata=False,
+                 sigma_gd_kpa=0.0,
+                 u1_ineffective=0.0,
+                 gamma_C=1.5,
+                 gamma_S=1.15,
+                 beta_mode="simplificado",
+                 laje_As_lx_cm2pm=None,
+                 laje_As_ly_cm2pm=None,
+                 laje_rho_l=None,
+                 edge_perp_interior=True,
+                 corner_interior=True):
+
+        def _f(x):
+            return np.nan if x is None else x
+
+        entradas = (laje_d, betão_fck, aço_fyk, aço_fywk, pilar_tipo, pilar_forma, V_Ed,
+                    pilar_c1, _f(pilar_c2), M_Edx, M_Edy, sigma_cp, is_sapata, sigma_gd_kpa,
+                    u1_ineffective, gamma_C, gamma_S, beta_mode, _f(laje_As_lx_cm2pm),
+                    _f(laje_As_ly_cm2pm), _f(laje_rho_l), edge_perp_interior, corner_interior)
+        shape = np.broadcast_shapes(*(np.shape(x) for x in entradas))
+        self.n = int(np.prod(shape))
+
+        def _num(x):
+            return np.broadcast_to(np.asarray(x, dtype=float), shape).ravel()
+
+        def _bool(x):
+            return np.broadcast_to(np.asarray(x, dtype=bool), shape).ravel()
+
+        def _cat(x, opcoes, nome, normalizar=None):
+            return np.broadcast_to(_codificar(x, opcoes, nome, normalizar), shape).ravel()
+
+        #entradas base
+        self.d = _num(laje_d)
+        self.fck = _num(betão_fck)
+        self.fyk = _num(aço_fyk)
+        self.fywk = _num(aço_fywk)
+        self.tipo = _cat(pilar_tipo, TIPOS_PILAR, "pilar_tipo")
+        self.forma = _cat(pilar_forma, FORMAS_PILAR, "pilar_forma")
+        self.V_Ed = _num(V_Ed)
+        self.c1 = _num(pilar_c1)
+        c2 = _num(_f(pilar_c2))
+        self.M_Edx = _num(M_Edx)
+        self.M_Edy = _num(M_Edy)
+        self.sigma_cp = _num(sigma_cp)
+        self.is_sapata = _bool(is_sapata)
+        self.u1_ineffective = _num(u1_ineffective)
+        self.gamma_C = _num(gamma_C)
+        self.gamma_S = _num(gamma_S)
+        self.beta_mode = _cat(beta_mode, BETA_MODES, "beta_mode", normalizar_beta_mode)
+        self.edge_perp_interior = _bool(edge_perp_interior)
+        self.corner_interior = _bool(corner_interior)
+        As_lx = _num(_f(laje_As_lx_cm2pm))
+        As_ly = _num(_f(laje_As_ly_cm2pm))
+        rho_l = _num(_f(laje_rho_l))
+
+        self.sigma_gd = _num(sigma_gd_kpa) * 1000
+        self._armadura_laje = (As_lx, As_ly, rho_l)
+        self._get_parametros(c2, As_lx, As_ly, rho_l)
+
+    def _get_parametros(self, c2, As_lx, As_ly, rho_l):
+        """
+        c2/D dos pilares circulares, ρl e parâmetros de cálculo (fcd, k, v_min, ν, ...).
+        Também chamado com números duais por Punching_EC2_sensibilidades.
+        """
+        circ = self.forma == 1
+        if np.any(~circ & ~np.isfinite(c2)):
+            raise ValueError("Pilares retangulares exigem pilar_c2.")
+        self.c2 = np.where(circ, self.c1, c2)
+        self.D = np.where(circ, self.c1, np.nan)
+
+        #cálculo automático de ρl (prioridade: Asx/Asy)
+        with np.errstate(invalid="ignore"):
+            rho_lx = np.nan_to_num(As_lx) / 10000.0 / self.d
+            rho_ly = np.nan_to_num(As_ly) / 10000.0 / self.d
+            from_As = (rho_lx > 0) & (rho_ly > 0)
+            #** 0.5 no NumPy é sqrt (no motor escalar, pow): ±1 ulp, ver TOLERANCIA_ESCALAR
+            rho = np.where(from_As, np.minimum((rho_lx * rho_ly) ** 0.5, 0.02), np.minimum(rho_l, 0.02))
+        if np.any(~from_As & ~np.isfinite(rho_l)):
+            raise ValueError("Forneça As_lx/As_ly (cm²/m) ou laje_rho_l.")
+        self.rho_l = rho
+
+        #parâmetros de cálculo
+        self.fcd = 1.0 * self.fck / self.gamma_C
+        self.fywd = self.fywk / self.gamma_S
+        self.k_val = np.minimum(1 + np.sqrt(200 / (self.d * 1000)), 2.0)
+        self.C_Rd_c = 0.18 / self.gamma_C
+        self.k1 = 0.1
+        self.v_min = 0.035 * (self.k_val ** 1.5) * (self.fck ** 0.5)
+        self.nu = 0.6 * (1 - self.fck / 250)
+        self.kmax = 1.5
+
+    @classmethod
+    def from_arrays(cls, d, fck, c1, c2, V_Ed, M_Edx=0.0, M_Edy=0.0,
+                    tipo="interior", forma="retangular", *,
+                    fyk=500.0, fywk=500.0, As_lx=None, As_ly=None, rho_l=None, **kwargs):
+        """Construtor com nomes curtos: d, fck, c1, c2, V_Ed, M_Edx, M_Edy, tipo, forma, ..."""
+        return cls(laje_d=d, betão_fck=fck, aço_fyk=fyk, aço_fywk=fywk,
+                   pilar_tipo=tipo, pilar_forma=forma, V_Ed=V_Ed,
+                   pilar_c1=c1, pilar_c2=c2, M_Edx=M_Edx, M_Edy=M_Edy,
+                   laje_As_lx_cm2pm=As_lx, laje_As_ly_cm2pm=As_ly, laje_rho_l=rho_l, **kwargs)
+
+    @classmethod
+    def from_casos(cls, casos):
+        """Construtor a partir de uma lista de dicts de argumentos de PuncoamentoEC2."""
+        casos = list(casos)
+        if not casos:
+            raise ValueError("Lista de casos vazia.")
+        defaults = dict(pilar_c2=None, M_Edx=0.0, M_Edy=0.0, sigma_cp=0.0, is_sapata=False,
+                        sigma_gd_kpa=0.0, u1_ineffective=0.0, gamma_C=1.5, gamma_S=1.15,
+                        beta_mode="simplificado", laje_As_lx_cm2pm=None, laje_As_ly_cm2pm=None,
+                        laje_rho_l=None, edge_perp_interior=True, corner_interior=True)
+        nomes = ("laje_d", "betão_fck", "aço_fyk", "aço_fywk", "pilar_tipo", "pilar_forma",
+                 "V_Ed", "pilar_c1", *defaults)
+        colunas = {}
+        for nome in nomes:
+            vals = [c.get(nome, defaults.get(nome)) for c in casos]
+            if nome in ("pilar_c2", "laje_As_lx_cm2pm", "laje_As_ly_cm2pm", "laje_rho_l"):
+                vals = [np.nan if v is None else v for v in vals]
+            elif nome == "beta_mode":
+                vals = [normalizar_beta_mode(v) for v in vals]
+            colunas[nome] = vals
+        return cls(**colunas)
+
+    # -------------------------------
+    # Perímetros críticos u0 / u1
+    # --------------------------
+    def _get_perimetros_criticos(self):
+        """Calcula u0 (face) e u1 (a 2d) para todos os casos."""
+        c1, c2, D, d = self.c1, self.c2, self.D, self.d
+        ret = self.forma == 0
+        interior, bordo = self.tipo == 0, self.tipo == 1
+        with np.errstate(invalid="ignore"):
+            self.u0 = np.where(ret, np.select(
+                [interior, bordo],
+                [2 * (c1 + c2), np.minimum(c2 + 3 * d, c2 + 2 * c1)],
+                np.minimum(3 * d, c1 + c2)),
+                np.select(
+                [interior, bordo],
+                [math.pi * D, np.minimum(D + 3 * d, 3 * D)],
+                np.minimum(3 * d, 2 * D)))
+            self.u1 = np.where(ret, np.select(
+                [interior, bordo],
+                [2 * (c1 + c2) + 4 * math.pi * d, (c1 + 2 * c2) + 3 * math.pi * d],
+                (c1 + c2) + 2 * math.pi * d),
+                np.select(
+                [interior, bordo],
+                [math.pi * (D + 4 * d), 0.5 * math.pi * D + 3 * math.pi * d],
+                0.25 * math.pi * D + 2 * math.pi * d))
+
+    # --------------------------
+    # Beta (simplificado / EC2 / fib)
+    # ---------------------------------------
+    def _get_termos_beta(self):
+        """
+        Termos de β que só dependem da geometria (k, W1, u1*, b_x, b_y, b1,e, ...).
+        Calculados uma vez por pilar; as excentricidades entram em _beta_de_esforcos.
+        """
+        c1, c2, d, u1 = self.c1, self.c2, self.d, self.u1
+        ret = self.forma == 0
+        t = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # EC2 – k(c1/c2) comum
+            ratio = np.where(ret & (c2 != 0.0), c1 / c2, 1.0)
+            t["k_ratio"] = _interp_k_por_ratio(ratio)
+
+            # interior retangular (uniaxial x / y e biaxial)
+            t["W1_x"] = _W1_retangular(c1, c2, d)
+            t["k_y"] = _interp_k_por_ratio(np.where(ratio > _TINY, 1.0 / ratio, 1.0))
+            t["W1_y"] = _W1_retangular(c2, c1, d)
+            t["b_x"] = c1 + 4.0 * d
+            t["b_y"] = c2 + 4.0 * d
+            t["b_circ"] = c1 + 4.0 * d
+
+            # bordo (c1 paralelo ao bordo; c2 perpendicular)
+            u1_star_b = np.maximum(u1 - 2.0 * np.minimum(0.5*c1, 1.5*d), 0.0)
+            t["W1_b"] = np.where(ret, (c1**2) / 4.0 + c1 * c2 + 4.0 * c2 * d + 8.0 * d**2 + math.pi * d * c1,
+                                 _W1_retangular(c1, c2, d))
+            t["k_bordo"] = np.where(ret, _interp_k_por_ratio(np.where(c2 != 0.0, c1 / (2.0 * c2), 1.0)), 0.45)
+            t["beta_base"] = u1 / u1_star_b
+
+            # canto
+            u1_star_c = np.maximum(u1 - (np.minimum(0.5*c1, 1.5*d) + np.minimum(0.5*c2, 1.5*d)), 0.0)
+            t["beta_canto_int"] = u1 / u1_star_c
+
+            # fib MC2010
+            t["be1_x"] = np.maximum(c1 + 4.0 * d, 1e-6)
+            t["be1_y"] = np.maximum(c2 + 4.0 * d, 1e-6)
+            t["ke_min"] = np.select([self.tipo == 0, self.tipo == 1], [0.90, 0.70], 0.65)
+        return t
+
+    def _beta_de_esforcos(self, t, V_Ed, M_Edx, M_Edy):
+        """
+        β e k_beta para os esforços dados, com os mesmos ramos de PuncoamentoEC2._get_beta.
+        Os esforços podem ter outro comprimento que a geometria (difusão NumPy).
+        Devolve (beta, k_beta, beta_erro).
+        """
+        u1 = self.u1
+        ret = self.forma == 0
+        interior, bordo = self.tipo == 0, self.tipo == 1
+        simpl, ec2 = self.beta_mode == 0, self.beta_mode == 1
+
+        V = np.maximum(V_Ed, 1e-9)
+        e_x = M_Edy / V
+        e_y = M_Edx / V
+        ax, ay = np.abs(e_x), np.abs(e_y)
+        sem_exc = (ax < _TINY) & (ay < _TINY)
+        e_tot = np.sqrt(e_x**2 + e_y**2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # 1) simplificado
+            beta_simpl = np.where(sem_exc, 1.0, _BETA_SIMPLIFICADO[self.tipo])
+
+            # 2.1 EC2 interior
+            uni_x = (ax >= ay) & (ay < _TINY)
+            uni_y = ~uni_x & (ay > ax) & (ax < _TINY)
+            beta_x = 1.0 + t["k_ratio"] * ax * u1 / t["W1_x"]
+            beta_y = 1.0 + t["k_y"] * ay * u1 / t["W1_y"]
+            beta_bi = 1.0 + 1.8 * np.sqrt((e_x / t["b_x"]) ** 2 + (e_y / t["b_y"]) ** 2)
+            beta_int_ret = np.select([uni_x, uni_y], [beta_x, beta_y], beta_bi)
+            beta_int_circ = 1.0 + 0.6 * math.pi * e_tot / t["b_circ"]
+            beta_int = np.where(sem_exc, 1.0, np.where(ret, beta_int_ret, beta_int_circ))
+
+            # 2.2 EC2 bordo
+            beta_bordo = np.where(
+                self.edge_perp_interior,
+                np.where(ax < _TINY, t["beta_base"], t["beta_base"] + t["k_bordo"] * (u1 / t["W1_b"]) * ax),
+                1.0 + t["k_bordo"] * ay * u1 / t["W1_b"])
+
+            # 2.3 EC2 canto
+            beta_canto = np.where(self.corner_interior, t["beta_canto_int"],
+                                  1.0 + t["k_ratio"] * e_tot * u1 / t["W1_x"])
+
+            beta_ec2 = np.select([interior, bordo], [beta_int, beta_bordo], beta_canto)
+            k_ec2 = np.where(bordo, t["k_bordo"], t["k_ratio"])
+
+            # 3) fib MC2010 – ke
+            be1 = np.where(ret & (ax < ay), t["be1_y"], t["be1_x"])
+            ke = 1.0 / (1.0 + e_tot / be1)
+            ke = np.maximum(np.minimum(ke, 1.0), t["ke_min"])
+            beta_fib = np.where(sem_exc, 1.0, 1.0 / ke)
+
+        beta = np.select([simpl, ec2], [beta_simpl, beta_ec2], beta_fib)
+        k_beta = np.broadcast_to(np.where(ec2, k_ec2, np.nan), beta.shape)
+        # β não finito corresponde a uma divisão por zero no motor escalar (u1* = 0)
+        beta_erro = ~np.isfinite(beta)
+        return np.where(beta_erro, 1.0, beta), k_beta, beta_erro
+
+    def _get_beta(self):
+        """Calcula β e k_beta para todos os casos."""
+        t = self._get_termos_beta()
+        self.beta, self.k_beta, self._beta_erro = self._beta_de_esforcos(t, self.V_Ed, self.M_Edx, self.M_Edy)
+
+    # --------------------------
+    # resistências e esforços
+    # --------------------------------------------------------------------------
+    def _get_V_Ed_red_e_u1_efetivo(self):
+        """V_Ed_red (sapatas) e u1_eff (aberturas)."""
+        c1, c2, d = self.c1, self.c2, self.d
+        A_ret = (c1 * c2) + (c1 * 2 * d) + (c2 * 2 * d) + (math.pi * (2 * d)**2 / 4)
+        with np.errstate(invalid="ignore"):
+            A_circ = math.pi * (self.D/2 + 2*d)**2
+        A_control_1 = np.where(self.forma == 0, A_ret, A_circ)
+        self._sapata = self.is_sapata & (self.sigma_gd > 0)
+        self.Delta_V_Ed = np.where(self._sapata, self.sigma_gd * A_control_1, 0.0)
+        self.V_Ed_red = np.where(self._sapata, self.V_Ed - self.Delta_V_Ed, self.V_Ed)
+        self.u1_eff = np.where(self.u1_ineffective > 0, self.u1 - self.u1_ineffective, self.u1)
+
+    def _get_v_Rd_c(self):
+        """v_Rd,c (MPa) – Eq. 6.47 (até TOLERANCIA_ESCALAR do motor escalar, ver docstring do módulo)."""
+        v_Rd_c_calc = self.C_Rd_c * self.k_val * (100 * self.rho_l * self.fck)**(1/3) + self.k1 * self.sigma_cp
+        v_min_calc = self.v_min + self.k1 * self.sigma_cp
+        return np.maximum(v_Rd_c_calc, v_min_calc)
+
+    def _asw_sr(self, v_Ed_u1):
+        """Asw/sr (Eq. 6.52) e mínimo; devolve (f_ywd_ef, Asw_sr_calc, Asw_sr_min, Asw_sr_req)."""
+        return _asw_sr(v_Ed_u1, self.v_Rd_c, self.u1_eff, self.d, self.fck, self.fywd, self.fywk)
+
+    def _dimensionar_armadura(self, m):
+        """Asw/sr, u_out,ef e número de perímetros nos casos da máscara `m`."""
+        nan = np.full(self.n, np.nan)
+        d, c1, c2 = self.d, self.c1, self.c2
+        v_Rd_c = self.v_Rd_c
+
+        self.v_Rd_cs_max = np.where(m, self.kmax * v_Rd_c, nan)
+        with np.errstate(invalid="ignore"):
+            falha_cs = m & (self.v_Ed_u1 > self.v_Rd_cs_max)
+        ok = m & ~falha_cs
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f_ywd_ef, Asw_sr_calc, Asw_sr_min, Asw_sr_req = self._asw_sr(self.v_Ed_u1)
+            u_out_ef = (self.beta * self.V_Ed_red) / (v_Rd_c * d) / 1e6
+
+            dist_zona_armar, n_perimetros = _n_perimetros(u_out_ef, c1, c2, d, self.tipo, self.forma)
+            s0_max = 0.5 * d
+            sr_max = 0.75 * d
+
+        self.f_ywd_ef = np.where(ok, f_ywd_ef, nan)
+        self.Asw_sr_calc = np.where(ok, Asw_sr_calc, nan)
+        self.Asw_sr_min = np.where(ok, Asw_sr_min, nan)
+        self.Asw_sr_req = np.where(ok, Asw_sr_req, nan)
+        self.u_out_ef = np.where(ok, u_out_ef, nan)
+        self.dist_zona_armar = np.where(ok, dist_zona_armar, nan)
+        self.s0_max = np.where(ok, s0_max, nan)
+        self.sr_max = np.where(ok, sr_max, nan)
+        self.n_perimetros = np.where(ok, np.nan_to_num(n_perimetros), 0).astype(np.int64)
+        self.Asw_por_perimetro = np.where(ok, Asw_sr_req * sr_max, nan)
+        return falha_cs
+
+    # ------------------------------------------------------
+    # pipeline principal
+    # --------------------------
+    def verificar_puncoamento(self):
+        """Executa a verificação completa para todos os casos e devolve self."""
+        self._get_perimetros_criticos()
+        self._get_beta()
+        self._get_V_Ed_red_e_u1_efetivo()
+
+        erro_u0 = self._beta_erro | (self.u0 == 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            v_Rd_max = 0.4 * self.nu * self.fcd
+            v_Ed_u0 = (self.beta * self.V_Ed) / (self.u0 * self.d) / 1e6
+        self.v_Rd_max = np.where(erro_u0, 0.0, v_Rd_max)
+        self.v_Ed_u0 = np.where(erro_u0, 0.0, v_Ed_u0)
+        falha_u0 = ~erro_u0 & (self.v_Ed_u0 > self.v_Rd_max)
+
+        segue = ~erro_u0 & ~falha_u0
+        self.v_Rd_c = np.where(segue, self._get_v_Rd_c(), 0.0)
+        erro_u1 = segue & (self.u1_eff == 0)
+        segue &= ~erro_u1
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            v_Ed_u1 = (self.beta * self.V_Ed_red) / (self.u1_eff * self.d) / 1e6
+        self.v_Ed_u1 = np.where(segue, v_Ed_u1, 0.0)
+        self.armadura_necessaria = segue & (self.v_Ed_u1 > self.v_Rd_c)
+        falha_cs = self._dimensionar_armadura(self.armadura_necessaria)
+
+        self.estado = np.select(
+            [erro_u0 | erro_u1, falha_u0, falha_cs, self.armadura_necessaria],
+            [ESTADO_ERRO, ESTADO_FALHA_U0, ESTADO_FALHA_CS_MAX, ESTADO_ARMADURA],
+            ESTADO_OK).astype(np.int8)
+        return self
+
+    def fatores_de_reserva(self) -> dict:
+        """
+        Multiplicador λ das cargas para o qual cada verificação atinge a unidade,
+        por caso: {"u0": array, "u1": array, "cs_max": array}.
+        Mesmas expressões de PuncoamentoEC2.fatores_de_reserva (inf se V_Ed ≤ 0; NaN em erro).
+        """
+        if not hasattr(self, "estado"):
+            self.verificar_puncoamento()
+        v_Rd_max = 0.4 * self.nu * self.fcd
+        v_Rd_c = self._get_v_Rd_c()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bV = self.beta * self.V_Ed / 1e6
+            lam_u0 = v_Rd_max * self.u0 * self.d / bV
+            lam_u1 = (v_Rd_c * self.u1_eff * self.d * 1e6 / self.beta + self.Delta_V_Ed) / self.V_Ed
+            lam_cs = (self.kmax * v_Rd_c * self.u1_eff * self.d * 1e6 / self.beta + self.Delta_V_Ed) / self.V_Ed
+        sem_carga = self.V_Ed <= 0
+        erro_u0 = self._beta_erro | (self.u0 <= 0)
+        erro_u1 = self._beta_erro | (self.u1_eff <= 0)
+        return {
+            "u0": np.where(sem_carga, np.inf, np.where(erro_u0, np.nan, lam_u0)),
+            "u1": np.where(sem_carga, np.inf, np.where(erro_u1, np.nan, lam_u1)),
+            "cs_max": np.where(sem_carga, np.inf, np.where(erro_u1, np.nan, lam_cs)),
+        }
+
+    def _utilizacoes(self):
+        """
+        Utilizações sem máscara ({"u0", "u1", "cs_max"}) e casos em erro, a partir dos
+        perímetros, β e reduções já calculados (também com números duais).
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            v_Rd_max = 0.4 * self.nu * self.fcd
+            util_u1 = (self.beta * self.V_Ed_red) / (self.u1_eff * self.d) / 1e6 / self._get_v_Rd_c()
+            util = {"u0": (self.beta * self.V_Ed) / (self.u0 * self.d) / 1e6 / v_Rd_max,
+                    "u1": util_u1, "cs_max": util_u1 / self.kmax}
+        erro_u1 = self._beta_erro | (self.u1_eff <= 0)
+        return util, {"u0": self._beta_erro | (self.u0 <= 0), "u1": erro_u1, "cs_max": erro_u1}
+
+    def utilizacoes(self) -> dict:
+        """
+        Utilizações por caso, independentes do estado: u0 = v_Ed(u0)/v_Rd,max,
+        u1 = v_Ed(u1)/v_Rd,c e cs_max = u1/k_max (NaN em erro: u0, u1,ef ou u1* nulos).
+        Só calcula perímetros, β e reduções (sem dimensionamento da armadura).
+        """
+        if not hasattr(self, "u1_eff"):
+            self._get_perimetros_criticos()
+            self._get_beta()
+            self._get_V_Ed_red_e_u1_efetivo()
+        util, erros = self._utilizacoes()
+        return {v: np.where(erros[v], np.nan, u) for v, u in util.items()}
+
+    def sensibilidades(self):
+        """
+        Utilizações e derivadas em relação a d, fck, c1, c2, As_lx, As_ly, V_Ed, M_Edx
+        e M_Edy, por caso (ResultadoSensibilidades; ver Punching_EC2_sensibilidades).
+        """
+        from Punching_EC2_sensibilidades import sensibilidades_lote
+        return sensibilidades_lote(self)
+
+    def __len__(self):
+        return self.n
+
+    def to_array(self):
+        """Resultados num array estruturado (dtype_resultado()), um registo por caso."""
+        arr = np.empty(self.n, dtype=dtype_resultado())
+        for nome in CAMPOS_RESULTADO:
+            arr[nome] = getattr(self, nome)
+        return arr
+
+    def guardar(self, caminho: str):
+        """Escreve os resultados numa pasta em colunas (Punching_EC2_resultados) e reabre-a."""
+        from Punching_EC2_resultados import guardar_resultados
+        return guardar_resultados(caminho, self)
+
+    def guardar_excel(self, caminho: str, **kwargs) -> dict:
+        """Exporta os resultados para Excel, uma linha por caso (Punching_EC2_excel.exportar_excel)."""
+        from Punching_EC2_excel import exportar_excel
+        return exportar_excel(caminho, self, **kwargs)
+
+
+class ResultadoEnvolvente:
+    """Resultados de EnvolventeEC2.avaliar: um elemento por combinação de esforços."""
+
+    def __init__(self, **valores):
+        self.__dict__.update(valores)
+
+    def __len__(self):
+        return self.beta.size
+
+
+class EnvolventeEC2:
+    """
+    Envolvente de combinações de carga de um pilar (geometria e materiais fixos).
+
+    Recebe os argumentos de PuncoamentoEC2 exceto V_Ed, M_Edx e M_Edy. Perímetros,
+    termos geométricos de β (W1, u1*, k do Quadro 6.1), V_Ed,red por unidade,
+    v_Rd,c e v_Rd,max são calculados uma única vez; avaliar() aplica depois os
+    triplos (V_Ed, M_Edx, M_Edy) como arrays.
+    """
+
+    def __init__(self, **kwargs):
+        esforcos = {"V_Ed", "M_Edx", "M_Edy"} & set(kwargs)
+        if esforcos:
+            raise TypeError(f"Os esforços ({', '.join(sorted(esforcos))}) são passados a avaliar().")
+        self.kwargs = kwargs
+        geo = PuncoamentoEC2Batch(V_Ed=0.0, **kwargs)
+        if geo.n != 1:
+            raise ValueError("A envolvente é definida para um único pilar.")
+        geo._get_perimetros_criticos()
+        geo._get_V_Ed_red_e_u1_efetivo()
+        self._geo = geo
+        self._termos = geo._get_termos_beta()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            geo.v_Rd_c = geo._get_v_Rd_c()
+        self.u0, self.u1, self.u1_eff = geo.u0[0], geo.u1[0], geo.u1_eff[0]
+        self.v_Rd_max = (0.4 * geo.nu * geo.fcd)[0]
+        self.v_Rd_c = geo.v_Rd_c[0]
+        self.v_Rd_cs_max = geo.kmax * self.v_Rd_c
+
+    def avaliar(self, V_Ed, M_Edx=0.0, M_Edy=0.0) -> ResultadoEnvolvente:
+        """
+        Avalia as combinações (arrays difundidos para um comprimento comum).
+
+        v_Ed(u0) e v_Ed(u1) são calculados para todas as combinações (também as que
+        falham em u0); `estado` segue a ordem de decisão de PuncoamentoEC2.
+        `governante` indica, por verificação, o índice da combinação condicionante.
+        """
+        g = self._geo
+        V_Ed, M_Edx, M_Edy = (np.atleast_1d(np.asarray(x, dtype=float)).ravel()
+                              for x in np.broadcast_arrays(V_Ed, M_Edx, M_Edy))
+        if V_Ed.size == 0:
+            raise ValueError("Sem combinações para avaliar.")
+
+        beta, k_beta, beta_erro = g._beta_de_esforcos(self._termos, V_Ed, M_Edx, M_Edy)
+        V_Ed_red = np.where(g._sapata, V_Ed - g.Delta_V_Ed, V_Ed)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            v_Ed_u0 = (beta * V_Ed) / (g.u0 * g.d) / 1e6
+            v_Ed_u1 = (beta * V_Ed_red) / (g.u1_eff * g.d) / 1e6
+            util_u0 = v_Ed_u0 / self.v_Rd_max
+            util_u1 = v_Ed_u1 / self.v_Rd_c
+            util_cs_max = v_Ed_u1 / self.v_Rd_cs_max
+            Asw_sr_req = g._asw_sr(v_Ed_u1)[3]
+
+        erro = beta_erro | (self.u0 == 0) | (self.u1_eff == 0)
+        falha_u0 = ~erro & (v_Ed_u0 > self.v_Rd_max)
+        armadura = ~erro & ~falha_u0 & (v_Ed_u1 > self.v_Rd_c)
+        falha_cs = armadura & (v_Ed_u1 > self.v_Rd_cs_max)
+        estado = np.select([erro, falha_u0, falha_cs, armadura],
+                           [ESTADO_ERRO, ESTADO_FALHA_U0, ESTADO_FALHA_CS_MAX, ESTADO_ARMADURA],
+                           ESTADO_OK).astype(np.int8)
+        Asw_sr_req = np.where(armadura & ~falha_cs, Asw_sr_req, np.nan)
+
+        def _idx(util):
+            return None if np.all(np.isnan(util)) else int(np.nanargmax(util))
+
+        governante = {"u0": _idx(util_u0), "u1": _idx(util_u1),
+                      "cs_max": _idx(util_cs_max), "Asw": _idx(Asw_sr_req)}
+        return ResultadoEnvolvente(
+            V_Ed=V_Ed, M_Edx=M_Edx, M_Edy=M_Edy, beta=beta, k_beta=k_beta, V_Ed_red=V_Ed_red,
+            v_Ed_u0=v_Ed_u0, v_Ed_u1=v_Ed_u1, util_u0=util_u0, util_u1=util_u1,
+            util_cs_max=util_cs_max, Asw_sr_req=Asw_sr_req, estado=estado, governante=governante,
+            v_Rd_max=self.v_Rd_max, v_Rd_c=self.v_Rd_c, v_Rd_cs_max=self.v_Rd_cs_max,
+            u0=self.u0, u1=self.u1, u1_eff=self.u1_eff,
+        )
+
+    def caso(self, V_Ed, M_Edx=0.0, M_Edy=0.0):
+        """PuncoamentoEC2 de uma combinação (p.ex. a condicionante), para obter o relatório."""
+        from Punching_EC2 import PuncoamentoEC2
+        return PuncoamentoEC2(V_Ed=float(V_Ed), M_Edx=float(M_Edx), M_Edy=float(M_Edy), **self.kwargs)
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks do motor de punçoamento e das exportações.
+
+Cargas sintéticas fixas (determinísticas) que percorrem tipo × forma × β,
+sapatas e aberturas. Mede:
+    - latência de um caso (construção + verificação), com e sem relatório,
+      também por ramo (tipo/forma/β);
+    - custo de formatação do relatório (gerar_relatorio);
+    - débito do motor vetorizado e de run_many (casos/s);
+    - exportação XLSX e PDF de Punching_EC2_GUI (sem abrir janela);
+    - débito da exportação de PDF em lote (Punching_EC2_pdf, páginas/s, num processo);
+    - débito da exportação de resultados em lote para Excel (Punching_EC2_excel, casos/s);
+    - arranque da interface num processo novo: importação do módulo e tempo
+      até à janela estar desenhada (objetivo: < 300 ms; requer um ecrã).
+
+Os resultados são escritos em JSON para comparação entre commits:
+    python Punching_EC2_benchmark.py --saida bench_novo.json
+    python Punching_EC2_benchmark.py --saida bench_novo.json --comparar bench_antigo.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime
+
+from Punching_EC2 import BETA_MODES, FORMAS_PILAR, TIPOS_PILAR, PuncoamentoEC2, run_many
+
+VERSAO_FORMATO = 1
+
+#tempos: menor é melhor; débitos (casos/s, páginas/s): maior é melhor
+_MAIOR_E_MELHOR = {"casos/s", "paginas/s"}
+
+
+def casos_sinteticos() -> list:
+    """Grelha fixa de casos: tipo × forma × β × momentos × V_Ed × (normal/sapata/abertura/exterior)."""
+    casos = []
+    for tipo, forma, beta, (mx, my), V, extra in itertools.product(
+            TIPOS_PILAR, FORMAS_PILAR, BETA_MODES,
+            ((0.0, 0.0), (40e3, 0.0), (0.0, 40e3), (25e3, -20e3)),
+            (350e3, 700e3, 1_100e3),
+            ("", "sapata", "abertura", "exterior")):
+        casos.append(dict(
+            laje_d=0.24, betão_fck=30, aço_fyk=500, aço_fywk=500,
+            pilar_tipo=tipo, pilar_forma=forma, V_Ed=V,
+            pilar_c1=0.45, pilar_c2=0.30 if forma == "retangular" else None,
+            M_Edx=mx, M_Edy=my,
+            is_sapata=(extra == "sapata"), sigma_gd_kpa=150.0 if extra == "sapata" else 0.0,
+            u1_ineffective=0.30 if extra == "abertura" else 0.0,
+            beta_mode=beta,
+            laje_As_lx_cm2pm=8.8, laje_As_ly_cm2pm=8.8,
+            edge_perp_interior=(extra != "exterior"), corner_interior=(extra != "exterior"),
+        ))
+    return casos
+
+
+def _por_operacao(func, numero: int, repeticoes: int) -> float:
+    """Melhor tempo (s) por chamada de func em `repeticoes` séries de `numero` chamadas."""
+    return min(timeit.Timer(func).repeat(repeat=repeticoes, number=numero)) / numero
+
+
+def _medida(valor, unidade, **extra) -> dict:
+    return {"valor": valor, "unidade": unidade, **extra}
+
+
+# ---------------------------------------------------------------------
+# --- MEDIÇÕES ---
+# ---------------------------------------------------------------------
+
+def medir_escalar(casos, repeticoes=5) -> dict:
+    """Latência média por caso (µs), sem e com relatório, e por ramo (tipo/forma/β)."""
+    def so_numeros():
+        for kw in casos:
+            PuncoamentoEC2(**kw).verificar_puncoamento(relatorio=False)
+
+    def com_relatorio():
+        for kw in casos:
+            PuncoamentoEC2(**kw).verificar_puncoamento()
+
+    verificados = []
+    for kw in casos:
+        v = PuncoamentoEC2(**kw)
+        v.verificar_puncoamento(relatorio=False)
+        verificados.append(v)
+
+    def formatar():
+        for v in verificados:
+            v.gerar_relatorio()
+
+    n = len(casos)
+    res = {
+        "escalar_latencia": _medida(_por_operacao(so_numeros, 1, repeticoes) / n * 1e6, "µs"),
+        "escalar_latencia_relatorio": _medida(_por_operacao(com_relatorio, 1, repeticoes) / n * 1e6, "µs"),
+        "relatorio_formatacao": _medida(_por_operacao(formatar, 1, repeticoes) / n * 1e6, "µs"),
+    }
+
+    grupos = {}
+    for kw in casos:
+        chave = f"{kw['pilar_tipo']}/{kw['pilar_forma']}/{kw['beta_mode']}"
+        grupos.setdefault(chave, []).append(kw)
+    ramos = {}
+    for chave, grupo in grupos.items():
+        def correr(grupo=grupo):
+            for kw in grupo:
+                PuncoamentoEC2(**kw).verificar_puncoamento(relatorio=False)
+        ramos[chave] = round(_por_operacao(correr, 1, repeticoes) / len(grupo) * 1e6, 3)
+    res["escalar_latencia"]["por_ramo"] = ramos
+    return res
+
+
+def medir_lote(casos, n_lote=100_000, repeticoes=3) -> dict:
+    """Débito (casos/s) do motor vetorizado e de run_many em série."""
+    res = {}
+    try:
+        from Punching_EC2_batch import PuncoamentoEC2Batch
+    except ImportError as exc:
+        res["lote_debito"] = _medida(None, "casos/s", indisponivel=str(exc))
+    else:
+        grandes = (casos * (n_lote // len(casos) + 1))[:n_lote]
+        lote = PuncoamentoEC2Batch.from_casos(grandes)
+        t = _por_operacao(lote.verificar_puncoamento, 1, repeticoes)
+        t_montagem = _por_operacao(lambda: PuncoamentoEC2Batch.from_casos(grandes), 1, 1)
+        res["lote_debito"] = _medida(n_lote / t, "casos/s", n=n_lote)
+        res["lote_debito_com_montagem"] = _medida(n_lote / (t + t_montagem), "casos/s", n=n_lote)
+
+    t = _por_operacao(lambda: run_many(casos, workers=1), 1, repeticoes)
+    res["run_many_serie_debito"] = _medida(len(casos) / t, "casos/s", n=len(casos))
+    return res
+
+
+class _Valor:
+    """Substitui uma variável Tk (só .get()), para exportar sem janela."""
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def get(self):
+        return self.valor
+
+
+def _exportador(kw: dict):
+    """Objeto com o estado mínimo de PuncoamentoApp usado por _create_pdf/_create_excel."""
+    from Punching_EC2_GUI import PuncoamentoApp
+
+    class _ExportadorSemJanela:
+        _create_pdf = PuncoamentoApp._create_pdf
+        _create_excel = PuncoamentoApp._create_excel
+        _build_professional_report_sections = PuncoamentoApp._build_professional_report_sections
+        _wrap_text = staticmethod(PuncoamentoApp._wrap_text)
+
+    app = _ExportadorSemJanela()
+    v = PuncoamentoEC2(**kw)
+    app.last_report = v.verificar_puncoamento()
+    app.last_verif = v
+    valores = {
+        "fck": kw["betão_fck"], "fyk": kw["aço_fyk"], "fywk": kw["aço_fywk"], "d": kw["laje_d"],
+        "asx": kw["laje_As_lx_cm2pm"], "asy": kw["laje_As_ly_cm2pm"], "sigma_cp": 0.0,
+        "tipo_pilar": kw["pilar_tipo"], "forma_pilar": kw["pilar_forma"],
+        "c1": kw["pilar_c1"], "c2": kw["pilar_c2"], "ved": kw["V_Ed"] / 1000,
+        "medx": kw["M_Edx"] / 1000, "medy": kw["M_Edy"] / 1000, "beta": kw["beta_mode"],
+        "resultado": "É necessária armadura de punçoamento" if v.armadura_necessaria
+                     else "Não é necessária armadura de punçoamento",
+    }
+    for nome, valor in valores.items():
+        setattr(app, "var_" + nome, _Valor(str(valor)))
+    return app
+
+
+def medir_exportacao(casos, repeticoes=3) -> dict:
+    """Tempo (ms) por ficheiro das exportações XLSX e PDF da interface."""
+    try:
+        import Punching_EC2_GUI as gui
+    except Exception as exc:  # tkinter indisponível
+        return {"exportacao_excel": _medida(None, "ms", indisponivel=str(exc)),
+                "exportacao_pdf": _medida(None, "ms", indisponivel=str(exc))}
+
+    #caso com armadura (relatório mais longo) de um pilar de bordo
+    kw = next(k for k in casos if k["pilar_tipo"] == "bordo" and k["V_Ed"] == 700e3
+              and k["beta_mode"] == "ec2" and k["pilar_forma"] == "retangular")
+    app = _exportador(kw)
+    res = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        exportacoes = (
+            ("exportacao_excel", gui.OPENPYXL_OK, ".xlsx", lambda caminho: app._create_excel(caminho)),
+            ("exportacao_pdf", gui.REPORTLAB_OK, ".pdf", lambda caminho: app._create_pdf(caminho, app.last_report)),
+        )
+        for nome, disponivel, ext, exportar in exportacoes:
+            if not disponivel:
+                res[nome] = _medida(None, "ms", indisponivel="biblioteca não instalada")
+                continue
+            caminho = os.path.join(pasta, "relatorio" + ext)
+            t = _por_operacao(lambda: exportar(caminho), 1, repeticoes)
+            res[nome] = _medida(t * 1e3, "ms", bytes=os.path.getsize(caminho))
+    return res
+
+
+def medir_pdf_lote(casos, n_relatorios=500) -> dict:
+    """Débito (páginas/s) de Punching_EC2_pdf.exportar_pdfs, um PDF por caso, em série."""
+    import Punching_EC2_pdf as pdf
+    if not pdf.REPORTLAB_OK:
+        return {"exportacao_pdf_lote": _medida(None, "paginas/s", indisponivel="biblioteca não instalada")}
+    lote = (casos * (n_relatorios // len(casos) + 1))[:n_relatorios]
+    with tempfile.TemporaryDirectory() as pasta:
+        res = pdf.exportar_pdfs(lote, pasta, workers=1)
+    return {"exportacao_pdf_lote": _medida(res["paginas_por_segundo"], "paginas/s",
+                                           relatorios=res["relatorios"], paginas=res["paginas"])}
+
+
+def medir_excel_lote(casos, n_lote=100_000) -> dict:
+    """Débito (casos/s) de Punching_EC2_excel.exportar_excel com os resultados de um lote."""
+    try:
+        from Punching_EC2_batch import PuncoamentoEC2Batch
+        from Punching_EC2_excel import exportar_excel
+    except ImportError as exc:
+        return {"exportacao_excel_lote": _medida(None, "casos/s", indisponivel=str(exc))}
+    grandes = (casos * (n_lote // len(casos) + 1))[:n_lote]
+    arr = PuncoamentoEC2Batch.from_casos(grandes).verificar_puncoamento().to_array()
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "resultados.xlsx")
+        res = exportar_excel(caminho, arr)
+        tamanho = os.path.getsize(caminho)
+    return {"exportacao_excel_lote": _medida(res["casos_por_segundo"], "casos/s", n=n_lote, bytes=tamanho)}
+
+
+#corre num processo novo (importações a frio); imprime uma linha JSON
+_SCRIPT_ARRANQUE = """
+import json, sys, time
+t0 = time.perf_counter()
+import Punching_EC2_GUI
+t_import = time.perf_counter() - t0
+t_janela = None
+try:
+    app = Punching_EC2_GUI.PuncoamentoApp()
+    app.update()
+    t_janela = time.perf_counter() - t0
+    app.destroy()
+except Exception as exc:
+    erro = str(exc)
+else:
+    erro = None
+print(json.dumps({"importacao": t_import, "janela": t_janela, "erro": erro,
+                  "carregados": [m for m in ("openpyxl", "reportlab", "numpy") if m in sys.modules]}))
+"""
+
+OBJETIVO_JANELA_MS = 300.0
+
+
+def medir_arranque(repeticoes=5) -> dict:
+    """Arranque da interface (ms), o melhor de `repeticoes` processos novos."""
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    medicoes = []
+    for _ in range(repeticoes):
+        try:
+            saida = subprocess.run([sys.executable, "-c", _SCRIPT_ARRANQUE], cwd=pasta, capture_output=True,
+                                   text=True, timeout=60)
+            medicoes.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+        except Exception as exc:
+            erro = str(exc) or type(exc).__name__
+            return {"arranque_importacao": _medida(None, "ms", indisponivel=erro),
+                    "arranque_janela": _medida(None, "ms", indisponivel=erro)}
+    importacao = min(m["importacao"] for m in medicoes) * 1e3
+    carregados = medicoes[0]["carregados"]
+    res = {"arranque_importacao": _medida(importacao, "ms", modulos_exportacao=carregados)}
+    janelas = [m["janela"] for m in medicoes if m["janela"] is not None]
+    if janelas:
+        res["arranque_janela"] = _medida(min(janelas) * 1e3, "ms", objetivo=OBJETIVO_JANELA_MS)
+    else:  # sem ecrã (p.ex. servidor de integração contínua)
+        res["arranque_janela"] = _medida(None, "ms", indisponivel=medicoes[0]["erro"])
+    return res
+
+
+# ---------------------------------------------------------------------
+# --- EXECUÇÃO / COMPARAÇÃO ---
+# ---------------------------------------------------------------------
+
+def _commit_atual():
+    try:
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=pasta, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def executar(rapido: bool = False, exportacao: bool = True, arranque: bool = True) -> dict:
+    """Corre todos os benchmarks e devolve o dicionário a gravar em JSON."""
+    casos = casos_sinteticos()
+    repeticoes = 2 if rapido else 5
+    t0 = time.perf_counter()
+    resultados = {}
+    resultados.update(medir_escalar(casos, repeticoes))
+    resultados.update(medir_lote(casos, n_lote=5_000 if rapido else 100_000, repeticoes=min(repeticoes, 3)))
+    if exportacao:
+        resultados.update(medir_exportacao(casos, repeticoes=1 if rapido else 3))
+        resultados.update(medir_pdf_lote(casos, n_relatorios=50 if rapido else 500))
+        resultados.update(medir_excel_lote(casos, n_lote=5_000 if rapido else 100_000))
+    if arranque:
+        resultados.update(medir_arranque(repeticoes=2 if rapido else 5))
+    try:
+        import numpy
+        versao_numpy = numpy.__version__
+    except ImportError:
+        versao_numpy = None
+    return {
+        "formato": VERSAO_FORMATO,
+        "meta": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit_atual(),
+            "python": platform.python_version(),
+            "numpy": versao_numpy,
+            "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(),
+            "n_casos": len(casos),
+            "rapido": rapido,
+            "duracao_s": round(time.perf_counter() - t0, 2),
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(novo: dict, antigo: dict, tolerancia: float = 0.10) -> list:
+    """
+    Compara dois resultados; devolve linhas (nome, antigo, novo, variação, regressão?).
+
+    variação > 0 é sempre uma melhoria (tempo menor ou débito maior).
+    """
+    linhas = []
+    for nome, med in novo["resultados"].items():
+        ref = antigo.get("resultados", {}).get(nome)
+        if not ref or med.get("valor") is None or ref.get("valor") is None:
+            continue
+        a, b = ref["valor"], med["valor"]
+        if med["unidade"] in _MAIOR_E_MELHOR:
+            variacao = b / a - 1.0
+        else:
+            variacao = a / b - 1.0
+        linhas.append((nome, a, b, med["unidade"], variacao, variacao < -tolerancia))
+    return linhas
+
+
+def _imprimir(dados: dict, linhas_comparacao=None):
+    print(f"{'medida':<30}{'valor':>14}  unidade")
+    for nome, med in dados["resultados"].items():
+        valor = "-" if med["valor"] is None else f"{med['valor']:.3f}"
+        print(f"{nome:<30}{valor:>14}  {med['unidade']}")
+    if linhas_comparacao:
+        print(f"\n{'medida':<30}{'antigo':>14}{'novo':>14}{'variação':>11}")
+        for nome, a, b, unidade, variacao, regressao in linhas_comparacao:
+            marca = "  REGRESSÃO" if regressao else ""
+            print(f"{nome:<30}{a:>14.3f}{b:>14.3f}{variacao:>+10.1%}{marca}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de PunchingShearEC2 (resultados em JSON).")
+    parser.add_argument("--saida", help="ficheiro JSON onde gravar os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="perda relativa acima da qual se assinala regressão (default: 0.10)")
+    parser.add_argument("--rapido", action="store_true", help="menos repetições e lote menor")
+    parser.add_argument("--sem-exportacao", action="store_true", help="não medir XLSX/PDF")
+    parser.add_argument("--sem-arranque", action="store_true", help="não medir o arranque da interface")
+    args = parser.parse_args(argv)
+
+    dados = executar(rapido=args.rapido, exportacao=not args.sem_exportacao, arranque=not args.sem_arranque)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(dados, f, indent=2, ensure_ascii=False)
+    linhas = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            linhas = comparar(dados, json.load(f), args.tolerancia)
+    _imprimir(dados, linhas)
+    return 1 if linhas and any(l[-1] for l in linhas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
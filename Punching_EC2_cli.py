@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Linha de comandos não interativa (sem interface gráfica).
+
+Lê casos em JSON (objeto, lista ou {"casos": [...]}) ou NDJSON (um objeto por
+linha), de ficheiros ou da entrada padrão, e escreve um resultado NDJSON por
+caso com todos os campos numéricos de PuncoamentoEC2 (CAMPOS_NUMERICOS), o
+estado e a situação. Só importa o motor e a biblioteca padrão (sem tkinter,
+reportlab, openpyxl nem numpy), para ser chamada muitas vezes por scripts; a
+ler da entrada padrão em NDJSON, cada resultado é escrito (e despejado) logo
+que a linha é lida, pelo que também serve como processo de longa duração.
+
+As chaves de cada caso são os argumentos de PuncoamentoEC2 (unidades SI: m,
+MPa, N, N·m; betao_fck, aco_fyk, aco_fywk são aceites sem acentos) e,
+opcionalmente, "id", copiado para o resultado. Valores não calculados ou não
+finitos saem como null; um caso inválido dá uma linha com "erro".
+
+Utilização:
+    python -m punching check casos.json
+    python -m punching check casos.ndjson -o resultados.ndjson --estrito
+    gerador_de_casos | python -m punching check --relatorio
+    python -m punching servir --porta 8765     (serviço HTTP, ver Punching_EC2_servico)
+
+Código de saída: 0 ok; 1 algum caso inválido; 2 argumentos inválidos;
+3 (com --estrito) algum caso não verifica (esmagamento, v_Rd,cs,max ou erro).
+"""
+
+import argparse
+import json
+import math
+import sys
+
+from Punching_EC2 import (CAMPOS_ENTRADA, ESTADO_ARMADURA, ESTADO_OK, ESTADOS, PuncoamentoEC2,
+                          _DEFAULTS_ENTRADA)
+
+#atributos numéricos de PuncoamentoEC2 após verificar_puncoamento (None se não calculados)
+CAMPOS_NUMERICOS = (
+    "d", "fck", "fyk", "fywk", "V_Ed", "c1", "c2", "D", "M_Edx", "M_Edy", "sigma_cp", "sigma_gd",
+    "u1_ineffective", "gamma_C", "gamma_S", "rho_l", "Asx_cm2pm", "Asy_cm2pm",
+    "fcd", "fctm", "fctk_0_05", "fctd", "fyd", "fywd", "k_val", "C_Rd_c", "v_min", "nu", "k1", "kmax",
+    "u0", "u1", "u1_eff", "V_Ed_red", "Delta_V_Ed", "beta", "k_beta",
+    "v_Ed_u0", "v_Ed_u1", "v_Rd_max", "v_Rd_c", "v_Rd_cs_max", "f_ywd_ef",
+    "Asw_sr_calc", "Asw_sr_min", "Asw_sr_req", "u_out_ef", "dist_zona_armar", "s0_max", "sr_max",
+    "n_perimetros", "Asw_por_perimetro",
+)
+CAMPOS_TEXTO = ("tipo_pilar", "forma_pilar", "beta_mode")
+CAMPOS_LOGICOS = ("is_sapata", "edge_perp_interior", "corner_interior", "armadura_necessaria")
+
+_ALIASES = {"betao_fck": "betão_fck", "aco_fyk": "aço_fyk", "aco_fywk": "aço_fywk"}
+_OBRIGATORIOS = tuple(nome for nome in CAMPOS_ENTRADA if nome not in _DEFAULTS_ENTRADA)
+
+SAIDA_OK, SAIDA_CASO_INVALIDO, SAIDA_NAO_VERIFICA = 0, 1, 3
+
+
+def _numero(valor):
+    if valor is None or isinstance(valor, bool):
+        return valor
+    return valor if math.isfinite(valor) else None
+
+
+def mensagem_de_erro(exc: Exception) -> str:
+    """Texto do campo "erro" de um caso inválido (com o tipo da exceção se não for de validação)."""
+    if isinstance(exc, (TypeError, ValueError, ZeroDivisionError)):
+        return str(exc) or type(exc).__name__
+    return f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+
+
+def caso_para_argumentos(caso: dict) -> dict:
+    """Valida as chaves de um caso e devolve os argumentos de PuncoamentoEC2 (sem "id")."""
+    if not isinstance(caso, dict):
+        raise TypeError("Cada caso deve ser um objeto JSON.")
+    args = {}
+    for chave, valor in caso.items():
+        if chave == "id":
+            continue
+        nome = _ALIASES.get(chave, chave)
+        if nome not in CAMPOS_ENTRADA:
+            raise TypeError(f"Argumento desconhecido: '{chave}'.")
+        args[nome] = valor
+    em_falta = [nome for nome in _OBRIGATORIOS if nome not in args]
+    if em_falta:
+        raise TypeError(f"Falta(m) o(s) argumento(s): {', '.join(em_falta)}.")
+    return args
+
+
+def verificar_caso(caso: dict, relatorio: bool = False) -> dict:
+    """Verifica um caso e devolve o registo de saída (texto, lógicos, CAMPOS_NUMERICOS, estado)."""
+    v = PuncoamentoEC2(**caso_para_argumentos(caso))
+    texto = v.verificar_puncoamento(relatorio=relatorio)
+    registo = {nome: getattr(v, nome) for nome in CAMPOS_TEXTO}
+    registo.update((nome, bool(getattr(v, nome, False))) for nome in CAMPOS_LOGICOS)
+    registo.update((nome, _numero(getattr(v, nome, None))) for nome in CAMPOS_NUMERICOS)
+    registo["estado"] = v.estado
+    registo["situacao"] = ESTADOS[v.estado]
+    if relatorio:
+        registo["relatorio"] = texto
+    return registo
+
+
+def ler_casos(fonte, formato: str = "auto"):
+    """
+    Gerador de (caso, erro) de um ficheiro de texto aberto.
+
+    formato "json": um objeto, uma lista ou {"casos": [...]}; "ndjson": um
+    objeto por linha (linhas vazias ignoradas); "auto": json se o primeiro
+    carácter não branco for "[", senão ndjson (um objeto JSON em várias
+    linhas exige --formato json).
+    """
+    if formato == "auto":
+        primeira = fonte.readline()
+        while primeira and not primeira.strip():
+            primeira = fonte.readline()
+        formato = "json" if primeira.lstrip().startswith("[") else "ndjson"
+        linhas = _encadear(primeira, fonte)
+    else:
+        linhas = fonte
+    if formato == "json":
+        try:
+            dados = json.loads("".join(linhas))
+        except ValueError as exc:
+            yield None, f"JSON inválido: {exc}"
+            return
+        if isinstance(dados, dict):
+            dados = dados["casos"] if isinstance(dados.get("casos"), list) else [dados]
+        if not isinstance(dados, list):
+            yield None, "O JSON deve ser um objeto, uma lista ou {\"casos\": [...]}."
+            return
+        for caso in dados:
+            yield caso, None
+        return
+    for linha in linhas:
+        if not linha.strip():
+            continue
+        try:
+            yield json.loads(linha), None
+        except ValueError as exc:
+            yield None, f"JSON inválido: {exc}"
+
+
+def _encadear(primeira, resto):
+    if primeira:
+        yield primeira
+    yield from resto
+
+
+def _formato_do_ficheiro(caminho: str, formato: str) -> str:
+    if formato != "auto" or caminho == "-":
+        return formato
+    if caminho.lower().endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if caminho.lower().endswith(".json"):
+        return "json"
+    return formato
+
+
+def verificar(entradas, saida, formato: str = "auto", relatorio: bool = False) -> tuple:
+    """
+    Verifica os casos de `entradas` (caminhos; "-" = entrada padrão) e escreve NDJSON em `saida`.
+
+    Devolve (nº de casos, nº de casos inválidos, nº de casos que não verificam).
+    """
+    n = invalidos = nao_verificam = 0
+    for caminho in entradas:
+        padrao = caminho == "-"
+        fonte = sys.stdin if padrao else open(caminho, encoding="utf-8-sig")
+        try:
+            for caso, erro in ler_casos(fonte, _formato_do_ficheiro(caminho, formato)):
+                ident = caso.get("id") if isinstance(caso, dict) else None
+                registo = {"linha": n, "id": ident}
+                if erro is None:
+                    try:
+                        registo.update(verificar_caso(caso, relatorio))
+                    except Exception as exc:  # um caso inválido nunca interrompe o lote
+                        erro = mensagem_de_erro(exc)
+                if erro is None:
+                    nao_verificam += registo["estado"] not in (ESTADO_OK, ESTADO_ARMADURA)
+                else:
+                    registo["erro"] = erro
+                    invalidos += 1
+                saida.write(json.dumps(registo, ensure_ascii=False, separators=(",", ":")) + "\n")
+                if padrao:
+                    saida.flush()
+                n += 1
+        finally:
+            if not padrao:
+                fonte.close()
+    return n, invalidos, nao_verificam
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="punching", description="Verificação ao punçoamento (NP EN 1992-1-1) sem interface gráfica.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    check = sub.add_parser("check", help="verifica casos JSON/NDJSON e escreve resultados NDJSON")
+    check.add_argument("entradas", nargs="*", default=["-"],
+                       help="ficheiros .json/.ndjson (default ou '-': entrada padrão)")
+    check.add_argument("-o", "--saida", help="ficheiro NDJSON de resultados (default: saída padrão)")
+    check.add_argument("--formato", choices=("auto", "json", "ndjson"), default="auto",
+                       help="formato das entradas (default: pela extensão / primeiro carácter)")
+    check.add_argument("--relatorio", action="store_true", help="inclui o relatório de cálculo em texto")
+    check.add_argument("--estrito", action="store_true",
+                       help="código de saída 3 se algum caso não verificar")
+    sub.add_parser("servir", add_help=False,
+                   help="serviço HTTP local com micro-lotes (argumentos: ver Punching_EC2_servico)")
+    args, resto = parser.parse_known_args(argv)
+    if args.comando == "servir":
+        from Punching_EC2_servico import main as servir  # asyncio só para o serviço
+        return servir(resto)
+    if resto:
+        parser.error(f"argumentos não reconhecidos: {' '.join(resto)}")
+
+    saida = open(args.saida, "w", encoding="utf-8") if args.saida else sys.stdout
+    try:
+        _, invalidos, nao_verificam = verificar(args.entradas, saida, args.formato, args.relatorio)
+    except OSError as exc:
+        print(f"punching: {exc}", file=sys.stderr)
+        return SAIDA_CASO_INVALIDO
+    finally:
+        if args.saida:
+            saida.close()
+    if invalidos:
+        return SAIDA_CASO_INVALIDO
+    if args.estrito and nao_verificam:
+        return SAIDA_NAO_VERIFICA
+    return SAIDA_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Pré-seleção das combinações de carga condicionantes de um pilar.
+
+Para geometria fixa, v_Ed(u0) e v_Ed(u1) (sem sapata) são proporcionais a β·V_Ed.
+Nos modos "simplificado" e "ec2", agrupando as combinações pelas excentricidades
+nulas (e_x ≈ 0, e_y ≈ 0 – o que fixa o ramo de β), β·V_Ed é em cada grupo
+    a·V_Ed + b·|M|                        (6.39, 6.44, 6.46, simplificado) ou
+    a·V_Ed + c·√((|M_Edx|/bx)² + (|M_Edy|/by)²)   (biaxial, circular, canto exterior),
+isto é, convexa e não decrescente em (V_Ed, |M_Edx|, |M_Edy|). O máximo está
+então num vértice da envolvente convexa da nuvem que não é dominado por outro
+ponto; só esses vértices são verificados com PuncoamentoEC2.
+
+Onde o argumento não se aplica (β fib, limitado por ke,min; u1 de sapatas, em
+que V_Ed,red = V_Ed − ΔV_Ed), a combinação condicionante é obtida de forma exata
+com EnvolventeEC2 (vetorizado) e só essa é verificada com o motor escalar.
+
+A envolvente convexa usa scipy.spatial.ConvexHull quando disponível; sem scipy
+usa-se apenas o filtro de não dominância (também exato, com mais candidatos).
+"""
+
+import numpy as np
+
+from Punching_EC2 import PuncoamentoEC2, normalizar_beta_mode
+from Punching_EC2_batch import EnvolventeEC2
+
+try:
+    from scipy.spatial import ConvexHull
+    from scipy.spatial import QhullError
+    SCIPY_OK = True
+except Exception:
+    SCIPY_OK = False
+
+_TINY = 1e-12  # o mesmo limiar de excentricidade nula de PuncoamentoEC2._get_beta
+
+
+def _nao_dominados(P: np.ndarray) -> np.ndarray:
+    """Índices dos pontos de P (n × k) não dominados (maximização em todas as colunas)."""
+    ordem = np.lexsort(P.T[::-1])[::-1]  # um ponto dominante aparece sempre antes
+    mantidos = []
+    for i in ordem:
+        if mantidos and np.any(np.all(P[mantidos] >= P[i], axis=1)):
+            continue
+        mantidos.append(i)
+    return np.sort(np.asarray(mantidos, dtype=np.int64))
+
+
+def _vertices_envolvente(P: np.ndarray) -> np.ndarray:
+    """Índices dos vértices da envolvente convexa de P (todos, se degenerada ou sem scipy)."""
+    todos = np.arange(len(P))
+    variaveis = np.ptp(P, axis=0) > 0
+    P = P[:, variaveis]
+    if P.shape[1] == 0:
+        return todos[:1]
+    if P.shape[1] == 1:
+        return np.unique([np.argmin(P[:, 0]), np.argmax(P[:, 0])])
+    if not SCIPY_OK or len(P) <= P.shape[1] + 1:
+        return todos
+    escala = np.abs(P).max(axis=0)
+    try:
+        return np.sort(ConvexHull(P / escala).vertices)
+    except QhullError:
+        return todos
+
+
+def candidatos_convexos(V_Ed, M_Edx, M_Edy) -> np.ndarray:
+    """
+    Índices das combinações que podem maximizar β·V_Ed (modos "simplificado"/"ec2").
+
+    Por grupo de excentricidades nulas: vértices da envolvente convexa de
+    (V_Ed, |M_Edx|, |M_Edy|) não dominados. Combinações com V_Ed ≤ 0 são sempre incluídas.
+    """
+    V_Ed, M_Edx, M_Edy = (np.atleast_1d(np.asarray(x, dtype=float)).ravel()
+                          for x in np.broadcast_arrays(V_Ed, M_Edx, M_Edy))
+    V = np.maximum(V_Ed, 1e-9)
+    ex_nula = np.abs(M_Edy / V) < _TINY
+    ey_nula = np.abs(M_Edx / V) < _TINY
+    P = np.column_stack([V_Ed, np.abs(M_Edx), np.abs(M_Edy)])
+
+    escolhidos = [np.flatnonzero(V_Ed <= 0)]
+    positivos = V_Ed > 0
+    for zx in (False, True):
+        for zy in (False, True):
+            grupo = np.flatnonzero(positivos & (ex_nula == zx) & (ey_nula == zy))
+            if grupo.size == 0:
+                continue
+            vert = grupo[_vertices_envolvente(P[grupo])]
+            escolhidos.append(vert[_nao_dominados(P[vert])])
+    return np.unique(np.concatenate(escolhidos))
+
+
+class ResultadoCombinacoes:
+    """Combinações condicionantes e verificações escalares feitas (só dos candidatos)."""
+
+    def __init__(self, **valores):
+        self.__dict__.update(valores)
+
+    def verificacao(self, verificacao: str) -> PuncoamentoEC2:
+        """PuncoamentoEC2 (já verificado) da combinação condicionante de "u0" ou "u1"."""
+        return self.verificacoes[self.governante[verificacao]]
+
+
+def _v_Ed_u1(v: PuncoamentoEC2) -> float:
+    """v_Ed(u1), também quando o motor termina antes (esmagamento em u0)."""
+    if not v.u1_eff:
+        return np.nan
+    return (v.beta * v.V_Ed_red) / (v.u1_eff * v.d) / 1e6
+
+
+def verificar_combinacoes(V_Ed, M_Edx=0.0, M_Edy=0.0, **kwargs) -> ResultadoCombinacoes:
+    """
+    Verifica um pilar (argumentos de PuncoamentoEC2 sem esforços) para muitas
+    combinações, correndo o motor escalar apenas nas candidatas a condicionantes.
+
+    Devolve governante {"u0": i, "u1": j} (índices nas combinações de entrada),
+    verificacoes {índice: PuncoamentoEC2}, candidatos, n_avaliacoes e metodo.
+    """
+    V_Ed, M_Edx, M_Edy = (np.atleast_1d(np.asarray(x, dtype=float)).ravel()
+                          for x in np.broadcast_arrays(V_Ed, M_Edx, M_Edy))
+    if V_Ed.size == 0:
+        raise ValueError("Sem combinações para verificar.")
+    modo = normalizar_beta_mode(kwargs.get("beta_mode"))
+    sapata = bool(kwargs.get("is_sapata")) and (kwargs.get("sigma_gd_kpa") or 0.0) > 0
+
+    exatos = []
+    if modo == "fib" or sapata:
+        r = EnvolventeEC2(**kwargs).avaliar(V_Ed, M_Edx, M_Edy)
+        exatos.append(int(np.nanargmax(r.v_Ed_u1)))
+    if modo == "fib":
+        exatos.append(int(np.nanargmax(r.v_Ed_u0)))
+        candidatos = np.unique(exatos)
+        metodo = "vetorizado"
+    else:
+        candidatos = np.unique(np.concatenate([candidatos_convexos(V_Ed, M_Edx, M_Edy),
+                                               np.asarray(exatos, dtype=np.int64)]))
+        metodo = "envolvente convexa" + (" + vetorizado (u1, sapata)" if sapata else "")
+
+    verificacoes, v_u0, v_u1 = {}, [], []
+    for i in candidatos.tolist():
+        v = PuncoamentoEC2(V_Ed=V_Ed[i], M_Edx=M_Edx[i], M_Edy=M_Edy[i], **kwargs)
+        v.verificar_puncoamento(relatorio=False)
+        verificacoes[i] = v
+        v_u0.append(v.v_Ed_u0)
+        v_u1.append(_v_Ed_u1(v))
+
+    governante = {"u0": int(candidatos[np.nanargmax(v_u0)])}
+    governante["u1"] = exatos[0] if sapata or modo == "fib" else int(candidatos[np.nanargmax(v_u1)])
+    return ResultadoCombinacoes(governante=governante, verificacoes=verificacoes,
+                                candidatos=candidatos, n_avaliacoes=len(candidatos),
+                                n_combinacoes=V_Ed.size, metodo=metodo)
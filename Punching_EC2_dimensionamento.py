@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Dimensionamento inverso: menor d, menor pilar ou menor ρl que verifica o punçoamento.
+
+Para um mapa de pilares (argumentos de PuncoamentoEC2Batch, escalares ou arrays),
+procura-se, por caso, o menor valor da variável que leva o motor ao estado
+ESTADO_OK (sem armadura de punçoamento) ou a ESTADO_OK/ESTADO_ARMADURA
+(com armadura, i.e. v_Ed(u0) ≤ v_Rd,max e v_Ed(u1) ≤ k_max·v_Rd,c):
+
+    "d"  – altura útil da laje (ρl de As_lx/As_ly varia com d, com o limite de 0.02);
+    "c"  – dimensões do pilar, c1 e c2 na proporção dada (D nos circulares);
+    "As" – ρl (e As_lx/As_ly na proporção dada), até ao limite de 0.02 do EC2.
+
+As resistências crescem com a variável (u0·d, u1(d)·d·k_val·ρl^(1/3), W1(d) em β;
+acima de ρl = 0.02 já não há ganho), pelo que se usa um intervalo [mínimo, máximo]
+e bisseção. Cada iteração é uma única avaliação vetorizada dos casos ainda por
+resolver; o nº de avaliações é fixo: 2 + ceil(log2((máximo − mínimo)/tol)) + 1.
+O valor devolvido é sempre o extremo viável do intervalo final.
+"""
+
+import math
+
+import numpy as np
+
+from Punching_EC2 import ESTADO_ARMADURA, ESTADO_OK
+from Punching_EC2_batch import PuncoamentoEC2Batch
+
+VARIAVEIS = ("d", "c", "As")
+LIMITES = {"d": (0.05, 1.50), "c": (0.10, 3.00), "As": (1e-4, 0.02)}  # m, m, ρl
+TOLERANCIAS = {"d": 1e-3, "c": 1e-3, "As": 1e-5}
+
+
+class ResultadoDimensionamento:
+    """
+    Resultado de dimensionar(): um elemento por caso.
+
+    valor: d (m), c1 (m) ou ρl, NaN se o caso não é viável no limite máximo;
+    argumentos: argumentos de PuncoamentoEC2Batch na solução (no máximo, se inviável);
+    lote: PuncoamentoEC2Batch já verificado com esses argumentos.
+    """
+
+    def __init__(self, **valores):
+        self.__dict__.update(valores)
+
+    def __len__(self):
+        return self.valor.size
+
+
+def _viavel(lote: PuncoamentoEC2Batch, com_armadura: bool) -> np.ndarray:
+    ok = lote.estado == ESTADO_OK
+    if com_armadura:
+        ok |= lote.estado == ESTADO_ARMADURA
+    return ok
+
+
+def dimensionar(variavel: str, com_armadura: bool = False, tol: float = None,
+                limites: tuple = None, **kwargs) -> ResultadoDimensionamento:
+    """
+    Menor d, pilar ou ρl (variavel = "d", "c" ou "As") que verifica todos os casos.
+
+    kwargs são os argumentos de PuncoamentoEC2Batch (o valor atual da variável
+    serve apenas para as proporções c2/c1 e As_ly/As_lx). `limites` = (mínimo,
+    máximo) e `tol` substituem os valores de LIMITES e TOLERANCIAS.
+    """
+    if variavel not in VARIAVEIS:
+        raise ValueError(f"variavel deve ser uma de: {', '.join(VARIAVEIS)}.")
+    lo_lim, hi_lim = limites if limites is not None else LIMITES[variavel]
+    tol = TOLERANCIAS[variavel] if tol is None else tol
+    if variavel == "As":
+        hi_lim = min(hi_lim, 0.02)  # acima do limite de ρl não há ganho
+    if not 0 < lo_lim < hi_lim or tol <= 0:
+        raise ValueError("Limites ou tolerância inválidos.")
+
+    ref = PuncoamentoEC2Batch(**kwargs)
+    n = ref.n
+    shape = np.broadcast_shapes(*(np.shape(v) for v in kwargs.values() if v is not None))
+    args = {k: (None if v is None else np.broadcast_to(np.asarray(v), shape).ravel())
+            for k, v in kwargs.items()}
+
+    razao = ref.c2 / ref.c1
+    As_lx, As_ly = (np.full(n, np.nan) if args.get(k) is None else args[k].astype(float)
+                    for k in ("laje_As_lx_cm2pm", "laje_As_ly_cm2pm"))
+    with np.errstate(invalid="ignore"):
+        rho_As = np.sqrt(As_lx * As_ly) / 10000.0 / ref.d  # sem o limite de 0.02
+
+    def _alteracoes(x, idx):
+        if variavel == "d":
+            return {"laje_d": x}
+        if variavel == "c":
+            return {"pilar_c1": x, "pilar_c2": x * razao[idx]}
+        return {"laje_rho_l": x, "laje_As_lx_cm2pm": None, "laje_As_ly_cm2pm": None}
+
+    n_avaliacoes = 0
+
+    def _avaliar(x, idx):
+        nonlocal n_avaliacoes
+        n_avaliacoes += 1
+        sub = {k: (None if v is None else v[idx]) for k, v in args.items()}
+        sub.update(_alteracoes(x, idx))
+        return PuncoamentoEC2Batch(**sub).verificar_puncoamento()
+
+    todos = np.arange(n)
+    lo = np.full(n, float(lo_lim))
+    hi = np.full(n, float(hi_lim))
+    ok_hi = _viavel(_avaliar(hi, todos), com_armadura)
+    ok_lo = _viavel(_avaliar(lo, todos), com_armadura)
+
+    ativos = np.flatnonzero(ok_hi & ~ok_lo)
+    hi[ok_lo] = lo[ok_lo]
+    for _ in range(max(math.ceil(math.log2((hi_lim - lo_lim) / tol)), 0)):
+        if ativos.size == 0:
+            break
+        meio = 0.5 * (lo[ativos] + hi[ativos])
+        ok = _viavel(_avaliar(meio, ativos), com_armadura)
+        hi[ativos[ok]] = meio[ok]
+        lo[ativos[~ok]] = meio[~ok]
+
+    lote = _avaliar(hi, todos)
+    valor = np.where(ok_hi, hi, np.nan)
+    resultado = dict(variavel=variavel, valor=valor, viavel=ok_hi, estado=lote.estado,
+                     n_avaliacoes=n_avaliacoes, argumentos={**args, **_alteracoes(hi, todos)},
+                     lote=lote)
+    if variavel == "As":
+        escala = valor / rho_As  # NaN se ρl foi dado diretamente
+        resultado.update(As_lx=As_lx * escala, As_ly=As_ly * escala)
+    return ResultadoDimensionamento(**resultado)
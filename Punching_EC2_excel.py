@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação em contínuo de resultados em lote para Excel (.xlsx).
+
+Uma linha por caso (pilar/combinação), escrita bloco a bloco diretamente no
+ficheiro comprimido: a memória usada não depende do nº de casos. Quando uma
+folha atinge o limite do Excel (1 048 576 linhas, com o cabeçalho) continua
+numa nova folha (Resultados, Resultados_2, ...); no fim é acrescentada uma
+folha Resumo com o nº de casos por estado.
+
+A formatação usa estilos com nome (PSE Cabeçalho, PSE Número, PSE Inteiro),
+definidos uma vez em styles.xml; cada célula só referencia o índice do
+estilo da sua coluna. As células são texto gerado com um modelo
+pré-compilado por coluna (NaN -> célula vazia), bloco a bloco, sem objetos
+de célula nem de estilo; o modo write-only do openpyxl cria e serializa um
+objeto por célula (~10⁵ células/s), o que para 500 000 casos levaria minutos.
+
+Utilização:
+    python Punching_EC2_excel.py run_2026_10 resultados.xlsx    # pasta de Punching_EC2_resultados
+"""
+
+import argparse
+import sys
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from Punching_EC2 import CAMPOS_RESULTADO, ESTADOS
+from Punching_EC2_resultados import ResultadosColunas, _para_array, abrir_resultados
+
+LINHAS_MAX_FOLHA = 1_048_576  # limite do Excel (inclui o cabeçalho)
+COLUNAS_DERIVADAS = ("util_u0", "util_u1", "situacao")
+
+#estilos com nome: (nome, índice em cellXfs)
+ESTILO_CABECALHO = ("PSE Cabeçalho", 1)
+ESTILO_NUMERO = ("PSE Número", 2)
+ESTILO_INTEIRO = ("PSE Inteiro", 3)
+
+_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_ESTILOS_XML = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="{_NS}">
+<numFmts count="1"><numFmt numFmtId="164" formatCode="0.000"/></numFmts>
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/><family val="2"/></font><font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/><family val="2"/></font></fonts>
+<fills count="3"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill><fill><patternFill patternType="solid"><fgColor rgb="FF1D4ED8"/><bgColor indexed="64"/></patternFill></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/><xf numFmtId="0" fontId="1" fillId="2" borderId="0" applyFont="1" applyFill="1" applyAlignment="1"><alignment horizontal="center"/></xf><xf numFmtId="164" fontId="0" fillId="0" borderId="0" applyNumberFormat="1"/><xf numFmtId="1" fontId="0" fillId="0" borderId="0" applyNumberFormat="1"/></cellStyleXfs>
+<cellXfs count="4"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/><xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="1" applyFont="1" applyFill="1" applyAlignment="1"><alignment horizontal="center"/></xf><xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="2" applyNumberFormat="1"/><xf numFmtId="1" fontId="0" fillId="0" borderId="0" xfId="3" applyNumberFormat="1"/></cellXfs>
+<cellStyles count="4"><cellStyle name="Normal" xfId="0" builtinId="0"/><cellStyle name="{ESTILO_CABECALHO[0]}" xfId="1"/><cellStyle name="{ESTILO_NUMERO[0]}" xfId="2"/><cellStyle name="{ESTILO_INTEIRO[0]}" xfId="3"/></cellStyles>
+</styleSheet>"""
+
+
+def _inicio_folha(larguras: list) -> str:
+    cols = "".join(f'<col min="{i + 1}" max="{i + 1}" width="{w}" customWidth="1"/>'
+                   for i, w in enumerate(larguras))
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<worksheet xmlns="{_NS}">'
+            '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" '
+            'activePane="bottomLeft" state="frozen"/></sheetView></sheetViews>'
+            f'<sheetFormatPr defaultRowHeight="15"/><cols>{cols}</cols><sheetData>')
+
+
+def _linha_texto(r: int, valores, estilo: int = 0) -> str:
+    s = f' s="{estilo}"' if estilo else ""
+    celulas = "".join(f'<c t="inlineStr"{s}><is><t>{escape(str(v))}</t></is></c>' for v in valores)
+    return f'<row r="{r}">{celulas}</row>'
+
+
+class _Coluna:
+    """Modelo de serialização de uma coluna: tipo ('f', 'i', 'b', 's') e estilo."""
+
+    __slots__ = ("nome", "tipo", "largura", "modelo")
+
+    def __init__(self, nome: str, tipo: str, largura: float = 14):
+        self.nome, self.tipo, self.largura = nome, tipo, largura
+        self.modelo = {
+            "f": f'<c s="{ESTILO_NUMERO[1]}"><v>{{!r}}</v></c>',
+            "i": f'<c s="{ESTILO_INTEIRO[1]}"><v>{{}}</v></c>',
+            "b": '<c t="b"><v>{:d}</v></c>',
+            "s": '<c t="inlineStr"><is><t>{}</t></is></c>',
+        }[tipo].format
+
+    def celulas(self, valores) -> list:
+        """Lista das células XML de um bloco (NaN/±inf e None -> célula vazia)."""
+        modelo = self.modelo
+        if self.tipo == "f":
+            valores = np.asarray(valores, dtype=float)
+            valores = np.where(np.isfinite(valores), valores, np.nan).tolist()
+            return [modelo(v) if v == v else "<c/>" for v in valores]
+        if self.tipo == "s":
+            return [modelo(escape(str(v))) if v is not None else "<c/>" for v in valores]
+        return [modelo(v) for v in np.asarray(valores).tolist()]
+
+
+def _tipo_de(valores) -> str:
+    kind = np.asarray(valores[:1]).dtype.kind
+    return {"b": "b", "i": "i", "u": "i", "f": "f"}.get(kind, "s")
+
+
+def _blocos(resultados, bloco: int):
+    """Gerador de arrays estruturados (dtype_resultado) com até `bloco` casos."""
+    if isinstance(resultados, ResultadosColunas):
+        for i in range(0, len(resultados), bloco):
+            yield resultados.registos(slice(i, i + bloco))
+        return
+    if hasattr(resultados, "to_array") or isinstance(resultados, np.ndarray):
+        arr = _para_array(resultados)
+        for i in range(0, arr.size, bloco):
+            yield arr[i:i + bloco]
+        return
+    atual = []
+    for r in resultados:  # dicts de run_many (campos extra ignorados) ou PunchingResult
+        atual.append({k: r[k] for k in CAMPOS_RESULTADO} if isinstance(r, dict) else r)
+        if len(atual) >= bloco:
+            yield _para_array(atual)
+            atual = []
+    if atual:
+        yield _para_array(atual)
+
+
+def exportar_excel(caminho: str, resultados, entradas: dict = None, ids=None, campos=None,
+                   bloco: int = 10_000, linhas_por_folha: int = LINHAS_MAX_FOLHA) -> dict:
+    """
+    Escreve os resultados em `caminho` (.xlsx), uma linha por caso, em contínuo.
+
+    resultados . PuncoamentoEC2Batch, array estruturado (dtype_resultado()),
+                 ResultadosColunas (lida aos blocos) ou iterável de dicts
+                 (run_many) / PunchingResult (consumido aos blocos)
+    entradas ... colunas de entrada a incluir antes dos resultados, {nome: array}
+    ids ........ identificadores (primeira coluna "id")
+    campos ..... subconjunto de CAMPOS_RESULTADO + COLUNAS_DERIVADAS (omissão: todos)
+    linhas_por_folha . nº máximo de linhas por folha, incluindo o cabeçalho
+
+    Colunas: linha (índice do caso, base 0), id, entradas, campos. Devolve
+    {"casos", "folhas", "segundos", "casos_por_segundo"}.
+    """
+    t0 = time.perf_counter()
+    campos = tuple(CAMPOS_RESULTADO + COLUNAS_DERIVADAS if campos is None else campos)
+    desconhecidos = set(campos) - set(CAMPOS_RESULTADO + COLUNAS_DERIVADAS)
+    if desconhecidos:
+        raise ValueError(f"Campos desconhecidos: {', '.join(sorted(desconhecidos))}")
+    if bloco < 1 or linhas_por_folha < 2:
+        raise ValueError("bloco deve ser ≥ 1 e linhas_por_folha ≥ 2.")
+    entradas = {nome: np.asarray(v) for nome, v in (entradas or {}).items()}
+
+    colunas = [_Coluna("linha", "i", 9)]
+    if ids is not None:
+        colunas.append(_Coluna("id", "s", 18))
+    colunas += [_Coluna(nome, _tipo_de(v)) for nome, v in entradas.items()]
+    tipos_resultado = {"armadura_necessaria": "b", "n_perimetros": "i", "estado": "i", "situacao": "s"}
+    colunas += [_Coluna(nome, tipos_resultado.get(nome, "f"), 20 if nome == "situacao" else 14)
+                for nome in campos]
+    cabecalho = _linha_texto(1, [c.nome for c in colunas], ESTILO_CABECALHO[1])
+    inicio = _inicio_folha([c.largura for c in colunas])
+    fim = "</sheetData></worksheet>"
+    por_folha = linhas_por_folha - 1
+    situacoes = np.array([ESTADOS.get(i, "erro") for i in range(max(ESTADOS) + 1)], dtype=object)
+    contagem = {nome: 0 for nome in ESTADOS.values()}
+
+    n = 0
+    folhas = []
+    with zipfile.ZipFile(caminho, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        f = None
+        for arr in _blocos(resultados, bloco):
+            m = arr.size
+            valores = {"linha": np.arange(n, n + m)}
+            if ids is not None:
+                valores["id"] = ids[n:n + m]
+            for nome, v in entradas.items():
+                valores[nome] = v[n:n + m]
+            for nome in campos:
+                if nome == "util_u0" or nome == "util_u1":
+                    num, den = ("v_Ed_u0", "v_Rd_max") if nome == "util_u0" else ("v_Ed_u1", "v_Rd_c")
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        valores[nome] = np.where(arr[den] > 0, arr[num] / arr[den], np.nan)
+                elif nome == "situacao":
+                    valores[nome] = situacoes[np.clip(arr["estado"], 0, situacoes.size - 1)]
+                else:
+                    valores[nome] = arr[nome]
+            codigos, conta = np.unique(arr["estado"], return_counts=True)
+            for codigo, k in zip(codigos.tolist(), conta.tolist()):
+                contagem[ESTADOS.get(codigo, "erro")] += k
+            celulas = [c.celulas(valores[c.nome]) for c in colunas]
+
+            i = 0
+            while i < m:
+                if f is None or (n + i) % por_folha == 0:
+                    if f is not None:
+                        f.write(fim.encode())
+                        f.close()
+                    folhas.append("Resultados" if not folhas else f"Resultados_{len(folhas) + 1}")
+                    f = zf.open(f"xl/worksheets/sheet{len(folhas)}.xml", "w", force_zip64=True)
+                    f.write((inicio + cabecalho).encode())
+                j = min(m, i + por_folha - (n + i) % por_folha)
+                r0 = (n + i) % por_folha + 2
+                f.write("".join(f'<row r="{r}">{"".join(linha)}</row>' for r, linha in
+                                zip(range(r0, r0 + j - i), zip(*(c[i:j] for c in celulas)))).encode())
+                i = j
+            n += m
+        if f is None:  # sem casos: só o cabeçalho
+            folhas.append("Resultados")
+            f = zf.open("xl/worksheets/sheet1.xml", "w")
+            f.write((inicio + cabecalho).encode())
+        f.write(fim.encode())
+        f.close()
+
+        # resumo
+        folhas.append("Resumo")
+        linhas = [_linha_texto(1, ("estado", "casos"), ESTILO_CABECALHO[1])]
+        for r, (nome, k) in enumerate(list(contagem.items()) + [("total", n)], start=2):
+            linhas.append(f'<row r="{r}"><c t="inlineStr"><is><t>{nome}</t></is></c>'
+                          f'<c s="{ESTILO_INTEIRO[1]}"><v>{k}</v></c></row>')
+        zf.writestr(f"xl/worksheets/sheet{len(folhas)}.xml",
+                    _inicio_folha([20, 12]) + "".join(linhas) + fim)
+        _escrever_pacote(zf, folhas)
+
+    segundos = time.perf_counter() - t0
+    return {"casos": n, "folhas": folhas, "segundos": segundos,
+            "casos_por_segundo": n / segundos if segundos > 0 else None}
+
+
+def _escrever_pacote(zf: zipfile.ZipFile, folhas: list):
+    """Partes fixas do pacote OOXML: tipos, relações, livro e estilos."""
+    tipos = "".join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/'
+                    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                    for i in range(1, len(folhas) + 1))
+    zf.writestr("[Content_Types].xml",
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Types xmlns="http://schemas.'
+                'openxmlformats.org/package/2006/content-types"><Default Extension="rels" ContentType='
+                '"application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" '
+                'ContentType="application/xml"/><Override PartName="/xl/workbook.xml" ContentType='
+                '"application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-'
+                f'officedocument.spreadsheetml.styles+xml"/>{tipos}</Types>')
+    zf.writestr("_rels/.rels",
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{_NS_REL}">'
+                '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                'relationships/officeDocument" Target="xl/workbook.xml"/></Relationships>')
+    folhas_xml = "".join(f'<sheet name="{nome}" sheetId="{i}" r:id="rId{i}"/>'
+                         for i, nome in enumerate(folhas, start=1))
+    zf.writestr("xl/workbook.xml",
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<workbook xmlns="{_NS}" '
+                f'xmlns:r="{_NS_R}"><sheets>{folhas_xml}</sheets></workbook>')
+    relacoes = "".join(f'<Relationship Id="rId{i}" Type="{_NS_R}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                       for i in range(1, len(folhas) + 1))
+    zf.writestr("xl/_rels/workbook.xml.rels",
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{_NS_REL}">'
+                f'{relacoes}<Relationship Id="rId{len(folhas) + 1}" Type="{_NS_R}/styles" '
+                'Target="styles.xml"/></Relationships>')
+    zf.writestr("xl/styles.xml", _ESTILOS_XML)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Exporta uma pasta de resultados em colunas (Punching_EC2_resultados) para Excel.")
+    parser.add_argument("resultados", help="pasta de resultados (p.ex. Punching_EC2_stream.py ... --colunas)")
+    parser.add_argument("saida", help="ficheiro .xlsx")
+    parser.add_argument("--campos", help="campos a exportar, separados por vírgulas (default: todos)")
+    parser.add_argument("--bloco", type=int, default=10_000, help="casos por bloco (default: 10000)")
+    args = parser.parse_args(argv)
+
+    campos = [c.strip() for c in args.campos.split(",")] if args.campos else None
+    res = exportar_excel(args.saida, abrir_resultados(args.resultados), campos=campos, bloco=args.bloco)
+    print(f"Concluído: {res['casos']} casos em {len(res['folhas']) - 1} folha(s) de resultados, "
+          f"{res['segundos']:.1f} s -> {args.saida}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Análise de fiabilidade por Monte Carlo da verificação ao punçoamento.
+
+As entradas numéricas de PuncoamentoEC2 (fck, d, As, dimensões do pilar, V_Ed,
+M_Edx, M_Edy, ...) podem ser dadas como Distribuicao; as restantes ficam fixas.
+As amostras são avaliadas por blocos com PuncoamentoEC2Batch.utilizacoes()
+(fórmulas vetorizadas, sem dimensionamento da armadura) e reduzidas a
+estatísticas correntes por bloco — média e variância de Welford/Chan, mínimo,
+máximo, contagens de excedências e histograma —, pelo que a memória não
+depende do nº de amostras.
+
+Cada bloco tem o seu fluxo de números aleatórios, filho de uma SeedSequence
+(semente, i); os blocos podem correr em processos diferentes e são juntados
+pela ordem, pelo que o resultado é o mesmo para qualquer nº de processos e é
+reprodutível dada a semente.
+
+Falha: u0 > 1 ou u1 > 1 (laje sem armadura de punçoamento) ou, com
+com_armadura=True, u0 > 1 ou u1 > k_max (esmagamento, cs_max > 1).
+As amostras em erro (ex.: u1,ef nulo, troço ineficaz ≥ u1) são contadas à parte e
+excluídas da probabilidade de falha.
+"""
+
+import math
+import os
+from functools import partial
+from statistics import NormalDist
+
+import numpy as np
+
+from Punching_EC2_batch import PuncoamentoEC2Batch
+from Punching_EC2_sensibilidades import VERIFICACOES
+
+#argumentos de PuncoamentoEC2 que não podem ser aleatórios (categóricos/booleanos)
+ARGUMENTOS_FIXOS = ("pilar_tipo", "pilar_forma", "beta_mode", "is_sapata",
+                    "edge_perp_interior", "corner_interior")
+
+#constante de Euler-Mascheroni (média da Gumbel)
+_EULER_GAMMA = 0.5772156649015329
+
+
+# ---------------------------------------------------------------------
+# --- DISTRIBUIÇÕES ---
+# ---------------------------------------------------------------------
+
+class Distribuicao:
+    """
+    Distribuição de uma entrada, definida pelos parâmetros do NumPy Generator.
+
+    Criar com os construtores normal, lognormal, uniforme e gumbel (média e desvio
+    padrão da própria variável, nas unidades de PuncoamentoEC2).
+    """
+
+    def __init__(self, tipo: str, **parametros):
+        self.tipo = tipo
+        self.parametros = parametros
+
+    def __repr__(self):
+        par = ", ".join(f"{k}={v:g}" for k, v in self.parametros.items())
+        return f"Distribuicao.{self.tipo}({par})"
+
+    @staticmethod
+    def _validar_desvio(desvio):
+        if not desvio >= 0:
+            raise ValueError("O desvio padrão deve ser ≥ 0.")
+
+    @classmethod
+    def normal(cls, media: float, desvio: float) -> "Distribuicao":
+        cls._validar_desvio(desvio)
+        return cls("normal", loc=float(media), scale=float(desvio))
+
+    @classmethod
+    def lognormal(cls, media: float, desvio: float) -> "Distribuicao":
+        """Lognormal com média e desvio padrão da variável (não do seu logaritmo)."""
+        cls._validar_desvio(desvio)
+        if not media > 0:
+            raise ValueError("A média de uma lognormal deve ser > 0.")
+        s2 = math.log1p((desvio / media) ** 2)
+        return cls("lognormal", mean=math.log(media) - s2 / 2, sigma=math.sqrt(s2))
+
+    @classmethod
+    def uniforme(cls, minimo: float, maximo: float) -> "Distribuicao":
+        if not minimo <= maximo:
+            raise ValueError("Uniforme: é preciso minimo ≤ maximo.")
+        return cls("uniform", low=float(minimo), high=float(maximo))
+
+    @classmethod
+    def gumbel(cls, media: float, desvio: float) -> "Distribuicao":
+        """Gumbel de máximos (ações variáveis) com média e desvio padrão dados."""
+        cls._validar_desvio(desvio)
+        escala = desvio * math.sqrt(6) / math.pi
+        return cls("gumbel", loc=media - _EULER_GAMMA * escala, scale=escala)
+
+    def amostrar(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """n amostras independentes com o gerador rng."""
+        return getattr(rng, self.tipo)(size=n, **self.parametros)
+
+
+# ---------------------------------------------------------------------
+# --- ESTATÍSTICAS CORRENTES ---
+# ---------------------------------------------------------------------
+
+class EstatisticaCorrente:
+    """
+    Estatísticas de uma utilização acumuladas bloco a bloco, sem guardar amostras.
+
+    media/m2 seguem Welford, com a junção de Chan et al. entre blocos;
+    excedencias[j] conta os valores > limiares[j]; histograma tem len(bordas) + 1
+    classes: [−∞, b0[, [b0, b1[, ..., [b_último, +∞[. Valores NaN são ignorados.
+    """
+
+    def __init__(self, limiares=(1.0,), bordas=None):
+        self.limiares = np.asarray(limiares, dtype=float)
+        self.bordas = np.linspace(0.0, 3.0, 301) if bordas is None else np.asarray(bordas, dtype=float)
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.excedencias = np.zeros(self.limiares.size, dtype=np.int64)
+        self.histograma = np.zeros(self.bordas.size + 1, dtype=np.int64)
+
+    @property
+    def variancia(self) -> float:
+        """Variância amostral (n − 1)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def desvio(self) -> float:
+        return math.sqrt(self.variancia)
+
+    def _juntar_momentos(self, n, media, m2):
+        total = self.n + n
+        delta = media - self.media
+        self.media += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def atualizar(self, x) -> "EstatisticaCorrente":
+        """Acrescenta um bloco de valores."""
+        x = np.asarray(x, dtype=float).ravel()
+        x = x[~np.isnan(x)]
+        if x.size:
+            media = float(x.mean())
+            self._juntar_momentos(x.size, media, float(np.square(x - media).sum()))
+            self.minimo = min(self.minimo, float(x.min()))
+            self.maximo = max(self.maximo, float(x.max()))
+            self.excedencias += (x[:, None] > self.limiares).sum(axis=0)
+            self.histograma += np.bincount(np.searchsorted(self.bordas, x, side="right"),
+                                           minlength=self.histograma.size)
+        return self
+
+    def juntar(self, outra: "EstatisticaCorrente") -> "EstatisticaCorrente":
+        """Junta as estatísticas de outro bloco (mesmos limiares e bordas)."""
+        if outra.n:
+            self._juntar_momentos(outra.n, outra.media, outra.m2)
+            self.minimo = min(self.minimo, outra.minimo)
+            self.maximo = max(self.maximo, outra.maximo)
+            self.excedencias += outra.excedencias
+            self.histograma += outra.histograma
+        return self
+
+    def prob_excedencia(self) -> np.ndarray:
+        """Fração dos valores acima de cada limiar."""
+        return self.excedencias / self.n if self.n else np.full(self.limiares.size, np.nan)
+
+
+# ---------------------------------------------------------------------
+# --- SIMULAÇÃO ---
+# ---------------------------------------------------------------------
+
+def _avaliar_bloco(tarefa, argumentos, com_armadura, limiares, bordas):
+    """Amostra e avalia um bloco; devolve (nº em erro, nº de falhas, {verificação: EstatisticaCorrente})."""
+    n, semente = tarefa
+    rng = np.random.default_rng(semente)
+    kwargs = {nome: (v.amostrar(rng, n) if isinstance(v, Distribuicao) else v)
+              for nome, v in sorted(argumentos.items())}
+    util = {v: np.broadcast_to(u, n) for v, u in PuncoamentoEC2Batch(**kwargs).utilizacoes().items()}
+
+    erro = np.isnan(util["u0"]) | np.isnan(util["u1"])
+    falha = (util["u0"] > 1) | (util["cs_max"] > 1 if com_armadura else util["u1"] > 1)
+    estat = {v: EstatisticaCorrente(limiares, bordas).atualizar(util[v]) for v in VERIFICACOES}
+    return int(erro.sum()), int((falha & ~erro).sum()), estat
+
+
+class ResultadoFiabilidade:
+    """
+    Resultado de fiabilidade().
+
+    prob_falha = n_falhas / (n_amostras − n_erros); erro_padrao = √(p(1 − p)/n);
+    intervalo: intervalo de Wilson a 95 %; indice_fiabilidade: β = −Φ⁻¹(p);
+    estatisticas[v]: EstatisticaCorrente de cada utilização v ∈ VERIFICACOES.
+    """
+
+    def __init__(self, **valores):
+        self.__dict__.update(valores)
+
+    @property
+    def n_validas(self) -> int:
+        return self.n_amostras - self.n_erros
+
+    @property
+    def prob_falha(self) -> float:
+        return self.n_falhas / self.n_validas if self.n_validas else math.nan
+
+    @property
+    def erro_padrao(self) -> float:
+        p = self.prob_falha
+        return math.sqrt(p * (1 - p) / self.n_validas) if self.n_validas else math.nan
+
+    @property
+    def intervalo(self) -> tuple:
+        """Intervalo de confiança de Wilson a 95 % para a probabilidade de falha."""
+        n, p, z = self.n_validas, self.prob_falha, 1.959963984540054
+        if not n:
+            return (math.nan, math.nan)
+        centro = (p + z * z / (2 * n)) / (1 + z * z / n)
+        meia = z / (1 + z * z / n) * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+        return (max(centro - meia, 0.0), min(centro + meia, 1.0))
+
+    @property
+    def indice_fiabilidade(self) -> float:
+        p = self.prob_falha
+        if math.isnan(p):
+            return math.nan
+        if p <= 0.0 or p >= 1.0:
+            return math.inf if p <= 0.0 else -math.inf
+        return -NormalDist().inv_cdf(p)
+
+    def resumo(self) -> str:
+        """Resumo de texto: probabilidade de falha, β e estatísticas das utilizações."""
+        lo, hi = self.intervalo
+        texto = [f"Amostras: {self.n_amostras} ({self.n_erros} em erro), semente {self.semente}",
+                 f"Falhas: {self.n_falhas}  P_f = {self.prob_falha:.4e}  "
+                 f"IC95% [{lo:.4e}, {hi:.4e}]  β = {self.indice_fiabilidade:.3f}",
+                 f"{'util':<8}{'média':>10}{'desvio':>10}{'mín':>10}{'máx':>10}"
+                 + "".join(f"{'P(>' + format(l, 'g') + ')':>12}" for l in self.estatisticas["u1"].limiares)]
+        for v in VERIFICACOES:
+            e = self.estatisticas[v]
+            texto.append(f"{v:<8}{e.media:>10.4f}{e.desvio:>10.4f}{e.minimo:>10.4f}{e.maximo:>10.4f}"
+                         + "".join(f"{p:>12.4e}" for p in e.prob_excedencia()))
+        return "\n".join(texto)
+
+
+def fiabilidade(n_amostras: int, semente=None, bloco: int = 100_000, workers: int | None = None,
+                com_armadura: bool = False, limiares=(1.0,), bordas=None, executor=None,
+                **argumentos) -> ResultadoFiabilidade:
+    """
+    Probabilidade de falha ao punçoamento por Monte Carlo.
+
+    n_amostras .. nº total de amostras
+    semente ..... semente da SeedSequence (None -> entropia do sistema, guardada no resultado)
+    bloco ....... nº de amostras avaliadas de cada vez (memória ≈ 1 kB por amostra)
+    workers ..... nº de processos (None -> os.cpu_count(); 1 -> execução em série)
+    com_armadura  se True, a falha é u0 > 1 ou cs_max > 1 (armadura de punçoamento possível)
+    limiares .... utilizações para as contagens de excedências
+    bordas ...... bordas do histograma (None -> 0 a 3 de 0.01 em 0.01)
+    executor .... ProcessPoolExecutor já criado, a reutilizar (ignora workers)
+    argumentos .. argumentos de PuncoamentoEC2: escalares ou Distribuicao (só os numéricos)
+    """
+    if n_amostras < 1 or bloco < 1:
+        raise ValueError("n_amostras e bloco devem ser ≥ 1.")
+    for nome, v in argumentos.items():
+        if isinstance(v, Distribuicao):
+            if nome in ARGUMENTOS_FIXOS:
+                raise ValueError(f"{nome} não pode ser aleatório.")
+        elif np.ndim(v) != 0:
+            raise ValueError(f"{nome}: os valores fixos devem ser escalares (usar Distribuicao).")
+
+    raiz = np.random.SeedSequence(semente)
+    n_blocos = -(-n_amostras // bloco)
+    tamanhos = [bloco] * (n_blocos - 1) + [n_amostras - bloco * (n_blocos - 1)]
+    tarefas = list(zip(tamanhos, raiz.spawn(n_blocos)))
+    tarefa = partial(_avaliar_bloco, argumentos=argumentos, com_armadura=com_armadura,
+                     limiares=limiares, bordas=bordas)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if executor is not None:
+        partes = executor.map(tarefa, tarefas)
+    elif workers <= 1 or n_blocos <= 1:
+        partes = map(tarefa, tarefas)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, n_blocos)) as ex:
+            partes = list(ex.map(tarefa, tarefas))
+
+    n_erros = n_falhas = 0
+    estatisticas = {v: EstatisticaCorrente(limiares, bordas) for v in VERIFICACOES}
+    for erros, falhas, estat in partes:  #pela ordem dos blocos
+        n_erros += erros
+        n_falhas += falhas
+        for v in VERIFICACOES:
+            estatisticas[v].juntar(estat[v])
+    return ResultadoFiabilidade(n_amostras=n_amostras, n_erros=n_erros, n_falhas=n_falhas,
+                                estatisticas=estatisticas, semente=raiz.entropy)
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+Perímetros de controlo de pilares de forma qualquer (polígonos), com bordos e aberturas.
+
+GeometriaPilar descreve, em planta (m):
+  * contorno ... vértices do pilar (qualquer polígono: L, T, extremos de paredes, ...);
+  * bordos ..... bordos livres da laje, cada um por dois pontos da reta (a laje fica
+                 do lado do pilar);
+  * aberturas .. polígonos das aberturas na laje.
+
+perimetros(d) constrói o perímetro básico u1 (6.4.2) como polilinha:
+  1. u1 tem comprimento mínimo, pelo que contorna o invólucro convexo do pilar
+     (troços retos paralelos às faces a 2d e arcos de raio 2d nos vértices);
+  2. junto aos bordos é cortado pelas retas dos bordos; como na Fig. 6.15, usa-se
+     também o perímetro do pilar prolongado perpendicularmente até aos bordos e
+     fica o mais curto dos dois;
+  3. a parte de u1 entre as tangentes traçadas do centro do pilar a cada abertura
+     a menos de 6d da face (Fig. 6.14) é ineficaz.
+W1 (6.40) integra |e| ao longo de u1, com e medido a partir dos eixos x e y que
+passam pelo centro de gravidade do pilar. Os arcos são discretizados em cordas
+(no máx. PASSO_ARCO rad) com o comprimento corrigido para o do arco.
+
+Os resultados ficam em cache por (geometria, d): um pilar com centenas de
+combinações de carga só calcula a geometria uma vez.
+Convenção dos eixos (como em PuncoamentoEC2): c1 segundo x (paralelo ao bordo nos
+pilares de bordo), c2 segundo y; e_x = M_Edy/V_Ed, e_y = M_Edx/V_Ed.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+#passo angular máximo da discretização dos arcos (rad)
+PASSO_ARCO = math.radians(1.0)
+#distância máxima das aberturas à face do pilar (em múltiplos de d)
+DIST_ABERTURAS = 6.0
+TAMANHO_CACHE_PERIMETROS = 256
+
+_TOL = 1e-9
+
+
+# ---------------------------------------------------------------------
+# --- AUXILIARES DE GEOMETRIA PLANA ---
+# ---------------------------------------------------------------------
+
+def _area_e_centroide(pontos):
+    """Área (com sinal, > 0 no sentido direto) e centro de gravidade de um polígono."""
+    x, y = pontos[:, 0], pontos[:, 1]
+    xs, ys = np.roll(x, -1), np.roll(y, -1)
+    cruz = x * ys - xs * y
+    area = cruz.sum() / 2
+    if abs(area) < _TOL:
+        return 0.0, pontos.mean(axis=0)
+    return float(area), np.array([((x + xs) * cruz).sum(), ((y + ys) * cruz).sum()]) / (6 * area)
+
+
+def _involucro_convexo(pontos):
+    """Invólucro convexo (cadeia monótona de Andrew), no sentido direto, sem pontos colineares."""
+    p = sorted(set(map(tuple, np.round(pontos, 12))))
+    if len(p) < 3:
+        return np.array(p, dtype=float)
+
+    def _cadeia(seq):
+        h = []
+        for q in seq:
+            while len(h) >= 2 and ((h[-1][0] - h[-2][0]) * (q[1] - h[-2][1])
+                                   - (h[-1][1] - h[-2][1]) * (q[0] - h[-2][0])) <= _TOL:
+                h.pop()
+            h.append(q)
+        return h[:-1]
+
+    return np.array(_cadeia(p) + _cadeia(p[::-1]), dtype=float)
+
+
+def _dist_ponto_segmentos(p, a, b):
+    """Distância mínima de cada ponto p (N, 2) aos segmentos a→b (M, 2)."""
+    ab = b - a
+    ap = p[:, None, :] - a[None, :, :]
+    t = np.clip((ap * ab).sum(-1) / np.maximum((ab * ab).sum(-1), _TOL), 0.0, 1.0)
+    return np.hypot(*(ap - t[..., None] * ab).transpose(2, 0, 1)).min(axis=1)
+
+
+def _dist_poligonos(p, q):
+    """Distância entre os contornos de dois polígonos (0 se se intersetam num vértice/aresta)."""
+    return float(min(_dist_ponto_segmentos(p, q, np.roll(q, -1, axis=0)).min(),
+                     _dist_ponto_segmentos(q, p, np.roll(p, -1, axis=0)).min()))
+
+
+def _curva_paralela(involucro, r):
+    """
+    Curva a distância r do invólucro convexo (sentido direto): segmentos (A, B) e fator
+    comprimento real / corda (1 nos troços retos, arco/corda nos arcos).
+    """
+    seguinte = np.roll(involucro, -1, axis=0)
+    t = seguinte - involucro
+    normais = np.column_stack([t[:, 1], -t[:, 0]]) / np.hypot(t[:, 0], t[:, 1])[:, None]
+    pontos, fatores = [], []
+    for i, v in enumerate(involucro):
+        a0 = math.atan2(normais[i - 1, 1], normais[i - 1, 0])
+        delta = (math.atan2(normais[i, 1], normais[i, 0]) - a0) % (2 * math.pi)
+        k = max(1, math.ceil(delta / PASSO_ARCO))
+        ang = a0 + delta * np.arange(k + 1) / k
+        pontos.append(v + r * np.column_stack([np.cos(ang), np.sin(ang)]))
+        meio = delta / (2 * k)
+        fatores.append(np.full(k, meio / math.sin(meio) if meio > 0 else 1.0))
+        fatores.append([1.0])  #troço reto até ao arco seguinte
+    P = np.concatenate(pontos)
+    return P, np.roll(P, -1, axis=0), np.concatenate(fatores)
+
+
+def _cortar(A, B, f, semiplanos):
+    """Corta os segmentos pelos semiplanos n·p ≤ c (laje); devolve os troços dentro da laje."""
+    for n, c in semiplanos:
+        sa, sb = A @ n - c, B @ n - c
+        ficam = (sa < -_TOL) | (sb < -_TOL)  #troços sobre a reta do bordo não contam
+        A, B, f, sa, sb = A[ficam], B[ficam], f[ficam], sa[ficam], sb[ficam]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            X = A + (sa / (sa - sb))[:, None] * (B - A)
+        A = np.where((sa > _TOL)[:, None], X, A)
+        B = np.where((sb > _TOL)[:, None], X, B)
+    return A, B, f
+
+
+def _dividir_por_raio(A, B, f, centro, u):
+    """Divide os segmentos que cruzam a semirreta centro + s·u (s > 0)."""
+    ca = u[0] * (A[:, 1] - centro[1]) - u[1] * (A[:, 0] - centro[0])
+    cb = u[0] * (B[:, 1] - centro[1]) - u[1] * (B[:, 0] - centro[0])
+    cruza = ca * cb < 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        X = A + (ca / (ca - cb))[:, None] * (B - A)
+    cruza &= (X - centro) @ u > 0
+    if not cruza.any():
+        return A, B, f
+    return (np.concatenate([A[~cruza], A[cruza], X[cruza]]),
+            np.concatenate([B[~cruza], X[cruza], B[cruza]]),
+            np.concatenate([f[~cruza], f[cruza], f[cruza]]))
+
+
+def _integral_abs(a, b):
+    """∫₀¹ |a + t(b − a)| dt, elemento a elemento."""
+    aa, ab = np.abs(a), np.abs(b)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        troca = (a * a + b * b) / (2 * (aa + ab))
+    return np.where(a * b < 0, troca, (aa + ab) / 2)
+
+
+# ---------------------------------------------------------------------
+# --- GEOMETRIA DO PILAR ---
+# ---------------------------------------------------------------------
+
+def _pontos(seq, nome, minimo):
+    p = tuple((float(x), float(y)) for x, y in seq)
+    if len(p) < minimo:
+        raise ValueError(f"{nome}: são precisos pelo menos {minimo} pontos.")
+    return p
+
+
+class GeometriaPilar:
+    """
+    Contorno do pilar, bordos livres e aberturas da laje (m), em planta.
+
+    Imutável e comparável (pode ser chave de cache). Aceita-se também um dict
+    {"contorno": [[x, y], ...], "bordos": [[[x1, y1], [x2, y2]], ...], "aberturas": [[[x, y], ...], ...]}
+    (ver GeometriaPilar.de), por exemplo vindo de JSON.
+    """
+
+    def __init__(self, contorno, bordos=(), aberturas=()):
+        self.contorno = _pontos(contorno, "contorno", 3)
+        self.bordos = tuple(_pontos(b, "bordo", 2) for b in bordos)
+        self.aberturas = tuple(_pontos(a, "abertura", 3) for a in aberturas)
+        if any(len(b) != 2 or math.dist(*b) < _TOL for b in self.bordos):
+            raise ValueError("Cada bordo é dado por dois pontos distintos da sua reta.")
+
+        area, self.centro = _area_e_centroide(np.array(self.contorno))
+        if area == 0.0:
+            raise ValueError("O contorno do pilar tem área nula.")
+        self.involucro = _involucro_convexo(np.array(self.contorno))
+        self.semiplanos = tuple(self._semiplano(b) for b in self.bordos)
+        for n, c in self.semiplanos:
+            if np.any(self.involucro @ n - c > 1e-6):
+                raise ValueError("O pilar atravessa um bordo da laje.")
+        for a in self.aberturas:
+            if abs(_area_e_centroide(np.array(a))[0]) == 0.0:
+                raise ValueError("Abertura com área nula.")
+
+    def _semiplano(self, bordo):
+        """(n, c) com n·p ≤ c do lado da laje (o do centro do pilar) e n unitário."""
+        (x1, y1), (x2, y2) = bordo
+        n = np.array([y2 - y1, x1 - x2]) / math.hypot(x2 - x1, y2 - y1)
+        c = float(n @ (x1, y1))
+        return (n, c) if n @ self.centro <= c else (-n, -c)
+
+    @classmethod
+    def retangular(cls, c1: float, c2: float, bordos=(), aberturas=()) -> "GeometriaPilar":
+        """Pilar retangular c1 (segundo x) × c2 (segundo y), centrado na origem."""
+        a, b = c1 / 2, c2 / 2
+        return cls([(-a, -b), (a, -b), (a, b), (-a, b)], bordos, aberturas)
+
+    @classmethod
+    def circular(cls, D: float, n: int = 256, bordos=(), aberturas=()) -> "GeometriaPilar":
+        """Pilar circular de diâmetro D (polígono regular inscrito de n lados), centrado na origem."""
+        ang = 2 * math.pi * np.arange(n) / n
+        return cls(np.column_stack([np.cos(ang), np.sin(ang)]) * D / 2, bordos, aberturas)
+
+    @classmethod
+    def de(cls, valor) -> "GeometriaPilar":
+        """GeometriaPilar a partir de outra ou de um dict (contorno, bordos, aberturas)."""
+        if isinstance(valor, cls):
+            return valor
+        if isinstance(valor, dict):
+            desconhecidas = set(valor) - {"contorno", "bordos", "aberturas"}
+            if desconhecidas:
+                raise TypeError(f"Chave(s) desconhecida(s) na geometria: {', '.join(sorted(desconhecidas))}.")
+            return cls(valor["contorno"], valor.get("bordos", ()), valor.get("aberturas", ()))
+        raise TypeError("geometria deve ser GeometriaPilar ou dict com 'contorno'.")
+
+    def como_dict(self) -> dict:
+        return {"contorno": [list(p) for p in self.contorno],
+                "bordos": [[list(p) for p in b] for b in self.bordos],
+                "aberturas": [[list(p) for p in a] for a in self.aberturas]}
+
+    def _chave(self):
+        return self.contorno, self.bordos, self.aberturas
+
+    def __eq__(self, outra):
+        return isinstance(outra, GeometriaPilar) and self._chave() == outra._chave()
+
+    def __hash__(self):
+        return hash(self._chave())
+
+    def __repr__(self):
+        return (f"GeometriaPilar({len(self.contorno)} vértices, {len(self.bordos)} bordo(s), "
+                f"{len(self.aberturas)} abertura(s))")
+
+    @property
+    def dimensoes(self) -> tuple:
+        """(c1, c2): dimensões do retângulo envolvente segundo x e y."""
+        dx, dy = np.ptp(self.involucro, axis=0)
+        return float(dx), float(dy)
+
+    @property
+    def perimetro(self) -> float:
+        """Perímetro do invólucro convexo do pilar."""
+        return float(np.hypot(*(np.roll(self.involucro, -1, axis=0) - self.involucro).T).sum())
+
+    def area_controlo(self, r: float) -> float:
+        """Área limitada pela curva a distância r do pilar (Steiner: A + P·r + π·r²), sem bordos."""
+        area = _area_e_centroide(self.involucro)[0]
+        return area + self.perimetro * r + math.pi * r * r
+
+    def perimetros(self, d: float) -> "PerimetrosControlo":
+        """Perímetros de controlo para a altura útil d (em cache por geometria e d)."""
+        return _perimetros_cache(self, float(d))
+
+
+class PerimetrosControlo:
+    """
+    Resultado de GeometriaPilar.perimetros(d).
+
+    u0 ......... perímetro do pilar (invólucro convexo; usado nos pilares interiores)
+    u1 ......... comprimento do perímetro básico a 2d, cortado pelos bordos
+    u1_eff ..... u1 sem a parte na sombra das aberturas; u1_ineficaz = u1 − u1_eff
+    W1_x, W1_y . ∫|e| dl ao longo de u1 (6.40), e medido na direção x / y
+    segmentos .. array (M, 2, 2) com os troços de u1 (sem ordem) e eficaz (M,) se fora da sombra
+    aberturas .. índices das aberturas consideradas (a menos de 6d da face)
+    """
+
+    def __init__(self, **valores):
+        self.__dict__.update(valores)
+
+    def __repr__(self):
+        return (f"PerimetrosControlo(d={self.d:g}, u0={self.u0:.4f}, u1={self.u1:.4f}, "
+                f"u1_eff={self.u1_eff:.4f}, W1_x={self.W1_x:.4f}, W1_y={self.W1_y:.4f})")
+
+
+def _calcular_perimetros(g: GeometriaPilar, d: float) -> PerimetrosControlo:
+    if not d > 0:
+        raise ValueError("A altura útil d deve ser > 0.")
+    r = 2 * d
+
+    #perímetro a 2d, cortado pelos bordos; com bordos, também o do pilar prolongado até eles (Fig. 6.15)
+    candidatos = [_cortar(*_curva_paralela(g.involucro, r), g.semiplanos)]
+    if g.semiplanos:
+        pontos = g.involucro
+        for n, c in g.semiplanos:
+            pontos = np.concatenate([pontos, pontos - (pontos @ n - c)[:, None] * n])
+        candidatos.append(_cortar(*_curva_paralela(_involucro_convexo(pontos), r), g.semiplanos))
+    comprimentos = [float((np.hypot(*(B - A).T) * f).sum()) for A, B, f in candidatos]
+    A, B, f = candidatos[int(np.argmin(comprimentos))]
+
+    #sombra das aberturas a menos de 6d da face: setores entre as tangentes do centro do pilar
+    contorno = np.array(g.contorno)
+    setores, consideradas = [], []
+    for i, abertura in enumerate(g.aberturas):
+        abertura = np.array(abertura)
+        if _dist_poligonos(contorno, abertura) > DIST_ABERTURAS * d:
+            continue
+        rel = abertura - g.centro
+        ref = math.atan2(*(_area_e_centroide(abertura)[1] - g.centro)[::-1])
+        phi = (np.arctan2(rel[:, 1], rel[:, 0]) - ref + math.pi) % (2 * math.pi) - math.pi
+        lo, hi = float(phi.min()), float(phi.max())
+        if hi - lo >= math.pi:
+            raise ValueError("Abertura a envolver o pilar: não é possível traçar as tangentes.")
+        for a in (ref + lo, ref + hi):
+            A, B, f = _dividir_por_raio(A, B, f, g.centro, np.array([math.cos(a), math.sin(a)]))
+        setores.append((ref, lo, hi))
+        consideradas.append(i)
+
+    comprimento = np.hypot(*(B - A).T) * f
+    meio = (A + B) / 2 - g.centro
+    ang = np.arctan2(meio[:, 1], meio[:, 0])
+    eficaz = np.ones(len(A), dtype=bool)
+    for ref, lo, hi in setores:
+        phi = (ang - ref + math.pi) % (2 * math.pi) - math.pi
+        eficaz &= ~((phi > lo) & (phi < hi))
+
+    u1 = float(comprimento.sum())
+    u1_eff = float(comprimento[eficaz].sum())
+    rel_A, rel_B = A - g.centro, B - g.centro
+    segmentos = np.stack([A, B], axis=1)
+    segmentos.setflags(write=False)
+    eficaz.setflags(write=False)
+    return PerimetrosControlo(
+        d=d, u0=g.perimetro, u1=u1, u1_eff=u1_eff, u1_ineficaz=u1 - u1_eff,
+        W1_x=float((comprimento * _integral_abs(rel_A[:, 0], rel_B[:, 0])).sum()),
+        W1_y=float((comprimento * _integral_abs(rel_A[:, 1], rel_B[:, 1])).sum()),
+        segmentos=segmentos, eficaz=eficaz, aberturas=tuple(consideradas))
+
+
+_perimetros_cache = lru_cache(maxsize=TAMANHO_CACHE_PERIMETROS)(_calcular_perimetros)
+
+
+def info_cache_perimetros():
+    """Estatísticas da cache de perímetros: (hits, misses, maxsize, currsize)."""
+    return _perimetros_cache.cache_info()
+
+
+def limpar_cache_perimetros():
+    """Esvazia a cache de perímetros e repõe as estatísticas."""
+    _perimetros_cache.cache_clear()
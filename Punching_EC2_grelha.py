@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Exploração do espaço de projeto numa grelha d × fck × c1 × c2 × As.
+
+Para um pilar (tipo, forma, esforços e restantes argumentos fixos) avalia-se o
+produto cartesiano dos eixos com as fórmulas de PuncoamentoEC2Batch, sem formar
+todos os casos à partida: cada grandeza é calculada só sobre os eixos de que
+depende e fica com dimensão 1 nos restantes (difusão NumPy):
+
+    u0, u1, β, V_Ed,red, v_Ed(u0), v_Ed(u1), volume    – (d, 1, c1, c2, 1)
+    v_Rd,c                                              – (d, fck, 1, 1, As)
+    v_Rd,max                                            – (1, fck, 1, 1, 1)
+
+Só o estado, a utilização em u1 e o aço de punçoamento ocupam a grelha
+completa; são avaliados por blocos de valores de d (`bloco` pontos no máximo),
+pelo que a memória intermédia fica limitada. A frente de Pareto volume de
+betão × aço de punçoamento (Asw/sr,req · nº de perímetros) é reduzida bloco a
+bloco.
+"""
+
+import math
+
+import numpy as np
+
+from Punching_EC2 import (ESTADO_ARMADURA, ESTADO_ERRO, ESTADO_FALHA_CS_MAX, ESTADO_FALHA_U0,
+                          ESTADO_OK)
+from Punching_EC2_batch import PuncoamentoEC2Batch, _asw_sr, _n_perimetros
+
+EIXOS = ("d", "fck", "c1", "c2", "As")
+_ARGS_EIXOS = {"laje_d", "betão_fck", "pilar_c1", "pilar_c2",
+               "laje_As_lx_cm2pm", "laje_As_ly_cm2pm", "laje_rho_l"}
+
+
+def _frente_pareto(volume, aco, indice):
+    """Pontos não dominados (minimizar volume e aço); empates resolvidos pela ordem da grelha."""
+    ordem = np.lexsort((indice, aco, volume))
+    a = aco[ordem]
+    melhor = np.minimum.accumulate(a)
+    manter = np.ones(a.size, dtype=bool)
+    manter[1:] = a[1:] < melhor[:-1]
+    ordem = ordem[manter]
+    return volume[ordem], aco[ordem], indice[ordem]
+
+
+class ResultadoGrelha:
+    """
+    Resultado de explorar(): hipercubos indexados por (d, fck, c1, c2, As).
+
+    estado, util_u1, aco_puncoamento têm a forma completa da grelha; util_u0 e
+    volume têm dimensão 1 nos eixos de que não dependem (difundem-se com os outros).
+    aco_puncoamento = Asw/sr,req · nº de perímetros (m²/m·perímetro; 0 sem armadura,
+    NaN se não verifica). A frente de Pareto está em pareto_indices (m × 5),
+    pareto_volume (m³) e pareto_aco, por volume crescente.
+    """
+
+    def __init__(self, **valores):
+        self.__dict__.update(valores)
+
+    @property
+    def dimensoes(self):
+        return self.estado.shape
+
+    def viavel(self, com_armadura: bool = True) -> np.ndarray:
+        """Máscara dos pontos que verificam (com ou sem armadura de punçoamento)."""
+        ok = self.estado == ESTADO_OK
+        if com_armadura:
+            ok |= self.estado == ESTADO_ARMADURA
+        return ok
+
+    def ponto(self, indice) -> dict:
+        """Valores dos eixos num ponto da grelha, p.ex. ponto(r.pareto_indices[0])."""
+        return {eixo: self.eixos[eixo][i] for eixo, i in zip(EIXOS, indice)}
+
+
+def explorar(d, fck, c1, c2=None, As=None, *, bloco: int = 1_000_000,
+             area_laje: float = 25.0, altura_pilar: float = 3.0, recobrimento: float = 0.04,
+             **fixos) -> ResultadoGrelha:
+    """
+    Avalia a grelha d (m) × fck (MPa) × c1 (m) × c2 (m) × As (cm²/m, nas duas direções).
+
+    fixos são os restantes argumentos de PuncoamentoEC2Batch (escalares: aço, tipo,
+    forma, V_Ed, M_Edx, M_Edy, beta_mode, ...). c2 é ignorado nos pilares circulares.
+    O volume de betão é area_laje·(d + recobrimento) + área do pilar·altura_pilar.
+    """
+    repetidos = _ARGS_EIXOS & set(fixos)
+    if repetidos:
+        raise TypeError(f"Argumentos dados pelos eixos da grelha: {', '.join(sorted(repetidos))}.")
+    if any(np.ndim(v) for v in fixos.values()):
+        raise ValueError("Os argumentos fixos devem ser escalares (um único pilar).")
+    if As is None:
+        raise ValueError("Indique o eixo As (cm²/m).")
+    eixos = {nome: np.atleast_1d(np.asarray(v, dtype=float)).ravel()
+             for nome, v in zip(EIXOS, (d, fck, c1, np.nan if c2 is None else c2, As))}
+    nd, nf, nc1, nc2, nA = dims = tuple(v.size for v in eixos.values())
+    if min(dims) == 0:
+        raise ValueError("Eixo vazio.")
+
+    # geometria e ações: (d, 1, c1, c2, 1)
+    D, C1, C2 = np.meshgrid(eixos["d"], eixos["c1"], eixos["c2"], indexing="ij")
+    geo = PuncoamentoEC2Batch(laje_d=D.ravel(), betão_fck=eixos["fck"][0], pilar_c1=C1.ravel(),
+                              pilar_c2=C2.ravel(), laje_rho_l=0.01, **fixos)
+    geo._get_perimetros_criticos()
+    geo._get_beta()
+    geo._get_V_Ed_red_e_u1_efetivo()
+    fg = (nd, 1, nc1, nc2, 1)
+    g = {nome: getattr(geo, nome).reshape(fg)
+         for nome in ("d", "c1", "c2", "u0", "u1_eff", "beta", "V_Ed_red", "_beta_erro")}
+    erro = g["_beta_erro"] | (g["u0"] == 0) | (g["u1_eff"] == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v_Ed_u0 = (g["beta"] * geo.V_Ed[0]) / (g["u0"] * g["d"]) / 1e6
+        v_Ed_u1 = (g["beta"] * g["V_Ed_red"]) / (g["u1_eff"] * g["d"]) / 1e6
+    area_pilar = np.where(geo.forma[0] == 0, g["c1"] * g["c2"], math.pi * g["c1"]**2 / 4)
+    volume = area_laje * (g["d"] + recobrimento) + area_pilar * altura_pilar
+
+    # resistências: v_Rd,c em (d, fck, 1, 1, As); v_Rd,max em (1, fck, 1, 1, 1)
+    D, F, A = np.meshgrid(eixos["d"], eixos["fck"], eixos["As"], indexing="ij")
+    res = PuncoamentoEC2Batch(laje_d=D.ravel(), betão_fck=F.ravel(), pilar_c1=0.3, pilar_c2=0.3,
+                              laje_As_lx_cm2pm=A.ravel(), laje_As_ly_cm2pm=A.ravel(), **fixos)
+    fr = (nd, nf, 1, 1, nA)
+    v_Rd_c = res._get_v_Rd_c().reshape(fr)
+    v_Rd_max = (0.4 * res.nu * res.fcd).reshape(fr)[:1, :, :, :, :1]
+    fck_f = res.fck.reshape(fr)[:1, :, :, :, :1]
+    fywd, fywk, kmax = res.fywd[0], res.fywk[0], res.kmax
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        falha_u0 = ~erro & (v_Ed_u0 > v_Rd_max)
+        util_u0 = np.where(erro, np.nan, v_Ed_u0 / v_Rd_max).astype(np.float32)
+
+    estado = np.empty(dims, dtype=np.int8)
+    util_u1 = np.empty(dims, dtype=np.float32)
+    aco = np.empty(dims, dtype=np.float32)
+    por_d = nf * nc1 * nc2 * nA
+    passo = max(1, bloco // por_d)
+    frentes = []
+    for i0 in range(0, nd, passo):
+        sl = slice(i0, i0 + passo)
+        e, fu0 = erro[sl], falha_u0[sl]
+        vu1, vc = v_Ed_u1[sl], v_Rd_c[sl]
+        segue = ~e & ~fu0
+        armadura = segue & (vu1 > vc)
+        falha_cs = armadura & (vu1 > kmax * vc)
+        est = np.where(e, ESTADO_ERRO, np.where(fu0, ESTADO_FALHA_U0, np.where(
+            falha_cs, ESTADO_FALHA_CS_MAX, np.where(armadura, ESTADO_ARMADURA, ESTADO_OK))))
+        estado[sl] = est
+        with np.errstate(divide="ignore", invalid="ignore"):
+            util_u1[sl] = np.where(segue, vu1 / vc, np.nan)
+            Asw_sr_req = _asw_sr(vu1, vc, g["u1_eff"][sl], g["d"][sl], fck_f, fywd, fywk)[3]
+            u_out_ef = (g["beta"][sl] * g["V_Ed_red"][sl]) / (vc * g["d"][sl]) / 1e6
+            n_per = _n_perimetros(u_out_ef, g["c1"][sl], g["c2"][sl], g["d"][sl], geo.tipo[0], geo.forma[0])[1]
+        aco[sl] = np.where(est == ESTADO_OK, 0.0,
+                           np.where(est == ESTADO_ARMADURA, Asw_sr_req * np.nan_to_num(n_per), np.nan))
+
+        local = np.flatnonzero((est == ESTADO_OK) | (est == ESTADO_ARMADURA))
+        if local.size:
+            i, _, j, k, _ = np.unravel_index(local, est.shape)
+            frentes.append(_frente_pareto(volume[sl][i, 0, j, k, 0], aco[sl].reshape(-1)[local],
+                                          local + i0 * por_d))
+
+    if frentes:
+        vol_p, aco_p, idx_p = _frente_pareto(*(np.concatenate(x) for x in zip(*frentes)))
+    else:
+        vol_p, aco_p, idx_p = np.empty(0), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+    return ResultadoGrelha(eixos=eixos, estado=estado, util_u0=util_u0, util_u1=util_u1,
+                           aco_puncoamento=aco, volume=volume,
+                           pareto_indices=np.column_stack(np.unravel_index(idx_p, dims)),
+                           pareto_volume=vol_p, pareto_aco=aco_p)
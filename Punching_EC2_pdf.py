@@ -0,0 +1,512 @@
+# -*- coding: utf-8 -*-
+"""
+Relatórios PDF de verificação de punçoamento, um a um ou em lote (sem janela).
+
+A paginação é a do relatório da interface (Punching_EC2_GUI): A4, Courier,
+cabeçalho na primeira página e rodapé com a data de emissão. Para muitos
+pilares:
+    - as larguras das palavras (stringWidth) ficam em cache e a largura de uma
+      linha é a soma das larguras das palavras e dos espaços; a quebra de cada
+      texto também fica em cache (as frases normativas repetem-se em todos os
+      relatórios);
+    - a paginação (PaginacaoPDF) é criada uma vez por processo e reutilizada;
+    - os relatórios são desenhados por blocos num conjunto de processos;
+    - em modo livro, cada bloco gera uma parte e as partes são juntas com pypdf
+      (opcional; sem pypdf o livro é desenhado em série num só ficheiro).
+
+Utilização:
+    python Punching_EC2_pdf.py mapa.csv relatorios/ --workers 8
+    python Punching_EC2_pdf.py mapa.csv livro.pdf --livro --workers 8
+
+Linhas/casos inválidos não interrompem a exportação: são listados no fim
+(código de saída 1).
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from functools import lru_cache
+
+from Punching_EC2 import CAMPOS_ENTRADA, PuncoamentoEC2, _caso_para_tupla
+from Punching_EC2_cli import mensagem_de_erro
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.pdfgen import canvas as pdf_canvas
+    REPORTLAB_OK = True
+except Exception:
+    REPORTLAB_OK = False
+
+try:
+    from pypdf import PdfWriter
+    PYPDF_OK = True
+except Exception:
+    PYPDF_OK = False
+
+REPO_URL = "https://github.com/lutondatomalela/PunchingShearEC2"
+TITULO_PDF = "PunchingShearEC2 - Relatório de Verificação de Punçoamento"
+
+
+# ---------------------------------------------------------------------
+# --- CONTEÚDO DO RELATÓRIO ---
+# ---------------------------------------------------------------------
+
+def conclusao(v: PuncoamentoEC2) -> str:
+    """Frase de conclusão (a mesma do resumo da interface)."""
+    if v.v_Ed_u0 > v.v_Rd_max:
+        return "Falha no perímetro u0"
+    if v.v_Ed_u1 > v.v_Rd_c:
+        return "É necessária armadura de punçoamento"
+    return "Não é necessária armadura de punçoamento"
+
+
+def secoes_relatorio(v: PuncoamentoEC2, conclusao_texto: str = None, As_lx: str = None,
+                     As_ly: str = None, beta_mode: str = None) -> list:
+    """
+    Secções do relatório ({"title", "lines"}) de uma verificação já calculada.
+
+    As_lx/As_ly (cm²/m) e beta_mode são os textos a mostrar (por omissão, os
+    valores do motor); conclusao_texto por omissão é conclusao(v).
+    """
+    def fmt(num, nd=3):
+        try:
+            return f"{float(num):.{nd}f}"
+        except Exception:
+            return "-"
+
+    def yesno(flag):
+        return "Sim" if flag else "Não"
+
+    As_lx = fmt(v.Asx_cm2pm, 2) if As_lx is None else As_lx
+    As_ly = fmt(v.Asy_cm2pm, 2) if As_ly is None else As_ly
+    beta_mode = v.beta_mode if beta_mode is None else beta_mode
+    conclusao_texto = conclusao(v) if conclusao_texto is None else conclusao_texto
+    tipo = v.tipo_pilar.capitalize()
+    forma = v.forma_pilar.capitalize()
+    c2_label = "Diâmetro do pilar D [m]" if v.forma_pilar == "circular" else "Dimensão do pilar c2 [m]"
+    ratio_u0 = v.v_Ed_u0 / v.v_Rd_max if getattr(v, 'v_Rd_max', 0) else float('inf')
+    ratio_u1 = v.v_Ed_u1 / v.v_Rd_c if getattr(v, 'v_Rd_c', 0) else float('inf')
+
+    sections = [
+        {"title": "1. Info", "lines": [
+            "Verificação de punçoamento de ligação laje-pilar segundo a NP EN 1992-1-1, com avaliação da resistência na face do pilar e da resistência sem armadura de punçoamento no perímetro de controlo básico.",
+        ]},
+        {"title": "2. Dados de entrada", "lines": [
+            f"Resistência característica do betão fck [MPa]: {fmt(v.fck)}",
+            f"Tensão característica de cedência das armaduras longitudinais fyk [MPa]: {fmt(v.fyk)}",
+            f"Tensão característica de cedência das armaduras de punçoamento fywk [MPa]: {fmt(v.fywk)}",
+            f"Altura útil da laje d [m]: {fmt(v.d)}",
+            f"Armadura longitudinal As,lx [cm²/m]: {As_lx}",
+            f"Armadura longitudinal As,ly [cm²/m]: {As_ly}",
+            f"Taxa média de armadura ρl [%]: {fmt(v.rho_l * 100)}",
+            f"Tensão média de compressão σcp [MPa]: {fmt(v.sigma_cp)}",
+            f"Tipo de pilar: {tipo}",
+            f"Forma do pilar: {forma}",
+            f"Dimensão do pilar c1 [m]: {fmt(v.c1)}",
+            f"{c2_label}: {fmt(v.c2 if getattr(v,'c2',None) is not None else getattr(v,'D',None))}",
+            f"Esforço transverso de cálculo VEd [kN]: {fmt(v.V_Ed / 1000)}",
+            f"Momento fletor de cálculo MEdx [kN·m]: {fmt(v.M_Edx / 1000)}",
+            f"Momento fletor de cálculo MEdy [kN·m]: {fmt(v.M_Edy / 1000)}",
+            f"Elemento de fundação tipo sapata: {yesno(v.is_sapata)}",
+            f"Existem aberturas próximas consideradas na redução de perímetro: {yesno(v.u1_ineffective > 0)}",
+            f"Perímetro ineficaz devido a aberturas u1,inef [m]: {fmt(v.u1_ineffective)}",
+            f"Modo de avaliação do coeficiente β: {beta_mode.upper()}",
+        ]},
+        {"title": "3. Parâmetros geométricos e mecânicos", "lines": [
+            f"Perímetro na face do pilar u0 [m]: {fmt(v.u0)}",
+            f"Perímetro de controlo básico u1 [m]: {fmt(v.u1)}",
+            f"Perímetro de controlo efetivo u1,ef [m]: {fmt(v.u1_eff)}",
+            f"Esforço transverso reduzido VEd,red [kN]: {fmt(v.V_Ed_red / 1000)}",
+            f"Coeficiente β [-]: {fmt(v.beta)}",
+            f"Coeficiente k [-]: {fmt(getattr(v, 'k_val', None))}",
+            f"Tensão de cálculo v_Ed(u0) [MPa]: {fmt(v.v_Ed_u0)}",
+            f"Tensão resistente máxima v_Rd,max [MPa]: {fmt(v.v_Rd_max)}",
+            f"Tensão de cálculo v_Ed(u1) [MPa]: {fmt(v.v_Ed_u1)}",
+            f"Tensão resistente do betão v_Rd,c [MPa]: {fmt(v.v_Rd_c)}",
+            f"Índice de utilização em u0 [-]: {fmt(ratio_u0)}",
+            f"Índice de utilização em u1 [-]: {fmt(ratio_u1)}",
+        ]},
+        {"title": "4. Referências normativas adotadas", "lines": [
+            "Determinação do perímetro de controlo básico conforme 6.4.2 da NP EN 1992-1-1.",
+            "Avaliação do coeficiente β conforme 6.4.3, incluindo expressões (6.39), (6.41), (6.44), (6.45) e (6.46), conforme aplicável ao tipo de pilar e à direção da excentricidade.",
+            "Resistência ao punçoamento sem armadura conforme 6.4.4, com v_Rd,c pela expressão (6.47).",
+            "Resistência máxima junto ao pilar conforme 6.4.5 e respetiva nota nacional adotada no programa para v_Rd,max.",
+            "Dimensionamento da armadura de punçoamento, quando necessária, conforme 6.4.5 e expressão (6.52).",
+        ]},
+        {"title": "5. Verificações realizadas", "lines": [
+            f"Verificação na face do pilar: v_Ed(u0) = {fmt(v.v_Ed_u0)} MPa {'≤' if v.v_Ed_u0 <= v.v_Rd_max else '>'} v_Rd,max = {fmt(v.v_Rd_max)} MPa.",
+            f"Verificação no perímetro de controlo básico: v_Ed(u1) = {fmt(v.v_Ed_u1)} MPa {'≤' if v.v_Ed_u1 <= v.v_Rd_c else '>'} v_Rd,c = {fmt(v.v_Rd_c)} MPa.",
+        ]},
+        {"title": "6. Conclusão", "lines": [
+            conclusao_texto + ".",
+        ]},
+    ]
+
+    det_lines = []
+    if getattr(v, 'armadura_necessaria', False):
+        det_lines.extend([
+            f"Tensão resistente máxima com armadura v_Rd,cs,max [MPa]: {fmt(getattr(v, 'v_Rd_cs_max', None))}",
+            f"Tensão efetiva de cálculo do aço de punçoamento f_ywd,ef [MPa]: {fmt(getattr(v, 'f_ywd_ef', None))}",
+            f"Armadura calculada Asw/sr [cm²/m]: {fmt(getattr(v, 'Asw_sr_calc', 0) * 1e4)}",
+            f"Armadura mínima Asw/sr [cm²/m]: {fmt(getattr(v, 'Asw_sr_min', 0) * 1e4)}",
+            f"Armadura adotada Asw/sr [cm²/m]: {fmt(getattr(v, 'Asw_sr_req', 0) * 1e4)}",
+            f"Perímetro exterior efetivo u_out,ef [m]: {fmt(getattr(v, 'u_out_ef', None))}",
+            f"Extensão radial a armar a partir da face do pilar [m]: {fmt(getattr(v, 'dist_zona_armar', None))}",
+            f"Posição máxima do primeiro perímetro s0,max [m]: {fmt(getattr(v, 's0_max', None))}",
+            f"Espaçamento radial máximo entre perímetros sr,max [m]: {fmt(getattr(v, 'sr_max', None))}",
+            f"Número estimado de perímetros de armadura: {getattr(v, 'n_perimetros', '-')}",
+            f"Área de armadura por perímetro Asw [cm²]: {fmt(getattr(v, 'Asw_por_perimetro', 0) * 1e4)}",
+            "Pormenorização resultante: dispor o primeiro perímetro a uma distância não superior a 0,5d da face do pilar e os perímetros seguintes com espaçamento radial não superior a 0,75d, prolongando a armadura até ao limite definido por u_out,ef.",
+        ])
+    else:
+        det_lines.append("Pormenorização resultante: não é necessária armadura específica de punçoamento para a situação verificada.")
+    sections.append({"title": "7. Recomendação de pormenorização", "lines": det_lines})
+
+    note_lines = []
+    if v.tipo_pilar == 'bordo':
+        note_lines.append("Nota: para pilar de bordo, o programa adota a formulação do EC2 com u1*, β pela expressão (6.44), quando aplicável, e W1 pela expressão (6.45).")
+    elif v.tipo_pilar == 'canto':
+        note_lines.append("Nota: para pilar de canto com excentricidade dirigida para o interior da laje, o programa adota β = u1/u1* conforme a expressão (6.46).")
+    if note_lines:
+        sections.append({"title": "", "lines": note_lines})
+
+    return sections
+
+
+# ---------------------------------------------------------------------
+# --- MÉTRICAS DE LETRA E QUEBRA DE LINHAS ---
+# ---------------------------------------------------------------------
+
+@lru_cache(maxsize=65536)
+def _largura(texto: str, fonte: str, tamanho: float) -> float:
+    """stringWidth com cache (palavras, espaço, rodapés)."""
+    return stringWidth(texto, fonte, tamanho)
+
+
+@lru_cache(maxsize=8192)
+def quebrar_texto(texto: str, fonte: str, tamanho: float, largura_max: float) -> tuple:
+    """
+    Quebra `texto` em linhas de largura ≤ largura_max (palavra a palavra).
+
+    A largura da linha em curso é acumulada (palavra + espaço), em vez de medir
+    a linha inteira a cada palavra; o resultado é o da quebra gulosa com
+    stringWidth (fontes sem kerning, como as Type 1 base do PDF).
+    """
+    palavras = texto.split()
+    if not palavras:
+        return ("",)
+    espaco = _largura(" ", fonte, tamanho)
+    linhas, atual = [], palavras[0]
+    largura = _largura(atual, fonte, tamanho)
+    for palavra in palavras[1:]:
+        w = _largura(palavra, fonte, tamanho)
+        if largura + espaco + w <= largura_max:
+            atual += " " + palavra
+            largura += espaco + w
+        else:
+            linhas.append(atual)
+            atual, largura = palavra, w
+    linhas.append(atual)
+    return tuple(linhas)
+
+
+# ---------------------------------------------------------------------
+# --- PAGINAÇÃO ---
+# ---------------------------------------------------------------------
+
+class PaginacaoPDF:
+    """
+    Paginação do relatório (A4): medidas, letras e cabeçalho calculados uma vez
+    e reutilizados em todos os relatórios desenhados com a mesma instância.
+    """
+
+    def __init__(self):
+        if not REPORTLAB_OK:
+            raise RuntimeError("A biblioteca ReportLab não está disponível neste ambiente.")
+        self.width, self.height = A4
+        self.x0 = 2.0 * cm
+        self.top_margin = 2.2 * cm
+        self.bottom_margin = 1.8 * cm
+        self.usable_w = self.width - 4.0 * cm
+        self.body_font = "Courier"
+        self.body_bold = "Courier-Bold"
+        self.body_size = 10
+        self.subtitle_size = 12
+        self.footer_size = 8
+        self.body_leading = self.body_size * 1.5
+        self.section_gap = self.body_size * 2.0
+        self.subtitle_gap = self.body_size * 2.0
+        self.prog_text = "Programa: PunchingShearEC2"
+        self.prog_w = stringWidth(self.prog_text, self.body_font, self.body_size)
+
+    def novo_canvas(self, caminho: str, titulo: str = TITULO_PDF):
+        """Canvas A4 para `caminho`, com o título do documento."""
+        c = pdf_canvas.Canvas(caminho, pagesize=A4)
+        c.setTitle(titulo)
+        return c
+
+    def desenhar(self, c, secoes: list, emitido_em: str, marcador: str = None) -> int:
+        """
+        Desenha um relatório a partir da página atual (vazia) de `c`, sem a fechar.
+
+        marcador: se dado, entrada no índice (outline) do PDF na primeira página.
+        Devolve o nº de páginas do relatório.
+        """
+        footer = f"PunchingShearEC2 | {emitido_em}"
+        footer_w = _largura(footer, self.body_font, self.footer_size)
+        footer_x = (self.width - footer_w) / 2
+        footer_y = 1.0 * cm
+        x0, bottom_margin, body_leading = self.x0, self.bottom_margin, self.body_leading
+        body_font, body_size = self.body_font, self.body_size
+        paginas = 1
+
+        def draw_footer():
+            c.setFont(body_font, self.footer_size)
+            c.drawString(footer_x, footer_y, footer)
+            c.linkURL(REPO_URL, (footer_x, footer_y-2, footer_x + footer_w, footer_y + self.footer_size), relative=0)
+
+        def new_page():
+            nonlocal paginas
+            c.showPage()
+            paginas += 1
+            return self.height - self.top_margin
+
+        # primeira página: cabeçalho
+        y = self.height - self.top_margin
+        if marcador is not None:
+            chave = f"r{c.getPageNumber()}"
+            c.bookmarkPage(chave)
+            c.addOutlineEntry(marcador, chave, level=0)
+        c.setFont(self.body_bold, 14)
+        c.drawString(x0, y, "Relatório de verificação de punçoamento")
+        y -= 0.9 * cm
+        c.setFont(body_font, body_size)
+        c.drawString(x0, y, self.prog_text)
+        c.linkURL(REPO_URL, (x0, y-2, x0 + self.prog_w, y + body_size), relative=0)
+        y -= 0.55 * cm
+        c.drawString(x0, y, "Norma de referência principal: NP EN 1992-1-1")
+        y -= 0.8 * cm
+
+        c.setFont(body_font, body_size)
+        for section in secoes:
+            title = section.get("title", "")
+            lines = section.get("lines", [])
+            if title:
+                needed = self.subtitle_size + self.subtitle_gap + body_leading * max(1, len(lines)) + self.section_gap
+                if y < bottom_margin + needed:
+                    draw_footer()
+                    y = new_page()
+                c.setFont(self.body_bold, self.subtitle_size)
+                c.drawString(x0, y, title)
+                y -= self.subtitle_gap
+            c.setFont(body_font, body_size)
+            for line in lines:
+                for wrapped in quebrar_texto(line if line else " ", body_font, body_size, self.usable_w):
+                    if y < bottom_margin + body_leading:
+                        draw_footer()
+                        y = new_page()
+                        c.setFont(body_font, body_size)
+                    c.drawString(x0, y, wrapped)
+                    y -= body_leading
+            y -= self.section_gap
+
+        draw_footer()
+        return paginas
+
+
+_paginacao = None
+
+
+def _paginacao_do_processo() -> PaginacaoPDF:
+    global _paginacao
+    if _paginacao is None:
+        _paginacao = PaginacaoPDF()
+    return _paginacao
+
+
+# ---------------------------------------------------------------------
+# --- EXPORTAÇÃO EM LOTE ---
+# ---------------------------------------------------------------------
+
+def _verificacao(valores) -> PuncoamentoEC2:
+    v = PuncoamentoEC2(**dict(zip(CAMPOS_ENTRADA, valores)))
+    v.verificar_puncoamento(relatorio=False)
+    return v
+
+
+def _secoes_do_caso(valores) -> tuple:
+    """(secções, None) do relatório; se o caso for inválido, (página de erro, mensagem)."""
+    try:
+        return secoes_relatorio(_verificacao(valores)), None
+    except Exception as exc:  # um caso inválido não pode interromper o lote
+        mensagem = mensagem_de_erro(exc)
+        return [{"title": "Caso não verificado", "lines": [
+            f"Não foi possível verificar este caso: {mensagem}",
+            "",
+            "Dados de entrada:",
+        ] + [f"  {nome} = {valor!r}" for nome, valor in zip(CAMPOS_ENTRADA, valores)]}], mensagem
+
+
+def _renderizar_bloco(tarefa) -> tuple:
+    """
+    Desenha um bloco de relatórios (corre nos processos); devolve (nº de páginas,
+    [(nome, mensagem)] dos casos inválidos, que ficam com uma página de erro).
+
+    tarefa = (entradas, caminhos, livro, marcadores, emitido_em): com livro, um
+    único ficheiro caminhos[0] com todos os relatórios; senão, um ficheiro por caso.
+    """
+    entradas, caminhos, livro, marcadores, emitido_em = tarefa
+    pag = _paginacao_do_processo()
+    paginas, erros = 0, []
+    if livro:
+        c = pag.novo_canvas(caminhos[0], "PunchingShearEC2 - Relatórios de Verificação de Punçoamento")
+        for i, (valores, marcador) in enumerate(zip(entradas, marcadores)):
+            if i:
+                c.showPage()
+            secoes, erro = _secoes_do_caso(valores)
+            if erro is not None:
+                erros.append((marcador, erro))
+            paginas += pag.desenhar(c, secoes, emitido_em, marcador)
+        c.save()
+        return paginas, erros
+    for valores, caminho, nome in zip(entradas, caminhos, marcadores):
+        secoes, erro = _secoes_do_caso(valores)
+        if erro is not None:
+            erros.append((nome, erro))
+        c = pag.novo_canvas(caminho)
+        paginas += pag.desenhar(c, secoes, emitido_em)
+        c.save()
+    return paginas, erros
+
+
+def exportar_pdfs(casos, destino: str, livro: bool = False, workers: int | None = None,
+                  chunksize: int = 64, nomes=None, emitido_em: str = None, executor=None) -> dict:
+    """
+    Gera os relatórios PDF de muitos pilares.
+
+    casos ...... iterável de dicts com os argumentos de PuncoamentoEC2 (como em run_many)
+    destino .... pasta (um PDF por caso) ou, com livro=True, o ficheiro PDF único
+    workers .... nº de processos (None -> os.cpu_count(); 1 -> em série)
+    chunksize .. nº de relatórios por bloco enviado a cada processo
+    nomes ...... nomes dos ficheiros / entradas do índice (por omissão pilar_00001, ...)
+    emitido_em . data de emissão no rodapé (por omissão, agora)
+    executor ... ProcessPoolExecutor já criado, a reutilizar (ignora workers)
+
+    O livro é composto por partes (uma por bloco) juntas com pypdf; sem pypdf é
+    desenhado em série num único ficheiro. Um caso inválido não interrompe o lote:
+    o seu relatório é uma página com o erro e o caso é listado em "erros".
+    Devolve {"ficheiros", "relatorios", "paginas", "segundos",
+    "paginas_por_segundo", "erros": [(nome, mensagem), ...]}.
+    """
+    if not REPORTLAB_OK:
+        raise RuntimeError("A biblioteca ReportLab não está disponível neste ambiente.")
+    if chunksize < 1:
+        raise ValueError("chunksize deve ser ≥ 1.")
+    t0 = time.perf_counter()
+    entradas = [_caso_para_tupla(c) for c in casos]
+    n = len(entradas)
+    nomes = [f"pilar_{i + 1:05d}" for i in range(n)] if nomes is None else [str(x) for x in nomes]
+    if len(nomes) != n:
+        raise ValueError("nomes deve ter um elemento por caso.")
+    emitido_em = emitido_em or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    juntar = livro and PYPDF_OK
+    if livro and not juntar:
+        chunksize, workers = max(n, 1), 1  # sem pypdf: uma só parte, desenhada em série
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(destino))) if juntar \
+            else nullcontext() as pasta_tmp:
+        if livro:
+            ficheiros = [destino]
+        else:
+            os.makedirs(destino, exist_ok=True)
+            ficheiros = [os.path.join(destino, nome + ".pdf") for nome in nomes]
+        tarefas = []
+        for i in range(0, n, chunksize):
+            fim = min(i + chunksize, n)
+            if juntar:
+                caminhos = [os.path.join(pasta_tmp, f"parte_{i:08d}.pdf")]
+            else:
+                caminhos = ficheiros[:1] if livro else ficheiros[i:fim]
+            tarefas.append((entradas[i:fim], caminhos, livro, nomes[i:fim], emitido_em))
+
+        if executor is not None and len(tarefas) > 1:
+            partes = list(executor.map(_renderizar_bloco, tarefas))
+        elif workers <= 1 or len(tarefas) <= 1:
+            partes = list(map(_renderizar_bloco, tarefas))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(tarefas))) as ex:
+                partes = list(ex.map(_renderizar_bloco, tarefas))
+
+        if juntar:
+            escritor = PdfWriter()
+            for tarefa in tarefas:
+                escritor.append(tarefa[1][0])
+            with open(destino, "wb") as f:
+                escritor.write(f)
+
+    segundos = time.perf_counter() - t0
+    total = sum(paginas for paginas, _ in partes)
+    return {"ficheiros": ficheiros if n else [], "relatorios": n, "paginas": total,
+            "segundos": segundos, "paginas_por_segundo": total / segundos if segundos > 0 else None,
+            "erros": [erro for _, erros in partes for erro in erros]}
+
+
+# ---------------------------------------------------------------------
+# --- LINHA DE COMANDOS ---
+# ---------------------------------------------------------------------
+
+def main(argv=None) -> int:
+    from Punching_EC2_stream import ler_linhas, linha_para_caso
+
+    parser = argparse.ArgumentParser(
+        description="Relatórios PDF de punçoamento (NP EN 1992-1-1) de um mapa de pilares em CSV/Parquet.")
+    parser.add_argument("entrada", help="mapa de pilares (.csv ou .parquet; colunas de Punching_EC2_stream)")
+    parser.add_argument("destino", help="pasta de saída (um PDF por pilar) ou ficheiro PDF com --livro")
+    parser.add_argument("--livro", action="store_true", help="um único PDF com todos os relatórios")
+    parser.add_argument("--workers", type=int, default=None, help="nº de processos (default: nº de CPUs)")
+    parser.add_argument("--bloco", type=int, default=64, help="relatórios por bloco (default: 64)")
+    parser.add_argument("--sep", default=",", help="separador do CSV de entrada (default: ,)")
+    parser.add_argument("--fyk", type=float, default=500.0, help="fyk por omissão (MPa)")
+    parser.add_argument("--fywk", type=float, default=500.0, help="fywk por omissão (MPa)")
+    parser.add_argument("--beta", default="simplificado", help="modo de β por omissão")
+    args = parser.parse_args(argv)
+
+    if not REPORTLAB_OK:
+        print("A biblioteca ReportLab não está disponível neste ambiente.", file=sys.stderr)
+        return 1
+    defaults = {"fyk": args.fyk, "fywk": args.fywk, "beta_mode": args.beta}
+    casos, nomes, erros = [], [], []
+    for n, linha in enumerate(ler_linhas(args.entrada, args.sep)):
+        ident = str(linha.get("id") or "").strip()
+        nome = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in ident) or f"pilar_{n + 1:05d}"
+        try:
+            casos.append(linha_para_caso(linha, defaults))
+        except Exception as exc:  # linha inválida: sem relatório, listada no fim
+            erros.append((nome, mensagem_de_erro(exc)))
+            continue
+        nomes.append(nome)
+    if len(set(nomes)) != len(nomes):  # ids repetidos: prefixo com o nº da linha
+        nomes = [f"{n + 1:05d}_{nome}" for n, nome in enumerate(nomes)]
+
+    res = exportar_pdfs(casos, args.destino, livro=args.livro, workers=args.workers,
+                        chunksize=args.bloco, nomes=nomes)
+    erros += res["erros"]
+    print(f"Concluído: {res['relatorios']} relatórios, {res['paginas']} páginas em "
+          f"{res['segundos']:.1f} s ({res['paginas_por_segundo'] or 0:.0f} páginas/s) -> {args.destino}",
+          file=sys.stderr)
+    for nome, mensagem in erros:
+        print(f"Erro em {nome}: {mensagem}", file=sys.stderr)
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
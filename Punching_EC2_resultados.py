@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Armazenamento em colunas dos resultados de verificações em lote.
+
+Um conjunto de resultados é uma pasta com um ficheiro binário por campo de
+CAMPOS_RESULTADO (valores contíguos, little-endian, tipos de dtype_resultado())
+e um meta.json com o nº de casos. Os campos reabrem-se com np.memmap, sem
+cópia nem recálculo, e filtram-se diretamente:
+
+    res = abrir_resultados("run_2026_10")
+    criticos = np.flatnonzero(res.util_u1() > 0.95)
+    tabela = res.registos(criticos)
+
+A pasta pode ser escrita aos blocos (EscritorResultados); o meta.json é
+atualizado após cada bloco, pelo que uma execução interrompida fica legível
+até ao último bloco concluído.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from Punching_EC2 import CAMPOS_RESULTADO, PunchingResult, dtype_resultado
+
+FORMATO = "PunchingShearEC2-colunas"
+VERSAO = 1
+_META = "meta.json"
+
+
+def _ficheiro(caminho: str, nome: str) -> str:
+    return os.path.join(caminho, nome + ".bin")
+
+
+def _para_array(dados) -> np.ndarray:
+    """Converte array estruturado, PuncoamentoEC2Batch ou sequência de PunchingResult/dicts."""
+    if hasattr(dados, "to_array"):
+        return dados.to_array()
+    if isinstance(dados, np.ndarray):
+        if dados.dtype != dtype_resultado():
+            raise ValueError("O array não tem o dtype de dtype_resultado().")
+        return dados
+    registos = [r if isinstance(r, PunchingResult) else PunchingResult(**r) for r in dados]
+    return PunchingResult.to_array(registos)
+
+
+def _ler_meta(caminho: str) -> dict:
+    with open(os.path.join(caminho, _META), encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("formato") != FORMATO:
+        raise ValueError(f"'{caminho}' não é uma pasta de resultados ({FORMATO}).")
+    if meta.get("versao", 0) > VERSAO:
+        raise ValueError(f"Versão {meta['versao']} do formato não suportada.")
+    return meta
+
+
+class EscritorResultados:
+    """
+    Escreve resultados em colunas, aos blocos.
+
+    inicio = 0 cria (ou substitui) a pasta; inicio > 0 retoma uma pasta existente,
+    descartando os casos a partir de `inicio` (p.ex. de um bloco interrompido).
+    """
+
+    def __init__(self, caminho: str, inicio: int = 0):
+        self.caminho = caminho
+        self.dtype = dtype_resultado()
+        os.makedirs(caminho, exist_ok=True)
+        if inicio > 0:
+            n = _ler_meta(caminho)["n"]
+            if n < inicio:
+                raise ValueError(f"A pasta tem {n} casos; não é possível retomar no caso {inicio}.")
+            for nome in CAMPOS_RESULTADO:
+                with open(_ficheiro(caminho, nome), "r+b") as f:
+                    f.truncate(inicio * self.dtype[nome].itemsize)
+        else:
+            for nome in CAMPOS_RESULTADO:
+                open(_ficheiro(caminho, nome), "wb").close()
+        self.n = inicio
+        self._escrever_meta()
+
+    def _escrever_meta(self):
+        meta = {"formato": FORMATO, "versao": VERSAO, "n": self.n,
+                "colunas": {nome: self.dtype[nome].str for nome in CAMPOS_RESULTADO}}
+        temp = os.path.join(self.caminho, _META + ".tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(temp, os.path.join(self.caminho, _META))
+
+    def acrescentar(self, dados) -> int:
+        """Acrescenta um bloco de resultados; devolve o nº total de casos escritos."""
+        arr = _para_array(dados)
+        for nome in CAMPOS_RESULTADO:
+            with open(_ficheiro(self.caminho, nome), "ab") as f:
+                f.write(np.ascontiguousarray(arr[nome]).tobytes())
+        self.n += arr.size
+        self._escrever_meta()
+        return self.n
+
+
+def guardar_resultados(caminho: str, dados) -> "ResultadosColunas":
+    """Escreve todos os resultados de uma vez e devolve-os reabertos em memória mapeada."""
+    EscritorResultados(caminho).acrescentar(dados)
+    return abrir_resultados(caminho)
+
+
+class ResultadosColunas:
+    """Pasta de resultados aberta em memória mapeada (uma coluna np.memmap por campo)."""
+
+    def __init__(self, caminho: str, modo: str = "r"):
+        if modo not in ("r", "r+", "c"):
+            raise ValueError("modo deve ser 'r', 'r+' ou 'c'.")
+        meta = _ler_meta(caminho)
+        self.caminho = caminho
+        self.n = meta["n"]
+        self.campos = tuple(meta["colunas"])
+        self._colunas = {}
+        for nome, tipo in meta["colunas"].items():
+            if self.n == 0:
+                self._colunas[nome] = np.empty(0, dtype=tipo)
+            else:
+                self._colunas[nome] = np.memmap(_ficheiro(caminho, nome), dtype=tipo, mode=modo,
+                                                shape=(self.n,))
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, nome: str) -> np.ndarray:
+        return self._colunas[nome]
+
+    def util_u0(self) -> np.ndarray:
+        """Utilização da escora em u0: v_Ed(u0) / v_Rd,max (NaN se não calculada)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self["v_Rd_max"] > 0, self["v_Ed_u0"] / self["v_Rd_max"], np.nan)
+
+    def util_u1(self) -> np.ndarray:
+        """Utilização sem armadura em u1: v_Ed(u1) / v_Rd,c (NaN se não calculada)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self["v_Rd_c"] > 0, self["v_Ed_u1"] / self["v_Rd_c"], np.nan)
+
+    def registos(self, indices=None) -> np.ndarray:
+        """Cópia, em array estruturado, dos casos `indices` (máscara ou índices; None = todos)."""
+        sel = slice(None) if indices is None else indices
+        primeira = self[self.campos[0]][sel]
+        arr = np.empty(np.shape(primeira), dtype=dtype_resultado())
+        for nome in self.campos:
+            arr[nome] = self[nome][sel]
+        return arr
+
+
+def abrir_resultados(caminho: str, modo: str = "r") -> ResultadosColunas:
+    """Reabre uma pasta de resultados em memória mapeada (modo 'r' só de leitura)."""
+    return ResultadosColunas(caminho, modo)
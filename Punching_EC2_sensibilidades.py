@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Sensibilidades analíticas das utilizações em relação às entradas (modo direto).
+
+Para um mapa de pilares (argumentos de PuncoamentoEC2Batch, escalares ou arrays)
+devolve, por caso, as utilizações
+
+    u0     = v_Ed(u0) / v_Rd,max
+    u1     = v_Ed(u1) / v_Rd,c
+    cs_max = v_Ed(u1) / (k_max · v_Rd,c)
+
+e as derivadas parciais de cada uma em relação a VARIAVEIS (d, fck, c1, c2,
+As_lx, As_ly, V_Ed, M_Edx, M_Edy). As derivadas propagam-se por diferenciação
+automática em modo direto: as entradas passam a números duais (valor e uma
+derivada por variável) e atravessam os mesmos métodos de PuncoamentoEC2Batch
+(ρl e parâmetros de cálculo, perímetros, termos de β com a interpolação linear
+por troços do Quadro 6.1, β, V_Ed,red, u1,ef e v_Rd,c, com os limites min/max
+de ρl, k, v_min e k_e). Uma só passagem vetorizada dá todas as derivadas, em
+vez das 2·9 avaliações das diferenças centradas.
+
+Nos pontos angulosos (mudança de ramo ou limite atingido) usa-se a derivada do
+ramo escolhido pelo motor (max/min: o primeiro argumento em caso de empate;
+excentricidade nula: derivada nula de √(e_x² + e_y²)).
+Unidades: por m (d, c1, c2), por MPa (fck), por cm²/m (As_lx, As_ly), por N
+(V_Ed) e por N·m (M_Edx, M_Edy). Com ρl dado diretamente (laje_rho_l) as
+derivadas em As_lx/As_ly são nulas; nos pilares circulares c1 é o diâmetro e a
+derivada em c2 é nula.
+"""
+
+import copy
+
+import numpy as np
+
+from Punching_EC2_batch import PuncoamentoEC2Batch
+
+VARIAVEIS = ("d", "fck", "c1", "c2", "As_lx", "As_ly", "V_Ed", "M_Edx", "M_Edy")
+VERIFICACOES = ("u0", "u1", "cs_max")
+
+#variável -> argumento de PuncoamentoEC2 / PuncoamentoEC2Batch
+ARGUMENTOS = {"d": "laje_d", "fck": "betão_fck", "c1": "pilar_c1", "c2": "pilar_c2",
+              "As_lx": "laje_As_lx_cm2pm", "As_ly": "laje_As_ly_cm2pm",
+              "V_Ed": "V_Ed", "M_Edx": "M_Edx", "M_Edy": "M_Edy"}
+
+
+# ---------------------------------------------------------------------
+# --- NÚMEROS DUAIS (diferenciação automática em modo direto) ---
+# ---------------------------------------------------------------------
+
+class Dual:
+    """
+    Número dual vetorizado: valor (array) e derivadas, um dict índice da variável ->
+    array (ou escalar), só com as variáveis de que o valor depende.
+
+    Segue os protocolos __array_ufunc__/__array_function__ do NumPy para as
+    operações usadas por PuncoamentoEC2Batch; as restantes dão TypeError.
+    """
+
+    __slots__ = ("valor", "derivadas")
+    __hash__ = None
+
+    def __init__(self, valor, derivadas):
+        self.valor = valor
+        self.derivadas = derivadas
+
+    @property
+    def shape(self):
+        return np.shape(self.valor)
+
+    def __repr__(self):
+        return f"Dual(valor={self.valor!r}, derivadas={self.derivadas!r})"
+
+    def __array_ufunc__(self, ufunc, method, *entradas, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        if ufunc in _SEM_DERIVADA:
+            return ufunc(*(_valor(x) for x in entradas))
+        regra = _REGRAS.get(ufunc)
+        if regra is None:
+            return NotImplemented
+        return regra(*entradas)
+
+    def __array_function__(self, func, types, args, kwargs):
+        funcao = _FUNCOES.get(func)
+        if funcao is None:
+            return NotImplemented
+        return funcao(*args, **kwargs)
+
+    def __add__(self, outro): return np.add(self, outro)
+    def __radd__(self, outro): return np.add(outro, self)
+    def __sub__(self, outro): return np.subtract(self, outro)
+    def __rsub__(self, outro): return np.subtract(outro, self)
+    def __mul__(self, outro): return np.multiply(self, outro)
+    def __rmul__(self, outro): return np.multiply(outro, self)
+    def __truediv__(self, outro): return np.true_divide(self, outro)
+    def __rtruediv__(self, outro): return np.true_divide(outro, self)
+    def __pow__(self, outro): return np.power(self, outro)
+    def __neg__(self): return np.negative(self)
+    def __pos__(self): return self
+    def __abs__(self): return np.absolute(self)
+    def __lt__(self, outro): return np.less(self, outro)
+    def __le__(self, outro): return np.less_equal(self, outro)
+    def __gt__(self, outro): return np.greater(self, outro)
+    def __ge__(self, outro): return np.greater_equal(self, outro)
+    def __eq__(self, outro): return np.equal(self, outro)
+    def __ne__(self, outro): return np.not_equal(self, outro)
+
+
+def _valor(x):
+    return x.valor if isinstance(x, Dual) else x
+
+
+def _derivadas(x):
+    return x.derivadas if isinstance(x, Dual) else {}
+
+
+def _acumular(derivadas, termos, fator):
+    """derivadas += fator · termos (dicts de derivadas; devolve um novo dict)."""
+    resultado = dict(derivadas)
+    for i, termo in termos.items():
+        termo = fator * termo
+        resultado[i] = resultado[i] + termo if i in resultado else termo
+    return resultado
+
+
+def _escalar(derivadas, fator):
+    return {i: fator * termo for i, termo in derivadas.items()}
+
+
+def _somar(a, b):
+    return Dual(_valor(a) + _valor(b), _acumular(_derivadas(a), _derivadas(b), 1.0))
+
+
+def _subtrair(a, b):
+    return Dual(_valor(a) - _valor(b), _acumular(_derivadas(a), _derivadas(b), -1.0))
+
+
+def _multiplicar(a, b):
+    va, vb = _valor(a), _valor(b)
+    return Dual(va * vb, _acumular(_escalar(_derivadas(a), vb), _derivadas(b), va))
+
+
+def _dividir(a, b):
+    va, vb = _valor(a), _valor(b)
+    q = va / vb
+    return Dual(q, _acumular(_escalar(_derivadas(a), 1.0 / vb), _derivadas(b), -q / vb))
+
+
+def _potencia(a, p):
+    if isinstance(p, Dual) or not isinstance(a, Dual):
+        return NotImplemented  # só expoentes constantes
+    return Dual(a.valor ** p, _escalar(a.derivadas, p * a.valor ** (p - 1)))
+
+
+def _raiz(a):
+    r = np.sqrt(a.valor)
+    return Dual(r, _escalar(a.derivadas, np.where(r > 0, 0.5 / r, 0.0)))  # √(e_x² + e_y²) em e = 0: 0
+
+
+def _escolher(condicao, a, b, valor):
+    da, db = _derivadas(a), _derivadas(b)
+    return Dual(valor, {i: np.where(condicao, da.get(i, 0.0), db.get(i, 0.0)) for i in da.keys() | db.keys()})
+
+
+def _maximo(a, b):
+    va, vb = _valor(a), _valor(b)
+    return _escolher(va >= vb, a, b, np.maximum(va, vb))
+
+
+def _minimo(a, b):
+    va, vb = _valor(a), _valor(b)
+    return _escolher(va <= vb, a, b, np.minimum(va, vb))
+
+
+_REGRAS = {
+    np.add: _somar,
+    np.subtract: _subtrair,
+    np.multiply: _multiplicar,
+    np.true_divide: _dividir,
+    np.power: _potencia,
+    np.sqrt: _raiz,
+    np.negative: lambda a: Dual(-a.valor, _escalar(a.derivadas, -1.0)),
+    np.absolute: lambda a: Dual(np.abs(a.valor), _escalar(a.derivadas, np.sign(a.valor))),
+    np.maximum: _maximo,
+    np.minimum: _minimo,
+}
+
+#comparações e testes: aplicam-se só aos valores (resultado sem derivadas)
+_SEM_DERIVADA = {np.less, np.less_equal, np.greater, np.greater_equal, np.equal, np.not_equal,
+                 np.isfinite, np.isnan, np.isinf, np.sign, np.ceil, np.floor}
+
+
+def _where(condicao, x, y):
+    return _escolher(condicao, x, y, np.where(condicao, _valor(x), _valor(y)))
+
+
+def _select(condicoes, escolhas, default=0):
+    resultado = default
+    for condicao, escolha in zip(reversed(condicoes), reversed(escolhas)):
+        resultado = _where(condicao, escolha, resultado)
+    return resultado
+
+
+def _broadcast_to(x, shape, subok=False):
+    return Dual(np.broadcast_to(x.valor, shape),
+                {i: np.broadcast_to(termo, shape) for i, termo in x.derivadas.items()})
+
+
+def _nan_to_num(x, *args, **kwargs):
+    return Dual(np.nan_to_num(x.valor, *args, **kwargs), _escalar(x.derivadas, ~np.isnan(x.valor)))
+
+
+_FUNCOES = {np.where: _where, np.select: _select, np.broadcast_to: _broadcast_to, np.nan_to_num: _nan_to_num}
+
+
+def variaveis_duais(*valores) -> list:
+    """Um Dual por array de valores, com derivada 1 na sua própria direção (sementes)."""
+    shape = np.broadcast_shapes(*(np.shape(v) for v in valores))
+    return [Dual(np.broadcast_to(np.asarray(v, dtype=float), shape), {i: 1.0}) for i, v in enumerate(valores)]
+
+
+def _gradiente(x, n_variaveis: int) -> np.ndarray:
+    """Derivadas de um Dual (ou constante) num array (n_variaveis, *shape), com zeros."""
+    g = np.zeros((n_variaveis,) + np.shape(_valor(x)))
+    for i, termo in _derivadas(x).items():
+        g[i] = termo
+    return g
+
+
+# ---------------------------------------------------------------------
+# --- SENSIBILIDADES ---
+# ---------------------------------------------------------------------
+
+class ResultadoSensibilidades:
+    """
+    Resultado de sensibilidades(): um elemento por caso.
+
+    util[v]: utilização v ∈ VERIFICACOES (NaN em erro: u0, u1,ef ou u1* nulos);
+    gradiente[v]: array (len(VARIAVEIS), n) com ∂util[v]/∂x, linhas pela ordem de VARIAVEIS.
+    """
+
+    def __init__(self, **valores):
+        self.__dict__.update(valores)
+
+    def __len__(self):
+        return self.n
+
+    def derivada(self, verificacao: str, variavel: str) -> np.ndarray:
+        """∂util[verificacao]/∂variavel, um valor por caso."""
+        return self.gradiente[verificacao][VARIAVEIS.index(variavel)]
+
+    def caso(self, i: int = 0) -> dict:
+        """Utilizações e derivadas de um caso: {"u1": {"util": ..., "d": ..., ...}, ...}."""
+        return {v: {"util": float(self.util[v][i]),
+                    **{x: float(g) for x, g in zip(VARIAVEIS, self.gradiente[v][:, i])}}
+                for v in VERIFICACOES}
+
+    def tabela(self, i: int = 0) -> str:
+        """Tabela de texto das derivadas de um caso (uma linha por variável)."""
+        texto = [f"{'variável':<8}" + "".join(f" {'∂' + v:>12}" for v in VERIFICACOES),
+                 f"{'util':<8}" + "".join(f" {self.util[v][i]:>12.4g}" for v in VERIFICACOES)]
+        for j, x in enumerate(VARIAVEIS):
+            texto.append(f"{x:<8}" + "".join(f" {self.gradiente[v][j, i]:>12.4g}" for v in VERIFICACOES))
+        return "\n".join(texto)
+
+
+def sensibilidades_lote(lote: PuncoamentoEC2Batch) -> ResultadoSensibilidades:
+    """Sensibilidades dos casos de um PuncoamentoEC2Batch (o lote dado não é alterado)."""
+    lote = copy.copy(lote)
+    As_lx, As_ly, rho_l = lote._armadura_laje
+    (lote.d, lote.fck, lote.c1, c2, As_lx, As_ly,
+     lote.V_Ed, lote.M_Edx, lote.M_Edy) = variaveis_duais(lote.d, lote.fck, lote.c1, lote.c2, As_lx, As_ly,
+                                                          lote.V_Ed, lote.M_Edx, lote.M_Edy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lote._get_parametros(c2, As_lx, As_ly, rho_l)
+        lote._get_perimetros_criticos()
+        lote._get_beta()
+        lote._get_V_Ed_red_e_u1_efetivo()
+        util_duais, erros = lote._utilizacoes()
+
+    util, gradiente = {}, {}
+    for v in VERIFICACOES:
+        util[v] = np.where(erros[v], np.nan, _valor(util_duais[v]))
+        gradiente[v] = np.where(erros[v], np.nan, _gradiente(util_duais[v], len(VARIAVEIS)))
+    return ResultadoSensibilidades(n=lote.n, util=util, gradiente=gradiente)
+
+
+def sensibilidades(**kwargs) -> ResultadoSensibilidades:
+    """
+    Utilizações e derivadas em relação a VARIAVEIS para todos os casos.
+
+    kwargs são os argumentos de PuncoamentoEC2Batch (escalares ou arrays).
+    """
+    return sensibilidades_lote(PuncoamentoEC2Batch(**kwargs))
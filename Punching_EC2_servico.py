@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Serviço HTTP local (asyncio, só biblioteca padrão) para verificações ao punçoamento.
+
+Um processo de longa duração, ligado apenas a um endereço de loopback, que
+aceita pedidos JSON e responde com os mesmos registos da linha de comandos
+(Punching_EC2_cli.verificar_caso). Os casos de pedidos concorrentes são
+agrupados em micro-lotes (até `lote_max` casos ou `janela_ms` ms após o
+primeiro) e avaliados num conjunto de processos (ou numa thread, com
+workers=1), o que amortiza o arranque do interpretador e o custo por chamada
+das ferramentas clientes.
+
+Pedidos:
+    POST /check            um caso (objeto) -> um registo
+                           lista ou {"casos": [...]} -> {"resultados": [...]}
+                           ?relatorio=1 inclui o relatório de cálculo
+    GET  /estado           contadores (pedidos, casos, lotes, rejeitados, fila)
+
+Contrapressão: a fila tem no máximo `fila_max` casos; um pedido que não caiba
+recebe 503 com Retry-After, sem ser parcialmente avaliado (413 se tiver mais
+de `fila_max` casos, pois nunca caberia).
+
+Utilização:
+    python Punching_EC2_servico.py --porta 8765 --janela-ms 5 --lote-max 256
+    python -m punching servir --porta 8765
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from Punching_EC2_cli import mensagem_de_erro, verificar_caso
+
+CORPO_MAX = 64 * 1024 * 1024  #bytes por pedido
+_RAZOES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def _avaliar_lote(lote: list) -> list:
+    """Avalia um micro-lote [(caso, relatorio), ...] (no processo de trabalho); um registo por caso."""
+    registos = []
+    for caso, relatorio in lote:
+        registo = {"id": caso.get("id") if isinstance(caso, dict) else None}
+        try:
+            registo.update(verificar_caso(caso, relatorio))
+        except Exception as exc:  # um caso inválido não pode fazer falhar o micro-lote
+            registo["erro"] = mensagem_de_erro(exc)
+        registos.append(registo)
+    return registos
+
+
+def _endereco_local(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class _ErroHTTP(Exception):
+    def __init__(self, codigo: int, mensagem: str, cabecalhos: dict | None = None):
+        super().__init__(mensagem)
+        self.codigo = codigo
+        self.cabecalhos = cabecalhos or {}
+
+
+class ServicoVerificacao:
+    """
+    Servidor HTTP com micro-lotes.
+
+    host ....... endereço de loopback (127.0.0.1, ::1 ou localhost; outros -> ValueError)
+    porta ...... porta TCP (0 -> escolhida pelo sistema, ver .porta após iniciar())
+    janela_ms .. tempo máximo de espera por mais casos após o primeiro de um lote
+    lote_max ... nº máximo de casos por micro-lote
+    fila_max ... nº máximo de casos à espera (contrapressão: 503 acima disso)
+    workers .... nº de processos (None -> os.cpu_count(); 1 -> uma thread, sem processos)
+
+    Uso:
+        async with ServicoVerificacao(porta=0) as servico:
+            ...                      # servico.porta
+            await servico.servir()   # até ser cancelado
+    """
+
+    def __init__(self, host: str = "127.0.0.1", porta: int = 8765, janela_ms: float = 5.0,
+                 lote_max: int = 256, fila_max: int = 10_000, workers: int | None = None):
+        if not _endereco_local(host):
+            raise ValueError(f"O serviço só pode escutar em loopback (recebido '{host}').")
+        if janela_ms < 0 or lote_max < 1 or fila_max < 1:
+            raise ValueError("janela_ms deve ser ≥ 0; lote_max e fila_max devem ser ≥ 1.")
+        self.host = host
+        self.porta = porta
+        self.janela = janela_ms / 1000.0
+        self.lote_max = lote_max
+        self.fila_max = fila_max
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.contadores = {"pedidos": 0, "casos": 0, "lotes": 0, "rejeitados": 0}
+        self._fila = None
+        self._servidor = None
+        self._agrupador = None
+        self._executor = None
+        self._em_curso = set()
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.parar()
+
+    # ---------------------------------------------------------------
+    # ciclo de vida
+    # ---------------------------------------------------------------
+    async def iniciar(self):
+        self._fila = asyncio.Queue(maxsize=self.fila_max)
+        if self.workers <= 1:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            #lança os processos antes de abrir o socket: com fork, herdariam as ligações
+            #aceites e um close() no servidor deixaria de chegar ao cliente
+            await asyncio.get_running_loop().run_in_executor(self._executor, os.getpid)
+        self._agrupador = asyncio.create_task(self._agrupar())
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+
+    async def servir(self):
+        await self._servidor.serve_forever()
+
+    async def parar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        if self._agrupador is not None:
+            self._agrupador.cancel()
+            await asyncio.gather(self._agrupador, return_exceptions=True)
+        if self._em_curso:
+            await asyncio.gather(*self._em_curso, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._servidor = self._agrupador = self._executor = None
+
+    # ---------------------------------------------------------------
+    # micro-lotes
+    # ---------------------------------------------------------------
+    async def verificar(self, casos: list, relatorio: bool = False) -> list:
+        """Enfileira os casos (todos ou nenhum) e devolve os registos, pela ordem."""
+        if len(casos) > self.fila_max:  # nunca caberia: repetir o pedido não adianta
+            self.contadores["rejeitados"] += 1
+            raise _ErroHTTP(413, f"O pedido tem {len(casos)} casos; o máximo por pedido é fila_max = "
+                                 f"{self.fila_max}. Dividir o pedido.")
+        if self.fila_max - self._fila.qsize() < len(casos):
+            self.contadores["rejeitados"] += 1
+            raise _ErroHTTP(503, "Fila cheia; tentar mais tarde.", {"Retry-After": "1"})
+        ciclo = asyncio.get_running_loop()
+        futuros = []
+        for caso in casos:
+            futuro = ciclo.create_future()
+            self._fila.put_nowait((caso, relatorio, futuro))
+            futuros.append(futuro)
+        self.contadores["casos"] += len(casos)
+        return await asyncio.gather(*futuros)
+
+    async def _agrupar(self):
+        ciclo = asyncio.get_running_loop()
+        livres = asyncio.Semaphore(self.workers)
+        while True:
+            lote = [await self._fila.get()]
+            limite = ciclo.time() + self.janela
+            while len(lote) < self.lote_max:
+                if self._fila.empty():
+                    resta = limite - ciclo.time()
+                    if resta <= 0:
+                        break
+                    try:
+                        lote.append(await asyncio.wait_for(self._fila.get(), resta))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    lote.append(self._fila.get_nowait())
+            await livres.acquire()
+            tarefa = asyncio.create_task(self._avaliar(lote, livres))
+            self._em_curso.add(tarefa)
+            tarefa.add_done_callback(self._em_curso.discard)
+
+    async def _avaliar(self, lote: list, livres: asyncio.Semaphore):
+        try:
+            self.contadores["lotes"] += 1
+            ciclo = asyncio.get_running_loop()
+            entradas = [(caso, relatorio) for caso, relatorio, _ in lote]
+            try:
+                registos = await ciclo.run_in_executor(self._executor, _avaliar_lote, entradas)
+            except Exception as exc:  # processo de trabalho terminado, caso não serializável, ...
+                erro = _ErroHTTP(500, f"Falha ao avaliar o micro-lote: {mensagem_de_erro(exc)}")
+                for _, _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(erro)
+                return
+            for (_, _, futuro), registo in zip(lote, registos):
+                if not futuro.done():
+                    futuro.set_result(registo)
+        finally:
+            livres.release()
+
+    # ---------------------------------------------------------------
+    # HTTP/1.1 (mínimo: Content-Length, keep-alive)
+    # ---------------------------------------------------------------
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha.strip():
+                    break
+                cabecalhos = {}
+                while True:
+                    h = await leitor.readline()
+                    if not h.strip():
+                        break
+                    nome, _, valor = h.decode("latin-1").partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                manter = cabecalhos.get("connection", "").lower() != "close"
+                try:
+                    metodo, alvo, _ = linha.decode("latin-1").split()
+                    tamanho = int(cabecalhos.get("content-length", 0))
+                    if tamanho > CORPO_MAX:
+                        manter = False
+                        raise _ErroHTTP(413, f"Corpo do pedido acima de {CORPO_MAX} bytes.")
+                    corpo = await leitor.readexactly(tamanho) if tamanho else b""
+                    codigo, resposta, extra = 200, await self._responder(metodo, alvo, corpo), {}
+                except _ErroHTTP as exc:
+                    codigo, resposta, extra = exc.codigo, {"erro": str(exc)}, exc.cabecalhos
+                except ValueError:
+                    codigo, resposta, extra, manter = 400, {"erro": "Pedido HTTP inválido."}, {}, False
+                except Exception as exc:  # nunca fechar a ligação sem resposta
+                    codigo, resposta, extra = 500, {"erro": mensagem_de_erro(exc)}, {}
+                dados = json.dumps(resposta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                cabecalho = [f"HTTP/1.1 {codigo} {_RAZOES[codigo]}",
+                             "Content-Type: application/json; charset=utf-8",
+                             f"Content-Length: {len(dados)}",
+                             f"Connection: {'keep-alive' if manter else 'close'}"]
+                cabecalho += [f"{k}: {v}" for k, v in extra.items()]
+                escritor.write(("\r\n".join(cabecalho) + "\r\n\r\n").encode("latin-1") + dados)
+                await escritor.drain()
+                if not manter:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, metodo: str, alvo: str, corpo: bytes):
+        url = urlsplit(alvo)
+        if url.path == "/estado":
+            if metodo != "GET":
+                raise _ErroHTTP(405, "Usar GET.")
+            return {**self.contadores, "fila": self._fila.qsize(), "janela_ms": self.janela * 1000.0,
+                    "lote_max": self.lote_max, "fila_max": self.fila_max, "workers": self.workers}
+        if url.path != "/check":
+            raise _ErroHTTP(404, f"Caminho desconhecido: {url.path}")
+        if metodo != "POST":
+            raise _ErroHTTP(405, "Usar POST.")
+        relatorio = parse_qs(url.query).get("relatorio", ["0"])[-1] not in ("0", "false", "")
+        try:
+            dados = json.loads(corpo)
+        except ValueError as exc:
+            raise _ErroHTTP(400, f"JSON inválido: {exc}")
+        self.contadores["pedidos"] += 1
+        if isinstance(dados, dict) and not isinstance(dados.get("casos"), list):
+            return (await self.verificar([dados], relatorio))[0]
+        casos = dados["casos"] if isinstance(dados, dict) else dados
+        if not isinstance(casos, list):
+            raise _ErroHTTP(400, "O corpo deve ser um objeto, uma lista ou {\"casos\": [...]}.")
+        return {"resultados": await self.verificar(casos, relatorio)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de verificação ao punçoamento.")
+    parser.add_argument("--host", default="127.0.0.1", help="endereço de loopback (default: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--janela-ms", type=float, default=5.0, help="janela de agrupamento (default: 5 ms)")
+    parser.add_argument("--lote-max", type=int, default=256, help="casos por micro-lote (default: 256)")
+    parser.add_argument("--fila-max", type=int, default=10_000, help="casos em espera antes de 503")
+    parser.add_argument("--workers", type=int, default=None, help="processos (default: nº de CPUs)")
+    args = parser.parse_args(argv)
+
+    async def correr():
+        async with ServicoVerificacao(args.host, args.porta, args.janela_ms, args.lote_max,
+                                      args.fila_max, args.workers) as servico:
+            print(f"A servir em http://{args.host}:{servico.porta} "
+                  f"(janela {args.janela_ms} ms, lote {args.lote_max}, {servico.workers} worker(s))",
+                  file=sys.stderr, flush=True)
+            await servico.servir()
+
+    try:
+        asyncio.run(correr())
+    except KeyboardInterrupt:
+        pass
+    except ValueError as exc:
+        print(f"Erro: {exc}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
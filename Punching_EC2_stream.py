@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Verificação em contínuo (streaming) de um mapa de pilares em CSV ou Parquet.
+
+Cada linha do ficheiro de entrada é um caso (pilar/combinação) verificado com
+PuncoamentoEC2; os resultados são escritos em CSV bloco a bloco, pelo que a
+memória usada não depende do tamanho do ficheiro.
+
+Colunas reconhecidas (cabeçalho, maiúsculas/minúsculas indiferentes):
+    id ................. identificador livre (copiado para a saída)
+    d .................. altura útil (m)
+    fck, fyk, fywk ..... resistências características (MPa)
+    As_lx, As_ly ....... armaduras de flexão (cm²/m)  | ou rho_l (-)
+    tipo, forma ........ "interior"/"bordo"/"canto", "retangular"/"circular"
+    c1, c2 ............. dimensões do pilar / diâmetro em c1 (m)
+    V_Ed ............... esforço transverso (kN)
+    M_Edx, M_Edy ....... momentos (kN·m)
+    sigma_cp ........... tensão média de compressão (MPa)
+    sapata ............. 1/0, sim/não (se omitida: sapata quando sigma_gd > 0)
+    sigma_gd ........... tensão no solo (kPa)
+    u1_ineffective ..... comprimento ineficaz de u1 (m)
+    beta_mode, edge_perp_interior, corner_interior (opcionais)
+
+Utilização:
+    python Punching_EC2_stream.py mapa.csv resultados.csv --bloco 20000 --workers 8
+    python Punching_EC2_stream.py mapa.parquet resultados.csv --retomar
+    python Punching_EC2_stream.py mapa.csv resultados.csv --colunas resultados_bin
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+from Punching_EC2 import CAMPOS_RESULTADO, FORMAS_PILAR, TIPOS_PILAR, PunchingResult, run_many
+from Punching_EC2_cli import mensagem_de_erro
+from Punching_EC2_resultados import EscritorResultados, abrir_resultados
+
+try:
+    import pyarrow.parquet as pq
+    PYARROW_OK = True
+except Exception:
+    PYARROW_OK = False
+
+COLUNAS_SAIDA = ("linha", "id") + CAMPOS_RESULTADO + ("erro",)
+
+_VERDADEIRO = {"1", "true", "t", "sim", "s", "yes", "y"}
+
+
+def _num(valor, default=None):
+    """Converte texto (aceita vírgula decimal) em float; vazio -> default."""
+    if valor is None:
+        return default
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    txt = str(valor).strip()
+    if txt == "":
+        return default
+    return float(txt.replace(",", "."))
+
+
+def _bool(valor, default=False):
+    if valor is None or str(valor).strip() == "":
+        return default
+    if isinstance(valor, bool):
+        return valor
+    return str(valor).strip().lower() in _VERDADEIRO
+
+
+def linha_para_caso(linha: dict, defaults: dict) -> dict:
+    """Converte uma linha do mapa (chaves normalizadas em minúsculas) em argumentos de PuncoamentoEC2."""
+    for nome in ("d", "fck", "c1", "v_ed"):
+        if _num(linha.get(nome)) is None:
+            raise ValueError(f"Falta o valor de '{nome}'.")
+    for nome in ("d", "fck", "c1", "c2"):
+        valor = _num(linha.get(nome))
+        if valor is not None and not valor > 0:  # c2 pode faltar (pilar circular)
+            raise ValueError(f"'{nome}' deve ser > 0.")
+    tipo = str(linha.get("tipo") or "").strip().lower()
+    forma = str(linha.get("forma") or "retangular").strip().lower()
+    if tipo not in TIPOS_PILAR or forma not in FORMAS_PILAR:
+        raise ValueError(f"Tipo/forma de pilar inválidos: {tipo!r}/{forma!r}.")
+    sigma_gd = _num(linha.get("sigma_gd"), 0.0)
+    As_lx = _num(linha.get("as_lx"))
+    As_ly = _num(linha.get("as_ly"))
+    rho_l = _num(linha.get("rho_l"))
+    if not (As_lx and As_ly and As_lx > 0 and As_ly > 0) and rho_l is None:
+        raise ValueError("Forneça As_lx/As_ly (cm²/m) ou rho_l.")
+    return dict(
+        laje_d=_num(linha.get("d")),
+        betão_fck=_num(linha.get("fck")),
+        aço_fyk=_num(linha.get("fyk"), defaults["fyk"]),
+        aço_fywk=_num(linha.get("fywk"), defaults["fywk"]),
+        pilar_tipo=tipo,
+        pilar_forma=forma,
+        V_Ed=_num(linha.get("v_ed")) * 1000.0,
+        pilar_c1=_num(linha.get("c1")),
+        pilar_c2=_num(linha.get("c2")),
+        M_Edx=_num(linha.get("m_edx"), 0.0) * 1000.0,
+        M_Edy=_num(linha.get("m_edy"), 0.0) * 1000.0,
+        sigma_cp=_num(linha.get("sigma_cp"), 0.0),
+        is_sapata=_bool(linha.get("sapata"), sigma_gd > 0),
+        sigma_gd_kpa=sigma_gd,
+        u1_ineffective=_num(linha.get("u1_ineffective"), 0.0),
+        beta_mode=str(linha.get("beta_mode") or defaults["beta_mode"]),
+        laje_As_lx_cm2pm=As_lx,
+        laje_As_ly_cm2pm=As_ly,
+        laje_rho_l=rho_l,
+        edge_perp_interior=_bool(linha.get("edge_perp_interior"), True),
+        corner_interior=_bool(linha.get("corner_interior"), True),
+    )
+
+
+def ler_linhas(caminho: str, sep: str = ","):
+    """Gerador de dicts (chaves em minúsculas), lido em contínuo de CSV ou Parquet."""
+    if caminho.lower().endswith((".parquet", ".pq")):
+        if not PYARROW_OK:
+            raise RuntimeError("A biblioteca pyarrow não está disponível para ler Parquet.")
+        ficheiro = pq.ParquetFile(caminho)
+        for lote in ficheiro.iter_batches(batch_size=65536):
+            nomes = [n.lower() for n in lote.schema.names]
+            colunas = [c.to_pylist() for c in lote.columns]
+            for valores in zip(*colunas):
+                yield dict(zip(nomes, valores))
+        return
+    with open(caminho, newline="", encoding="utf-8-sig") as f:
+        leitor = csv.reader(f, delimiter=sep)
+        nomes = [n.strip().lower() for n in next(leitor)]
+        for valores in leitor:
+            if valores:
+                yield dict(zip(nomes, valores))
+
+
+def _registos_completos(caminho: str, maximo: int | None = None) -> tuple:
+    """
+    (nº de registos CSV completos, incluindo o cabeçalho; nº de bytes que ocupam),
+    parando em `maximo` registos. Um registo só está completo se terminar em fim
+    de linha (uma interrupção pode deixar o último escrito a meio).
+    """
+    n = fim = consumido = 0
+    completa = True
+    with open(caminho, "rb") as f:
+        def linhas():
+            nonlocal consumido, completa
+            for bruta in f:
+                consumido += len(bruta)
+                completa = bruta.endswith(b"\n")
+                yield bruta.decode("utf-8", errors="replace")
+        try:
+            for _ in csv.reader(linhas()):
+                if not completa or n == maximo:
+                    break
+                n, fim = n + 1, consumido
+        except csv.Error:  # aspas por fechar no registo interrompido
+            pass
+    return n, fim
+
+
+def contar_linhas_escritas(caminho: str) -> int:
+    """Nº de linhas de dados completas já presentes num CSV de resultados (para retomar)."""
+    if not os.path.exists(caminho):
+        return 0
+    return max(_registos_completos(caminho)[0] - 1, 0)
+
+
+def preparar_retoma(saida: str, colunas: str | None = None) -> int:
+    """
+    Prepara a retoma de uma execução interrompida e devolve a linha de dados onde retomar.
+
+    Corta `saida` no fim do último registo completo e, com `colunas`, no nº de casos
+    da pasta de resultados, se esta tiver menos (interrupção entre a escrita do CSV e
+    a das colunas); a pasta é cortada no mesmo nº ao abri-la com EscritorResultados.
+    """
+    n = contar_linhas_escritas(saida)
+    if colunas is not None and n > 0:
+        try:
+            n = min(n, len(abrir_resultados(colunas)))
+        except (OSError, ValueError):  # pasta inexistente ou ilegível: recomeçar
+            n = 0
+    if n > 0:
+        fim = _registos_completos(saida, n + 1)[1]
+        with open(saida, "r+b") as f:
+            f.truncate(fim)
+    return n
+
+
+def _escrever_bloco(escritor, bloco, defaults, executor=None, workers=1):
+    """Verifica um bloco de linhas [(nº linha, dict)], escreve-o e devolve os PunchingResult."""
+    casos, validos, erros = [], [], {}
+    for n, linha in bloco:
+        try:
+            casos.append(linha_para_caso(linha, defaults))
+            validos.append(n)
+        except Exception as exc:
+            erros[n] = mensagem_de_erro(exc)
+    try:
+        if executor is None:
+            res_casos = run_many(casos, workers=1)
+        else:
+            res_casos = run_many(casos, chunksize=max(len(casos) // (4 * workers), 64), executor=executor)
+        resultados = dict(zip(validos, res_casos))
+    except Exception:  # um caso falhou no motor: repetir o bloco caso a caso para isolá-lo
+        resultados = {}
+        for n, caso in zip(validos, casos):
+            try:
+                resultados[n] = run_many([caso], workers=1)[0]
+            except Exception as exc:
+                erros[n] = mensagem_de_erro(exc)
+    registos = []
+    for n, linha in bloco:
+        res = resultados.get(n, {})
+        escritor.writerow([n, linha.get("id", "")]
+                          + ["" if res.get(c) is None else res[c] for c in CAMPOS_RESULTADO]
+                          + [erros.get(n, "")])
+        registos.append(PunchingResult(**res))
+    return registos
+
+
+def processar(entrada: str, saida: str, bloco: int = 10000, inicio: int = 0,
+              workers: int | None = 1, sep: str = ",", defaults: dict | None = None,
+              progresso=None, colunas: str | None = None) -> int:
+    """
+    Verifica o mapa `entrada` e escreve os resultados em `saida` (CSV), bloco a bloco.
+
+    inicio ..... nº de linhas de dados a saltar (retoma após interrupção); com
+                 inicio > 0 os resultados são acrescentados ao ficheiro existente
+    progresso .. função opcional chamada com o nº de linhas concluídas
+    colunas .... pasta onde escrever também os resultados em colunas
+                 (Punching_EC2_resultados; linhas inválidas ficam com estado de erro)
+
+    Devolve o nº de linhas processadas nesta execução.
+    """
+    defaults = {"fyk": 500.0, "fywk": 500.0, "beta_mode": "simplificado", **(defaults or {})}
+    acrescentar = inicio > 0 and os.path.exists(saida)
+    processadas = 0
+    armazem = EscritorResultados(colunas, inicio if acrescentar else 0) if colunas else None
+    executor = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    with executor or nullcontext(), open(saida, "a" if acrescentar else "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        if not acrescentar:
+            escritor.writerow(COLUNAS_SAIDA)
+        atual = []
+        for n, linha in enumerate(ler_linhas(entrada, sep)):
+            if n < inicio:
+                continue
+            atual.append((n, linha))
+            if len(atual) >= bloco:
+                registos = _escrever_bloco(escritor, atual, defaults, executor, workers)
+                f.flush()
+                if armazem:
+                    armazem.acrescentar(registos)
+                processadas += len(atual)
+                atual = []
+                if progresso:
+                    progresso(inicio + processadas)
+        if atual:
+            registos = _escrever_bloco(escritor, atual, defaults, executor, workers)
+            f.flush()
+            if armazem:
+                armazem.acrescentar(registos)
+            processadas += len(atual)
+            if progresso:
+                progresso(inicio + processadas)
+    return processadas
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Verificação ao punçoamento (NP EN 1992-1-1) de um mapa de pilares em CSV/Parquet.")
+    parser.add_argument("entrada", help="mapa de pilares (.csv ou .parquet)")
+    parser.add_argument("saida", help="ficheiro CSV de resultados")
+    parser.add_argument("--bloco", type=int, default=10000, help="linhas por bloco (default: 10000)")
+    parser.add_argument("--workers", type=int, default=1, help="nº de processos (default: 1)")
+    parser.add_argument("--sep", default=",", help="separador do CSV de entrada (default: ,)")
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument("--inicio", type=int, default=0, help="retomar a partir desta linha de dados (0-based)")
+    grupo.add_argument("--retomar", action="store_true", help="retomar após a última linha completa da saída (e das --colunas)")
+    parser.add_argument("--fyk", type=float, default=500.0, help="fyk por omissão (MPa)")
+    parser.add_argument("--fywk", type=float, default=500.0, help="fywk por omissão (MPa)")
+    parser.add_argument("--beta", default="simplificado", help="modo de β por omissão")
+    parser.add_argument("--colunas", help="pasta onde guardar também os resultados em colunas (memmap)")
+    args = parser.parse_args(argv)
+
+    if args.bloco < 1:
+        parser.error("--bloco deve ser ≥ 1")
+    inicio = preparar_retoma(args.saida, args.colunas) if args.retomar else args.inicio
+    t0 = time.perf_counter()
+
+    def progresso(n):
+        print(f"{n} linhas verificadas ({time.perf_counter() - t0:.1f} s)", file=sys.stderr)
+
+    n = processar(args.entrada, args.saida, bloco=args.bloco, inicio=inicio, workers=args.workers,
+                  sep=args.sep, defaults={"fyk": args.fyk, "fywk": args.fywk, "beta_mode": args.beta},
+                  progresso=progresso, colunas=args.colunas)
+    print(f"Concluído: {n} linhas (a partir da linha {inicio}) -> {args.saida}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,7 @@ import math
 import re
 import pytest
 
-from Punching_EC2 import PuncoamentoEC2
+from Punching_EC2 import CAMPOS_ENTRADA, GRAFO_DEPENDENCIAS, PuncoamentoEC2, nos_a_jusante
 
 
 # ----------------------------
@@ -144,3 +144,249 @@ def test_relatorio_tem_tres_casas_decimais_em_valores_chave():
     assert re.search(r"\b\d+\.\d{3}\s*MPa\b", rep) is not None
     assert re.search(r"u1,?ef=\d+\.\d{3}\s*m", rep.replace(" ", "")) or re.search(r"u1=\d+\.\d{3}\s*m", rep) is not None
 
+
+
+@pytest.mark.parametrize("over", [
+    dict(),
+    dict(V_Ed=1_000_000, beta_mode='calculado', pilar_tipo='bordo', M_Edy=30_000.0),
+    dict(laje_d=0.10),
+    dict(is_sapata=True, sigma_gd_kpa=150.0, u1_ineffective=0.30, beta_mode='fib', M_Edx=20_000.0),
+])
+def test_modo_so_numeros_igual_ao_relatorio(over):
+    # sem relatório: mesmos valores e o texto gerado depois é idêntico
+    v_rel = PuncoamentoEC2(**base_kwargs(**over))
+    rep = v_rel.verificar_puncoamento()
+
+    v_num = PuncoamentoEC2(**base_kwargs(**over))
+    assert v_num.verificar_puncoamento(relatorio=False) is None
+    assert v_num.relatorio == []
+    assert v_num.traco
+    for nome in ("beta", "u0", "u1_eff", "v_Ed_u0", "v_Rd_max", "v_Rd_c", "v_Ed_u1", "armadura_necessaria"):
+        assert getattr(v_num, nome) == getattr(v_rel, nome)
+    assert v_num.gerar_relatorio() == rep
+    assert "\n".join(v_num.relatorio) == rep
+
+
+def test_run_many_paralelo_igual_ao_serie_e_ordenado():
+    from Punching_EC2 import run_many
+    casos = [base_kwargs(V_Ed=200_000 + 10_000 * i, M_Edx=1_000.0 * i, beta_mode='calculado',
+                         pilar_tipo=('interior', 'bordo', 'canto')[i % 3]) for i in range(60)]
+    serie = run_many(casos, workers=1)
+    paralelo = run_many(casos, workers=3, chunksize=7)
+    assert serie == paralelo
+    for kw, res in zip(casos, serie):
+        v = PuncoamentoEC2(**kw)
+        v.verificar_puncoamento()
+        assert res["v_Ed_u1"] == v.v_Ed_u1
+        assert res["beta"] == v.beta
+
+    com_rel = run_many(casos[:3], workers=1, relatorio=True)
+    assert com_rel[0]["relatorio"] == PuncoamentoEC2(**casos[0]).verificar_puncoamento()
+
+
+def test_cache_constantes_reutiliza_e_conta():
+    from Punching_EC2 import configurar_cache_constantes, info_cache_constantes, limpar_cache_constantes
+    limpar_cache_constantes()
+    a = PuncoamentoEC2(**base_kwargs(V_Ed=500_000))
+    b = PuncoamentoEC2(**base_kwargs(V_Ed=700_000, pilar_tipo='bordo'))
+    c = PuncoamentoEC2(**base_kwargs(betão_fck=55))
+    info = info_cache_constantes()
+    assert (info.hits, info.misses) == (1, 2)
+    for nome in ("rho_l", "fcd", "fctm", "fctd", "fywd", "k_val", "v_min", "nu"):
+        assert getattr(a, nome) == getattr(b, nome)
+    assert c.fctm == pytest.approx(2.12 * math.log(1 + (55 + 8) / 10), rel=1e-15)
+
+    configurar_cache_constantes(maxsize=1)
+    PuncoamentoEC2(**base_kwargs())
+    PuncoamentoEC2(**base_kwargs(laje_d=0.25))
+    PuncoamentoEC2(**base_kwargs())
+    info = info_cache_constantes()
+    assert (info.hits, info.misses, info.currsize) == (0, 3, 1)
+    configurar_cache_constantes()
+    with pytest.raises(ValueError):
+        PuncoamentoEC2(**base_kwargs(laje_As_lx_cm2pm=None))
+
+
+def test_punching_result_compacto_e_ida_e_volta_em_array():
+    import pickle
+    from Punching_EC2 import CAMPOS_RESULTADO, ESTADO_ARMADURA, ESTADO_OK, PunchingResult
+    v_ok = PuncoamentoEC2(**base_kwargs(V_Ed=300_000))
+    v_ok.verificar_puncoamento(relatorio=False)
+    v_arm = PuncoamentoEC2(**base_kwargs(V_Ed=650_000))
+    v_arm.verificar_puncoamento(relatorio=False)
+    r_ok, r_arm = v_ok.resultado(), v_arm.resultado()
+
+    assert not hasattr(r_ok, "__dict__")
+    assert (r_ok.estado, r_arm.estado) == (ESTADO_OK, ESTADO_ARMADURA)
+    assert math.isnan(r_ok.Asw_sr_req) and r_ok.n_perimetros == 0
+    assert r_arm.Asw_sr_req == v_arm.Asw_sr_req and r_arm.n_perimetros == v_arm.n_perimetros
+    with pytest.raises(AttributeError):
+        r_ok.beta = 2.0
+
+    arr = PunchingResult.to_array([r_ok, r_arm])
+    assert arr.dtype.names == CAMPOS_RESULTADO
+    assert arr["v_Ed_u1"].tolist() == [v_ok.v_Ed_u1, v_arm.v_Ed_u1]
+    assert PunchingResult.from_array(arr) == [r_ok, r_arm]
+    assert PunchingResult.from_array(arr[1]) == r_arm
+    assert pickle.loads(pickle.dumps(r_arm)) == r_arm
+
+
+def test_perfil_etapas_conta_e_nao_altera_resultados(tmp_path):
+    from Punching_EC2 import PerfilEtapas
+    casos = [base_kwargs(V_Ed=300_000), base_kwargs(V_Ed=650_000, beta_mode='calculado', M_Edx=20_000.0)]
+    sem = [PuncoamentoEC2(**kw) for kw in casos]
+    rel_sem = [v.verificar_puncoamento() for v in sem]
+
+    perfil = PerfilEtapas()
+    with perfil:
+        com = [PuncoamentoEC2(**kw) for kw in casos]
+        rel_com = [v.verificar_puncoamento() for v in com]
+    assert rel_com == rel_sem
+    assert [v.resultado() for v in com] == [v.resultado() for v in sem]
+    assert all("_get_beta" not in v.__dict__ for v in com)
+
+    linhas = {l["etapa"]: l for l in perfil.linhas()}
+    assert linhas["verificar_puncoamento"]["chamadas"] == 2
+    assert linhas["gerar_relatorio"]["chamadas"] == 2
+    assert linhas["_dimensionar_armadura"]["chamadas"] == 1
+    assert "_get_beta [ec2/interior/retangular] interior ret., uniaxial y" in linhas
+    assert "_get_beta [simplificado/interior/retangular] sem momentos" in linhas
+    assert linhas["_get_beta"]["total_ms"] <= linhas["verificar_puncoamento"]["total_ms"]
+
+    #desativado: nada é registado
+    PuncoamentoEC2(**casos[0]).verificar_puncoamento()
+    assert perfil.linhas()[0]["chamadas"] == 2
+    perfil.guardar_csv(tmp_path / "perfil.csv")
+    assert (tmp_path / "perfil.csv").read_text(encoding="utf-8").startswith("etapa,chamadas")
+
+
+def test_perfil_etapas_so_na_thread_onde_foi_ativado():
+    import threading
+    from Punching_EC2 import PerfilEtapas
+
+    def verificar_noutra_thread(perfil=None):
+        def alvo():
+            if perfil is None:
+                PuncoamentoEC2(**base_kwargs()).verificar_puncoamento()
+                return
+            with perfil:
+                PuncoamentoEC2(**base_kwargs()).verificar_puncoamento()
+        t = threading.Thread(target=alvo)
+        t.start()
+        t.join()
+
+    principal = PerfilEtapas()
+    with principal:
+        verificar_noutra_thread()
+        PuncoamentoEC2(**base_kwargs()).verificar_puncoamento()
+    assert principal.chamadas["verificar_puncoamento"] == 1
+
+    secundario = PerfilEtapas()
+    verificar_noutra_thread(secundario)
+    v = PuncoamentoEC2(**base_kwargs())
+    v.verificar_puncoamento()
+    assert secundario.chamadas["verificar_puncoamento"] == 1 and "_get_beta" not in v.__dict__
+
+
+@pytest.mark.parametrize("over", [
+    dict(V_Ed=400_000),
+    dict(V_Ed=500_000, beta_mode='calculado', pilar_tipo='bordo', M_Edy=30_000.0),
+    dict(V_Ed=900_000, is_sapata=True, sigma_gd_kpa=200.0),
+])
+def test_fatores_de_reserva_levam_cada_verificacao_a_unidade(over):
+    v = PuncoamentoEC2(**base_kwargs(**over))
+    lam = v.fatores_de_reserva()
+    assert lam["u0"] > lam["cs_max"] > lam["u1"] > 0
+
+    def escalado(s):
+        kw = base_kwargs(**over)
+        for nome in ("V_Ed", "M_Edx", "M_Edy"):
+            kw[nome] *= s
+        w = PuncoamentoEC2(**kw)
+        w.verificar_puncoamento(relatorio=False)
+        return w
+
+    w = escalado(lam["u0"])
+    assert w.v_Ed_u0 == pytest.approx(w.v_Rd_max, rel=1e-12)
+    w = escalado(lam["u1"])
+    assert w.v_Ed_u1 == pytest.approx(w.v_Rd_c, rel=1e-12)
+    w = escalado(lam["cs_max"] * 0.999999)
+    assert w.estado == 1 and escalado(lam["cs_max"] * 1.000001).estado == 2
+    assert PuncoamentoEC2(**base_kwargs(V_Ed=0.0)).fatores_de_reserva()["u1"] == math.inf
+
+
+def test_fatores_de_reserva_apos_alterar_entradas():
+    """Entradas alteradas entre chamadas (com ou sem verificação) dão os fatores de um objeto novo."""
+    kw = base_kwargs(V_Ed=500_000, beta_mode='calculado', pilar_tipo='bordo', M_Edy=30_000.0)
+    v = PuncoamentoEC2(**kw)
+    v.fatores_de_reserva()
+    for nome, valor in (("M_Edx", 80e3), ("V_Ed", 650_000), ("d", 0.30), ("fck", 35)):
+        setattr(v, nome, valor)
+        kw[{"d": "laje_d", "fck": "betão_fck"}.get(nome, nome)] = valor
+        assert v.fatores_de_reserva() == PuncoamentoEC2(**kw).fatores_de_reserva()
+    v.verificar_puncoamento()
+    relatorio = v.relatorio
+    v.fatores_de_reserva()
+    assert v.relatorio is relatorio  #sem alterações não volta a verificar
+
+
+def test_recalculo_incremental_igual_a_objeto_novo():
+    campos = ("u0", "u1", "u1_eff", "V_Ed_red", "beta", "v_Ed_u0", "v_Rd_max", "v_Ed_u1", "v_Rd_c",
+              "armadura_necessaria", "estado", "Asw_sr_req", "n_perimetros")
+    v = PuncoamentoEC2(**base_kwargs())
+    assert v.nos_avaliados is None
+    assert v.verificar_puncoamento() and v.nos_avaliados == list(GRAFO_DEPENDENCIAS)
+    for over in (dict(V_Ed=900_000), dict(laje_As_lx_cm2pm=20.0), dict(pilar_tipo='bordo', M_Edy=30_000.0),
+                 dict(beta_mode='calculado'), dict(V_Ed=5_000_000), dict(V_Ed=200_000), dict(is_sapata=True)):
+        texto = v.atualizar(**over).verificar_puncoamento()
+        novo = PuncoamentoEC2(**{**v.entradas(), **over})
+        assert texto == novo.verificar_puncoamento()
+        assert [getattr(v, c, None) for c in campos] == [getattr(novo, c, None) for c in campos]
+
+
+def test_recalculo_incremental_so_reavalia_nos_a_jusante():
+    v = PuncoamentoEC2(**base_kwargs())
+    v.verificar_puncoamento(relatorio=False)
+    assert v.nos_avaliados == list(GRAFO_DEPENDENCIAS)  #1.ª verificação: avalia tudo
+    v.verificar_puncoamento(relatorio=False)
+    assert v.nos_avaliados == []
+    v.V_Ed = 900_000
+    v.verificar_puncoamento(relatorio=False)
+    assert v.nos_avaliados == ["beta", "reducoes", "verificacao"]
+    v.atualizar(laje_As_lx_cm2pm=20.0).verificar_puncoamento(relatorio=False)
+    assert set(v.nos_avaliados) == {"constantes", "v_Rd_max", "v_Rd_c", "verificacao"}
+    assert set(v.nos_avaliados) == {"constantes"} | nos_a_jusante("_armadura_laje")
+
+    with pytest.raises(TypeError):
+        v.atualizar(V_ed=1.0)
+    with pytest.raises(ValueError):
+        v.atualizar(laje_As_lx_cm2pm=None)
+    assert v.V_Ed == 900_000 and v.d == 0.22
+
+
+def test_entradas_alteradas_antes_da_1a_verificacao():
+    #cada entrada alterada (atualizar ou atribuição direta) antes da 1.ª verificação
+    campos = ("rho_l", "k_val", "u0", "u1", "u1_eff", "V_Ed_red", "beta", "v_Ed_u0", "v_Rd_max", "v_Ed_u1",
+              "v_Rd_c", "estado", "Asw_sr_req", "n_perimetros")
+    base = base_kwargs(beta_mode='ec2', M_Edx=20_000.0, V_Ed=900_000)
+    alteracoes = dict(laje_d=0.30, betão_fck=40, aço_fyk=400, aço_fywk=400, pilar_tipo='bordo',
+                      pilar_forma='circular', V_Ed=700_000, pilar_c1=0.50, pilar_c2=0.30, M_Edx=60_000.0,
+                      M_Edy=30_000.0, sigma_cp=1.0, is_sapata=True, sigma_gd_kpa=150.0, u1_ineffective=0.2,
+                      gamma_C=1.3, gamma_S=1.0, beta_mode='fib', laje_As_lx_cm2pm=20.0, laje_As_ly_cm2pm=15.0,
+                      laje_rho_l=0.01, edge_perp_interior=False, corner_interior=False,
+                      geometria={"contorno": [(0, 0), (0.5, 0), (0.5, 0.3), (0, 0.3)]})
+    assert set(alteracoes) == set(CAMPOS_ENTRADA)
+    for nome, valor in alteracoes.items():
+        novo = PuncoamentoEC2(**{**base, nome: valor})
+        texto = novo.verificar_puncoamento()
+        v = PuncoamentoEC2(**base).atualizar(**{nome: valor})
+        assert v.verificar_puncoamento() == texto, nome
+        assert [getattr(v, c, None) for c in campos] == [getattr(novo, c, None) for c in campos], nome
+
+    v = PuncoamentoEC2(**base)
+    v.d = 0.30
+    v._armadura_laje = (20.0, 8.80, None)
+    v.verificar_puncoamento(relatorio=False)
+    novo = PuncoamentoEC2(**{**base, "laje_d": 0.30, "laje_As_lx_cm2pm": 20.0})
+    novo.verificar_puncoamento(relatorio=False)
+    assert (v.rho_l, v.k_val, v.v_Rd_c) == (novo.rho_l, novo.k_val, novo.v_Rd_c)
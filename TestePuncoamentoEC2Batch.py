@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from Punching_EC2 import PuncoamentoEC2
+from Punching_EC2_batch import (ESTADO_ARMADURA, ESTADO_FALHA_CS_MAX, ESTADO_FALHA_U0,
+                                ESTADO_OK, TOLERANCIA_ESCALAR, EnvolventeEC2, PuncoamentoEC2Batch)
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+def base_kwargs(**over):
+    """Argumentos base (iguais aos de TestePuncoamentoEC2)."""
+    kw = dict(
+        laje_d=0.220,
+        betão_fck=30, aço_fyk=500, aço_fywk=500,
+        pilar_tipo='interior', pilar_forma='retangular',
+        V_Ed=600_000,
+        pilar_c1=0.40, pilar_c2=0.40,
+        M_Edx=0.0, M_Edy=0.0,
+        sigma_cp=0.0,
+        is_sapata=False, sigma_gd_kpa=0.0,
+        u1_ineffective=0.0,
+        beta_mode='simplificado',
+        laje_As_lx_cm2pm=8.80, laje_As_ly_cm2pm=8.80
+    )
+    kw.update(over)
+    return kw
+
+
+def casos_todos_os_ramos():
+    """Grelha que percorre tipo × forma × β × excentricidades × sapata/aberturas."""
+    casos = []
+    for tipo, forma, beta, (mx, my), V, flags in itertools.product(
+            ("interior", "bordo", "canto"),
+            ("retangular", "circular"),
+            ("simplificado", "calculado", "fib"),
+            ((0.0, 0.0), (30_000.0, 0.0), (0.0, 45_000.0), (20_000.0, -15_000.0)),
+            (300_000, 650_000, 1_100_000),
+            ("", "sapata", "abertura", "exterior")):
+        casos.append(base_kwargs(
+            pilar_tipo=tipo, pilar_forma=forma, beta_mode=beta,
+            pilar_c1=0.45, pilar_c2=0.30 if forma == "retangular" else None,
+            M_Edx=mx, M_Edy=my, V_Ed=V, laje_d=0.24,
+            is_sapata=(flags == "sapata"), sigma_gd_kpa=150.0 if flags == "sapata" else 0.0,
+            u1_ineffective=0.30 if flags == "abertura" else 0.0,
+            edge_perp_interior=(flags != "exterior"), corner_interior=(flags != "exterior"),
+        ))
+    return casos
+
+
+def valor_escalar(v, nome):
+    x = getattr(v, nome, None)
+    return np.nan if x is None else x
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_batch_igual_ao_escalar_em_todos_os_ramos():
+    casos = casos_todos_os_ramos()
+    lote = PuncoamentoEC2Batch.from_casos(casos).verificar_puncoamento()
+    assert len(lote) == len(casos)
+
+    campos = ("u0", "u1", "u1_eff", "V_Ed_red", "beta", "k_beta", "v_Ed_u0", "v_Rd_max",
+              "v_Rd_c", "v_Ed_u1", "v_Rd_cs_max", "Asw_sr_req", "u_out_ef")
+    for i, kw in enumerate(casos):
+        v = PuncoamentoEC2(**kw)
+        v.verificar_puncoamento()
+        for nome in campos:
+            esperado = valor_escalar(v, nome)
+            obtido = getattr(lote, nome)[i]
+            if math.isnan(esperado):
+                assert math.isnan(obtido), (i, nome)
+            else:
+                assert obtido == pytest.approx(esperado, rel=TOLERANCIA_ESCALAR, abs=1e-15), (i, nome)
+        assert bool(lote.armadura_necessaria[i]) == v.armadura_necessaria
+        assert lote.estado[i] == v.estado
+        #n_perimetros só é calculado com armadura; no lote fica 0 nos outros casos
+        assert lote.n_perimetros[i] == (v.n_perimetros if v.estado == ESTADO_ARMADURA else 0), i
+
+
+def test_batch_dentro_da_tolerancia_com_entradas_variadas():
+    """As, fck, d e σcp variados: ρl, v_min e v_Rd,c (pow vs NumPy) ficam dentro de TOLERANCIA_ESCALAR."""
+    rng = np.random.default_rng(7)
+    casos = [base_kwargs(laje_d=rng.uniform(0.15, 0.50), betão_fck=int(rng.choice([20, 30, 45, 60, 90])),
+                         laje_As_lx_cm2pm=rng.uniform(3, 40), laje_As_ly_cm2pm=rng.uniform(3, 40),
+                         sigma_cp=rng.uniform(0, 3), V_Ed=rng.uniform(2e5, 2e6)) for _ in range(400)]
+    lote = PuncoamentoEC2Batch.from_casos(casos).verificar_puncoamento()
+    for i, kw in enumerate(casos):
+        v = PuncoamentoEC2(**kw)
+        v.verificar_puncoamento(relatorio=False)
+        for nome in ("rho_l", "v_min", "v_Rd_c", "v_Rd_cs_max", "Asw_sr_req", "u_out_ef", "dist_zona_armar"):
+            esperado = valor_escalar(v, nome)
+            if not math.isnan(esperado):
+                assert getattr(lote, nome)[i] == pytest.approx(esperado, rel=TOLERANCIA_ESCALAR), (i, nome)
+        assert lote.estado[i] == v.estado
+
+
+def test_fatores_de_reserva_lote_igual_ao_escalar():
+    casos = casos_todos_os_ramos()
+    lam = PuncoamentoEC2Batch.from_casos(casos).fatores_de_reserva()
+    for i, kw in enumerate(casos):
+        esperado = PuncoamentoEC2(**kw).fatores_de_reserva()
+        for nome, valor in esperado.items():
+            assert lam[nome][i] == pytest.approx(valor, rel=TOLERANCIA_ESCALAR), (i, nome)
+
+
+def test_batch_estados_cobrem_os_desfechos():
+    casos = casos_todos_os_ramos()
+    lote = PuncoamentoEC2Batch.from_casos(casos).verificar_puncoamento()
+    assert {ESTADO_OK, ESTADO_ARMADURA, ESTADO_FALHA_CS_MAX, ESTADO_FALHA_U0} <= set(lote.estado.tolist())
+
+
+def test_from_arrays_difunde_escalares():
+    V = np.array([300e3, 600e3, 900e3])
+    lote = PuncoamentoEC2Batch.from_arrays(
+        d=0.22, fck=30, c1=0.40, c2=0.40, V_Ed=V,
+        tipo="interior", forma="retangular", As_lx=8.80, As_ly=8.80,
+    ).verificar_puncoamento()
+    for i, V_i in enumerate(V):
+        v = PuncoamentoEC2(**base_kwargs(V_Ed=V_i))
+        v.verificar_puncoamento()
+        assert lote.v_Ed_u1[i] == pytest.approx(v.v_Ed_u1, rel=TOLERANCIA_ESCALAR)
+        assert lote.v_Rd_c[i] == pytest.approx(v.v_Rd_c, rel=TOLERANCIA_ESCALAR)
+
+
+def test_batch_valida_entradas():
+    with pytest.raises(ValueError):
+        PuncoamentoEC2Batch.from_arrays(d=0.22, fck=30, c1=0.4, c2=0.4, V_Ed=1e5,
+                                        tipo="lateral", As_lx=8.8, As_ly=8.8)
+    with pytest.raises(ValueError):
+        PuncoamentoEC2Batch.from_arrays(d=0.22, fck=30, c1=0.4, c2=0.4, V_Ed=1e5)
+
+
+@pytest.mark.parametrize("tipo, forma, beta, flags", [
+    ("interior", "retangular", "calculado", ""),
+    ("bordo", "retangular", "fib", "sapata"),
+    ("canto", "circular", "calculado", "abertura"),
+    ("bordo", "circular", "simplificado", "exterior"),
+])
+def test_envolvente_igual_ao_escalar_por_combinacao(tipo, forma, beta, flags):
+    kw = casos_todos_os_ramos()[0]
+    kw.update(pilar_tipo=tipo, pilar_forma=forma, beta_mode=beta,
+              pilar_c2=0.30 if forma == "retangular" else None,
+              is_sapata=(flags == "sapata"), sigma_gd_kpa=150.0 if flags == "sapata" else 0.0,
+              u1_ineffective=0.30 if flags == "abertura" else 0.0,
+              edge_perp_interior=(flags != "exterior"), corner_interior=(flags != "exterior"))
+    for nome in ("V_Ed", "M_Edx", "M_Edy"):
+        kw.pop(nome)
+    rng = np.random.default_rng(6)
+    V = rng.uniform(100e3, 1_200e3, 40)
+    Mx = rng.uniform(-60e3, 60e3, 40)
+    My = rng.uniform(-60e3, 60e3, 40)
+
+    env = EnvolventeEC2(**kw)
+    r = env.avaliar(V, Mx, My)
+    assert len(r) == 40
+    for i in range(40):
+        v = env.caso(V[i], Mx[i], My[i])
+        v.verificar_puncoamento(relatorio=False)
+        assert r.beta[i] == pytest.approx(v.beta, rel=TOLERANCIA_ESCALAR)
+        assert r.v_Ed_u0[i] == pytest.approx(v.v_Ed_u0, rel=TOLERANCIA_ESCALAR)
+        assert r.v_Rd_max == pytest.approx(v.v_Rd_max, rel=TOLERANCIA_ESCALAR)
+        if v.v_Ed_u1:
+            assert r.v_Ed_u1[i] == pytest.approx(v.v_Ed_u1, rel=TOLERANCIA_ESCALAR)
+            assert r.v_Rd_c == pytest.approx(v.v_Rd_c, rel=TOLERANCIA_ESCALAR)
+        if getattr(v, "Asw_sr_req", None) is not None:
+            assert r.Asw_sr_req[i] == pytest.approx(v.Asw_sr_req, rel=TOLERANCIA_ESCALAR)
+    assert r.governante["u0"] == int(np.argmax(r.v_Ed_u0))
+    assert r.governante["u1"] == int(np.argmax(r.v_Ed_u1))
+
+
+def test_envolvente_rejeita_esforcos_no_construtor():
+    with pytest.raises(TypeError):
+        EnvolventeEC2(**base_kwargs())
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+import Punching_EC2_benchmark as bench
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_casos_sinteticos_cobrem_todos_os_ramos():
+    casos = bench.casos_sinteticos()
+    ramos = {(c["pilar_tipo"], c["pilar_forma"], c["beta_mode"]) for c in casos}
+    assert len(ramos) == 3 * 2 * 3
+    assert any(c["is_sapata"] for c in casos) and any(c["u1_ineffective"] > 0 for c in casos)
+    assert casos == bench.casos_sinteticos()
+
+
+def test_benchmark_rapido_grava_json_e_compara(tmp_path):
+    saida = tmp_path / "bench.json"
+    assert bench.main(["--rapido", "--saida", str(saida)]) == 0
+    dados = json.loads(saida.read_text(encoding="utf-8"))
+    res = dados["resultados"]
+    for nome in ("escalar_latencia", "escalar_latencia_relatorio", "relatorio_formatacao",
+                 "lote_debito", "run_many_serie_debito", "exportacao_excel", "exportacao_pdf",
+                 "exportacao_pdf_lote", "exportacao_excel_lote", "arranque_importacao",
+                 "arranque_janela"):
+        assert nome in res
+    assert res["escalar_latencia"]["valor"] > 0
+    assert len(res["escalar_latencia"]["por_ramo"]) == 18
+
+    #um débito que cai para metade e um tempo que duplica são regressões
+    pior = json.loads(json.dumps(dados))
+    pior["resultados"]["lote_debito"]["valor"] /= 2
+    pior["resultados"]["escalar_latencia"]["valor"] *= 2
+    regressoes = {l[0] for l in bench.comparar(pior, dados) if l[-1]}
+    assert regressoes == {"lote_debito", "escalar_latencia"}
+
+
+def test_arranque_nao_importa_exportadores():
+    res = bench.medir_arranque(repeticoes=1)
+    if res["arranque_importacao"]["valor"] is None:
+        pytest.skip("tkinter indisponível")
+    assert res["arranque_importacao"]["modulos_exportacao"] == []
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import numbers
+import os
+import subprocess
+import sys
+
+import pytest
+
+from Punching_EC2 import ESTADO_FALHA_U0, PuncoamentoEC2
+from Punching_EC2_benchmark import casos_sinteticos
+from Punching_EC2_cli import CAMPOS_NUMERICOS, ler_casos, main
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+def amostra(n=60):
+    casos = casos_sinteticos()
+    return [casos[i] for i in range(0, len(casos), len(casos) // n)][:n]
+
+
+def executar(*args, entrada=""):
+    return subprocess.run([sys.executable, "-m", "punching", *args], input=entrada, cwd=AQUI,
+                          capture_output=True, text=True, encoding="utf-8")
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_ndjson_igual_ao_motor(tmp_path):
+    casos = amostra()
+    entrada = tmp_path / "casos.ndjson"
+    entrada.write_text("".join(json.dumps({"id": f"P{i}", **c}) + "\n" for i, c in enumerate(casos)),
+                       encoding="utf-8")
+    saida = tmp_path / "r.ndjson"
+    assert main(["check", str(entrada), "-o", str(saida)]) == 0
+
+    registos = [json.loads(l) for l in saida.read_text(encoding="utf-8").splitlines()]
+    assert len(registos) == len(casos)
+    for i, (caso, r) in enumerate(zip(casos, registos)):
+        v = PuncoamentoEC2(**caso)
+        v.verificar_puncoamento(relatorio=False)
+        assert r["linha"] == i and r["id"] == f"P{i}" and r["estado"] == v.estado
+        for nome in CAMPOS_NUMERICOS:
+            assert r[nome] == getattr(v, nome, None)
+
+
+def test_campos_numericos_cobrem_o_motor():
+    """Todos os atributos numéricos do motor, em todos os estados, estão em CAMPOS_NUMERICOS."""
+    vistos = set()
+    for caso in casos_sinteticos():
+        v = PuncoamentoEC2(**caso)
+        v.verificar_puncoamento(relatorio=False)
+        vistos |= {k for k, x in vars(v).items()
+                   if isinstance(x, numbers.Real) and not isinstance(x, bool) and k != "estado"}
+    assert vistos <= set(CAMPOS_NUMERICOS)
+
+
+def test_json_lista_e_aliases():
+    caso = {"id": 7, "laje_d": 0.2, "betao_fck": 25, "aco_fyk": 500, "aco_fywk": 500,
+            "pilar_tipo": "interior", "pilar_forma": "retangular", "V_Ed": 9e6,
+            "pilar_c1": 0.3, "pilar_c2": 0.3, "laje_rho_l": 0.01}
+    fonte = io.StringIO(json.dumps({"casos": [caso, {**caso, "V_Ed": 1e5}]}, indent=2))
+    assert [(c["V_Ed"], erro) for c, erro in ler_casos(fonte, "json")] == [(9e6, None), (1e5, None)]
+
+    r = executar("check", "--estrito", entrada=json.dumps([caso]))
+    assert r.returncode == 3
+    registo = json.loads(r.stdout)
+    assert registo["id"] == 7 and registo["estado"] == ESTADO_FALHA_U0 and registo["fck"] == 25
+
+
+def test_erros_por_linha_sem_interromper():
+    entrada = "\n".join(['{"laje_d": 0.2, "xpto": 1}', "{nao json", "",
+                         json.dumps(amostra(1)[0])]) + "\n"
+    r = executar("check", "--relatorio", entrada=entrada)
+    assert r.returncode == 1
+    registos = [json.loads(l) for l in r.stdout.splitlines()]
+    assert [x["linha"] for x in registos] == [0, 1, 2]
+    assert "xpto" in registos[0]["erro"] and "JSON" in registos[1]["erro"]
+    assert "erro" not in registos[2] and registos[2]["relatorio"]
+
+
+def test_excecoes_inesperadas_dao_linha_de_erro():
+    """Valores de tipo errado (AttributeError, KeyError no motor) não interrompem o comando."""
+    valido = amostra(1)[0]
+    entrada = "\n".join(json.dumps(c) for c in (
+        {**valido, "pilar_tipo": None},
+        {**valido, "pilar_forma": "poligonal", "geometria": {"vertices": []}},
+        valido)) + "\n"
+    r = executar("check", entrada=entrada)
+    assert r.returncode == 1 and "Traceback" not in r.stderr
+    registos = [json.loads(l) for l in r.stdout.splitlines()]
+    assert [x["linha"] for x in registos] == [0, 1, 2]
+    assert registos[0]["erro"] and registos[1]["erro"] and "erro" not in registos[2]
+
+
+def test_nao_importa_dependencias_pesadas():
+    codigo = ("import sys, Punching_EC2_cli; "
+              "print([m for m in ('tkinter', 'reportlab', 'openpyxl', 'numpy') if m in sys.modules])")
+    r = subprocess.run([sys.executable, "-c", codigo], cwd=AQUI, capture_output=True, text=True)
+    assert r.stdout.strip() == "[]"
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import itertools
+
+import numpy as np
+import pytest
+
+import Punching_EC2_combinacoes as comb
+from Punching_EC2 import PuncoamentoEC2
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+def nuvem(n, seed=11):
+    """Combinações aleatórias, com grupos de momentos nulos (ramos uniaxiais e sem momentos)."""
+    rng = np.random.default_rng(seed)
+    V = rng.uniform(100e3, 900e3, n)
+    Mx, My = rng.normal(0, 30e3, n), rng.normal(0, 30e3, n)
+    k = n // 10
+    Mx[:k] = 0.0
+    My[k:2 * k] = 0.0
+    Mx[2 * k:3 * k] = My[2 * k:3 * k] = 0.0
+    return V, Mx, My
+
+
+def pilar(tipo, forma, beta, extra=""):
+    return dict(laje_d=0.24, betão_fck=30, aço_fyk=500, aço_fywk=500,
+                pilar_tipo=tipo, pilar_forma=forma, beta_mode=beta,
+                pilar_c1=0.45, pilar_c2=0.30 if forma == "retangular" else None,
+                is_sapata=(extra == "sapata"), sigma_gd_kpa=150.0 if extra == "sapata" else 0.0,
+                edge_perp_interior=(extra != "exterior"), corner_interior=(extra != "exterior"),
+                laje_As_lx_cm2pm=8.8, laje_As_ly_cm2pm=8.8)
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+@pytest.mark.parametrize("scipy_ok", [True, False])
+def test_condicionantes_iguais_a_forca_bruta(monkeypatch, scipy_ok):
+    if scipy_ok and not comb.SCIPY_OK:
+        pytest.skip("scipy não disponível")
+    monkeypatch.setattr(comb, "SCIPY_OK", scipy_ok)
+    V, Mx, My = nuvem(300)
+    for tipo, forma, beta, extra in itertools.product(
+            ("interior", "bordo", "canto"), ("retangular", "circular"),
+            ("simplificado", "calculado", "fib"), ("", "sapata", "exterior")):
+        kw = pilar(tipo, forma, beta, extra)
+        r = comb.verificar_combinacoes(V, Mx, My, **kw)
+        u0, u1 = [], []
+        for i in range(V.size):
+            v = PuncoamentoEC2(V_Ed=V[i], M_Edx=Mx[i], M_Edy=My[i], **kw)
+            v.verificar_puncoamento(relatorio=False)
+            u0.append(v.v_Ed_u0)
+            u1.append(comb._v_Ed_u1(v))
+        assert r.verificacao("u0").v_Ed_u0 == max(u0), (tipo, forma, beta, extra)
+        assert comb._v_Ed_u1(r.verificacao("u1")) == max(u1), (tipo, forma, beta, extra)
+
+
+def test_poda_reduz_avaliacoes():
+    V, Mx, My = nuvem(3000)
+    r = comb.verificar_combinacoes(V, Mx, My, **pilar("interior", "retangular", "calculado"))
+    assert r.n_combinacoes == 3000
+    assert r.n_avaliacoes <= (3000 // 50 if comb.SCIPY_OK else 3000 // 30)
+    assert set(r.governante.values()) <= set(r.verificacoes)
+
+    r = comb.verificar_combinacoes(V, Mx, My, **pilar("bordo", "retangular", "fib"))
+    assert r.n_avaliacoes <= 2 and r.metodo == "vetorizado"
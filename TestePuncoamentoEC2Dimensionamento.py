@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from Punching_EC2 import ESTADO_ARMADURA, ESTADO_OK, PuncoamentoEC2
+from Punching_EC2_dimensionamento import LIMITES, TOLERANCIAS, dimensionar
+
+CHAVE = {"d": "laje_d", "c": "pilar_c1", "As": "laje_rho_l"}
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+def mapa(n=120, seed=5):
+    """Mapa de pilares com todos os tipos, formas e modos de β."""
+    rng = np.random.default_rng(seed)
+    tipos, formas, modos = zip(*itertools.product(
+        ("interior", "bordo", "canto"), ("retangular", "circular"), ("simplificado", "ec2", "fib")))
+    rep = -(-n // len(tipos))
+    return dict(laje_d=0.24, betão_fck=30, aço_fyk=500, aço_fywk=500,
+                pilar_tipo=np.tile(tipos, rep)[:n], pilar_forma=np.tile(formas, rep)[:n],
+                beta_mode=np.tile(modos, rep)[:n],
+                V_Ed=rng.uniform(150e3, 1200e3, n), M_Edx=rng.uniform(0, 60e3, n), M_Edy=0.0,
+                pilar_c1=rng.uniform(0.25, 0.60, n), pilar_c2=0.35,
+                laje_As_lx_cm2pm=10.0, laje_As_ly_cm2pm=8.0)
+
+
+def verifica(argumentos, i, com_armadura, **alteracoes):
+    a = {k: (None if v is None else v[i].item()) for k, v in argumentos.items()}
+    a.update(alteracoes)
+    v = PuncoamentoEC2(**a)
+    v.verificar_puncoamento(relatorio=False)
+    return v.estado == ESTADO_OK or (com_armadura and v.estado == ESTADO_ARMADURA)
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+@pytest.mark.parametrize("variavel, com_armadura",
+                         list(itertools.product(("d", "c", "As"), (False, True))))
+def test_solucao_minima_no_motor_escalar(variavel, com_armadura):
+    r = dimensionar(variavel, com_armadura=com_armadura, **mapa())
+    lo, hi = LIMITES[variavel]
+    tol = TOLERANCIAS[variavel]
+    assert r.n_avaliacoes == 3 + math.ceil(math.log2((hi - lo) / tol))
+    assert r.viavel.any()
+
+    chave = CHAVE[variavel]
+    for i in np.flatnonzero(r.viavel):
+        assert verifica(r.argumentos, i, com_armadura)
+        x = r.valor[i]
+        if x - tol > lo:
+            menor = {chave: x - tol}
+            if variavel == "c":
+                menor["pilar_c2"] = r.argumentos["pilar_c2"][i] * (x - tol) / x
+            assert not verifica(r.argumentos, i, com_armadura, **menor)
+
+    inviaveis = ~r.viavel
+    assert np.all(np.isnan(r.valor[inviaveis]))
+    ok = (r.estado == ESTADO_OK) | (com_armadura & (r.estado == ESTADO_ARMADURA))
+    np.testing.assert_array_equal(ok, r.viavel)
+
+
+def test_armadura_de_flexao_na_proporcao_dada():
+    r = dimensionar("As", **mapa())
+    i = np.flatnonzero(r.viavel)
+    np.testing.assert_allclose(r.As_ly[i] / r.As_lx[i], 0.8)
+    rho = np.sqrt(r.As_lx[i] * r.As_ly[i]) / 10000.0 / 0.24
+    np.testing.assert_allclose(rho, r.valor[i])
+    assert np.all(r.valor[i] <= 0.02)
+
+
+def test_com_armadura_nao_exige_mais_que_sem_armadura():
+    sem = dimensionar("d", **mapa())
+    com = dimensionar("d", com_armadura=True, **mapa())
+    assert np.all(com.valor[sem.viavel] <= sem.valor[sem.viavel])
+
+
+def test_variavel_invalida():
+    with pytest.raises(ValueError):
+        dimensionar("fck", **mapa())
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import math
+
+import numpy as np
+import pytest
+
+from Punching_EC2 import CAMPOS_RESULTADO, ESTADOS, run_many
+from Punching_EC2_batch import PuncoamentoEC2Batch
+from Punching_EC2_benchmark import casos_sinteticos
+from Punching_EC2_excel import exportar_excel
+from Punching_EC2_resultados import guardar_resultados
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+def lote():
+    return PuncoamentoEC2Batch.from_casos(casos_sinteticos()).verificar_puncoamento()
+
+
+def linhas(caminho):
+    """Todas as linhas de dados das folhas Resultados*, pela ordem."""
+    wb = openpyxl.load_workbook(caminho, read_only=True)
+    folhas = [ws for ws in wb.worksheets if ws.title.startswith("Resultados")]
+    cabecalho = [c.value for c in next(folhas[0].iter_rows(max_row=1))]
+    dados = [list(r) for ws in folhas for r in ws.iter_rows(min_row=2, values_only=True)]
+    wb.close()
+    return cabecalho, dados
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_valores_iguais_ao_lote(tmp_path):
+    lt = lote()
+    arr = lt.to_array()
+    caminho = tmp_path / "r.xlsx"
+    res = lt.guardar_excel(str(caminho), ids=[f"P{i}<&>" for i in range(arr.size)])
+    assert res["casos"] == arr.size and res["folhas"] == ["Resultados", "Resumo"]
+
+    cabecalho, dados = linhas(caminho)
+    assert cabecalho == ["linha", "id", *CAMPOS_RESULTADO, "util_u0", "util_u1", "situacao"]
+    assert len(dados) == arr.size
+    for i in (0, 17, 401, arr.size - 1):
+        linha = dict(zip(cabecalho, dados[i]))
+        assert linha["linha"] == i and linha["id"] == f"P{i}<&>"
+        for nome in CAMPOS_RESULTADO:
+            esperado = arr[nome][i].item()
+            if isinstance(esperado, float) and math.isnan(esperado):
+                assert linha[nome] is None
+            else:
+                assert linha[nome] == esperado  # repr: sem perda de precisão
+        assert linha["situacao"] == ESTADOS[arr["estado"][i]]
+
+    wb = openpyxl.load_workbook(caminho)
+    assert {"PSE Cabeçalho", "PSE Número", "PSE Inteiro"} <= set(wb.named_styles)
+    ws = wb["Resultados"]
+    assert ws.freeze_panes == "A2"
+    assert ws["A1"].style == "PSE Cabeçalho" and ws["C2"].style == "PSE Número"
+    resumo = {k: v for k, v in wb["Resumo"].iter_rows(min_row=2, values_only=True)}
+    assert resumo["total"] == arr.size
+    assert sum(v for k, v in resumo.items() if k != "total") == arr.size
+
+
+def test_divide_em_folhas_no_limite(tmp_path):
+    arr = lote().to_array()
+    caminho = tmp_path / "r.xlsx"
+    res = exportar_excel(str(caminho), arr, bloco=97, linhas_por_folha=301, campos=["beta", "estado"])
+    assert res["folhas"] == ["Resultados", "Resultados_2", "Resultados_3", "Resumo"]
+    wb = openpyxl.load_workbook(caminho, read_only=True)
+    assert [sum(1 for _ in wb[f].iter_rows()) for f in res["folhas"][:-1]] == [301, 301, arr.size - 600 + 1]
+    wb.close()
+    _, dados = linhas(caminho)
+    np.testing.assert_array_equal([d[0] for d in dados], np.arange(arr.size))
+    np.testing.assert_array_equal([d[2] for d in dados], arr["estado"])
+
+
+def test_fontes_de_resultados_equivalentes(tmp_path):
+    casos = casos_sinteticos()[:150]
+    arr = PuncoamentoEC2Batch.from_casos(casos).verificar_puncoamento().to_array()
+    colunas = guardar_resultados(str(tmp_path / "colunas"), arr)
+    fontes = {"array": arr, "colunas": colunas, "run_many": iter(run_many(casos, workers=1))}
+    obtidos = {}
+    for nome, fonte in fontes.items():
+        exportar_excel(str(tmp_path / f"{nome}.xlsx"), fonte, bloco=40,
+                       entradas={"V_Ed": [c["V_Ed"] for c in casos]})
+        obtidos[nome] = linhas(tmp_path / f"{nome}.xlsx")
+    assert obtidos["array"] == obtidos["colunas"] == obtidos["run_many"]
+    assert obtidos["array"][0][1] == "V_Ed"
+
+
+def test_campos_desconhecidos(tmp_path):
+    with pytest.raises(ValueError):
+        exportar_excel(str(tmp_path / "r.xlsx"), lote(), campos=["beta", "v_Ed"])
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from Punching_EC2 import PuncoamentoEC2
+from Punching_EC2_fiabilidade import Distribuicao, EstatisticaCorrente, fiabilidade
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+FIXOS = dict(laje_d=0.22, betão_fck=30, aço_fyk=500, aço_fywk=500, pilar_tipo="interior",
+             pilar_forma="retangular", pilar_c1=0.40, pilar_c2=0.40,
+             laje_As_lx_cm2pm=12.0, laje_As_ly_cm2pm=12.0)
+
+
+def util_maxima(V_Ed):
+    """max(u0, u1) do caso FIXOS (linear em V_Ed com β simplificado e sem momentos)."""
+    v = PuncoamentoEC2(**FIXOS, V_Ed=V_Ed)
+    v.verificar_puncoamento()
+    return max(v.v_Ed_u0 / v.v_Rd_max, v.v_Ed_u1 / v.v_Rd_c)
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_estatistica_corrente_igual_ao_numpy():
+    x = np.random.default_rng(3).normal(1.0, 0.4, 10_001)
+    x[::97] = np.nan
+    total = EstatisticaCorrente(limiares=(0.5, 1.0, 1.5), bordas=np.linspace(0, 2, 21))
+    for parte in np.array_split(x, [7, 8, 2000, 6500]):
+        total.juntar(EstatisticaCorrente(total.limiares, total.bordas).atualizar(parte))
+    y = x[~np.isnan(x)]
+    assert total.n == y.size and total.histograma.sum() == y.size
+    assert total.media == pytest.approx(y.mean(), rel=1e-12)
+    assert total.variancia == pytest.approx(y.var(ddof=1), rel=1e-12)
+    assert (total.minimo, total.maximo) == (y.min(), y.max())
+    np.testing.assert_array_equal(total.excedencias, [(y > l).sum() for l in (0.5, 1.0, 1.5)])
+    #a última classe do numpy é fechada: comparar só com os valores < 2
+    np.testing.assert_array_equal(total.histograma[1:-1], np.histogram(y[y < 2], total.bordas)[0])
+    assert total.histograma[0] == (y < 0).sum() and total.histograma[-1] == (y >= 2).sum()
+
+
+def test_probabilidade_de_falha_analitica():
+    #só V_Ed aleatório: falha ⇔ V_Ed > V_crit = V0 / max(u0, u1)(V0)
+    V0 = 500e3
+    V_crit = V0 / util_maxima(V0)
+    media, desvio = 0.9 * V_crit, 0.1 * V_crit
+    r = fiabilidade(200_000, semente=7, bloco=30_000, workers=1,
+                    V_Ed=Distribuicao.normal(media, desvio), **FIXOS)
+    p = 1 - NormalDist(media, desvio).cdf(V_crit)
+    assert r.n_erros == 0 and abs(r.prob_falha - p) < 4 * r.erro_padrao
+    assert r.intervalo[0] < p < r.intervalo[1]
+    assert r.indice_fiabilidade == pytest.approx(1.0, abs=0.05)
+    assert r.estatisticas["u1"].excedencias[0] >= r.n_falhas - r.estatisticas["u0"].excedencias[0]
+    assert "P_f" in r.resumo()
+
+
+def test_reprodutivel_e_independente_dos_processos():
+    kw = dict(FIXOS, laje_d=Distribuicao.normal(0.22, 0.01), betão_fck=Distribuicao.lognormal(38, 5),
+              V_Ed=Distribuicao.gumbel(550e3, 80e3), M_Edx=Distribuicao.uniforme(0, 40e3))
+    a = fiabilidade(50_000, semente=11, bloco=12_000, workers=1, **kw)
+    b = fiabilidade(50_000, semente=11, bloco=12_000, workers=2, **kw)
+    c = fiabilidade(50_000, semente=12, bloco=12_000, workers=1, **kw)
+    assert a.n_falhas == b.n_falhas and a.semente == 11
+    for v in ("u0", "u1", "cs_max"):
+        ea, eb = a.estatisticas[v], b.estatisticas[v]
+        assert (ea.media, ea.m2, ea.maximo) == (eb.media, eb.m2, eb.maximo)
+        np.testing.assert_array_equal(ea.histograma, eb.histograma)
+    assert c.n_falhas != a.n_falhas
+    #com armadura de punçoamento só falha por u0 ou cs_max
+    d = fiabilidade(50_000, semente=11, bloco=12_000, workers=1, com_armadura=True, **kw)
+    assert d.n_falhas < a.n_falhas
+
+
+def test_distribuicoes_e_validacao():
+    rng = np.random.default_rng(0)
+    for dist in (Distribuicao.normal(30, 3), Distribuicao.lognormal(30, 3), Distribuicao.gumbel(30, 3)):
+        x = dist.amostrar(rng, 400_000)
+        assert x.mean() == pytest.approx(30, rel=2e-3) and x.std() == pytest.approx(3, rel=1e-2)
+    x = Distribuicao.uniforme(1, 2).amostrar(rng, 1000)
+    assert x.min() >= 1 and x.max() < 2
+    with pytest.raises(ValueError):
+        Distribuicao.normal(1, -1)
+    with pytest.raises(ValueError):
+        Distribuicao.lognormal(0, 1)
+    with pytest.raises(ValueError):
+        fiabilidade(10, V_Ed=500e3, **{**FIXOS, "pilar_tipo": Distribuicao.uniforme(0, 2)})
+    with pytest.raises(ValueError):
+        fiabilidade(10, V_Ed=np.array([500e3, 600e3]), **FIXOS)
+    #troço ineficaz maior do que u1 em parte das amostras: em erro, contadas à parte
+    r = fiabilidade(2000, semente=1, workers=1, V_Ed=500e3, u1_ineffective=Distribuicao.uniforme(3.0, 6.0), **FIXOS)
+    assert 0 < r.n_erros < 2000 and r.n_validas == 2000 - r.n_erros
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import math
+
+import pytest
+
+from Punching_EC2 import PuncoamentoEC2
+from Punching_EC2_cli import verificar_caso
+from Punching_EC2_geometria import GeometriaPilar, info_cache_perimetros, limpar_cache_perimetros
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+BASE = dict(laje_d=0.20, betão_fck=30, aço_fyk=500, aço_fywk=500, pilar_tipo="interior",
+            pilar_forma="retangular", V_Ed=600e3, pilar_c1=0.50, pilar_c2=0.30,
+            laje_As_lx_cm2pm=12.0, laje_As_ly_cm2pm=12.0, beta_mode="ec2")
+
+
+def verificado(**kw):
+    v = PuncoamentoEC2(**{**BASE, **kw})
+    v.verificar_puncoamento(relatorio=False)
+    return v
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_retangulo_igual_as_expressoes_do_ec2():
+    d, c1, c2 = 0.20, 0.50, 0.30
+    p = GeometriaPilar.retangular(c1, c2).perimetros(d)
+    assert p.u0 == pytest.approx(2 * (c1 + c2), rel=1e-12)
+    assert p.u1 == pytest.approx(2 * (c1 + c2) + 4 * math.pi * d, rel=1e-12)
+    assert p.W1_x == pytest.approx(c1**2 / 2 + c1 * c2 + 4 * c2 * d + 16 * d**2 + 2 * math.pi * d * c1, rel=1e-4)
+    assert p.W1_y == pytest.approx(c2**2 / 2 + c1 * c2 + 4 * c1 * d + 16 * d**2 + 2 * math.pi * d * c2, rel=1e-4)
+
+    #bordo encostado (6.45), afastado a < 2d (Fig. 6.15: prolongado até ao bordo) e canto
+    bordo = [(0, c2 / 2), (1, c2 / 2)]
+    p = GeometriaPilar.retangular(c1, c2, bordos=[bordo]).perimetros(d)
+    assert p.u1 == pytest.approx(c1 + 2 * c2 + 2 * math.pi * d, rel=1e-12)
+    assert p.W1_x == pytest.approx(c1**2 / 4 + c1 * c2 + 4 * c2 * d + 8 * d**2 + math.pi * d * c1, rel=1e-4)
+    p = GeometriaPilar.retangular(c1, c2, bordos=[[(0, c2 / 2 + 0.1), (1, c2 / 2 + 0.1)]]).perimetros(d)
+    assert p.u1 == pytest.approx(c1 + 2 * (c2 + 0.1) + 2 * math.pi * d, rel=1e-12)
+    p = GeometriaPilar.retangular(c1, c2, bordos=[bordo, [(c1 / 2, 0), (c1 / 2, 1)]]).perimetros(d)
+    assert p.u1 == pytest.approx(c1 + c2 + math.pi * d, rel=1e-12)
+
+    p = GeometriaPilar.circular(0.40).perimetros(d)
+    assert p.u1 == pytest.approx(math.pi * (0.40 + 4 * d), rel=1e-4)
+
+
+def test_pilar_em_L_e_abertura():
+    d = 0.20
+    L = [(0, 0), (0.6, 0), (0.6, 0.2), (0.2, 0.2), (0.2, 0.6), (0, 0.6)]
+    p = GeometriaPilar(L).perimetros(d)
+    #u1 contorna o invólucro convexo (a reentrância não conta)
+    casca = 0.6 + 0.2 + math.hypot(0.4, 0.4) + 0.2 + 0.6
+    assert p.u0 == pytest.approx(casca) and p.u1 == pytest.approx(casca + 4 * math.pi * d)
+
+    #abertura a 0.3 m da face (< 6d): sombra entre as tangentes do centro do pilar
+    abertura = [(0.55, -0.1), (0.75, -0.1), (0.75, 0.1), (0.55, 0.1)]
+    p = GeometriaPilar.retangular(0.5, 0.5, aberturas=[abertura]).perimetros(d)
+    #troço reto x = 0.25 + 2d entre as tangentes y = ±0.1·x/0.55
+    assert p.aberturas == (0,) and p.u1_ineficaz == pytest.approx(2 * 0.1 * 0.65 / 0.55)
+    assert p.eficaz.sum() < len(p.segmentos)
+    longe = [(x + 1.0, y) for x, y in abertura]
+    assert GeometriaPilar.retangular(0.5, 0.5, aberturas=[longe]).perimetros(d).u1_ineficaz == 0.0
+
+
+def test_motor_com_geometria():
+    sem = verificado(M_Edy=40e3)
+    g = GeometriaPilar.retangular(0.50, 0.30)
+    com = verificado(M_Edy=40e3, geometria=g)
+    assert (com.u0, com.u1) == pytest.approx((sem.u0, sem.u1), rel=1e-12)
+    assert com.beta == pytest.approx(sem.beta, rel=1e-5) and com.estado == sem.estado
+
+    #poligonal: c1 e c2 envolventes; aberturas reduzem u1,ef (somadas a u1_ineffective)
+    L = dict(contorno=[(0, 0), (0.6, 0), (0.6, 0.2), (0.2, 0.2), (0.2, 0.6), (0, 0.6)],
+             aberturas=[[(0.8, 0.1), (1.0, 0.1), (1.0, 0.3), (0.8, 0.3)]])
+    v = verificado(pilar_forma="poligonal", pilar_c1=None, pilar_c2=None, geometria=L, u1_ineffective=0.05)
+    assert (v.c1, v.c2) == pytest.approx((0.6, 0.6))
+    assert v.u1_eff == pytest.approx(v.u1 - 0.05 - v.perimetros_controlo.u1_ineficaz)
+    assert v.perimetros_controlo.u1_ineficaz > 0 and v.estado != 4
+    with pytest.raises(ValueError):
+        PuncoamentoEC2(**{**BASE, "pilar_forma": "poligonal"})
+    with pytest.raises(ValueError):
+        v.sensibilidades()
+
+    #linha de comandos: geometria em JSON
+    r = verificar_caso({**BASE, "pilar_forma": "poligonal", "pilar_c1": None, "geometria": L})
+    assert r["u1_eff"] == pytest.approx(v.u1_eff + 0.05)
+
+
+def test_geometria_calculada_uma_vez_por_pilar():
+    limpar_cache_perimetros()
+    g = GeometriaPilar.retangular(0.5, 0.3, bordos=[[(0, 0.15), (1, 0.15)]])
+    v = PuncoamentoEC2(**{**BASE, "pilar_tipo": "bordo", "geometria": g})
+    v.verificar_puncoamento(relatorio=False)
+    for V in range(100, 600, 5):
+        v.atualizar(V_Ed=V * 1e3).verificar_puncoamento(relatorio=False)
+    assert v.nos_avaliados == ["beta", "reducoes", "verificacao"]
+    PuncoamentoEC2(**{**BASE, "pilar_tipo": "bordo", "geometria": g.como_dict()}).verificar_puncoamento()
+    assert info_cache_perimetros().misses == 1
+
+    with pytest.raises(ValueError):
+        GeometriaPilar.retangular(0.5, 0.3, bordos=[[(0, 0.1), (1, 0.1)]])  # pilar a atravessar o bordo
+    with pytest.raises(TypeError):
+        GeometriaPilar.de({"contorno": [(0, 0), (1, 0), (0, 1)], "furos": []})
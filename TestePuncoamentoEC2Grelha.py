@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import itertools
+
+import numpy as np
+import pytest
+
+from Punching_EC2_batch import PuncoamentoEC2Batch
+from Punching_EC2_grelha import explorar
+
+EIXOS = dict(d=np.linspace(0.16, 0.40, 7), fck=[25, 30, 40], c1=np.linspace(0.25, 0.60, 5),
+             c2=[0.30, 0.45], As=[6.0, 10.0, 16.0])
+
+
+def pilar(tipo, forma, beta, sapata):
+    return dict(aço_fyk=500, aço_fywk=500, pilar_tipo=tipo, pilar_forma=forma, beta_mode=beta,
+                V_Ed=700e3, M_Edx=30e3, M_Edy=10e3,
+                is_sapata=sapata, sigma_gd_kpa=150.0 if sapata else 0.0)
+
+
+@pytest.mark.parametrize("tipo, forma, beta, sapata", list(itertools.product(
+    ("interior", "bordo", "canto"), ("retangular", "circular"), ("simplificado", "ec2", "fib"),
+    (False, True))))
+def test_grelha_igual_ao_lote(tipo, forma, beta, sapata):
+    fixos = pilar(tipo, forma, beta, sapata)
+    r = explorar(**EIXOS, bloco=200, **fixos)   # vários blocos
+    D, F, C1, C2, A = np.meshgrid(*EIXOS.values(), indexing="ij")
+    lote = PuncoamentoEC2Batch(laje_d=D.ravel(), betão_fck=F.ravel(), pilar_c1=C1.ravel(),
+                               pilar_c2=C2.ravel(), laje_As_lx_cm2pm=A.ravel(),
+                               laje_As_ly_cm2pm=A.ravel(), **fixos).verificar_puncoamento()
+
+    assert r.util_u0.shape == (7, 3, 5, 2, 1)
+    assert r.volume.shape == (7, 1, 5, 2, 1)
+    np.testing.assert_array_equal(r.estado.ravel(), lote.estado)
+    aco = np.where(lote.estado == 0, 0.0,
+                   np.where(lote.estado == 1, lote.Asw_sr_req * lote.n_perimetros, np.nan))
+    np.testing.assert_allclose(r.aco_puncoamento.ravel(), aco, rtol=1e-6)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        util_u1 = np.where(lote.v_Rd_c > 0, lote.v_Ed_u1 / lote.v_Rd_c, np.nan)
+    np.testing.assert_allclose(r.util_u1.ravel(), util_u1, rtol=1e-6)
+
+    # frente de Pareto por força bruta
+    ok = r.viavel().ravel()
+    vol = np.broadcast_to(r.volume, r.dimensoes).ravel()[ok]
+    aco = r.aco_puncoamento.ravel()[ok]
+    frente = {(v, a) for v, a in zip(vol, aco)
+              if not np.any((vol <= v) & (aco <= a) & ((vol < v) | (aco < a)))}
+    assert set(zip(r.pareto_volume, r.pareto_aco)) == frente
+    for idx, v in zip(r.pareto_indices, r.pareto_volume):
+        assert r.viavel()[tuple(idx)]
+        assert r.volume[idx[0], 0, idx[2], idx[3], 0] == v
+
+
+def test_argumentos_dos_eixos_rejeitados():
+    with pytest.raises(TypeError):
+        explorar(**EIXOS, laje_d=0.2, **pilar("interior", "retangular", "ec2", False))
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import random
+import re
+
+import pytest
+
+import Punching_EC2_pdf as P
+from Punching_EC2 import PuncoamentoEC2
+from Punching_EC2_benchmark import casos_sinteticos
+
+pytestmark = pytest.mark.skipif(not P.REPORTLAB_OK, reason="reportlab indisponível")
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+def paginas(caminho):
+    """Nº de páginas de um PDF escrito pelo reportlab (objetos /Type /Page)."""
+    with open(caminho, "rb") as f:
+        return len(re.findall(rb"/Type /Page(?!s)", f.read()))
+
+
+def quebra_gulosa(texto, fonte, tamanho, largura_max):
+    """Quebra original da interface: mede a linha inteira a cada palavra."""
+    palavras = texto.split()
+    if not palavras:
+        return ("",)
+    linhas, atual = [], palavras[0]
+    for palavra in palavras[1:]:
+        teste = atual + " " + palavra
+        if P.stringWidth(teste, fonte, tamanho) <= largura_max:
+            atual = teste
+        else:
+            linhas.append(atual); atual = palavra
+    linhas.append(atual)
+    return tuple(linhas)
+
+
+def amostra(n=40):
+    casos = casos_sinteticos()
+    return [casos[i] for i in range(0, len(casos), len(casos) // n)][:n]
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+@pytest.mark.parametrize("fonte", ["Courier", "Helvetica", "Times-Roman"])
+def test_quebra_em_cache_igual_a_gulosa(fonte):
+    rng = random.Random(3)
+    vocab = ["v_Ed(u0)", "≤", "β", "punçoamento", "a", "NP", "EN", "1992-1-1,", "WWWWWWWW", "iiii", "(6.47)."]
+    for _ in range(300):
+        texto = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 60)))
+        largura = rng.uniform(40, 480)
+        assert P.quebrar_texto(texto, fonte, 10, largura) == quebra_gulosa(texto, fonte, 10, largura)
+
+
+def test_um_pdf_por_pilar_em_paralelo_igual_em_serie(tmp_path):
+    casos = amostra()
+    serie = P.exportar_pdfs(casos, str(tmp_path / "serie"), workers=1, emitido_em="2026-10-19")
+    par = P.exportar_pdfs(casos, str(tmp_path / "par"), workers=2, chunksize=7, emitido_em="2026-10-19")
+    assert serie["relatorios"] == par["relatorios"] == len(casos)
+    assert len(par["ficheiros"]) == len(casos)
+    assert [paginas(f) for f in par["ficheiros"]] == [paginas(f) for f in serie["ficheiros"]]
+    assert par["paginas"] == sum(paginas(f) for f in par["ficheiros"]) >= len(casos)
+    assert par["paginas_por_segundo"] > 0
+
+
+def test_livro_tem_todas_as_paginas(tmp_path):
+    casos = amostra(20)
+    nomes = [f"P{i}" for i in range(len(casos))]
+    soltos = P.exportar_pdfs(casos, str(tmp_path / "soltos"), workers=1)
+    livro = str(tmp_path / "livro.pdf")
+    res = P.exportar_pdfs(casos, livro, livro=True, workers=2, chunksize=6, nomes=nomes)
+    assert res["ficheiros"] == [livro]
+    assert res["paginas"] == soltos["paginas"]
+    if P.PYPDF_OK:
+        from pypdf import PdfReader
+        leitor = PdfReader(livro)
+        assert len(leitor.pages) == res["paginas"]
+        assert [o.title for o in leitor.outline] == nomes
+    else:
+        assert paginas(livro) == res["paginas"]
+    assert not list(tmp_path.glob("**/parte_*"))  # partes temporárias apagadas
+
+
+@pytest.mark.parametrize("livro", [False, True])
+def test_caso_invalido_nao_interrompe_o_lote(tmp_path, livro):
+    casos = amostra(6)
+    casos[2] = {**casos[2], "laje_d": 0.0}
+    nomes = [f"P{i}" for i in range(len(casos))]
+    destino = str(tmp_path / ("livro.pdf" if livro else "soltos"))
+    res = P.exportar_pdfs(casos, destino, livro=livro, workers=2, chunksize=2, nomes=nomes)
+    assert res["relatorios"] == len(casos)
+    assert [nome for nome, _ in res["erros"]] == ["P2"] and "division" in res["erros"][0][1]
+    if not livro:
+        assert paginas(res["ficheiros"][2]) == 1 and paginas(res["ficheiros"][3]) >= 1
+
+
+def test_main_lista_linhas_invalidas(tmp_path, capsys):
+    entrada = tmp_path / "mapa.csv"
+    entrada.write_text("id,d,fck,As_lx,As_ly,tipo,c1,c2,V_Ed\n"
+                       "A,0.22,30,8.8,8.8,interior,0.4,0.4,500\n"
+                       "B,0,30,8.8,8.8,interior,0.4,0.4,500\n"
+                       "C,0.22,30,8.8,8.8,lateral,0.4,0.4,500\n", encoding="utf-8")
+    assert P.main([str(entrada), str(tmp_path / "pdfs"), "--workers", "1"]) == 1
+    assert sorted(p.name for p in (tmp_path / "pdfs").iterdir()) == ["A.pdf"]
+    erro = capsys.readouterr().err
+    assert "Erro em B" in erro and "Erro em C" in erro
+
+
+def test_secoes_conclusao_e_pormenorizacao():
+    caso = next(c for c in casos_sinteticos() if c["pilar_tipo"] == "bordo" and c["V_Ed"] == 1_100e3)
+    v = PuncoamentoEC2(**caso)
+    v.verificar_puncoamento(relatorio=False)
+    secoes = P.secoes_relatorio(v)
+    titulos = [s["title"] for s in secoes]
+    assert titulos[:7] == ["1. Info", "2. Dados de entrada", "3. Parâmetros geométricos e mecânicos",
+                           "4. Referências normativas adotadas", "5. Verificações realizadas",
+                           "6. Conclusão", "7. Recomendação de pormenorização"]
+    assert secoes[5]["lines"] == [P.conclusao(v) + "."]
+    assert len(secoes[6]["lines"]) == (12 if v.armadura_necessaria else 1)
+    assert secoes[-1]["lines"][0].startswith("Nota: para pilar de bordo")
+    assert "As,lx [cm²/m]: 8.80" in "\n".join(secoes[1]["lines"])
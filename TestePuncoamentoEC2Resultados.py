@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from Punching_EC2 import ESTADO_ARMADURA, PuncoamentoEC2, PunchingResult
+from Punching_EC2_batch import PuncoamentoEC2Batch
+from Punching_EC2_resultados import EscritorResultados, abrir_resultados
+from TestePuncoamentoEC2Batch import casos_todos_os_ramos
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_lote_guardado_reabre_em_memmap_igual(tmp_path):
+    casos = casos_todos_os_ramos()
+    lote = PuncoamentoEC2Batch.from_casos(casos).verificar_puncoamento()
+    res = lote.guardar(tmp_path / "run")
+    assert len(res) == len(casos)
+    assert isinstance(res["beta"], np.memmap)
+    esperado, lido = lote.to_array(), res.registos()
+    for nome in esperado.dtype.names:
+        np.testing.assert_array_equal(lido[nome], esperado[nome])
+
+    criticos = np.flatnonzero(res.util_u1() > 0.95)
+    assert criticos.size and np.all(lote.v_Ed_u1[criticos] > 0.95 * lote.v_Rd_c[criticos])
+    sel = res.registos(res["estado"] == ESTADO_ARMADURA)
+    assert sel.size == np.count_nonzero(lote.estado == ESTADO_ARMADURA)
+    assert np.all(sel["Asw_sr_req"] > 0)
+    with pytest.raises(ValueError):
+        res["beta"][0] = 2.0
+
+
+def test_escritor_aos_blocos_e_retoma(tmp_path):
+    casos = casos_todos_os_ramos()[:40]
+    registos = []
+    for kw in casos:
+        v = PuncoamentoEC2(**kw)
+        v.verificar_puncoamento(relatorio=False)
+        registos.append(v.resultado())
+
+    pasta = tmp_path / "run"
+    escritor = EscritorResultados(pasta)
+    escritor.acrescentar(registos[:15])
+    escritor.acrescentar([r.como_dict() for r in registos[15:25]])
+    # retoma no caso 20: descarta 20..24 e volta a escrevê-los
+    escritor = EscritorResultados(pasta, inicio=20)
+    assert escritor.acrescentar(registos[20:]) == 40
+
+    res = abrir_resultados(pasta)
+    assert PunchingResult.from_array(res.registos()) == registos
+    with pytest.raises(ValueError):
+        EscritorResultados(pasta, inicio=41)
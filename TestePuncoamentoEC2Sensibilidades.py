@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from Punching_EC2 import ESTADO_ERRO, ESTADO_FALHA_U0, PuncoamentoEC2
+from Punching_EC2_batch import PuncoamentoEC2Batch
+from Punching_EC2_benchmark import casos_sinteticos
+from Punching_EC2_sensibilidades import ARGUMENTOS, VARIAVEIS, VERIFICACOES, Dual, sensibilidades, variaveis_duais
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+def util_perturbada(casos, variavel, passo):
+    """Utilizações com a variável multiplicada por (1 + passo) (só onde está definida)."""
+    arg = ARGUMENTOS[variavel]
+    alterados = [{**c, arg: c[arg] * (1 + passo)} if c.get(arg) else c for c in casos]
+    return PuncoamentoEC2Batch.from_casos(alterados).sensibilidades().util
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_utilizacoes_iguais_ao_motor():
+    lote = PuncoamentoEC2Batch.from_casos(casos_sinteticos()).verificar_puncoamento()
+    r = lote.sensibilidades()
+    assert len(r) == lote.n and r.gradiente["u1"].shape == (len(VARIAVEIS), lote.n)
+    sem_erro = lote.estado != ESTADO_ERRO
+    segue = sem_erro & (lote.estado != ESTADO_FALHA_U0)
+    np.testing.assert_allclose(r.util["u0"][sem_erro], lote.v_Ed_u0[sem_erro] / lote.v_Rd_max[sem_erro], rtol=1e-13)
+    np.testing.assert_allclose(r.util["u1"][segue], lote.v_Ed_u1[segue] / lote.v_Rd_c[segue], rtol=1e-13)
+    np.testing.assert_allclose(r.util["cs_max"], r.util["u1"] / 1.5)
+
+
+@pytest.mark.parametrize("variavel", VARIAVEIS)
+def test_derivadas_iguais_as_diferencas_centradas(variavel):
+    casos = casos_sinteticos()
+    r = PuncoamentoEC2Batch.from_casos(casos).sensibilidades()
+    x = np.array([c.get(ARGUMENTOS[variavel]) or np.nan for c in casos], dtype=float)
+    h = 1e-6
+    cima, baixo = util_perturbada(casos, variavel, h), util_perturbada(casos, variavel, -h)
+    for v in ("u0", "u1"):
+        dif = (cima[v] - baixo[v]) / (2 * h * x)
+        analitica = r.derivada(v, variavel)
+        definida = np.isfinite(dif)
+        assert definida.sum() >= len(casos) // 2
+        escala = np.abs(r.util[v][definida] / x[definida])  # ordem de grandeza de ∂u/∂x
+        np.testing.assert_allclose(analitica[definida], dif[definida], rtol=1e-4, atol=1e-6 * escala.max())
+
+
+def test_caso_isolado_e_casos_particulares():
+    kw = dict(laje_d=0.22, betão_fck=30, aço_fyk=500, aço_fywk=500, pilar_tipo="bordo",
+              pilar_forma="retangular", V_Ed=500e3, pilar_c1=0.40, pilar_c2=0.30, M_Edy=30e3,
+              beta_mode="ec2", laje_As_lx_cm2pm=10.0, laje_As_ly_cm2pm=8.0)
+    s = PuncoamentoEC2(**kw).sensibilidades()
+    assert set(s) == set(VERIFICACOES) and list(s["u1"]) == ["util", *VARIAVEIS]
+    r = sensibilidades(**kw)
+    assert s == r.caso(0) and "As_lx" in r.tabela()
+    assert s["u1"]["V_Ed"] > 0 and s["u1"]["d"] < 0 and s["u1"]["As_lx"] < 0 and s["u0"]["As_lx"] == 0
+
+    #ρl dado diretamente: sem derivadas em As; circular: sem derivada em c2
+    s = sensibilidades(**{**kw, "laje_As_lx_cm2pm": None, "laje_As_ly_cm2pm": None, "laje_rho_l": 0.005,
+                          "pilar_forma": "circular", "pilar_c2": None}).caso(0)
+    assert s["u1"]["As_lx"] == s["u1"]["As_ly"] == s["u1"]["c2"] == 0.0 and s["u1"]["c1"] < 0
+    #ρl no limite de 0.02: As já não conta
+    s = sensibilidades(**{**kw, "laje_As_lx_cm2pm": 60.0, "laje_As_ly_cm2pm": 60.0}).caso(0)
+    assert s["u1"]["As_lx"] == 0.0 and s["u1"]["d"] < 0
+
+
+def test_dual_operacoes_nao_suportadas():
+    x, y = variaveis_duais(np.array([1.0, 4.0]), 2.0)
+    z = np.where(x > 2.0, np.sqrt(x) * y, np.maximum(x, y) / x)
+    assert isinstance(z, Dual)
+    np.testing.assert_allclose(z.valor, [2.0, 4.0])
+    np.testing.assert_allclose([z.derivadas[0], z.derivadas[1]], [[-2.0, 0.5], [1.0, 2.0]])
+    with pytest.raises(TypeError):
+        np.exp(x)
+    with pytest.raises(TypeError):
+        2.0 ** x
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+
+import pytest
+
+from Punching_EC2 import PuncoamentoEC2
+from Punching_EC2_benchmark import casos_sinteticos
+from Punching_EC2_cli import CAMPOS_NUMERICOS
+from Punching_EC2_servico import ServicoVerificacao
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+async def pedido(porta, metodo, caminho, corpo=None):
+    """Um pedido HTTP/1.1 (Connection: close); devolve (código, cabeçalhos, JSON)."""
+    leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+    dados = json.dumps(corpo).encode("utf-8") if corpo is not None else b""
+    escritor.write(f"{metodo} {caminho} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                   f"Content-Length: {len(dados)}\r\n\r\n".encode("latin-1") + dados)
+    await escritor.drain()
+    resposta = await leitor.read()
+    escritor.close()
+    cabecalho, _, corpo_resposta = resposta.partition(b"\r\n\r\n")
+    linhas = cabecalho.decode("latin-1").split("\r\n")
+    cabecalhos = dict(l.split(": ", 1) for l in linhas[1:])
+    return int(linhas[0].split()[1]), cabecalhos, json.loads(corpo_resposta)
+
+
+def esperado(caso):
+    v = PuncoamentoEC2(**caso)
+    v.verificar_puncoamento(relatorio=False)
+    return v
+
+
+def correr(coro):
+    return asyncio.run(asyncio.wait_for(coro, 60))
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_pedidos_concorrentes_agrupados_em_micro_lotes():
+    casos = casos_sinteticos()[:120]
+
+    async def cenario():
+        async with ServicoVerificacao(porta=0, janela_ms=50, lote_max=64, workers=1) as s:
+            respostas = await asyncio.gather(*(pedido(s.porta, "POST", "/check", c) for c in casos))
+            _, _, estado = await pedido(s.porta, "GET", "/estado")
+        return respostas, estado
+
+    respostas, estado = correr(cenario())
+    assert all(codigo == 200 for codigo, _, _ in respostas)
+    for caso, (_, _, r) in zip(casos, respostas):
+        v = esperado(caso)
+        assert r["estado"] == v.estado
+        assert all(r[nome] == getattr(v, nome, None) for nome in CAMPOS_NUMERICOS)
+    assert estado["pedidos"] == estado["casos"] == len(casos)
+    assert estado["lotes"] < len(casos) // 4  # agrupados, não um lote por pedido
+
+
+def test_pedido_em_lote_em_processos_e_erros_por_caso():
+    casos = [{"id": f"P{i}", **c} for i, c in enumerate(casos_sinteticos()[:300:7])]
+    casos.insert(3, {"id": "mau", "laje_d": 0.2, "xpto": 1})
+
+    async def cenario():
+        async with ServicoVerificacao(porta=0, janela_ms=2, lote_max=8, workers=2) as s:
+            return await pedido(s.porta, "POST", "/check?relatorio=1", {"casos": casos})
+
+    codigo, _, corpo = correr(cenario())
+    assert codigo == 200
+    resultados = corpo["resultados"]
+    assert [r["id"] for r in resultados] == [c["id"] for c in casos]
+    assert "xpto" in resultados[3]["erro"]
+    ok = [r for r in resultados if "erro" not in r]
+    assert len(ok) == len(casos) - 1 and all(r["relatorio"] for r in ok)
+
+
+def test_excecoes_inesperadas_por_caso_nao_afetam_o_lote():
+    """pilar_tipo null (AttributeError) e geometria incompleta (KeyError) dão "erro" só nesse caso."""
+    valido = casos_sinteticos()[0]
+    casos = [valido, {**valido, "pilar_tipo": None},
+             {**valido, "pilar_forma": "poligonal", "geometria": {"vertices": []}}, valido]
+
+    async def cenario():
+        async with ServicoVerificacao(porta=0, janela_ms=50, lote_max=64, workers=1) as s:
+            return await asyncio.gather(*(pedido(s.porta, "POST", "/check", c) for c in casos))
+
+    respostas = correr(cenario())
+    assert [codigo for codigo, _, _ in respostas] == [200] * len(casos)
+    assert [("erro" in r) for _, _, r in respostas] == [False, True, True, False]
+    assert respostas[0][2]["estado"] == esperado(valido).estado
+
+
+def test_falha_do_micro_lote_da_500_em_json(monkeypatch):
+    import Punching_EC2_servico
+
+    def falha(lote):
+        raise RuntimeError("processo de trabalho terminado")
+
+    monkeypatch.setattr(Punching_EC2_servico, "_avaliar_lote", falha)
+
+    async def cenario():
+        async with ServicoVerificacao(porta=0, workers=1) as s:
+            return await pedido(s.porta, "POST", "/check", casos_sinteticos()[0])
+
+    codigo, _, corpo = correr(cenario())
+    assert codigo == 500 and "terminado" in corpo["erro"]
+
+
+def test_contrapressao_e_erros_http():
+    casos = casos_sinteticos()[:5]
+
+    async def cenario():
+        async with ServicoVerificacao(porta=0, fila_max=4, workers=1) as s:
+            grande = await pedido(s.porta, "POST", "/check", casos)
+            #fila temporariamente cheia: agrupador parado e 4 casos à espera
+            s._agrupador.cancel()
+            await asyncio.gather(s._agrupador, return_exceptions=True)
+            for c in casos[:4]:
+                s._fila.put_nowait((c, False, asyncio.get_running_loop().create_future()))
+            cheio = await pedido(s.porta, "POST", "/check", casos[:1])
+            while not s._fila.empty():
+                s._fila.get_nowait()
+            s._agrupador = asyncio.create_task(s._agrupar())
+            cabe = await pedido(s.porta, "POST", "/check", casos[:4])
+            invalido = await pedido(s.porta, "POST", "/check", "texto")
+            desconhecido = await pedido(s.porta, "GET", "/xpto")
+            _, _, estado = await pedido(s.porta, "GET", "/estado")
+        return grande, cheio, cabe, invalido, desconhecido, estado
+
+    grande, cheio, cabe, invalido, desconhecido, estado = correr(cenario())
+    assert grande[0] == 413 and "Retry-After" not in grande[1] and "fila_max = 4" in grande[2]["erro"]
+    assert cheio[0] == 503 and cheio[1]["Retry-After"] == "1"
+    assert cabe[0] == 200 and len(cabe[2]["resultados"]) == 4
+    assert invalido[0] == 400 and desconhecido[0] == 404
+    assert estado["rejeitados"] == 2 and estado["casos"] == 4
+
+
+@pytest.mark.parametrize("host", ["0.0.0.0", "192.168.1.10", "exemplo.pt"])
+def test_so_loopback(host):
+    with pytest.raises(ValueError):
+        ServicoVerificacao(host=host)
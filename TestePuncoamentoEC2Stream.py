@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import csv
+
+import pytest
+
+from Punching_EC2 import PuncoamentoEC2
+import Punching_EC2_stream as stream
+
+
+# ----------------------------
+# helpers
+# ----------------------------
+CABECALHO = ["id", "d", "fck", "As_lx", "As_ly", "tipo", "forma", "c1", "c2",
+             "V_Ed", "M_Edx", "M_Edy", "sigma_cp", "sigma_gd", "u1_ineffective"]
+
+
+def escrever_mapa(caminho, n, sep=","):
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, delimiter=sep)
+        w.writerow(CABECALHO)
+        for i in range(n):
+            tipo = ("interior", "bordo", "canto")[i % 3]
+            w.writerow([f"P{i}", "0.22", "30", "8.8", "8.8", tipo, "retangular", "0.40", "0.40",
+                        str(300 + 25 * i), "10", "5", "0", "", ""])
+
+
+def ler_saida(caminho):
+    with open(caminho, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+# ---------     -------------------
+# testes
+# --------------------------   --
+
+def test_stream_csv_igual_ao_motor(tmp_path):
+    entrada, saida = tmp_path / "mapa.csv", tmp_path / "res.csv"
+    escrever_mapa(entrada, 25)
+    assert stream.main([str(entrada), str(saida), "--bloco", "4"]) == 0
+    linhas = ler_saida(saida)
+    assert [r["id"] for r in linhas] == [f"P{i}" for i in range(25)]
+
+    v = PuncoamentoEC2(laje_d=0.22, betão_fck=30, aço_fyk=500, aço_fywk=500,
+                       pilar_tipo="bordo", pilar_forma="retangular", V_Ed=325_000,
+                       pilar_c1=0.40, pilar_c2=0.40, M_Edx=10_000, M_Edy=5_000,
+                       laje_As_lx_cm2pm=8.8, laje_As_ly_cm2pm=8.8)
+    v.verificar_puncoamento()
+    assert float(linhas[1]["v_Ed_u1"]) == pytest.approx(v.v_Ed_u1, rel=1e-15)
+    assert linhas[1]["erro"] == ""
+
+
+def test_stream_retoma_a_partir_da_saida_existente(tmp_path):
+    entrada, saida, ref = tmp_path / "mapa.csv", tmp_path / "res.csv", tmp_path / "ref.csv"
+    escrever_mapa(entrada, 12)
+    stream.main([str(entrada), str(ref)])
+    # simula uma interrupção após 5 linhas
+    with open(ref, encoding="utf-8") as f:
+        cabecalho_e_5 = f.readlines()[:6]
+    saida.write_text("".join(cabecalho_e_5), encoding="utf-8")
+    stream.main([str(entrada), str(saida), "--retomar", "--bloco", "3"])
+    assert saida.read_text(encoding="utf-8") == ref.read_text(encoding="utf-8")
+
+
+def test_stream_retoma_apos_linha_escrita_a_meio(tmp_path):
+    entrada, saida, ref = tmp_path / "mapa.csv", tmp_path / "res.csv", tmp_path / "ref.csv"
+    escrever_mapa(entrada, 12)
+    stream.main([str(entrada), str(ref)])
+    completo = ref.read_bytes()
+    fim_da_6a = completo.index(b"\n", completo.index(b"P5,")) + 1
+    saida.write_bytes(completo[:fim_da_6a + 25])  # interrupção a meio da 7.ª linha de dados
+    assert stream.contar_linhas_escritas(str(saida)) == 6
+    stream.main([str(entrada), str(saida), "--retomar", "--bloco", "4"])
+    assert saida.read_bytes() == completo
+
+
+def test_stream_retoma_com_colunas_atrasadas(tmp_path):
+    """Interrupção entre a escrita do CSV e a das colunas: retoma no menor dos dois."""
+    from Punching_EC2_resultados import EscritorResultados, abrir_resultados
+    entrada, saida, ref, pasta = (tmp_path / "mapa.csv", tmp_path / "res.csv", tmp_path / "ref.csv",
+                                  tmp_path / "cols")
+    escrever_mapa(entrada, 10)
+    stream.main([str(entrada), str(ref), "--colunas", str(tmp_path / "ref_cols")])
+    stream.main([str(entrada), str(saida), "--bloco", "4", "--colunas", str(pasta)])
+    EscritorResultados(str(pasta), 4)  # as colunas só têm o 1.º bloco; o CSV tem tudo
+    stream.main([str(entrada), str(saida), "--retomar", "--bloco", "4", "--colunas", str(pasta)])
+    assert saida.read_bytes() == ref.read_bytes()
+    assert abrir_resultados(pasta).registos().tobytes() == \
+        abrir_resultados(tmp_path / "ref_cols").registos().tobytes()
+
+
+def test_stream_linha_invalida_fica_registada(tmp_path):
+    entrada, saida = tmp_path / "mapa.csv", tmp_path / "res.csv"
+    escrever_mapa(entrada, 3, sep=";")
+    texto = entrada.read_text(encoding="utf-8").replace("canto", "lateral")
+    entrada.write_text(texto.replace("0.22", "0,22"), encoding="utf-8")
+    stream.main([str(entrada), str(saida), "--sep", ";"])
+    linhas = ler_saida(saida)
+    assert linhas[0]["erro"] == "" and linhas[0]["beta"] != ""
+    assert "inválidos" in linhas[2]["erro"] and linhas[2]["beta"] == ""
+
+
+def test_stream_linha_com_d_nulo_nao_interrompe(tmp_path):
+    from Punching_EC2 import ESTADO_ERRO
+    from Punching_EC2_resultados import abrir_resultados
+    entrada, saida, pasta = tmp_path / "mapa.csv", tmp_path / "res.csv", tmp_path / "cols"
+    escrever_mapa(entrada, 3)
+    linhas = entrada.read_text(encoding="utf-8").splitlines(keepends=True)
+    linhas[2] = linhas[2].replace("0.22", "0", 1)
+    entrada.write_text("".join(linhas), encoding="utf-8")
+    assert stream.main([str(entrada), str(saida), "--colunas", str(pasta)]) == 0
+    registos = ler_saida(saida)
+    assert [r["id"] for r in registos] == ["P0", "P1", "P2"]
+    assert registos[0]["erro"] == registos[2]["erro"] == "" and "'d'" in registos[1]["erro"]
+    assert abrir_resultados(pasta)["estado"].tolist()[1] == ESTADO_ERRO
+
+
+def test_stream_falha_do_motor_isolada_por_caso(tmp_path, monkeypatch):
+    """Se run_many falhar num bloco, o bloco é repetido caso a caso e só o caso culpado fica com erro."""
+    run_many = stream.run_many
+
+    def run_many_fragil(casos, **kw):
+        if any(c["V_Ed"] == 350_000 for c in casos):
+            raise ZeroDivisionError("float division by zero")
+        return run_many(casos, **kw)
+
+    monkeypatch.setattr(stream, "run_many", run_many_fragil)
+    entrada, saida = tmp_path / "mapa.csv", tmp_path / "res.csv"
+    escrever_mapa(entrada, 5)  # P2 tem V_Ed = 350 kN
+    stream.main([str(entrada), str(saida), "--bloco", "4"])
+    registos = ler_saida(saida)
+    assert [r["id"] for r in registos] == [f"P{i}" for i in range(5)]
+    assert [r["erro"] != "" for r in registos] == [False, False, True, False, False]
+    assert "division" in registos[2]["erro"] and registos[3]["beta"] != ""
+
+
+def test_stream_com_processos_igual_ao_serie(tmp_path):
+    entrada, serie, paralelo = tmp_path / "mapa.csv", tmp_path / "a.csv", tmp_path / "b.csv"
+    escrever_mapa(entrada, 300)
+    stream.main([str(entrada), str(serie), "--bloco", "100"])
+    stream.main([str(entrada), str(paralelo), "--bloco", "100", "--workers", "2"])
+    assert serie.read_text(encoding="utf-8") == paralelo.read_text(encoding="utf-8")
+
+
+def test_stream_escreve_colunas_e_retoma(tmp_path):
+    from Punching_EC2_resultados import abrir_resultados
+    entrada, saida, pasta = tmp_path / "mapa.csv", tmp_path / "res.csv", tmp_path / "cols"
+    escrever_mapa(entrada, 11)
+    stream.main([str(entrada), str(saida), "--bloco", "4", "--colunas", str(pasta)])
+    linhas = ler_saida(saida)
+    res = abrir_resultados(pasta)
+    assert len(res) == 11
+    assert res["v_Ed_u1"].tolist() == [float(r["v_Ed_u1"]) for r in linhas]
+
+    stream.main([str(entrada), str(saida), "--inicio", "6", "--colunas", str(pasta)])
+    assert abrir_resultados(pasta)["v_Ed_u1"].tolist() == res["v_Ed_u1"].tolist()
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""Ponto de entrada `python -m punching` (ver Punching_EC2_cli)."""
+
+import sys
+
+from Punching_EC2_cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())